@@ -0,0 +1,68 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Enqueue throughput of the batch event queue under contention: request threads
+enqueue events while the flusher swaps full batches out and a stand-in sender
+takes them, so no time is spent on the network.
+
+Usage: python benchmarks/batch_event_queue_benchmark.py
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import benchmark_util  # noqa: F401  (puts the SDK on the path)
+from vwo.services.batch_event_queue import BatchEventQueue
+
+EVENTS_PER_THREAD = 50000
+EVENT = {"d": {"msgId": "benchmark", "visId": "user", "event": {"name": "vwo_variationShown"}}}
+
+
+class InlineNetworkManager:
+    def execute_in_background(self, func):
+        func()
+        return True
+
+
+def measure(thread_count):
+    with patch("vwo.services.batch_event_queue.NetworkManager.get_instance", return_value=InlineNetworkManager()):
+        queue = BatchEventQueue(100, 600, 1, "sdk-key")
+        queue.send_batch_events = lambda events, on_retry_complete=None: True
+
+        def produce():
+            for _ in range(EVENTS_PER_THREAD):
+                queue.enqueue(EVENT)
+
+        threads = [threading.Thread(target=produce) for _ in range(thread_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        queue.flush_and_clear_timer()
+        return thread_count * EVENTS_PER_THREAD / elapsed, queue.get_stats()
+
+
+def main():
+    print(f"{'threads':>8} {'enqueues/s':>12} {'flushes':>8} {'max depth':>10} {'dropped':>8}")
+    for thread_count in (1, 4, 16):
+        rate, stats = measure(thread_count)
+        print(f"{thread_count:>8} {rate:>12.0f} {stats['flushes']:>8} {stats['max_depth']:>10} {stats['dropped']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers shared by the benchmark scripts: synthetic settings of a given size,
+an offline client, and a small timing helper.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from vwo import init  # noqa: E402
+from vwo.packages.network_layer.models.response_model import ResponseModel  # noqa: E402
+
+
+def _ok_response() -> ResponseModel:
+    response = ResponseModel()
+    response.set_status_code(200)
+    return response
+
+
+def _variables(value: str) -> List[Dict[str, Any]]:
+    return [
+        {"id": 1, "key": "int", "type": "integer", "value": 10},
+        {"id": 2, "key": "string", "type": "string", "value": value},
+    ]
+
+
+def build_settings(num_features: int, segments: Dict = None) -> Dict[str, Any]:
+    """
+    Builds a settings file with one rollout and one A/B testing rule per feature.
+
+    :param num_features: The number of features (each feature adds two campaigns).
+    :param segments: Optional pre-segmentation DSL set on every testing rule.
+    :return: The settings dictionary.
+    """
+    features = []
+    campaigns = []
+    for index in range(num_features):
+        rollout_id = 2 * index + 1
+        testing_id = 2 * index + 2
+        feature_key = f"feature{index}"
+        features.append(
+            {
+                "id": index + 1,
+                "key": feature_key,
+                "name": feature_key,
+                "type": "FEATURE_FLAG",
+                "status": "ON",
+                "impactCampaign": {},
+                "metrics": [
+                    {
+                        "id": index + 1,
+                        "type": "CUSTOM_GOAL",
+                        "identifier": f"event{index}",
+                        "mca": -1,
+                    }
+                ],
+                "rules": [
+                    {
+                        "type": "FLAG_ROLLOUT",
+                        "ruleKey": "rollout",
+                        "campaignId": rollout_id,
+                        "variationId": 1,
+                    },
+                    {
+                        "type": "FLAG_TESTING",
+                        "ruleKey": "testing",
+                        "campaignId": testing_id,
+                    },
+                ],
+            }
+        )
+        campaigns.append(
+            {
+                "id": rollout_id,
+                "key": f"{feature_key}_rollout",
+                "name": f"{feature_key}_rollout",
+                "type": "FLAG_ROLLOUT",
+                "status": "RUNNING",
+                "segments": {},
+                "isForcedVariationEnabled": False,
+                "variations": [
+                    {
+                        "id": 1,
+                        "name": "Rollout-rule-1",
+                        "weight": 100,
+                        "segments": {},
+                        "variables": _variables("rollout"),
+                    }
+                ],
+            }
+        )
+        campaigns.append(
+            {
+                "id": testing_id,
+                "key": f"{feature_key}_testing",
+                "name": f"{feature_key}_testing",
+                "type": "FLAG_TESTING",
+                "status": "RUNNING",
+                "percentTraffic": 100,
+                "segments": segments or {},
+                "isForcedVariationEnabled": False,
+                "variations": [
+                    {
+                        "id": 1,
+                        "name": "Default",
+                        "weight": 50,
+                        "segments": {},
+                        "variables": _variables("default"),
+                    },
+                    {
+                        "id": 2,
+                        "name": "Variation-1",
+                        "weight": 50,
+                        "segments": {},
+                        "variables": _variables("variation"),
+                    },
+                ],
+            }
+        )
+
+    return {
+        "version": 1,
+        "accountId": 123456,
+        "sdkKey": "000000000000_MASKED_000000000000",
+        "features": features,
+        "campaigns": campaigns,
+    }
+
+
+@contextmanager
+def offline():
+    """Keeps the SDK from making any network call while benchmarking."""
+    with patch(
+        "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+        return_value=None,
+    ), patch(
+        "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+        side_effect=lambda *args, **kwargs: _ok_response(),
+    ), patch(
+        "vwo.packages.network_layer.manager.network_manager.NetworkManager.get",
+        return_value=None,
+    ):
+        yield
+
+
+def init_offline_client(settings: Dict[str, Any], options: Dict[str, Any] = None):
+    """
+    Initializes a client with the given settings without fetching them from the network.
+    Must be called inside the offline() context.
+    """
+    client_options = {
+        "sdk_key": settings["sdkKey"],
+        "account_id": str(settings["accountId"]),
+        "threading": {"enabled": False},
+    }
+    client_options.update(options or {})
+    with patch("vwo.vwo_builder.VWOBuilder.get_settings", return_value=settings):
+        return init(client_options)
+
+
+def time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    """
+    Runs the function the given number of times and returns the mean latency in microseconds.
+    """
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
@@ -0,0 +1,62 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bulk evaluation of one feature over many users.
+
+"before" calls get_flag once per user; "after" streams the same contexts
+through evaluate_cohort. Install numpy (pip install vwo-fme-python-sdk[bulk])
+to vectorize the bucketing hashes.
+
+Usage: python benchmarks/evaluate_cohort_benchmark.py
+"""
+
+import time
+
+from benchmark_util import build_settings, init_offline_client, offline
+from vwo.packages.decision_maker import decision_maker
+
+USERS = 20000
+SEGMENTS = {"or": [{"custom_variable": {"plan": "premium"}}]}
+
+
+def contexts():
+    for index in range(USERS):
+        yield {
+            "id": f"user-{index}",
+            "custom_variables": {"plan": "premium" if index % 3 else "free"},
+        }
+
+
+def main():
+    with offline():
+        client = init_offline_client(build_settings(10, SEGMENTS))
+
+        start = time.perf_counter()
+        before = [client.get_flag("feature5", context).is_enabled() for context in contexts()]
+        before_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = [flag.is_enabled() for flag in client.evaluate_cohort("feature5", contexts())]
+        after_s = time.perf_counter() - start
+
+    assert before == after
+    print(f"numpy: {'yes' if decision_maker.np is not None else 'no'}")
+    print(f"{'':>8} {'users/s':>12}")
+    print(f"{'before':>8} {USERS / before_s:>12.0f}")
+    print(f"{'after':>8} {USERS / after_s:>12.0f}   ({before_s / after_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Enqueue latency of the batch event queue with and without the disk spool. Every
+spooled enqueue writes its event through to the OS; fsync runs in groups on the
+spool's own thread, so enqueue should stay in microseconds.
+
+Usage: python benchmarks/event_spool_benchmark.py
+"""
+
+import tempfile
+import time
+from unittest.mock import patch
+
+import benchmark_util  # noqa: F401  (puts the SDK on the path)
+from vwo.services.batch_event_queue import BatchEventQueue
+from vwo.services.event_spool import EventSpool
+
+EVENTS = 50000
+EVENT = {"d": {"msgId": "benchmark", "visId": "user", "event": {"name": "vwo_variationShown"}}}
+
+
+class InlineNetworkManager:
+    def execute_in_background(self, func):
+        func()
+        return True
+
+
+def measure(spool):
+    with patch("vwo.services.batch_event_queue.NetworkManager.get_instance", return_value=InlineNetworkManager()):
+        queue = BatchEventQueue(100, 600, 1, "sdk-key", spool=spool)
+        queue.send_batch_events = lambda events, on_retry_complete=None: True
+        latencies = []
+        for _ in range(EVENTS):
+            start = time.perf_counter()
+            queue.enqueue(EVENT)
+            latencies.append(time.perf_counter() - start)
+        queue.flush_and_clear_timer()
+        queue.close_spool()
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)], queue.get_stats()
+
+
+def main():
+    print(f"{'spool':>8} {'p50 us':>8} {'p99 us':>8} {'fsyncs':>8}")
+    median, p99, _ = measure(None)
+    print(f"{'off':>8} {median * 1e6:>8.1f} {p99 * 1e6:>8.1f} {'-':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        median, p99, stats = measure(EventSpool(directory))
+        print(f"{'on':>8} {median * 1e6:>8.1f} {p99 * 1e6:>8.1f} {stats['spool']['fsyncs']:>8}")
+
+
+if __name__ == "__main__":
+    main()
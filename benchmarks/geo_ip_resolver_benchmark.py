@@ -0,0 +1,94 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lookup throughput of the mmap GeoIP resolver on a synthetic database of one
+million IPv4 ranges (about the size of a city-level GeoIP database).
+
+"uncached" resolves random addresses with the LRU disabled, so every lookup is
+a binary search over the mapped file; "cached" replays a skewed stream of
+addresses through the default LRU.
+
+Usage: python benchmarks/geo_ip_resolver_benchmark.py
+"""
+
+import ipaddress
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import benchmark_util  # noqa: F401  (puts the SDK on the path)
+from vwo.packages.segmentation_evaluator.utils.geo_ip_resolver import MmapGeoIpResolver
+
+RANGES = 1000000
+LOCATIONS = 50000
+LOOKUPS = 200000
+
+
+def build_ranges(rng):
+    locations = [
+        {"country": f"C{index % 200}", "region": f"R{index % 5000}", "city": f"City {index}"}
+        for index in range(LOCATIONS)
+    ]
+    width = 2 ** 32 // RANGES
+    for index in range(RANGES):
+        start = index * width
+        yield (
+            str(ipaddress.IPv4Address(start)),
+            str(ipaddress.IPv4Address(start + width - 1)),
+            rng.choice(locations),
+        )
+
+
+def measure(resolver, addresses):
+    start = time.perf_counter()
+    for address in addresses:
+        resolver.resolve(address)
+    return len(addresses) / (time.perf_counter() - start)
+
+
+def main():
+    rng = random.Random(7)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "geo.db")
+        start = time.perf_counter()
+        MmapGeoIpResolver.write_database(path, build_ranges(rng))
+        build_seconds = time.perf_counter() - start
+
+        addresses = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(LOOKUPS)]
+        resolver = MmapGeoIpResolver(path, max_size=0)
+        uncached = measure(resolver, addresses)
+        resolver.close()
+
+        # a small share of addresses carries most of the traffic
+        hot = addresses[:5000]
+        weights = [1 / (rank + 1) for rank in range(len(hot))]
+        resolver = MmapGeoIpResolver(path)
+        cached = measure(resolver, rng.choices(hot, weights, k=LOOKUPS))
+        stats = resolver.get_stats()
+        resolver.close()
+
+        print(f"database: {RANGES} ranges, {os.path.getsize(path) / 2 ** 20:.1f} MiB, built in {build_seconds:.1f}s")
+        print(f"{'':>10} {'lookups/s':>12} {'us/lookup':>10}")
+        print(f"{'uncached':>10} {uncached:>12.0f} {1e6 / uncached:>10.2f}")
+        print(f"{'cached':>10} {cached:>12.0f} {1e6 / cached:>10.2f}   {stats}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
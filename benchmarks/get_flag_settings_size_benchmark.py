@@ -0,0 +1,63 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+get_flag latency against settings size.
+
+"before" adds the schema validation that get_flag used to run on every call
+(a fresh Draft7Validator walking the whole settings file); "after" is get_flag
+as it runs now, checking only the validity flag stamped at load time.
+
+Usage: python benchmarks/get_flag_settings_size_benchmark.py
+"""
+
+import jsonschema
+
+from benchmark_util import build_settings, init_offline_client, offline, time_per_call
+from vwo.models.schemas.settings_schema import SETTINGS_FILE_SCHEMA
+
+SETTINGS_SIZES = [10, 100, 500, 1000]
+ITERATIONS = 200
+
+
+def per_call_validation(settings):
+    validator = jsonschema.Draft7Validator(SETTINGS_FILE_SCHEMA)
+    sorted(validator.iter_errors(settings), key=lambda e: e.path)
+
+
+def main():
+    print(f"{'features':>10} {'before (us)':>14} {'after (us)':>14} {'speedup':>9}")
+    with offline():
+        for size in SETTINGS_SIZES:
+            settings = build_settings(size)
+            client = init_offline_client(settings)
+            feature_key = f"feature{size // 2}"
+            context = {"id": "benchmark-user"}
+
+            def before():
+                per_call_validation(client.original_settings)
+                client.get_flag(feature_key, context)
+
+            def after():
+                client.get_flag(feature_key, context)
+
+            before_us = time_per_call(before, ITERATIONS)
+            after_us = time_per_call(after, ITERATIONS)
+            print(
+                f"{size:>10} {before_us:>14.1f} {after_us:>14.1f} {before_us / after_us:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
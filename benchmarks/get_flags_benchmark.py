@@ -0,0 +1,52 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Evaluating all the flags of a page for one user.
+
+"before" calls get_flag once per feature; "after" is one get_flags call for
+the same features.
+
+Usage: python benchmarks/get_flags_benchmark.py
+"""
+
+from benchmark_util import build_settings, init_offline_client, offline, time_per_call
+
+FLAGS_PER_PAGE = [10, 20, 40]
+ITERATIONS = 200
+
+
+def main():
+    print(f"{'flags':>6} {'before (us)':>14} {'after (us)':>14} {'speedup':>9}")
+    with offline():
+        settings = build_settings(max(FLAGS_PER_PAGE))
+        client = init_offline_client(settings)
+        context = {"id": "benchmark-user"}
+        for count in FLAGS_PER_PAGE:
+            feature_keys = [f"feature{index}" for index in range(count)]
+
+            def before():
+                for feature_key in feature_keys:
+                    client.get_flag(feature_key, context)
+
+            def after():
+                client.get_flags(feature_keys, context)
+
+            before_us = time_per_call(before, ITERATIONS)
+            after_us = time_per_call(after, ITERATIONS)
+            print(f"{count:>6} {before_us:>14.1f} {after_us:>14.1f} {before_us / after_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bytes on the wire and upload latency of batch event requests with and without
+body compression, against a local stand-in for the events server. The server
+decompresses every body and reads it at a simulated uplink bandwidth, so the
+latency includes both the compression time and the transfer time saved.
+
+Usage: python benchmarks/request_compression_benchmark.py [uplink Mbit/s, default 20]
+"""
+
+import gzip
+import json
+import sys
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest.mock import patch
+
+import benchmark_util  # noqa: F401  (puts the SDK on the path)
+from vwo.packages.network_layer.client.network_client import NetworkClient
+from vwo.packages.network_layer.client.request_compressor import RequestCompressor
+from vwo.packages.network_layer.models.request_model import RequestModel
+
+BATCH_SIZES = (10, 100, 1000, 5000)
+REQUESTS = 5
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    bytes_per_second = 20 * 1000 * 1000 / 8
+
+
+class EventsHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(len(data) / self.server.bytes_per_second)
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            gzip.decompress(data)
+        elif encoding == "deflate":
+            zlib.decompress(data)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def event(index):
+    user_id = f"user-{index}"
+    return {
+        "d": {
+            "msgId": f"{uuid.uuid4().hex}-{int(time.time() * 1000)}",
+            "visId": uuid.uuid5(uuid.NAMESPACE_DNS, user_id).hex.upper(),
+            "sessionId": int(time.time()),
+            "event": {
+                "name": "vwo_variationShown",
+                "time": int(time.time() * 1000),
+                "props": {
+                    "vwo_sdkName": "vwo-fme-python-sdk",
+                    "vwo_sdkVersion": "1.0.0",
+                    "vwo_envKey": "32-alpha-numeric-sdk-key-000000",
+                    "id": 12,
+                    "variation": index % 3 + 1,
+                    "isFirst": 1,
+                },
+            },
+            "visitor": {"props": {"vwo_fs_environment": "32-alpha-numeric-sdk-key-000000", "plan": "pro"}},
+        }
+    }
+
+
+def measure(client, port, events):
+    request = RequestModel("127.0.0.1", "POST", "/events/v1/track-batch", {"a": "1"}, {"ev": events}, scheme="http", port=port)
+    sent_bytes = []
+    original_post = client.session.post
+
+    def post(url, **kwargs):
+        body = kwargs["data"] if "data" in kwargs else json.dumps(kwargs["json"]).encode("utf-8")
+        sent_bytes.append(len(body))
+        return original_post(url, **kwargs)
+
+    client.session.post = post
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        response = client.post(request)
+        latencies.append(time.perf_counter() - start)
+        assert response.get_status_code() == 200, response.get_error()
+    client.session.post = original_post
+    return sent_bytes[-1], sorted(latencies)[len(latencies) // 2]
+
+
+def main():
+    server = StandInServer(("127.0.0.1", 0), EventsHandler)
+    if len(sys.argv) > 1:
+        server.bytes_per_second = float(sys.argv[1]) * 1000 * 1000 / 8
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    configurations = (
+        ("none", None),
+        ("gzip-1", RequestCompressor("gzip", 0, 1)),
+        ("gzip-6", RequestCompressor("gzip", 0, 6)),
+        ("deflate-6", RequestCompressor("deflate", 0, 6)),
+    )
+
+    print(f"{'events':>7} {'encoding':>10} {'bytes':>10} {'ratio':>6} {'p50 ms':>8}")
+    # the SDK compresses on its background sender only
+    with patch("vwo.packages.network_layer.client.network_client.is_background_thread", return_value=True):
+        for batch_size in BATCH_SIZES:
+            events = [event(index) for index in range(batch_size)]
+            baseline = None
+            for name, compressor in configurations:
+                client = NetworkClient(compressor=compressor)
+                sent, latency = measure(client, port, events)
+                baseline = baseline or sent
+                print(f"{batch_size:>7} {name:>10} {sent:>10} {baseline / sent:>6.1f} {latency * 1000:>8.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
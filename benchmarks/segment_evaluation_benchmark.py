@@ -0,0 +1,89 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Segment evaluation on large nested segment trees: the DSL interpreter
+(SegmentEvaluator.is_segmentation_valid) against the predicate tree compiled
+at settings load (compile_segment).
+
+Usage: python benchmarks/segment_evaluation_benchmark.py
+"""
+
+from benchmark_util import time_per_call
+from vwo.packages.segmentation_evaluator.evaluators.segment_evaluator import (
+    SegmentEvaluator,
+)
+from vwo.packages.segmentation_evaluator.evaluators.segment_compiler import (
+    compile_segment,
+)
+
+OPERANDS = [
+    "wildcard(*premium*)",
+    "wildcard(gold*)",
+    "lower(INDIA)",
+    "regex(^v[0-9]+$)",
+    "gte(2.10.3)",
+    "lt(100)",
+    "exact_value",
+]
+
+CUSTOM_VARIABLES = {
+    "attr0": "not-premium-member",
+    "attr1": "silver",
+    "attr2": "india",
+    "attr3": "v12",
+    "attr4": "2.9.0",
+    "attr5": 250,
+    "attr6": "other_value",
+}
+
+
+def build_tree(depth, breadth, counter=None):
+    """Alternating and/or levels; leaves cycle through the operand types."""
+    counter = counter if counter is not None else [0]
+    if depth == 0:
+        index = counter[0] % len(OPERANDS)
+        counter[0] += 1
+        return {"custom_variable": {f"attr{index}": OPERANDS[index]}}
+    operator = "and" if depth % 2 else "or"
+    children = [build_tree(depth - 1, breadth, counter) for _ in range(breadth)]
+    if depth % 3 == 0:
+        return {"not": {operator: children}}
+    return {operator: children}
+
+
+def main():
+    evaluator = SegmentEvaluator()
+    print(f"{'depth x breadth':>16} {'leaves':>8} {'interpreted (us)':>18} {'compiled (us)':>15} {'speedup':>9}")
+    for depth, breadth in [(2, 4), (3, 4), (4, 4), (3, 8), (5, 3)]:
+        dsl = build_tree(depth, breadth)
+        compiled = compile_segment(dsl)
+        assert compiled.evaluate(evaluator, CUSTOM_VARIABLES) == evaluator.is_segmentation_valid(
+            dsl, CUSTOM_VARIABLES
+        )
+        iterations = max(20, 20000 // breadth ** depth)
+        interpreted_us = time_per_call(
+            lambda: evaluator.is_segmentation_valid(dsl, CUSTOM_VARIABLES), iterations
+        )
+        compiled_us = time_per_call(
+            lambda: compiled.evaluate(evaluator, CUSTOM_VARIABLES), iterations
+        )
+        print(
+            f"{f'{depth} x {breadth}':>16} {breadth ** depth:>8} {interpreted_us:>18.1f} "
+            f"{compiled_us:>15.1f} {interpreted_us / compiled_us:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+UUID generation cost.
+
+"before" derives both namespaces and the user UUID on every call, as get_uuid
+used to; "cached" is get_uuid for a returning user (LRU hit); "bulk" is the
+per-user cost of get_uuids over a batch of distinct users.
+
+Usage: python benchmarks/uuid_benchmark.py
+"""
+
+import time
+import uuid
+
+import benchmark_util  # noqa: F401 (puts the SDK on the path)
+from benchmark_util import time_per_call
+from vwo.utils.uuid_util import get_uuid, get_uuids
+
+ITERATIONS = 20000
+BATCH_SIZE = 100000
+ACCOUNT_ID = "123456"
+
+
+def uncached_uuid(user_id, account_id):
+    vwo_namespace = uuid.uuid5(uuid.NAMESPACE_URL, "https://vwo.com")
+    account_namespace = uuid.UUID(str(uuid.uuid5(vwo_namespace, str(account_id))))
+    return str(uuid.uuid5(account_namespace, user_id)).replace("-", "").upper()
+
+
+def main():
+    before_us = time_per_call(lambda: uncached_uuid("user-1", ACCOUNT_ID), ITERATIONS)
+    cached_us = time_per_call(lambda: get_uuid("user-1", ACCOUNT_ID), ITERATIONS)
+
+    user_ids = [f"user-{index}" for index in range(BATCH_SIZE)]
+    start = time.perf_counter()
+    for user_id in user_ids:
+        uncached_uuid(user_id, ACCOUNT_ID)
+    loop_us = (time.perf_counter() - start) / BATCH_SIZE * 1e6
+    start = time.perf_counter()
+    get_uuids(user_ids, ACCOUNT_ID)
+    bulk_us = (time.perf_counter() - start) / BATCH_SIZE * 1e6
+
+    print(f"{'case':>28} {'per call (us)':>14} {'speedup':>9}")
+    print(f"{'before':>28} {before_us:>14.2f} {1:>8.1f}x")
+    print(f"{'get_uuid (returning user)':>28} {cached_us:>14.2f} {before_us / cached_us:>8.1f}x")
+    print(f"{'before, batch of users':>28} {loop_us:>14.2f} {1:>8.1f}x")
+    print(f"{'get_uuids, batch of users':>28} {bulk_us:>14.2f} {loop_us / bulk_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
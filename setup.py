@@ -154,4 +154,8 @@ setup(
     packages=find_packages(exclude=["tests"]),
     include_package_data=True,
     install_requires=REQUIREMENTS,
+    extras_require={
+        # vectorized bucketing for VWOClient.evaluate_cohort
+        "bulk": ["numpy"],
+    },
 )
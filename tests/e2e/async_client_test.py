@@ -0,0 +1,174 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import copy
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from vwo import init_async, AsyncStorageConnector
+from vwo.packages.network_layer.manager.network_manager import NetworkManager
+from vwo.packages.storage.storage import Storage
+from vwo.services.settings_manager import SettingsManager
+from ..data.dummy_test_data_reader import settings_files
+
+NETWORK_POST = "vwo.packages.network_layer.manager.network_manager.NetworkManager.post"
+GATEWAY_LOOKUP = (
+    "vwo.utils.gateway_service_util.get_from_gateway_service"
+)
+
+
+class DictAsyncStorage(AsyncStorageConnector):
+    def __init__(self):
+        self.data = {}
+        self.loop_threads = set()
+
+    async def get(self, key, user_id):
+        self.loop_threads.add(threading.get_ident())
+        await asyncio.sleep(0)
+        return self.data.get(f"{key}_{user_id}")
+
+    async def set(self, value):
+        self.loop_threads.add(threading.get_ident())
+        await asyncio.sleep(0)
+        self.data[f"{value.get('featureKey')}_{value.get('userId')}"] = value
+
+
+class AsyncVWOClientTest(unittest.TestCase):
+    """AsyncVWOClient awaits blocking work off the event loop and evaluates the rest inline."""
+
+    def setUp(self):
+        self.patches = [
+            patch(
+                "vwo.vwo_builder.VWOBuilder.get_settings",
+                return_value=copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS")),
+            ),
+            patch(
+                "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+                return_value=None,
+            ),
+            patch(NETWORK_POST, return_value=None),
+            patch("vwo.api.get_flag_api.send_impression_for_variation_shown_batch"),
+        ]
+        for active_patch in self.patches:
+            active_patch.start()
+
+    def tearDown(self):
+        for active_patch in self.patches:
+            active_patch.stop()
+        Storage.get_instance().attach_connector(None)
+
+    def _init(self, **options):
+        return init_async(dict({"sdk_key": "abcd", "account_id": "1234"}, **options))
+
+    def test_in_memory_evaluation_runs_inline(self):
+        async def scenario():
+            vwo_client = await self._init()
+            sync_flag = vwo_client.get_client().get_flag("feature1", {"id": "user"})
+            # events are sent from background threads, so nothing here blocks
+            with patch.object(
+                NetworkManager.get_instance(), "should_use_threading", True
+            ), patch.object(vwo_client._transport, "submit") as submit:
+                flag = await vwo_client.get_flag("feature1", {"id": "user"})
+                flags = await vwo_client.get_flags(["feature1"], {"id": "user"})
+                submit.assert_not_called()
+            await vwo_client.close()
+            return sync_flag, flag, flags
+
+        sync_flag, flag, flags = asyncio.run(scenario())
+        self.assertTrue(flag.is_enabled())
+        self.assertEqual(flag.get_variables(), sync_flag.get_variables())
+        self.assertTrue(flags["feature1"].is_enabled())
+
+    def test_cached_alias_runs_inline(self):
+        async def scenario():
+            vwo_client = await self._init(
+                gateway_service={"url": "http://127.0.0.1:1"}, is_aliasing_enabled=True
+            )
+            SettingsManager.get_instance().alias_cache.set("user", "user")
+            with patch.object(
+                NetworkManager.get_instance(), "should_use_threading", True
+            ), patch.object(vwo_client._transport, "submit") as submit:
+                await vwo_client.get_flag("feature1", {"id": "user"})
+                submit.assert_not_called()
+                self.assertTrue(vwo_client._needs_transport(["feature1"], {"id": "other-user"}))
+            await vwo_client.close()
+
+        asyncio.run(scenario())
+
+    def test_gateway_lookup_does_not_block_the_event_loop(self):
+        def slow_lookup(query_params, endpoint, context):
+            time.sleep(0.3)
+            return {}
+
+        async def ticker(ticks, done):
+            while not done.is_set():
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            vwo_client = await self._init(gateway_service={"url": "http://127.0.0.1:1"})
+            ticks = []
+            done = asyncio.Event()
+            ticking = asyncio.ensure_future(ticker(ticks, done))
+            with patch(GATEWAY_LOOKUP, side_effect=slow_lookup) as lookup:
+                flag = await vwo_client.get_flag(
+                    "feature1", {"id": "user", "user_agent": "Mozilla/5.0"}
+                )
+                self.assertEqual(lookup.call_count, 1)
+            done.set()
+            await ticking
+            await vwo_client.close()
+            return flag, ticks
+
+        flag, ticks = asyncio.run(scenario())
+        self.assertTrue(flag.is_enabled())
+        # the loop kept ticking while the lookup slept on the transport pool
+        self.assertGreater(len(ticks), 10)
+
+    def test_async_storage_connector(self):
+        storage = DictAsyncStorage()
+
+        async def scenario():
+            vwo_client = await self._init(storage=storage)
+            loop_thread = threading.get_ident()
+            first = await vwo_client.get_flag("feature1", {"id": "stored-user"})
+            second = await vwo_client.get_flag("feature1", {"id": "stored-user"})
+            await vwo_client.close()
+            return loop_thread, first, second
+
+        loop_thread, first, second = asyncio.run(scenario())
+        self.assertTrue(first.is_enabled())
+        self.assertEqual(first.get_variables(), second.get_variables())
+        self.assertIn("feature1_stored-user", storage.data)
+        # the connector's coroutines ran on the event loop, not on the transport threads
+        self.assertEqual(storage.loop_threads, {loop_thread})
+
+    def test_track_event_and_flush(self):
+        async def scenario():
+            vwo_client = await self._init()
+            result = await vwo_client.track_event("unknownEvent", {"id": "user"})
+            flushed = await vwo_client.flush_events()
+            await vwo_client.close()
+            return result, flushed
+
+        result, flushed = asyncio.run(scenario())
+        self.assertEqual(result, {"unknownEvent": False})
+        self.assertFalse(flushed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from vwo import init
+from ..data.dummy_test_data_reader import settings_files
+
+THREADS = 16
+USERS = 400
+
+
+class ConcurrentGetFlagTest(unittest.TestCase):
+    """get_flag from many threads decides exactly as it does on one thread."""
+
+    def setUp(self):
+        self.patches = [
+            patch(
+                "vwo.vwo_builder.VWOBuilder.get_settings",
+                return_value=settings_files.get("ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS"),
+            ),
+            patch(
+                "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+                return_value=None,
+            ),
+            patch(
+                "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+                return_value=None,
+            ),
+            patch("vwo.api.get_flag_api.send_impression_for_variation_shown_batch"),
+        ]
+        for active_patch in self.patches:
+            active_patch.start()
+        self.vwo_client = init(
+            {"sdk_key": "abcd", "account_id": "1234", "threading": {"enabled": False}}
+        )
+        # switch threads as often as possible to interleave the calls
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+        for active_patch in self.patches:
+            active_patch.stop()
+
+    def _decide(self, index):
+        # users alternate between the two price segments and a price matching neither
+        context = {
+            "id": f"concurrent-user-{index}",
+            "custom_variables": {"price": ["100", "200", "300"][index % 3]},
+        }
+        flag = self.vwo_client.get_flag("feature1", context)
+        return flag.is_enabled(), flag.get_variables()
+
+    def test_decisions_match_single_threaded_results(self):
+        expected = [self._decide(index) for index in range(USERS)]
+        self.assertTrue(any(enabled for enabled, _ in expected))
+        self.assertFalse(all(enabled for enabled, _ in expected))
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            for _ in range(3):
+                actual = list(executor.map(self._decide, range(USERS)))
+                self.assertEqual(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
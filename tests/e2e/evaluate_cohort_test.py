@@ -0,0 +1,172 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+from unittest.mock import MagicMock, patch
+
+from vwo import init
+from vwo.api.get_flag_api import GetFlagApi
+from vwo.packages.storage.storage import Storage
+from vwo.models.settings.settings_model import SettingsModel
+from vwo.packages.segmentation_evaluator.evaluators.segment_evaluator import SegmentEvaluator
+from ..data.dummy_test_data_reader import settings_files
+
+BATCH_SENDER = "vwo.utils.impression_util.send_impression_for_variation_shown_batch"
+
+
+def _partial_traffic_settings():
+    settings = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_TESTING_RULE_SETTINGS"))
+    for campaign in settings["campaigns"]:
+        if campaign["type"] == "FLAG_ROLLOUT":
+            campaign["variations"][0]["weight"] = 60
+        else:
+            campaign["percentTraffic"] = 40
+    return settings
+
+
+def _contexts(count):
+    contexts = []
+    for index in range(count):
+        context = {"id": f"user-{index}", "custom_variables": {"price": [50, 100, 150, 200][index % 4]}}
+        if index % 7 == 0:
+            context["bucketingSeed"] = f"seed-{index // 7}"
+        if index % 10 == 3:
+            # whitelisted in TESTING_WHITELISTING_SEGMENT_RULE_SETTINGS
+            context["id"] = "user_id_9"
+        contexts.append(context)
+    return contexts
+
+
+class EvaluateCohortTest(unittest.TestCase):
+
+    def setUp(self):
+        Storage.get_instance().attach_connector(None)
+
+    def _init(self, settings):
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings", return_value=settings
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ), patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            return init(
+                {"sdk_key": "abcd", "account_id": "1234", "threading": {"enabled": False}}
+            )
+
+    def _assert_matches_get_flag(self, settings):
+        vwo_client = self._init(settings)
+        contexts = _contexts(200)
+        with patch(BATCH_SENDER), patch(
+            "vwo.api.get_flag_api.send_impression_for_variation_shown_batch"
+        ):
+            expected = [vwo_client.get_flag("feature1", dict(context)) for context in contexts]
+            flags = list(vwo_client.evaluate_cohort("feature1", contexts, batch_size=64))
+
+        self.assertEqual(len(flags), len(contexts))
+        for flag, expected_flag in zip(flags, expected):
+            self.assertEqual(flag.is_enabled(), expected_flag.is_enabled())
+            self.assertEqual(flag.get_variables(), expected_flag.get_variables())
+            self.assertEqual(flag.get_uuid(), expected_flag.get_uuid())
+        return flags
+
+    def test_matches_get_flag(self):
+        for settings_key in (
+            "BASIC_ROLLOUT_SETTINGS",
+            "BASIC_ROLLOUT_TESTING_RULE_SETTINGS",
+            "ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS",
+            "NO_ROLLOUT_ONLY_TESTING_RULE_SETTINGS",
+            "SETTINGS_WITH_DIFFERENT_SALT",
+            "TESTING_WHITELISTING_SEGMENT_RULE_SETTINGS",
+        ):
+            with self.subTest(settings=settings_key):
+                self._assert_matches_get_flag(copy.deepcopy(settings_files.get(settings_key)))
+
+    def test_matches_get_flag_with_partial_traffic(self):
+        flags = self._assert_matches_get_flag(_partial_traffic_settings())
+        enabled = sum(flag.is_enabled() for flag in flags)
+        self.assertTrue(0 < enabled < len(flags))
+
+    def test_has_no_side_effects(self):
+        vwo_client = self._init(_partial_traffic_settings())
+        storage = MagicMock()
+        Storage.get_instance().attach_connector(storage)
+        contexts = [dict(context, user_agent="Mozilla/5.0", ip_address="1.2.3.4") for context in _contexts(50)]
+        with patch.object(GetFlagApi, "get") as get_flag_api, patch(BATCH_SENDER) as send_batch, patch(
+            "vwo.utils.gateway_service_util.get_from_gateway_service"
+        ) as gateway:
+            flags = list(vwo_client.evaluate_cohort("feature1", contexts))
+        self.assertEqual(len(flags), 50)
+        get_flag_api.assert_not_called()
+        send_batch.assert_not_called()
+        gateway.assert_not_called()
+        storage.get.assert_not_called()
+        storage.set.assert_not_called()
+
+    def test_evaluates_segments_once_per_distinct_value(self):
+        vwo_client = self._init(
+            copy.deepcopy(settings_files.get("ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS"))
+        )
+        contexts = [{"id": f"user-{index}", "custom_variables": {"price": 100}} for index in range(30)]
+        with patch.object(
+            SettingsModel, "get_compiled_segment", return_value=None
+        ), patch.object(
+            SegmentEvaluator,
+            "is_segmentation_valid",
+            autospec=True,
+            side_effect=SegmentEvaluator.is_segmentation_valid,
+        ) as is_segmentation_valid:
+            flags = list(vwo_client.evaluate_cohort("feature1", contexts))
+
+        self.assertTrue(all(flag.is_enabled() for flag in flags))
+        # one evaluation per rule for the single distinct price, not one per user
+        self.assertLess(is_segmentation_valid.call_count, len(contexts))
+
+    def test_rejects_features_in_mutually_exclusive_groups(self):
+        vwo_client = self._init(copy.deepcopy(settings_files.get("MEG_CAMPAIGN_RANDOM_ALGO_SETTINGS")))
+        with self.assertRaises(ValueError):
+            list(vwo_client.evaluate_cohort("feature1", [{"id": "user"}]))
+
+    def test_sends_impressions_when_asked(self):
+        vwo_client = self._init(_partial_traffic_settings())
+        with patch(
+            "vwo.api.evaluate_cohort_api.send_impression_for_variation_shown_batch"
+        ) as send_batch:
+            flags = list(
+                vwo_client.evaluate_cohort("feature1", _contexts(50), send_impressions=True)
+            )
+        self.assertEqual(send_batch.call_count, 1)
+        self.assertGreaterEqual(
+            len(send_batch.call_args[0][0]), sum(flag.is_enabled() for flag in flags)
+        )
+
+    def test_invalid_contexts_and_feature(self):
+        vwo_client = self._init(_partial_traffic_settings())
+        with patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            flags = list(vwo_client.evaluate_cohort("feature1", [{}, {"id": "user"}]))
+            self.assertFalse(flags[0].is_enabled())
+            flags = list(vwo_client.evaluate_cohort("missing", [{"id": "user"}]))
+            self.assertFalse(flags[0].is_enabled())
+            flags = list(vwo_client.evaluate_cohort(1, [{"id": "user"}]))
+            self.assertFalse(flags[0].is_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
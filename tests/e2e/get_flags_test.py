@@ -0,0 +1,112 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest.mock import patch
+
+from vwo import init
+from vwo.services.settings_manager import SettingsManager
+from ..data.dummy_test_data_reader import settings_files
+
+BATCH_SENDER = "vwo.utils.impression_util.send_impression_for_variation_shown_batch"
+NETWORK_POST = "vwo.packages.network_layer.manager.network_manager.NetworkManager.post"
+
+
+class GetFlagsTest(unittest.TestCase):
+
+    def _init(self, settings_key):
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings",
+            return_value=settings_files.get(settings_key),
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ), patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            return init(
+                {"sdk_key": "abcd", "account_id": "1234", "threading": {"enabled": False}}
+            )
+
+    def test_matches_get_flag(self):
+        vwo_client = self._init("SETTINGS_WITH_DIFFERENT_SALT")
+        with patch(BATCH_SENDER):
+            for index in range(20):
+                context = {"id": f"user-{index}"}
+                flags = vwo_client.get_flags(["feature1", "feature2"], context)
+                self.assertEqual(list(flags), ["feature1", "feature2"])
+                for feature_key, flag in flags.items():
+                    expected = vwo_client.get_flag(feature_key, context)
+                    self.assertEqual(flag.is_enabled(), expected.is_enabled())
+                    self.assertEqual(flag.get_variables(), expected.get_variables())
+                    self.assertEqual(flag.get_uuid(), expected.get_uuid())
+
+    def test_impressions_are_sent_as_one_batch(self):
+        vwo_client = self._init("SETTINGS_WITH_DIFFERENT_SALT")
+        with patch(BATCH_SENDER) as send_batch:
+            flags = vwo_client.get_flags(["feature1", "feature2"], {"id": "batch-user"})
+            self.assertEqual(send_batch.call_count, 1)
+            batch_payload = send_batch.call_args[0][0]
+
+        enabled_flags = [flag for flag in flags.values() if flag.is_enabled()]
+        self.assertGreaterEqual(len(batch_payload), len(enabled_flags))
+
+    def test_gateway_mode_sends_impressions_individually(self):
+        vwo_client = self._init("SETTINGS_WITH_DIFFERENT_SALT")
+        settings_manager = SettingsManager.get_instance()
+        with patch.object(
+            settings_manager, "is_gateway_service_provided", True
+        ), patch(BATCH_SENDER) as send_batch, patch(
+            "vwo.utils.impression_util.send_impression_for_variation_shown"
+        ) as send_single, patch(
+            "vwo.api.get_flag_api.send_impression_for_variation_shown"
+        ) as send_from_get_flag_api:
+            vwo_client.get_flags(["feature1", "feature2"], {"id": "gateway-user"})
+        send_batch.assert_not_called()
+        send_from_get_flag_api.assert_not_called()
+        self.assertGreater(send_single.call_count, 0)
+
+    def test_shares_session_id_across_flags(self):
+        vwo_client = self._init("SETTINGS_WITH_DIFFERENT_SALT")
+        with patch(BATCH_SENDER):
+            flags = vwo_client.get_flags(["feature1", "feature2"], {"id": "user"})
+        self.assertEqual(
+            flags["feature1"].get_session_id(), flags["feature2"].get_session_id()
+        )
+
+    def test_get_all_flags(self):
+        vwo_client = self._init("SETTINGS_WITH_DIFFERENT_SALT")
+        with patch(BATCH_SENDER):
+            flags = vwo_client.get_all_flags({"id": "user"})
+        self.assertEqual(set(flags), {"feature1", "feature2"})
+
+    def test_unknown_feature_is_disabled(self):
+        vwo_client = self._init("BASIC_ROLLOUT_SETTINGS")
+        # the missing feature is reported as a debug event
+        with patch(BATCH_SENDER), patch(NETWORK_POST):
+            flags = vwo_client.get_flags(["feature1", "missing"], {"id": "user"})
+        self.assertTrue(flags["feature1"].is_enabled())
+        self.assertFalse(flags["missing"].is_enabled())
+
+    def test_invalid_input_returns_disabled_flags(self):
+        vwo_client = self._init("BASIC_ROLLOUT_SETTINGS")
+        with patch(NETWORK_POST):
+            flags = vwo_client.get_flags(["feature1"], {})
+            self.assertFalse(flags["feature1"].is_enabled())
+            self.assertEqual(vwo_client.get_flags("feature1", {"id": "user"}), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
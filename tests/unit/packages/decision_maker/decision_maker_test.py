@@ -21,8 +21,18 @@ from unittest.mock import patch, MagicMock
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 # Now you can import the module
+from vwo.packages.decision_maker import decision_maker
 from vwo.packages.decision_maker.decision_maker import DecisionMaker
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BULK_HASH_KEYS = ["", "a", "ab", "abc", "abcd", "key123", "1_user-1", "ünïcode_ключ_键"] + [
+    f"{salt}_1234_user-{index}" for salt in ("salt", "42") for index in range(500)
+]
+
 
 class DecisionMakerTest(unittest.TestCase):
 
@@ -78,6 +88,31 @@ class DecisionMakerTest(unittest.TestCase):
         hash_value = self.decisionMaker.generate_hash_value(hash_key)
         self.assertEqual(hash_value, expected_hash_value)
 
+    def test_bulk_values_without_numpy(self):
+        with patch.object(decision_maker, "np", None):
+            hash_values = self.decisionMaker.generate_hash_values(BULK_HASH_KEYS)
+            bucket_values = self.decisionMaker.generate_bucket_values(hash_values, 10000)
+        self.assertEqual(
+            list(hash_values),
+            [self.decisionMaker.generate_hash_value(key) for key in BULK_HASH_KEYS],
+        )
+        self.assertEqual(
+            bucket_values,
+            [self.decisionMaker.generate_bucket_value(value, 10000) for value in hash_values],
+        )
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_bulk_values_with_numpy(self):
+        hash_values = self.decisionMaker.generate_hash_values(BULK_HASH_KEYS)
+        self.assertIsInstance(hash_values, numpy.ndarray)
+        expected_hash_values = [self.decisionMaker.generate_hash_value(key) for key in BULK_HASH_KEYS]
+        self.assertEqual([int(value) for value in hash_values], expected_hash_values)
+        for max_value in (100, 10000):
+            self.assertEqual(
+                self.decisionMaker.generate_bucket_values(hash_values, max_value),
+                [self.decisionMaker.generate_bucket_value(value, max_value) for value in expected_hash_values],
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
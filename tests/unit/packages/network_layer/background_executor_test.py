@@ -0,0 +1,181 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from vwo import init
+from vwo.enums.overflow_policy_enum import OverflowPolicyEnum
+from vwo.packages.network_layer.manager.background_executor import BackgroundExecutor
+from vwo.packages.network_layer.manager.network_manager import NetworkManager
+from ....data.dummy_test_data_reader import settings_files
+
+
+class BackgroundExecutorTest(unittest.TestCase):
+    """One bounded, long-lived pool runs every background network call."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.executed = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def _blocked_executor(self, policy):
+        executor = BackgroundExecutor(1, 2, policy)
+        started = threading.Event()
+
+        def blocking_task():
+            started.set()
+            self.release.wait(5)
+
+        executor.submit(blocking_task)
+        started.wait(5)
+        for name in ("first", "second"):
+            self.assertTrue(executor.submit(lambda name=name: self.executed.append(name)))
+        return executor
+
+    def test_workers_are_reused(self):
+        executor = BackgroundExecutor(3, 1000)
+        thread_count = threading.active_count()
+        for index in range(200):
+            executor.submit(lambda index=index: self.executed.append(index))
+        self.assertTrue(executor.shutdown(5))
+
+        self.assertEqual(sorted(self.executed), list(range(200)))
+        stats = executor.get_stats()
+        self.assertLessEqual(stats["workers"], 3)
+        self.assertEqual(stats["completed"], 200)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertLessEqual(threading.active_count(), thread_count)
+
+    def test_drop_newest_rejects_the_new_task(self):
+        executor = self._blocked_executor(OverflowPolicyEnum.DROP_NEWEST.value)
+        self.assertFalse(executor.submit(lambda: self.executed.append("third")))
+        self.assertEqual(executor.get_stats()["queue_depth"], 2)
+        self.assertEqual(executor.get_stats()["rejected"], 1)
+
+        self.release.set()
+        self.assertTrue(executor.shutdown(5))
+        self.assertEqual(self.executed, ["first", "second"])
+
+    def test_drop_oldest_evicts_the_oldest_task(self):
+        executor = self._blocked_executor(OverflowPolicyEnum.DROP_OLDEST.value)
+        self.assertTrue(executor.submit(lambda: self.executed.append("third")))
+        self.assertEqual(executor.get_stats()["rejected"], 1)
+
+        self.release.set()
+        self.assertTrue(executor.shutdown(5))
+        self.assertEqual(self.executed, ["second", "third"])
+
+    def test_block_waits_for_room(self):
+        executor = self._blocked_executor(OverflowPolicyEnum.BLOCK.value)
+        submitted = threading.Event()
+
+        def submit_third():
+            executor.submit(lambda: self.executed.append("third"))
+            submitted.set()
+
+        threading.Thread(target=submit_third).start()
+        self.assertFalse(submitted.wait(0.1))
+
+        self.release.set()
+        self.assertTrue(submitted.wait(5))
+        self.assertTrue(executor.shutdown(5))
+        self.assertEqual(self.executed, ["first", "second", "third"])
+        self.assertEqual(executor.get_stats()["rejected"], 0)
+
+    def test_block_runs_a_worker_submit_inline_when_full(self):
+        executor = BackgroundExecutor(2, 2, OverflowPolicyEnum.BLOCK.value)
+        lock = threading.Lock()
+
+        def resubmitting_task(index):
+            # e.g. a failed request sending its debug event from the worker
+            time.sleep(0.01)
+            executor.submit(lambda: self._append(lock, ("follow-up", index)))
+            self._append(lock, ("task", index))
+
+        for index in range(4):
+            executor.submit(lambda index=index: resubmitting_task(index))
+        deadline = time.monotonic() + 5
+        while len(self.executed) < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(executor.shutdown(5))
+
+        self.assertEqual(len(self.executed), 8)
+        stats = executor.get_stats()
+        self.assertEqual(stats["completed"], 8)
+        self.assertEqual(stats["rejected"], 0)
+
+    def _append(self, lock, item):
+        with lock:
+            self.executed.append(item)
+
+    def test_shutdown_drains_then_rejects(self):
+        executor = self._blocked_executor(OverflowPolicyEnum.BLOCK.value)
+        self.assertFalse(executor.shutdown(0.05))
+
+        self.release.set()
+        self.assertTrue(executor.shutdown(5))
+        self.assertEqual(self.executed, ["first", "second"])
+        self.assertFalse(executor.submit(lambda: self.executed.append("late")))
+        self.assertEqual(executor.get_stats()["rejected"], 1)
+
+    def test_failing_task_does_not_stop_the_worker(self):
+        executor = BackgroundExecutor(1, 10)
+        executor.submit(lambda: 1 / 0)
+        executor.submit(lambda: self.executed.append("after"))
+        self.assertTrue(executor.shutdown(5))
+        self.assertEqual(self.executed, ["after"])
+        self.assertEqual(executor.get_stats()["failed"], 1)
+
+    def test_network_manager_shares_one_executor(self):
+        network_manager = NetworkManager({"max_workers": 2, "overflow_policy": "unknown"})
+        self.assertEqual(network_manager.thread_pool_overflow_policy, OverflowPolicyEnum.BLOCK.value)
+        for index in range(50):
+            network_manager.execute_in_background(lambda index=index: self.executed.append(index))
+        executor = network_manager.get_executor()
+        self.assertTrue(network_manager.shutdown(5))
+
+        self.assertEqual(len(self.executed), 50)
+        self.assertLessEqual(executor.get_stats()["workers"], 2)
+        self.assertFalse(network_manager.execute_in_background(lambda: None))
+
+    def test_client_close_stops_the_executor(self):
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings",
+            return_value=settings_files.get("BASIC_ROLLOUT_SETTINGS"),
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ), patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            vwo_client = init({"sdk_key": "abcd", "account_id": "1234"})
+            # start from an empty executor, earlier tests may have left calls retrying
+            NetworkManager.get_instance().executor = None
+            NetworkManager.get_instance().execute_in_background(
+                lambda: (time.sleep(0.05), self.executed.append("sent"))
+            )
+            self.assertTrue(vwo_client.close(5))
+
+        self.assertEqual(self.executed, ["sent"])
+        self.assertTrue(NetworkManager.get_instance().get_executor().is_shutdown())
+
+
+if __name__ == "__main__":
+    unittest.main()
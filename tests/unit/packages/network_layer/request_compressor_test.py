@@ -0,0 +1,118 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gzip
+import json
+import unittest
+import zlib
+from unittest.mock import MagicMock, patch
+
+from vwo.enums.endpoint_class_enum import EndpointClassEnum
+from vwo.packages.network_layer.client.network_client import NetworkClient
+from vwo.packages.network_layer.client.request_compressor import RequestCompressor
+from vwo.packages.network_layer.manager.network_manager import NetworkManager
+from vwo.packages.network_layer.models.request_model import RequestModel
+
+EVENTS = EndpointClassEnum.EVENTS.value
+BODY = {"ev": [{"d": {"event": {"props": {"vwo_envKey": "sdk-key", "sdkName": "vwo-fme-python-sdk"}}}}] * 50}
+
+
+def response_with(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = ""
+    return response
+
+
+class RequestCompressorTest(unittest.TestCase):
+    def test_bodies_are_compressed_above_the_threshold(self):
+        compressor = RequestCompressor("gzip", threshold=100)
+        data, encoding = compressor.compress(BODY, EVENTS)
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(json.loads(gzip.decompress(data)), BODY)
+        self.assertIsNone(compressor.compress({"ev": []}, EVENTS))
+
+        stats = compressor.get_stats()
+        self.assertEqual((stats["compressed"], stats["uncompressed"]), (1, 1))
+        self.assertLess(stats["bytes_out"] * 10, stats["bytes_in"])
+
+    def test_deflate_uses_the_zlib_format(self):
+        data, encoding = RequestCompressor("deflate", threshold=0).compress(BODY, EVENTS)
+        self.assertEqual(encoding, "deflate")
+        self.assertEqual(json.loads(zlib.decompress(data)), BODY)
+
+    def test_only_event_endpoints_are_compressed(self):
+        compressor = RequestCompressor(threshold=0)
+        self.assertIsNone(compressor.compress(BODY, EndpointClassEnum.GATEWAY.value))
+        self.assertIsNone(compressor.compress(BODY, EndpointClassEnum.SETTINGS.value))
+
+    def test_a_rejected_encoding_is_never_tried_again(self):
+        compressor = RequestCompressor("gzip", threshold=0)
+        self.assertEqual(compressor.reject(EVENTS, "gzip", "deflate, gzip;q=0.5"), "deflate")
+        self.assertEqual(compressor.compress(BODY, EVENTS)[1], "deflate")
+        self.assertIsNone(compressor.reject(EVENTS, "deflate", "gzip"))
+        self.assertIsNone(compressor.compress(BODY, EVENTS))
+        self.assertEqual(compressor.get_stats()["rejections"], 2)
+
+    def test_invalid_options_fall_back_to_defaults(self):
+        self.assertIsNone(NetworkManager._create_compressor(False))
+        compressor = NetworkManager._create_compressor({"encoding": "br", "threshold": -1, "level": 12})
+        self.assertEqual(compressor.get_encoding(EVENTS), "gzip")
+        self.assertEqual((compressor.threshold, compressor.level), (1024, 6))
+
+
+class CompressedPostTest(unittest.TestCase):
+    def setUp(self):
+        self.client = NetworkClient(compressor=RequestCompressor("gzip", threshold=0))
+        self.client.session = MagicMock()
+        self.request = RequestModel("dev.visualwebsiteoptimizer.com", "POST", "/events/v1/track-batch", body=BODY)
+
+    def _post_in_background(self):
+        with patch("vwo.packages.network_layer.client.network_client.is_background_thread", return_value=True):
+            return self.client.post(self.request)
+
+    def test_background_posts_send_compressed_bodies(self):
+        self.client.session.post.return_value = response_with(200)
+        self.assertEqual(self._post_in_background().get_status_code(), 200)
+
+        kwargs = self.client.session.post.call_args[1]
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(kwargs["data"])), BODY)
+
+    def test_request_threads_send_json(self):
+        self.client.session.post.return_value = response_with(200)
+        self.client.post(self.request)
+
+        kwargs = self.client.session.post.call_args[1]
+        self.assertEqual(kwargs["json"], BODY)
+        self.assertNotIn("data", kwargs)
+
+    def test_a_415_is_resent_with_the_negotiated_encoding(self):
+        self.client.session.post.side_effect = [
+            response_with(415, {"Accept-Encoding": "deflate"}),
+            response_with(200),
+        ]
+        response = self._post_in_background()
+
+        self.assertEqual(response.get_status_code(), 200)
+        self.assertIsNone(response.get_error())
+        kwargs = self.client.session.post.call_args[1]
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "deflate")
+        self.assertEqual(json.loads(zlib.decompress(kwargs["data"])), BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from vwo.enums.circuit_breaker_state_enum import CircuitBreakerStateEnum
+from vwo.enums.endpoint_class_enum import EndpointClassEnum
+from vwo.packages.network_layer.client.network_client import NetworkClient
+from vwo.packages.network_layer.manager.background_executor import BackgroundExecutor
+from vwo.packages.network_layer.manager.retry_scheduler import RetryScheduler
+from vwo.packages.network_layer.models.request_model import RequestModel
+from vwo.packages.network_layer.retry.circuit_breaker import CircuitBreaker
+from vwo.packages.network_layer.retry.retry_policy import RetryBudget, RetryPolicy
+
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule(self, delay, func):
+        self.scheduled.append((delay, func))
+        return True
+
+
+def ok_response():
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"Content-Type": "application/json"}
+    response.json.return_value = {"ok": True}
+    response.content = b'{"ok": true}'
+    return response
+
+
+def request_for(endpoint_class=None):
+    request = RequestModel("dev.visualwebsiteoptimizer.com", "GET", "/server-side/v2-settings")
+    request.set_endpoint_class(endpoint_class)
+    return request
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("gateway", 3, 10, self.clock)
+
+    def _trip(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self._trip()
+
+        self.assertEqual(self.breaker.get_state(), CircuitBreakerStateEnum.OPEN.value)
+        self.assertFalse(self.breaker.allow_request())
+        stats = self.breaker.get_stats()
+        self.assertEqual(stats["trips"], 1)
+        self.assertEqual(stats["short_circuited"], 1)
+
+    def test_half_open_lets_one_probe_through(self):
+        self._trip()
+        self.clock.now = 10
+
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.get_state(), CircuitBreakerStateEnum.HALF_OPEN.value)
+        self.assertFalse(self.breaker.allow_request())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.get_state(), CircuitBreakerStateEnum.CLOSED.value)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_failed_probe_opens_again(self):
+        self._trip()
+        self.clock.now = 10
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.get_state(), CircuitBreakerStateEnum.OPEN.value)
+        self.assertEqual(self.breaker.get_stats()["trips"], 2)
+        self.clock.now = 15
+        self.assertFalse(self.breaker.allow_request())
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_backoff_uses_full_jitter_under_the_cap(self):
+        policy = RetryPolicy(5, 1, 4, 60, True, False, RetryBudget(1, 10))
+        for attempt, cap in ((0, 1), (1, 2), (2, 4), (4, 4)):
+            delays = [policy.get_backoff_delay(attempt) for _ in range(200)]
+            self.assertTrue(all(0 <= delay <= cap for delay in delays))
+            self.assertLess(min(delays), cap / 2)
+
+    def test_budget_limits_retries_to_a_share_of_calls(self):
+        budget = RetryBudget(0.5, 2)
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+        budget.record_call()
+        budget.record_call()
+        self.assertTrue(budget.try_spend())
+        stats = budget.get_stats()
+        self.assertEqual(stats["retries"], 3)
+        self.assertEqual(stats["budget_exhausted"], 1)
+
+
+class NetworkClientRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = FakeScheduler()
+        self.clock = FakeClock()
+        self.sleep = MagicMock(side_effect=self.clock.sleep)
+        self.client = NetworkClient(self.scheduler, self.clock, self.sleep)
+        self.client.session = MagicMock()
+
+    def test_gateway_call_on_a_request_thread_does_not_sleep(self):
+        self.client.session.get.side_effect = requests.ConnectionError("gateway down")
+        response = self.client.get(request_for(EndpointClassEnum.GATEWAY.value))
+
+        self.sleep.assert_not_called()
+        self.assertEqual(self.client.session.get.call_count, 1)
+        self.assertEqual(response.get_error(), "gateway down")
+        self.assertFalse(response.get_is_retry_scheduled())
+
+    def test_event_retry_is_scheduled_instead_of_slept(self):
+        self.client.session.post.side_effect = [requests.ConnectionError("down"), ok_response()]
+        request = request_for()
+        completed = []
+        request.set_on_retry_complete(completed.append)
+        response = self.client.post(request)
+        self.sleep.assert_not_called()
+        self.assertTrue(response.get_is_retry_scheduled())
+        self.assertEqual(len(self.scheduler.scheduled), 1)
+
+        delay, retry = self.scheduler.scheduled[0]
+        self.assertLessEqual(delay, 2)
+        retried = retry()
+
+        self.assertEqual(retried.get_status_code(), 200)
+        self.assertEqual(retried.get_total_attempts(), 0)
+        self.assertEqual(self.client.session.post.call_count, 2)
+        self.assertEqual(completed, [retried])
+
+    def test_retries_on_a_background_worker_sleep_in_place(self):
+        self.client.session.post.side_effect = [requests.ConnectionError("down"), ok_response()]
+        responses = []
+        executor = BackgroundExecutor(1, 10)
+        executor.submit(lambda: responses.append(self.client.post(request_for())))
+        self.assertTrue(executor.shutdown(5))
+
+        self.assertEqual(self.sleep.call_count, 1)
+        self.assertEqual(responses[0].get_status_code(), 200)
+        self.assertEqual(self.scheduler.scheduled, [])
+
+    def test_settings_retries_stop_at_the_deadline(self):
+        self.client.session.get.side_effect = requests.Timeout("slow")
+        policy = self.client.retry_policies[EndpointClassEnum.SETTINGS.value]
+        policy.deadline = 5
+        with patch.object(policy, "get_backoff_delay", return_value=3):
+            response = self.client.get(request_for(EndpointClassEnum.SETTINGS.value))
+
+        # the second retry would start 6 seconds after the first attempt
+        self.assertEqual(self.client.session.get.call_count, 2)
+        self.assertEqual(response.get_error(), "slow")
+
+    def test_open_breaker_fails_fast_and_is_reported(self):
+        self.client.session.get.side_effect = requests.ConnectionError("down")
+        for _ in range(5):
+            self.client.get(request_for(EndpointClassEnum.GATEWAY.value))
+        self.client.session.get.reset_mock()
+
+        response = self.client.get(request_for(EndpointClassEnum.GATEWAY.value))
+
+        self.client.session.get.assert_not_called()
+        self.assertIn("Circuit breaker for gateway calls is open", response.get_error())
+        stats = self.client.get_retry_stats()
+        self.assertEqual(stats["gateway"]["state"], CircuitBreakerStateEnum.OPEN.value)
+        self.assertEqual(stats["gateway"]["trips"], 1)
+        self.assertEqual(stats["events"]["state"], CircuitBreakerStateEnum.CLOSED.value)
+
+    def test_client_errors_do_not_open_the_breaker(self):
+        response = ok_response()
+        response.status_code = 404
+        response.text = "not found"
+        self.client.session.get.return_value = response
+        for _ in range(10):
+            self.client.get(request_for(EndpointClassEnum.GATEWAY.value))
+
+        self.assertEqual(self.client.get_retry_stats()["gateway"]["state"], CircuitBreakerStateEnum.CLOSED.value)
+
+    def test_debugger_events_are_not_retried(self):
+        self.client.session.post.side_effect = requests.ConnectionError("down")
+        request = RequestModel("dev.visualwebsiteoptimizer.com", "POST", "/server-side/events", {"en": "vwo_log"})
+        self.client.post(request)
+
+        self.sleep.assert_not_called()
+        self.assertEqual(self.client.session.post.call_count, 1)
+        self.assertEqual(self.scheduler.scheduled, [])
+
+
+class RetrySchedulerTest(unittest.TestCase):
+    def test_due_retries_are_submitted_in_order(self):
+        executor = BackgroundExecutor(1, 10)
+        scheduler = RetryScheduler(executor.submit)
+        ran = []
+        scheduler.schedule(0.05, lambda: ran.append("late"))
+        scheduler.schedule(0.01, lambda: ran.append("early"))
+        for _ in range(100):
+            if len(ran) == 2:
+                break
+            time.sleep(0.02)
+
+        self.assertEqual(ran, ["early", "late"])
+        self.assertEqual(scheduler.get_stats()["dispatched"], 2)
+
+    def test_shutdown_hands_pending_retries_over(self):
+        executor = BackgroundExecutor(1, 10)
+        scheduler = RetryScheduler(executor.submit)
+        ran = []
+        scheduler.schedule(60, lambda: ran.append("retry"))
+
+        self.assertEqual(scheduler.shutdown(), 1)
+        self.assertTrue(executor.shutdown(5))
+        self.assertEqual(ran, ["retry"])
+        self.assertFalse(scheduler.schedule(0, lambda: None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from vwo.models.user.context_model import ContextModel
+from vwo.packages.segmentation_evaluator.core.segmentation_manager import (
+    SegmentationManager,
+)
+from vwo.packages.segmentation_evaluator.utils.geo_ip_resolver import (
+    MmapGeoIpResolver,
+)
+from vwo.services.settings_manager import SettingsManager
+from vwo.utils.settings_util import build_settings_snapshot
+
+from ....data.dummy_test_data_reader import settings_files
+
+GATEWAY_LOOKUP = "vwo.utils.gateway_service_util.get_from_gateway_service"
+
+RANGES = [
+    ("81.2.69.0", "81.2.69.255", {"country": "GB", "region": "England", "city": "London"}),
+    ("1.0.0.0", "1.0.0.255", {"country": "AU"}),
+    ("2.16.0.0", "2.16.3.255", {"country": "FR", "region": "Ile-de-France", "city": "Paris"}),
+    ("2001:db8::", "2001:db8::ffff", {"country": "IN", "region": "Delhi", "city": "New Delhi"}),
+]
+
+
+class GeoIpResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "geo.db")
+        MmapGeoIpResolver.write_database(self.path, RANGES)
+
+
+class MmapGeoIpResolverTest(GeoIpResolverTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resolver = MmapGeoIpResolver(self.path, max_size=2)
+        self.addCleanup(self.resolver.close)
+
+    def test_resolves_addresses_inside_ranges(self):
+        expected = {
+            "81.2.69.0": {"country": "GB", "region": "England", "city": "London"},
+            "81.2.69.160": {"country": "GB", "region": "England", "city": "London"},
+            "2.16.3.255": {"country": "FR", "region": "Ile-de-France", "city": "Paris"},
+            "1.0.0.7": {"country": "AU"},
+            "::ffff:1.0.0.7": {"country": "AU"},
+            "2001:db8::1": {"country": "IN", "region": "Delhi", "city": "New Delhi"},
+        }
+        for ip_address, location in expected.items():
+            with self.subTest(ip_address=ip_address):
+                self.assertEqual(self.resolver.resolve(ip_address), location)
+
+    def test_unknown_and_invalid_addresses_have_no_location(self):
+        for ip_address in ("0.255.255.255", "1.0.1.0", "81.2.70.0", "255.255.255.255", "2001:db9::", "not an ip", ""):
+            with self.subTest(ip_address=ip_address):
+                self.assertIsNone(self.resolver.resolve(ip_address))
+
+    def test_resolved_addresses_are_cached(self):
+        first = self.resolver.resolve("81.2.69.1")
+        first["country"] = "changed"
+        self.assertEqual(self.resolver.resolve("81.2.69.1")["country"], "GB")
+        self.resolver.resolve("1.0.0.1")
+        self.resolver.resolve("2.16.0.1")
+
+        self.assertEqual(self.resolver.get_stats(), {"hits": 1, "misses": 3, "size": 2})
+
+    def test_rejects_files_that_are_not_databases(self):
+        with open(self.path, "wb") as database_file:
+            database_file.write(b"not a database" * 4)
+        with self.assertRaises(ValueError):
+            MmapGeoIpResolver(self.path)
+
+
+class SegmentationManagerGeoIpResolverTest(GeoIpResolverTestCase):
+    """The local database fills the location, the gateway is never asked for it."""
+
+    def setUp(self):
+        super().setUp()
+        self.settings = build_settings_snapshot(
+            settings_files.get("ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS")
+        ).get_settings()
+        self.feature = self.settings.get_features()[0]
+        self.manager = SegmentationManager.get_instance()
+        self.addCleanup(self.manager.attach_geo_ip_resolver, None)
+        SettingsManager(
+            {"sdk_key": "abcd", "account_id": "1234", "gateway_service": {"url": "http://127.0.0.1:1"}}
+        )
+
+    def _set_contextual_data(self, **context):
+        context = ContextModel(dict({"id": "user"}, **context))
+        self.manager.set_contextual_data(self.settings, self.feature, context)
+        return context
+
+    def test_location_segments_evaluate_without_network_calls(self):
+        self.manager.attach_geo_ip_resolver({"path": self.path, "max_size": 10})
+        self.addCleanup(self.manager._geo_ip_resolver.close)
+        with patch(GATEWAY_LOOKUP) as lookup:
+            context = self._set_contextual_data(ip_address="81.2.69.160")
+            self.assertTrue(self.manager.evaluator.check_location_pre_segmentation({"country": "GB", "city": "London"}))
+            self.assertFalse(self.manager.evaluator.check_location_pre_segmentation({"country": "FR"}))
+            unknown_context = self._set_contextual_data(ip_address="10.0.0.1")
+
+        lookup.assert_not_called()
+        self.assertEqual(context.get_vwo().get_location()["city"], "London")
+        self.assertEqual(unknown_context.get_vwo().get_location(), {})
+
+    def test_gateway_is_only_asked_for_the_user_agent(self):
+        self.manager.attach_geo_ip_resolver(self.path)
+        self.addCleanup(self.manager._geo_ip_resolver.close)
+        gateway_data = {"location": {"country": "from gateway"}, "userAgent": {"os": "iOS"}}
+        with patch(GATEWAY_LOOKUP, return_value=gateway_data) as lookup:
+            context = self._set_contextual_data(user_agent="Mozilla", ip_address="2.16.0.1")
+
+        self.assertEqual(lookup.call_args[0][0], {"userAgent": "Mozilla"})
+        self.assertEqual(context.get_vwo().get_location()["city"], "Paris")
+        self.assertEqual(context.get_vwo().get_ua_info(), {"os": "iOS"})
+
+    def test_missing_database_keeps_lookups_on_the_gateway(self):
+        self.manager.attach_geo_ip_resolver(os.path.join(os.path.dirname(self.path), "missing.db"))
+        self.assertIsNone(self.manager._geo_ip_resolver)
+
+    def test_custom_resolver_is_used_as_is(self):
+        class StaticResolver:
+            def resolve(self, ip_address):
+                return {"country": "US"}
+
+        self.manager.attach_geo_ip_resolver(StaticResolver())
+        with patch(GATEWAY_LOOKUP) as lookup:
+            context = self._set_contextual_data(ip_address="8.8.8.8")
+        lookup.assert_not_called()
+        self.assertEqual(context.get_vwo().get_location(), {"country": "US"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import threading
+import unittest
+from unittest.mock import patch
+
+from vwo.packages.segmentation_evaluator.utils.regex_cache import RegexCache
+from vwo.packages.segmentation_evaluator.evaluators.segment_operand_evaluator import (
+    SegmentOperandEvaluator,
+)
+from vwo.packages.segmentation_evaluator.enums.segment_operand_value_enum import (
+    SegmentOperandValueEnum,
+)
+from vwo.packages.segmentation_evaluator.evaluators.segment_evaluator import (
+    SegmentEvaluator,
+)
+
+
+class RegexCacheTest(unittest.TestCase):
+    def test_compiles_each_pattern_once(self):
+        cache = RegexCache(max_size=10)
+        first = cache.get("^ab+c$")
+        self.assertIs(first, cache.get("^ab+c$"))
+        self.assertIsNot(first, cache.get("^ab+c$", re.IGNORECASE))
+        self.assertEqual(
+            cache.get_stats(), {"hits": 1, "misses": 2, "evictions": 0, "size": 2}
+        )
+
+    def test_invalid_pattern_is_remembered(self):
+        cache = RegexCache(max_size=10)
+        with patch("re.compile", wraps=re.compile) as compile_spy:
+            self.assertIsNone(cache.get("(unclosed"))
+            self.assertIsNone(cache.get("(unclosed"))
+            self.assertEqual(compile_spy.call_count, 1)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = RegexCache(max_size=2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")  # evicts "b"
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        cache.get("a")
+        self.assertEqual(cache.get_stats()["misses"], 3)
+        cache.get("b")
+        self.assertEqual(cache.get_stats()["misses"], 4)
+        self.assertEqual(cache.get_stats()["size"], 2)
+
+    def test_concurrent_access_stays_bounded(self):
+        cache = RegexCache(max_size=16)
+
+        def worker(offset):
+            for index in range(200):
+                self.assertIsNotNone(cache.get(f"p{(index + offset) % 32}"))
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 8 * 200)
+        self.assertLessEqual(stats["size"], 16)
+
+    def test_segment_operands_use_shared_cache(self):
+        cache = RegexCache.get_instance()
+        cache.clear()
+        operand_evaluator = SegmentOperandEvaluator()
+        self.assertTrue(operand_evaluator.extract_result(
+            SegmentOperandValueEnum.REGEX_VALUE.value, "^chr.*$", "chrome"
+        ))
+        self.assertFalse(operand_evaluator.extract_result(
+            SegmentOperandValueEnum.REGEX_VALUE.value, "(bad", "chrome"
+        ))
+
+        segment_evaluator = SegmentEvaluator()
+        self.assertTrue(
+            segment_evaluator.check_value_present(
+                {"browser_string": ["wildcard(CHR*)"]}, {"browser_string": "chrome"}
+            )
+        )
+        self.assertGreaterEqual(cache.get_stats()["size"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
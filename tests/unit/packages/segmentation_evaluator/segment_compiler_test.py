@@ -0,0 +1,120 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+from unittest.mock import patch
+
+from ....data.dummy_test_data_reader import segmentor_dummy_dsl as TESTS_DATA
+from ....data.dummy_test_data_reader import settings_files
+from vwo import init
+from vwo.models.user.context_model import ContextModel
+from vwo.packages.segmentation_evaluator.evaluators.segment_evaluator import (
+    SegmentEvaluator,
+)
+from vwo.packages.segmentation_evaluator.evaluators.segment_compiler import (
+    compile_segment,
+)
+
+
+class SegmentCompilerTest(unittest.TestCase):
+    """Compiled segment trees give the same results as the interpreter."""
+
+    def setUp(self):
+        self.segment_evaluator = SegmentEvaluator()
+
+    def test_compiled_segments_match_expectations(self):
+        for group_name, group in TESTS_DATA.items():
+            for case_name, case in group.items():
+                with self.subTest(group=group_name, case=case_name):
+                    custom_variables = case.get("customVariables", {})
+                    compiled = compile_segment(case["dsl"])
+                    self.assertEqual(
+                        compiled.evaluate(self.segment_evaluator, custom_variables),
+                        case["expectation"],
+                    )
+
+    def test_context_operands_match_interpreter(self):
+        self.segment_evaluator.context = ContextModel(
+            {
+                "id": "user",
+                "uuid": "uuid",
+                "user_agent": "Mozilla/5.0 (Macintosh) Chrome/120.0",
+                "ip_address": "10.0.0.1",
+                "_vwo": {
+                    "location": {"country": "India", "city": "Delhi"},
+                    "userAgent": {
+                        "os": "Mac OS",
+                        "browser_string": "Chrome",
+                        "browser_version": "120.0",
+                        "os_version": "14.1",
+                    },
+                },
+            }
+        )
+        dsls = [
+            {"ua": "wildcard(*Chrome*)"},
+            {"ua": "regex(Firefox)"},
+            {"ip_address": "10.0.0.1"},
+            {"browser_version": "gte(119)"},
+            {"os_version": "lt(14.0.9)"},
+            {"and": [{"country": "India"}, {"city": "Delhi"}]},
+            {"and": [{"country": "India"}, {"city": "Mumbai"}]},
+            {"or": [{"os": "wildcard(mac*)"}, {"browser_string": "Firefox"}]},
+            {"or": [{"os": "Windows"}, {"browser_string": "Firefox"}]},
+            {"not": {"or": [{"ua": "wildcard(*Safari*)"}]}},
+            {"user": "a, user ,b"},
+            {"unknown": "value"},
+        ]
+        for dsl in dsls:
+            with self.subTest(dsl=dsl):
+                properties = {"_vwoUserId": "user"}
+                self.assertEqual(
+                    compile_segment(dsl).evaluate(self.segment_evaluator, properties),
+                    self.segment_evaluator.is_segmentation_valid(dsl, properties),
+                )
+
+    def test_malformed_dsl_falls_back_to_interpreter(self):
+        compiled = compile_segment({"custom_variable": {"count": 5}})
+        with self.assertRaises(TypeError):
+            compiled.evaluate(self.segment_evaluator, {"count": 5})
+        self.assertFalse(compiled.evaluate(self.segment_evaluator, {}))
+
+    def test_get_flag_uses_compiled_segments(self):
+        settings = copy.deepcopy(
+            settings_files.get("ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS")
+        )
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings", return_value=settings
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ), patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            vwo_client = init({"sdk_key": "abcd", "account_id": "1234"})
+
+            with patch.object(
+                SegmentEvaluator, "is_segmentation_valid"
+            ) as is_segmentation_valid:
+                flag = vwo_client.get_flag(
+                    "feature1", {"id": "user", "custom_variables": {"price": 200}}
+                )
+                is_segmentation_valid.assert_not_called()
+            self.assertTrue(flag.is_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
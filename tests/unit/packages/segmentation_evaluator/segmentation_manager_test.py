@@ -0,0 +1,78 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from vwo.models.user.context_model import ContextModel
+from vwo.packages.segmentation_evaluator.core.segmentation_manager import (
+    SegmentationManager,
+)
+from vwo.utils.settings_util import build_settings_snapshot
+
+from ....data.dummy_test_data_reader import settings_files
+
+
+class SegmentationManagerTest(unittest.TestCase):
+    """Each thread evaluates segments against the context it set itself."""
+
+    def setUp(self):
+        self.settings = build_settings_snapshot(
+            settings_files.get("ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS")
+        ).get_settings()
+        self.feature = self.settings.get_features()[0]
+        self.dsl = {"or": [{"custom_variable": {"price": "100"}}]}
+
+    def test_contextual_data_is_isolated_per_thread(self):
+        manager = SegmentationManager.get_instance()
+        both_set = threading.Barrier(2)
+        results = {}
+
+        def evaluate(user_id, price):
+            context = ContextModel({"id": user_id, "custom_variables": {"price": price}})
+            manager.set_contextual_data(self.settings, self.feature, context)
+            # the other thread sets its own contextual data before this one evaluates
+            both_set.wait()
+            results[user_id] = (
+                manager.evaluator.context.get_id(),
+                manager.validate_segmentation(self.dsl, context.get_custom_variables()),
+            )
+
+        threads = [
+            threading.Thread(target=evaluate, args=("user-100", "100")),
+            threading.Thread(target=evaluate, args=("user-200", "200")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {"user-100": ("user-100", True), "user-200": ("user-200", False)})
+
+    def test_attached_evaluator_is_used_outside_of_an_api_call(self):
+        manager = SegmentationManager.get_instance()
+        seen = []
+
+        def read_evaluator():
+            seen.append(manager.evaluator)
+
+        manager.attach_evaluator()
+        thread = threading.Thread(target=read_evaluator)
+        thread.start()
+        thread.join()
+        self.assertIs(seen[0], manager._evaluator)
+
+
+if __name__ == "__main__":
+    unittest.main()
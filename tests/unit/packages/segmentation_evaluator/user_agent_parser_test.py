@@ -0,0 +1,147 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest.mock import patch
+
+from vwo.models.user.context_model import ContextModel
+from vwo.packages.segmentation_evaluator.core.segmentation_manager import (
+    SegmentationManager,
+)
+from vwo.packages.segmentation_evaluator.utils.user_agent_parser import UserAgentParser
+from vwo.services.settings_manager import SettingsManager
+from vwo.utils.settings_util import build_settings_snapshot
+
+from ....data.dummy_test_data_reader import settings_files
+
+GATEWAY_LOOKUP = "vwo.utils.gateway_service_util.get_from_gateway_service"
+
+USER_AGENTS = {
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.2210.91": {
+        "os": "Windows",
+        "os_version": "10",
+        "browser_string": "Edge",
+        "browser_version": "120.0.2210.91",
+        "device_type": "desktop",
+    },
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15": {
+        "os": "Mac OS",
+        "os_version": "10.15.7",
+        "browser_string": "Safari",
+        "browser_version": "17.2",
+        "device_type": "desktop",
+        "device": "Mac",
+    },
+    "Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/120.0.6099.119 Mobile/15E148 Safari/604.1": {
+        "os": "iOS",
+        "os_version": "16.6",
+        "browser_string": "Chrome",
+        "browser_version": "120.0.6099.119",
+        "device_type": "tablet",
+        "device": "iPad",
+    },
+    "Mozilla/5.0 (Linux; Android 13; SM-S908B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/23.0 Chrome/115.0.0.0 Mobile Safari/537.36": {
+        "os": "Android",
+        "os_version": "13",
+        "browser_string": "Samsung Internet",
+        "browser_version": "23.0",
+        "device_type": "mobile",
+        "device": "SM-S908B",
+    },
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0": {
+        "os": "Linux",
+        "browser_string": "Firefox",
+        "browser_version": "121.0",
+        "device_type": "desktop",
+    },
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)": {
+        "device_type": "bot",
+    },
+}
+IPHONE_SAFARI = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_2_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1"
+
+
+class UserAgentParserTest(unittest.TestCase):
+    def test_parses_common_user_agents(self):
+        parser = UserAgentParser()
+        for user_agent, expected in USER_AGENTS.items():
+            with self.subTest(user_agent=user_agent):
+                self.assertEqual(parser.parse(user_agent), expected)
+        self.assertEqual(parser.parse(""), {})
+
+    def test_parsed_user_agents_are_cached(self):
+        parser = UserAgentParser(max_size=1)
+        first = parser.parse(IPHONE_SAFARI)
+        first["os"] = "changed"
+        self.assertEqual(parser.parse(IPHONE_SAFARI)["os"], "iOS")
+        parser.parse("Mozilla/5.0 (X11; Linux x86_64) Firefox/121.0")
+
+        self.assertEqual(parser.get_stats(), {"hits": 1, "misses": 2, "size": 1})
+
+
+class SegmentationManagerUserAgentParserTest(unittest.TestCase):
+    """The local parser fills ua_info, the gateway is only asked for the location."""
+
+    def setUp(self):
+        self.settings = build_settings_snapshot(
+            settings_files.get("ROLLOUT_TESTING_PRE_SEGMENT_RULE_SETTINGS")
+        ).get_settings()
+        self.feature = self.settings.get_features()[0]
+        self.manager = SegmentationManager.get_instance()
+        self.manager.attach_user_agent_parser(True)
+        self.addCleanup(self.manager.attach_user_agent_parser, None)
+
+    def _set_contextual_data(self, **context):
+        context = ContextModel(dict({"id": "user"}, **context))
+        self.manager.set_contextual_data(self.settings, self.feature, context)
+        return context
+
+    def test_user_agent_is_parsed_without_a_gateway(self):
+        SettingsManager({"sdk_key": "abcd", "account_id": "1234"})
+        with patch(GATEWAY_LOOKUP) as lookup:
+            context = self._set_contextual_data(user_agent=IPHONE_SAFARI)
+
+        lookup.assert_not_called()
+        ua_info = context.get_vwo().get_ua_info()
+        self.assertEqual((ua_info["os"], ua_info["device_type"]), ("iOS", "mobile"))
+        self.assertTrue(
+            self.manager.evaluator.check_user_agent_parser({"browser_string": ["safari"], "os": ["android"]})
+        )
+
+    def test_gateway_is_only_asked_for_the_location(self):
+        SettingsManager(
+            {"sdk_key": "abcd", "account_id": "1234", "gateway_service": {"url": "http://127.0.0.1:1"}}
+        )
+        gateway_data = {"location": {"country": "India"}, "userAgent": {"os": "from gateway"}}
+        with patch(GATEWAY_LOOKUP, return_value=gateway_data) as lookup:
+            context = self._set_contextual_data(user_agent=IPHONE_SAFARI, ip_address="1.2.3.4")
+
+        query_params = lookup.call_args[0][0]
+        self.assertEqual(query_params, {"ipAddress": "1.2.3.4"})
+        self.assertEqual(context.get_vwo().get_location(), {"country": "India"})
+        self.assertEqual(context.get_vwo().get_ua_info()["os"], "iOS")
+
+    def test_custom_parser_is_used_as_is(self):
+        class StaticParser:
+            def parse(self, user_agent):
+                return {"os": "Custom OS"}
+
+        SettingsManager({"sdk_key": "abcd", "account_id": "1234"})
+        self.manager.attach_user_agent_parser(StaticParser())
+        context = self._set_contextual_data(user_agent=IPHONE_SAFARI)
+        self.assertEqual(context.get_vwo().get_ua_info(), {"os": "Custom OS"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from vwo.enums.overflow_policy_enum import OverflowPolicyEnum
+from vwo.services.batch_event_queue import BatchEventQueue
+
+NETWORK_MANAGER = "vwo.services.batch_event_queue.NetworkManager.get_instance"
+
+
+class FakeNetworkManager:
+    """Holds background tasks until the test runs them."""
+
+    def __init__(self):
+        self.tasks = []
+
+    def execute_in_background(self, func):
+        self.tasks.append(func)
+        return True
+
+    def run_tasks(self):
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.001)
+
+
+class BatchEventQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.network_manager = FakeNetworkManager()
+        network_patch = patch(NETWORK_MANAGER, return_value=self.network_manager)
+        network_patch.start()
+        self.addCleanup(network_patch.stop)
+        self.sent = []
+        self.send_results = []
+
+    def _queue(self, events_per_request=3, **kwargs):
+        queue = BatchEventQueue(events_per_request, 600, 1, "sdk-key", **kwargs)
+        self.addCleanup(queue.clear_request_timer)
+
+        def send_batch_events(events, on_retry_complete=None):
+            self.sent.append(list(events))
+            return self.send_results.pop(0) if self.send_results else True
+
+        queue.send_batch_events = send_batch_events
+        return queue
+
+    def _events(self, queue):
+        return [event["n"] for event in queue.batch_queue]
+
+    def test_full_batches_are_flushed_by_the_flusher_thread(self):
+        queue = self._queue()
+        for index in range(3):
+            queue.enqueue({"n": index})
+
+        wait_until(lambda: self.network_manager.tasks)
+        self.network_manager.run_tasks()
+        self.assertEqual(self.sent, [[{"n": 0}, {"n": 1}, {"n": 2}]])
+        stats = queue.get_stats()
+        self.assertEqual((stats["depth"], stats["flushes"], stats["flushed_events"]), (0, 1, 3))
+
+    def test_flush_sends_events_per_request_per_batch(self):
+        queue = self._queue(events_per_request=2, max_queue_size=10)
+        queue.clear_request_timer()
+        for index in range(5):
+            queue.enqueue({"n": index})
+
+        self.assertTrue(queue.flush(manual=True))
+        self.network_manager.run_tasks()
+        self.assertEqual([[event["n"] for event in batch] for batch in self.sent], [[0, 1], [2, 3], [4]])
+        self.assertFalse(queue.flush())
+
+    def test_overflow_policies_drop_events(self):
+        for policy, expected_events, expected_result in (
+            (OverflowPolicyEnum.DROP_OLDEST.value, [1, 2, 3], True),
+            (OverflowPolicyEnum.DROP_NEWEST.value, [0, 1, 2], False),
+        ):
+            with self.subTest(policy=policy):
+                queue = self._queue(events_per_request=10, max_queue_size=3, overflow_policy=policy)
+                queue.max_queue_size = 3
+                for index in range(3):
+                    queue.enqueue({"n": index})
+                self.assertEqual(queue.enqueue({"n": 3}), expected_result)
+
+                self.assertEqual(self._events(queue), expected_events)
+                self.assertEqual(queue.get_stats()["dropped"], 1)
+
+    def test_block_policy_waits_for_the_flusher(self):
+        queue = self._queue(events_per_request=2, overflow_policy=OverflowPolicyEnum.BLOCK.value)
+        queue.max_queue_size = 2
+        queue.batch_queue.extend([{"n": 0}, {"n": 1}])
+
+        self.assertTrue(queue.enqueue({"n": 2}))
+        self.assertEqual(self._events(queue), [2])
+        self.assertEqual(queue.get_stats()["dropped"], 0)
+
+    def test_failed_batches_are_requeued_in_order(self):
+        queue = self._queue(events_per_request=2, max_queue_size=3)
+        queue.clear_request_timer()
+        queue.enqueue({"n": 0})
+        queue.enqueue({"n": 1})
+        queue.flush()
+        queue.enqueue({"n": 2})
+        queue.enqueue({"n": 3})
+
+        # the requeued batch does not fit next to the newer events, its oldest event is dropped
+        self.send_results.append(False)
+        self.network_manager.run_tasks()
+        self.assertEqual(self._events(queue), [1, 2, 3])
+        stats = queue.get_stats()
+        self.assertEqual((stats["failed_flushes"], stats["dropped"]), (1, 1))
+
+    def test_enqueue_does_not_wait_for_a_send_in_progress(self):
+        queue = self._queue(events_per_request=1)
+        queue.clear_request_timer()
+        queue.enqueue({"n": 0})
+        queue.flush()
+        release = threading.Event()
+        queue.send_batch_events = lambda events, on_retry_complete=None: release.wait(5)
+        sender = threading.Thread(target=self.network_manager.run_tasks)
+        sender.start()
+
+        self.assertTrue(queue.enqueue({"n": 1}))
+        release.set()
+        sender.join(5)
+        self.assertEqual(self._events(queue), [1])
+
+    def test_flush_latency_is_reported(self):
+        clock = FakeClock()
+        queue = self._queue(clock=clock)
+        queue.clear_request_timer()
+        queue.enqueue({"n": 0})
+        queue.flush()
+        clock.now = 0.25
+        self.network_manager.run_tasks()
+
+        stats = queue.get_stats()
+        self.assertEqual((stats["last_flush_latency"], stats["max_flush_latency"]), (0.25, 0.25))
+        self.assertEqual(stats["average_flush_latency"], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from vwo.services.batch_event_queue import BatchEventQueue
+from vwo.services.event_spool import EventSpool
+
+from .batch_event_queue_test import NETWORK_MANAGER, FakeClock, FakeNetworkManager, wait_until
+
+
+class EventSpoolTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def _spool(self, **kwargs):
+        kwargs.setdefault("fsync_interval", 60)
+        spool = EventSpool(self.directory, **kwargs)
+        self.addCleanup(spool.close)
+        return spool
+
+    def _segment_files(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".wal"))
+
+    def test_acknowledged_segments_are_compacted(self):
+        spool = self._spool(segment_bytes=20)
+        sequences = [spool.append({"n": index}) for index in range(4)]
+        self.assertEqual(sequences, [1, 2, 3, 4])
+        self.assertGreater(len(self._segment_files()), 1)
+
+        spool.ack(sequences)
+        self.assertEqual(len(self._segment_files()), 1)
+        self.assertEqual(spool.pending(), [])
+        self.assertEqual(spool.get_stats()["acked"], 4)
+
+    def test_pending_events_are_recovered_after_a_restart(self):
+        spool = EventSpool(self.directory, fsync_interval=60)
+        for index in range(3):
+            spool.append({"n": index})
+        spool.ack([2])
+        spool.close()
+
+        spool = self._spool()
+        self.assertEqual(spool.pending(), [(1, {"n": 0}), (3, {"n": 2})])
+        self.assertEqual(spool.append({"n": 3}), 4)
+        self.assertEqual(spool.pending(exclude={1}, limit=1), [(3, {"n": 2})])
+
+    def test_a_torn_last_record_is_ignored(self):
+        spool = EventSpool(self.directory, fsync_interval=60)
+        spool.append({"n": 0})
+        spool.close()
+        with open(os.path.join(self.directory, self._segment_files()[0]), "a") as segment_file:
+            segment_file.write('E\t2\t{"n"')
+
+        self.assertEqual(self._spool().pending(), [(1, {"n": 0})])
+
+    def test_oldest_segments_are_dropped_over_max_bytes(self):
+        spool = self._spool(segment_bytes=20, max_bytes=60)
+        for index in range(10):
+            spool.append({"n": index})
+
+        stats = spool.get_stats()
+        self.assertLessEqual(stats["bytes"], 60)
+        self.assertEqual(stats["dropped"] + stats["pending"], 10)
+        self.assertEqual(spool.pending()[-1], (10, {"n": 9}))
+
+    def test_segments_expire_after_max_age(self):
+        clock = FakeClock()
+        spool = self._spool(max_age=10, segment_bytes=10, clock=clock)
+        spool.append({"n": 0})
+        clock.now = 20
+        spool.append({"n": 1})
+        clock.now = 25
+
+        self.assertEqual(spool.pending(), [(2, {"n": 1})])
+        self.assertEqual(spool.get_stats()["expired"], 1)
+
+    def test_recovered_segments_age_from_their_events_not_the_file_time(self):
+        clock = FakeClock()
+        spool = EventSpool(self.directory, max_age=10, fsync_interval=60, clock=clock)
+        spool.append({"n": 0})
+        spool.append({"n": 1})
+        spool.close()
+        # an ack written now moves the mtime of the segment file
+        spool = EventSpool(self.directory, max_age=10, fsync_interval=60, clock=clock)
+        spool.ack([1])
+        spool.close()
+
+        clock.now = 25
+        spool = self._spool(max_age=10, clock=clock)
+        self.assertEqual(spool.pending(), [])
+        self.assertEqual(spool.get_stats()["expired"], 1)
+
+    def test_a_closed_spool_takes_no_more_writes(self):
+        spool = EventSpool(self.directory, fsync_interval=60)
+        seq = spool.append({"n": 0})
+        spool.close()
+
+        with self.assertRaises(RuntimeError):
+            spool.append({"n": 1})
+        spool.ack([seq])
+        # the directory may belong to another spool now
+        other = self._spool()
+        self.assertEqual(other.pending(), [(1, {"n": 0})])
+
+    def test_a_directory_is_used_by_one_spool_at_a_time(self):
+        self._spool()
+        with self.assertRaises(RuntimeError):
+            EventSpool(self.directory)
+
+
+class SpooledBatchEventQueueTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+        self.network_manager = FakeNetworkManager()
+        network_patch = patch(NETWORK_MANAGER, return_value=self.network_manager)
+        network_patch.start()
+        self.addCleanup(network_patch.stop)
+        self.sent = []
+
+    def _queue(self, **kwargs):
+        spool = EventSpool(self.directory, fsync_interval=60)
+        queue = BatchEventQueue(2, 600, 1, "sdk-key", spool=spool, **kwargs)
+        self.addCleanup(queue.close_spool)
+        self.addCleanup(queue.clear_request_timer)
+
+        def send_batch_events(events, on_retry_complete=None):
+            self.sent.append([event["n"] for event in events])
+            return True
+
+        queue.send_batch_events = send_batch_events
+        return queue
+
+    def test_a_full_queue_spills_to_the_spool_and_reads_back(self):
+        queue = self._queue(max_queue_size=2)
+        queue.clear_request_timer()
+        for index in range(5):
+            self.assertTrue(queue.enqueue({"n": index}))
+        stats = queue.get_stats()
+        self.assertEqual((stats["depth"], stats["spilled"], stats["dropped"]), (2, 3, 0))
+
+        queue.flush()
+        self.network_manager.run_tasks()
+        while queue._backfill():
+            queue.flush()
+            self.network_manager.run_tasks()
+
+        self.assertEqual(self.sent, [[0, 1], [2, 3], [4]])
+        self.assertEqual(queue.spool.pending_count(), 0)
+
+    def test_events_of_a_scheduled_retry_are_acknowledged_once_it_succeeds(self):
+        queue = self._queue()
+        queue.clear_request_timer()
+        retries = []
+
+        def send_batch_events(events, on_retry_complete=None):
+            retries.append(on_retry_complete)
+            return None
+
+        queue.send_batch_events = send_batch_events
+        queue.enqueue({"n": 0})
+        queue.flush()
+        self.network_manager.run_tasks()
+        self.assertEqual(queue.spool.pending_count(), 1)
+
+        retries[0](True)
+        self.assertEqual(queue.spool.pending_count(), 0)
+        self.assertEqual(queue.get_stats()["flushed_events"], 1)
+
+    def test_events_of_a_failed_scheduled_retry_are_requeued(self):
+        queue = self._queue()
+        queue.clear_request_timer()
+        retries = []
+        queue.send_batch_events = lambda events, on_retry_complete=None: retries.append(on_retry_complete)
+        queue.enqueue({"n": 0})
+        queue.flush()
+        self.network_manager.run_tasks()
+
+        retries[0](False)
+        self.assertEqual([event["n"] for event in queue.batch_queue], [0])
+        self.assertEqual(queue.spool.pending_count(), 1)
+
+    def test_events_of_a_previous_run_are_replayed(self):
+        spool = EventSpool(self.directory, fsync_interval=60)
+        for index in range(3):
+            spool.append({"n": index})
+        spool.close()
+
+        queue = self._queue(replay_concurrency=1)
+        wait_until(lambda: self.network_manager.tasks)
+        # one batch in flight at a time
+        self.assertEqual(len(self.network_manager.tasks), 1)
+        self.network_manager.run_tasks()
+        wait_until(lambda: self.network_manager.tasks)
+        self.network_manager.run_tasks()
+
+        self.assertEqual(self.sent, [[0, 1], [2]])
+        self.assertEqual(queue.spool.pending_count(), 0)
+
+    def test_create_spool_uses_a_directory_per_account(self):
+        with patch("tempfile.gettempdir", return_value=self.directory):
+            spool = BatchEventQueue.create_spool(True, 1, "sdk-key")
+        self.addCleanup(spool.close)
+
+        self.assertEqual(os.path.dirname(spool.directory), os.path.join(self.directory, "vwo-fme-events"))
+        self.assertNotIn("sdk-key", spool.directory)
+        self.assertIsNone(BatchEventQueue.create_spool(None, 1, "sdk-key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
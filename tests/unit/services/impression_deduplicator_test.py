@@ -0,0 +1,78 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from vwo.services.impression_deduplicator import ImpressionDeduplicator
+from vwo.utils.impression_util import send_impression_for_variation_shown_batch
+
+from .batch_event_queue_test import FakeClock
+
+
+def impression(uuid="UUID-1", campaign_id=1, variation_id="2"):
+    return {"d": {"visId": uuid, "event": {"props": {"id": campaign_id, "variation": variation_id, "isFirst": 1}}}}
+
+
+class ImpressionDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.deduplicator = ImpressionDeduplicator(window=60, max_keys=3, clock=self.clock)
+
+    def test_duplicates_within_the_window_are_dropped(self):
+        self.assertTrue(self.deduplicator.should_send(impression()))
+        self.clock.now = 59
+        self.assertFalse(self.deduplicator.should_send(impression()))
+        # another variation, campaign or user is a different impression
+        self.assertTrue(self.deduplicator.should_send(impression(variation_id="3")))
+        self.assertTrue(self.deduplicator.should_send(impression(campaign_id=2)))
+        self.assertTrue(self.deduplicator.should_send(impression(uuid="UUID-2")))
+
+    def test_an_impression_sent_again_after_the_window_is_not_first(self):
+        first = impression()
+        self.assertTrue(self.deduplicator.should_send(first))
+        self.assertEqual(first["d"]["event"]["props"]["isFirst"], 1)
+
+        self.clock.now = 60
+        repeated = impression()
+        self.assertTrue(self.deduplicator.should_send(repeated))
+        self.assertEqual(repeated["d"]["event"]["props"]["isFirst"], 0)
+        self.clock.now = 100
+        self.assertFalse(self.deduplicator.should_send(impression()))
+
+    def test_the_oldest_keys_are_evicted_beyond_max_keys(self):
+        payloads = [impression(uuid=f"UUID-{index}") for index in range(4)]
+        self.assertEqual(self.deduplicator.filter(payloads), payloads)
+
+        stats = self.deduplicator.get_stats()
+        self.assertEqual((stats["keys"], stats["evicted"]), (3, 1))
+        # evicting can only let a duplicate through
+        self.assertTrue(self.deduplicator.should_send(impression(uuid="UUID-0")))
+        self.assertFalse(self.deduplicator.should_send(impression(uuid="UUID-3")))
+
+    def test_duplicates_never_reach_the_batch_queue(self):
+        vwo_instance = MagicMock()
+        vwo_instance.impression_deduplicator = self.deduplicator
+        with patch("vwo.vwo_client.VWOClient.get_instance", return_value=vwo_instance):
+            send_impression_for_variation_shown_batch([impression(), impression(campaign_id=2)], 1, "sdk-key")
+            send_impression_for_variation_shown_batch([impression()], 1, "sdk-key")
+
+        enqueued = [call[0][0]["d"]["event"]["props"]["id"] for call in vwo_instance.batch_event_queue.enqueue.call_args_list]
+        self.assertEqual(enqueued, [1, 2])
+        self.assertEqual(self.deduplicator.get_stats()["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
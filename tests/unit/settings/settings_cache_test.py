@@ -0,0 +1,206 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from vwo import init, FileSettingsCache
+from vwo.vwo import VWO
+from vwo.vwo_builder import VWOBuilder
+from vwo.services.settings_manager import SettingsManager
+from vwo.packages.network_layer.models.response_model import ResponseModel
+from tests.data.dummy_test_data_reader import settings_files
+
+NETWORK_GET = "vwo.packages.network_layer.manager.network_manager.NetworkManager.get"
+
+
+def _settings_response(settings):
+    response = ResponseModel()
+    response.set_status_code(200)
+    response.set_data(settings)
+    return response
+
+
+class FileSettingsCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = FileSettingsCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_round_trip_leaves_no_temporary_files(self):
+        settings = settings_files.get("BASIC_ROLLOUT_SETTINGS")
+        self.cache.set("1234_abcd", settings)
+        self.cache.set("1234_abcd", settings)
+
+        self.assertEqual(self.cache.get("1234_abcd"), settings)
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(self.cache.get_file_path("1234_abcd"))])
+        self.assertNotIn("abcd", os.listdir(self.directory)[0])
+
+    def test_missing_or_corrupt_file_reads_as_empty(self):
+        self.assertIsNone(self.cache.get("1234_abcd"))
+        with open(self.cache.get_file_path("1234_abcd"), "w") as cache_file:
+            cache_file.write('{"version": ')
+        self.assertIsNone(self.cache.get("1234_abcd"))
+
+
+class SettingsCacheInitTest(unittest.TestCase):
+    """init starts from cached settings and refreshes them in the background."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.settings = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS"))
+        self.options = {
+            "sdk_key": "abcd",
+            "account_id": "1234",
+            "settings_cache": {"path": self.directory},
+        }
+        self.patches = [
+            patch(
+                "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+                return_value=None,
+            ),
+            patch(
+                "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+                return_value=None,
+            ),
+        ]
+        for active_patch in self.patches:
+            active_patch.start()
+
+    def tearDown(self):
+        for active_patch in self.patches:
+            active_patch.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_fetched_settings_are_cached(self):
+        with patch(NETWORK_GET, return_value=_settings_response(self.settings)):
+            vwo_client = init(self.options)
+
+        self.assertTrue(vwo_client.get_flag("feature1", {"id": "user"}).is_enabled())
+        cache = FileSettingsCache(self.directory)
+        self.assertEqual(cache.get("1234_abcd"), self.settings)
+
+    def test_init_starts_from_cache_when_fetch_fails(self):
+        FileSettingsCache(self.directory).set("1234_abcd", self.settings)
+
+        with patch.object(
+            SettingsManager, "fetch_settings", side_effect=Exception("settings endpoint down")
+        ) as fetch_settings, patch.object(
+            VWOBuilder, "refresh_settings_in_background"
+        ) as refresh:
+            vwo_client = init(self.options)
+            fetch_settings.assert_not_called()
+            refresh.assert_called_once()
+
+        self.assertEqual(vwo_client.original_settings, self.settings)
+        self.assertTrue(vwo_client.get_flag("feature1", {"id": "user"}).is_enabled())
+
+    def test_invalid_cached_settings_are_ignored(self):
+        FileSettingsCache(self.directory).set("1234_abcd", {"version": 1})
+
+        with patch.object(
+            SettingsManager, "fetch_settings", return_value=self.settings
+        ) as fetch_settings:
+            vwo_client = init(self.options)
+            fetch_settings.assert_called_once()
+
+        self.assertTrue(vwo_client.get_flag("feature1", {"id": "user"}).is_enabled())
+
+    def test_background_refresh_applies_fetched_settings(self):
+        cached_settings = copy.deepcopy(self.settings)
+        cached_settings["version"] = 0
+        FileSettingsCache(self.directory).set("1234_abcd", cached_settings)
+
+        with patch.object(VWOBuilder, "refresh_settings_in_background"):
+            vwo_client = init(self.options)
+        self.assertEqual(vwo_client._settings.get_version(), 0)
+
+        with patch(NETWORK_GET, return_value=_settings_response(self.settings)):
+            # what the background thread runs
+            VWO.vwo_builder.poll_settings()
+
+        self.assertEqual(vwo_client._settings.get_version(), self.settings["version"])
+
+    def test_cache_start_validates_once_and_sets_init_fields(self):
+        FileSettingsCache(self.directory).set("1234_abcd", self.settings)
+
+        with patch.object(
+            SettingsManager, "is_settings_valid", wraps=SettingsManager.is_settings_valid
+        ) as validate, patch.object(VWOBuilder, "refresh_settings_in_background"):
+            vwo_client = init(self.options)
+            self.assertEqual(validate.call_count, 1)
+
+        self.assertTrue(vwo_client.is_settings_valid_on_init)
+        self.assertIsInstance(vwo_client.settings_fetch_time, int)
+
+    def test_refresh_with_unchanged_settings_keeps_the_snapshot(self):
+        FileSettingsCache(self.directory).set("1234_abcd", self.settings)
+        with patch.object(VWOBuilder, "refresh_settings_in_background"):
+            vwo_client = init(self.options)
+        snapshot = vwo_client._settings_snapshot
+
+        response = _settings_response(copy.deepcopy(self.settings))
+        response.set_content(b'{"raw": "body"}')
+        with patch(NETWORK_GET, return_value=response), patch(
+            "vwo.vwo_builder.set_settings_and_add_campaigns_to_rules"
+        ) as apply_settings:
+            VWO.vwo_builder.poll_settings()
+            apply_settings.assert_not_called()
+
+        self.assertIs(vwo_client._settings_snapshot, snapshot)
+        # the raw body digest replaces the seeded one, so the next poll compares bodies
+        self.assertEqual(
+            SettingsManager.get_instance().get_settings_digest(),
+            SettingsManager.compute_settings_digest(b'{"raw": "body"}', None),
+        )
+
+    def test_refresh_and_polling_do_not_fetch_concurrently(self):
+        FileSettingsCache(self.directory).set("1234_abcd", self.settings)
+        with patch.object(VWOBuilder, "refresh_settings_in_background"):
+            init(self.options)
+
+        active = []
+        overlaps = []
+
+        def slow_get(request):
+            active.append(request)
+            if len(active) > 1:
+                overlaps.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+            return _settings_response(copy.deepcopy(self.settings))
+
+        with patch(NETWORK_GET, side_effect=slow_get) as network_get:
+            threads = [
+                threading.Thread(target=VWO.vwo_builder.poll_settings) for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(network_get.call_count, 4)
+        self.assertEqual(overlaps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from vwo.vwo_builder import VWOBuilder
+from vwo.services.settings_manager import SettingsManager
+from tests.data.dummy_test_data_reader import settings_files
+
+
+class _SettingsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.if_none_match_headers.append(self.headers.get("If-None-Match"))
+        if server.etag and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(server.settings).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SettingsConditionalFetchTest(unittest.TestCase):
+    """Polling an unchanged account costs one small request and no re-validation."""
+
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), _SettingsHandler)
+        self.server.settings = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS"))
+        self.server.etag = '"v1"'
+        self.server.if_none_match_headers = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.builder = VWOBuilder(
+            {
+                "sdk_key": "abcd",
+                "account_id": "1234",
+                "proxy_url": f"http://127.0.0.1:{self.server.server_port}",
+            }
+        )
+        self.builder.set_logger().set_settings_manager().set_network_manager()
+        self.settings_manager = self.builder.setting_file_manager
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_etag_short_circuits_unchanged_settings(self):
+        first = self.settings_manager.get_settings()
+        self.assertEqual(first, self.server.settings)
+
+        with patch.object(
+            SettingsManager, "is_settings_valid", wraps=SettingsManager.is_settings_valid
+        ) as validate:
+            second = self.settings_manager.get_settings()
+            validate.assert_not_called()
+
+        self.assertIs(second, first)
+        self.assertEqual(self.server.if_none_match_headers, [None, '"v1"'])
+
+    def test_digest_detects_unchanged_body_without_etag(self):
+        self.server.etag = None
+        first = self.settings_manager.get_settings()
+        digest = self.settings_manager.get_settings_digest()
+
+        with patch.object(
+            SettingsManager, "is_settings_valid", wraps=SettingsManager.is_settings_valid
+        ) as validate:
+            second = self.settings_manager.get_settings()
+            validate.assert_not_called()
+
+        self.assertIs(second, first)
+        self.assertEqual(self.settings_manager.get_settings_digest(), digest)
+        self.assertEqual(self.server.if_none_match_headers, [None, None])
+
+    def test_unchanged_body_is_not_parsed(self):
+        self.server.etag = None
+        first = self.settings_manager.get_settings()
+
+        with patch("requests.Response.json", side_effect=AssertionError("body parsed")):
+            second = self.settings_manager.get_settings()
+
+        self.assertIs(second, first)
+
+    def test_changed_settings_are_fetched_in_full(self):
+        first = self.settings_manager.get_settings()
+        self.server.settings = copy.deepcopy(self.server.settings)
+        self.server.settings["version"] = 2
+        self.server.etag = '"v2"'
+
+        second = self.settings_manager.get_settings()
+        self.assertIsNot(second, first)
+        self.assertEqual(second["version"], 2)
+        self.assertEqual(self.settings_manager.settings_etag, '"v2"')
+
+    def test_poll_applies_only_changed_settings(self):
+        self.builder.original_settings = self.builder.get_settings()
+        self.builder.vwo_instance = SimpleNamespace()
+
+        with patch(
+            "vwo.vwo_builder.set_settings_and_add_campaigns_to_rules"
+        ) as apply_settings, patch.object(
+            VWOBuilder, "update_poll_interval_and_check_and_poll", return_value=None
+        ):
+            self.builder.poll_settings()
+            apply_settings.assert_not_called()
+
+            self.server.settings = copy.deepcopy(self.server.settings)
+            self.server.settings["version"] = 2
+            self.server.etag = '"v2"'
+            self.builder.poll_settings()
+            self.assertEqual(apply_settings.call_count, 1)
+            self.assertEqual(apply_settings.call_args[0][0]["version"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+from types import SimpleNamespace
+
+from vwo.utils.settings_util import set_settings_and_add_campaigns_to_rules
+from vwo.utils.function_util import (
+    get_feature_from_key,
+    does_event_belong_to_any_feature,
+)
+from vwo.utils.campaign_util import (
+    get_variation_from_campaign_key,
+    get_campaign_key_from_campaign_id,
+    get_rule_type_using_campaign_id_from_feature,
+    get_group_details_if_campaign_part_of_it,
+    find_groups_feature_part_of,
+)
+from tests.data.dummy_test_data_reader import settings_files
+
+
+class SettingsIndexTest(unittest.TestCase):
+    """The settings lookup helpers read from indexes and agree with a linear scan."""
+
+    def setUp(self):
+        self.raw_settings = copy.deepcopy(
+            settings_files.get("MEG_CAMPAIGN_ADVANCE_ALGO_SETTINGS")
+        )
+        self.client = SimpleNamespace()
+        set_settings_and_add_campaigns_to_rules(self.raw_settings, self.client)
+        self.settings = self.client._settings_snapshot.get_settings()
+
+    def test_indexes_are_built_on_load(self):
+        self.assertEqual(
+            len(self.settings._feature_by_key),
+            len({feature.get_key() for feature in self.settings.get_features()}),
+        )
+
+    def test_feature_lookup(self):
+        for feature in self.settings.get_features():
+            self.assertIs(get_feature_from_key(self.settings, feature.get_key()), feature)
+        self.assertIsNone(get_feature_from_key(self.settings, "missing"))
+
+    def test_event_lookup(self):
+        for feature in self.settings.get_features():
+            for metric in feature.get_metrics():
+                self.assertTrue(
+                    does_event_belong_to_any_feature(metric.get_identifier(), self.settings)
+                )
+        self.assertFalse(does_event_belong_to_any_feature("missing", self.settings))
+
+    def test_campaign_and_variation_lookup(self):
+        for campaign in self.settings.get_campaigns():
+            self.assertEqual(
+                get_campaign_key_from_campaign_id(self.settings, campaign.get_id()),
+                campaign.get_key(),
+            )
+            for variation in campaign.get_variations():
+                self.assertIs(
+                    get_variation_from_campaign_key(
+                        self.settings, campaign.get_key(), variation.get_id()
+                    ),
+                    variation,
+                )
+        self.assertEqual(get_campaign_key_from_campaign_id(self.settings, -1), "")
+        self.assertIsNone(get_variation_from_campaign_key(self.settings, "missing", 1))
+
+    def test_rule_type_lookup(self):
+        for feature in self.settings.get_features():
+            for rule in feature.get_rules():
+                self.assertEqual(
+                    get_rule_type_using_campaign_id_from_feature(
+                        feature, rule.get_campaign_id()
+                    ),
+                    rule.get_type(),
+                )
+            self.assertEqual(get_rule_type_using_campaign_id_from_feature(feature, -1), "")
+
+    def test_group_lookup(self):
+        campaign_groups = self.raw_settings["campaignGroups"]
+        groups = self.raw_settings["groups"]
+        for campaign, group_id in campaign_groups.items():
+            parts = campaign.split("_")
+            group = get_group_details_if_campaign_part_of_it(
+                self.settings, parts[0], int(parts[1]) if len(parts) > 1 else None
+            )
+            self.assertEqual(
+                group,
+                {"groupId": str(group_id), "groupName": groups[str(group_id)]["name"]},
+            )
+        self.assertEqual(get_group_details_if_campaign_part_of_it(self.settings, "-1"), {})
+        self.assertTrue(
+            any(
+                find_groups_feature_part_of(self.settings, feature.get_key())
+                for feature in self.settings.get_features()
+            )
+        )
+
+    def test_indexes_are_only_rebuilt_explicitly(self):
+        features = self.settings.get_features()
+        self.settings.set_features(features[:1])
+        # Getters never rebuild the indexes, so readers on other threads see a stable view
+        for feature in features:
+            self.assertIsNotNone(get_feature_from_key(self.settings, feature.get_key()))
+
+        self.settings.build_indexes()
+        self.assertIsNotNone(get_feature_from_key(self.settings, features[0].get_key()))
+        if len(features) > 1:
+            self.assertIsNone(get_feature_from_key(self.settings, features[1].get_key()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import threading
+import unittest
+from unittest.mock import patch
+
+from vwo import init
+from vwo.api.get_flag_api import GetFlagApi
+from tests.data.dummy_test_data_reader import settings_files
+
+
+def _settings_with_string_variable(version, value):
+    settings = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS"))
+    settings["version"] = version
+    for variable in settings["campaigns"][0]["variations"][0]["variables"]:
+        if variable["key"] == "string":
+            variable["value"] = value
+    return settings
+
+
+class SettingsSnapshotTest(unittest.TestCase):
+    """Settings refreshes are published as one immutable snapshot."""
+
+    def setUp(self):
+        self.settings_v1 = _settings_with_string_variable(1, "v1")
+        self.settings_v2 = _settings_with_string_variable(2, "v2")
+        self.post_patch = patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        )
+        self.post_patch.start()
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings", return_value=self.settings_v1
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ):
+            self.vwo_client = init(
+                {"sdk_key": "abcd", "account_id": "1234", "threading": {"enabled": False}}
+            )
+
+    def tearDown(self):
+        self.post_patch.stop()
+
+    def test_snapshot_is_immutable(self):
+        snapshot = self.vwo_client._settings_snapshot
+        with self.assertRaises(AttributeError):
+            snapshot._settings = None
+
+    def test_update_swaps_snapshot_and_keeps_old_one_intact(self):
+        old_snapshot = self.vwo_client._settings_snapshot
+        self.vwo_client.update_settings(self.settings_v2)
+
+        new_snapshot = self.vwo_client._settings_snapshot
+        self.assertIsNot(new_snapshot, old_snapshot)
+        self.assertEqual(new_snapshot.get_version(), 2)
+        self.assertEqual(old_snapshot.get_version(), 1)
+        self.assertEqual(old_snapshot.get_settings().get_version(), 1)
+        self.assertIs(self.vwo_client.original_settings, self.settings_v2)
+
+    def test_get_flag_uses_snapshot_taken_at_entry(self):
+        original_get = GetFlagApi.get
+
+        def get_with_refresh(api, feature_key, settings, context, hook_manager):
+            # a refresh lands while the flag is being evaluated
+            self.vwo_client.update_settings(self.settings_v2)
+            return original_get(api, feature_key, settings, context, hook_manager)
+
+        with patch.object(GetFlagApi, "get", get_with_refresh):
+            flag = self.vwo_client.get_flag("feature1", {"id": "user"})
+
+        self.assertEqual(flag.get_variable("string"), "v1")
+        self.assertEqual(
+            self.vwo_client.get_flag("feature1", {"id": "user"}).get_variable("string"),
+            "v2",
+        )
+
+    def test_concurrent_refreshes_give_consistent_decisions(self):
+        errors = []
+        stop = threading.Event()
+
+        def refresh():
+            settings = [self.settings_v1, self.settings_v2]
+            index = 0
+            while not stop.is_set():
+                self.vwo_client.update_settings(settings[index % 2])
+                index += 1
+
+        def evaluate():
+            for _ in range(200):
+                flag = self.vwo_client.get_flag("feature1", {"id": "user"})
+                if not flag.is_enabled() or flag.get_variable("string") not in ("v1", "v2"):
+                    errors.append(flag)
+
+        refresher = threading.Thread(target=refresh)
+        refresher.start()
+        readers = [threading.Thread(target=evaluate) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        stop.set()
+        refresher.join()
+
+        self.assertEqual(errors, [])
+
+    def test_meg_evaluation_leaves_published_campaigns_unchanged(self):
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings",
+            return_value=copy.deepcopy(settings_files.get("MEG_CAMPAIGN_RANDOM_ALGO_SETTINGS")),
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ):
+            vwo_client = init({"sdk_key": "abcd", "account_id": "1234", "threading": {"enabled": False}})
+        settings = vwo_client._settings_snapshot.get_settings()
+        campaigns = settings.get_campaigns() + [
+            campaign for feature in settings.get_features() for campaign in feature.get_rules_linked_campaign()
+        ]
+        weights = [campaign.get_weight() for campaign in campaigns]
+
+        # the eligible campaigns are handed to the MEG algorithm without the defensive copy
+        with patch("vwo.utils.meg_util.clone_object", side_effect=lambda campaign: campaign):
+            for index in range(20):
+                # two MEG campaigns are eligible for this context
+                vwo_client.get_flag(
+                    "feature1", {"id": f"user-{index}", "custom_variables": {"price": 100, "name": "personalise"}}
+                )
+
+        self.assertEqual([campaign.get_weight() for campaign in campaigns], weights)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+from unittest.mock import patch
+
+from vwo import init
+from vwo.models.settings.settings_snapshot_model import SettingsSnapshotModel
+from vwo.services.settings_manager import SettingsManager
+from tests.data.dummy_test_data_reader import settings_files
+
+
+class SettingsValidationCacheTest(unittest.TestCase):
+    """Settings are validated once per load, not on every API call."""
+
+    def setUp(self):
+        self.settings = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS"))
+        with patch(
+            "vwo.vwo_builder.VWOBuilder.get_settings", return_value=self.settings
+        ), patch(
+            "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+            return_value=None,
+        ), patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            self.vwo_client = init({"sdk_key": "abcd", "account_id": "1234"})
+
+    def test_get_flag_does_not_validate_settings(self):
+        with patch.object(
+            SettingsManager, "is_settings_valid", wraps=SettingsManager.is_settings_valid
+        ) as validate, patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            for _ in range(5):
+                flag = self.vwo_client.get_flag("feature1", {"id": "user"})
+                self.assertTrue(flag.is_enabled())
+            validate.assert_not_called()
+
+    def test_validity_comes_from_the_snapshot(self):
+        snapshot = self.vwo_client._settings_snapshot
+        self.assertTrue(snapshot.get_is_valid())
+        self.assertTrue(self.vwo_client._has_valid_settings(snapshot))
+        self.assertFalse(self.vwo_client._has_valid_settings(None))
+
+        # a snapshot that failed validation is not trusted, whatever its contents
+        self.vwo_client._settings_snapshot = SettingsSnapshotModel(
+            snapshot.get_settings(), snapshot.get_original_settings(), False
+        )
+        self.assertFalse(self.vwo_client._has_valid_settings(self.vwo_client._settings_snapshot))
+        with patch(
+            "vwo.packages.network_layer.manager.network_manager.NetworkManager.post",
+            return_value=None,
+        ):
+            flag = self.vwo_client.get_flag("feature1", {"id": "user"})
+        self.assertFalse(flag.is_enabled())
+
+    def test_update_settings_revalidates_once(self):
+        updated_settings = copy.deepcopy(self.settings)
+        updated_settings["version"] = self.settings["version"] + 1
+
+        with patch.object(
+            SettingsManager, "is_settings_valid", wraps=SettingsManager.is_settings_valid
+        ) as validate:
+            self.vwo_client.update_settings(updated_settings)
+            self.assertEqual(validate.call_count, 1)
+
+        snapshot = self.vwo_client._settings_snapshot
+        self.assertTrue(snapshot.get_is_valid())
+        self.assertEqual(snapshot.get_version(), updated_settings["version"])
+
+    def test_validator_is_built_once(self):
+        self.assertIs(
+            SettingsManager.get_settings_validator(),
+            SettingsManager.get_settings_validator(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from vwo.vwo_builder import VWOBuilder
+from vwo.services.settings_manager import SettingsManager
+from vwo.services.shared_settings_store import SharedSettingsStore
+from vwo.packages.network_layer.models.response_model import ResponseModel
+from tests.data.dummy_test_data_reader import settings_files
+
+NETWORK_GET = "vwo.packages.network_layer.manager.network_manager.NetworkManager.get"
+
+
+def _settings_response(settings):
+    response = ResponseModel()
+    response.set_status_code(200)
+    response.set_data(settings)
+    return response
+
+
+@unittest.skipUnless(SharedSettingsStore.is_supported(), "needs fcntl")
+class SharedSettingsStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.leader = SharedSettingsStore(self.directory, "1234_abcd")
+        self.follower = SharedSettingsStore(self.directory, "1234_abcd")
+
+    def tearDown(self):
+        self.leader.close()
+        self.follower.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_one_store_is_elected_and_takes_over_after_close(self):
+        self.assertTrue(self.leader.try_lead())
+        self.assertFalse(self.follower.try_lead())
+
+        self.leader.close()
+        self.assertTrue(self.follower.try_lead())
+
+    def test_follower_sees_each_published_generation(self):
+        settings = settings_files.get("BASIC_ROLLOUT_SETTINGS")
+        self.assertEqual(self.follower.get_generation(), 0)
+        self.assertIsNone(self.follower.read())
+
+        self.leader.try_lead()
+        self.leader.publish(settings)
+        self.assertEqual(self.follower.read(), (1, settings))
+
+        changed_settings = dict(settings, version=settings["version"] + 1)
+        self.leader.publish(changed_settings)
+        self.assertEqual(self.follower.get_generation(), 2)
+        self.assertEqual(self.follower.read(), (2, changed_settings))
+
+    def test_follower_does_not_wait_once_the_leader_is_gone(self):
+        self.leader.try_lead()
+        self.leader.close()
+        self.assertIsNone(self.follower.wait_for_snapshot(timeout=5))
+        self.assertTrue(self.follower.is_leader)
+
+
+@unittest.skipUnless(SharedSettingsStore.is_supported(), "needs fcntl")
+class SharedSettingsManagerTest(unittest.TestCase):
+    """Only the elected process fetches, the others read its snapshot."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.settings = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS"))
+        options = {"sdk_key": "abcd", "account_id": "1234", "shared_settings": {"path": self.directory}}
+        builder = VWOBuilder(options)
+        builder.set_logger().set_settings_manager().set_network_manager()
+        self.leader = builder.setting_file_manager
+        self.follower = SettingsManager(options)
+
+    def tearDown(self):
+        self.leader.shared_settings_store.close()
+        self.follower.shared_settings_store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_follower_uses_the_published_settings_without_fetching(self):
+        with patch(NETWORK_GET, return_value=_settings_response(self.settings)) as network_get:
+            self.assertEqual(self.leader.get_settings(), self.settings)
+            shared_settings = self.follower.get_settings()
+            self.assertEqual(network_get.call_count, 1)
+
+        self.assertEqual(shared_settings, self.settings)
+        # nothing new was published, the follower hands out the same object
+        with patch.object(SettingsManager, "is_settings_valid") as validate:
+            self.assertIs(self.follower.get_settings(), shared_settings)
+            validate.assert_not_called()
+
+        changed_settings = dict(self.settings, version=self.settings["version"] + 1)
+        with patch(NETWORK_GET, return_value=_settings_response(changed_settings)):
+            self.leader.get_settings()
+        self.assertEqual(self.follower.get_settings(), changed_settings)
+
+    def test_follower_takes_over_without_changing_its_settings(self):
+        with patch(NETWORK_GET, return_value=_settings_response(self.settings)):
+            self.leader.get_settings()
+        shared_settings = self.follower.get_settings()
+        self.leader.shared_settings_store.close()
+
+        with patch(NETWORK_GET, return_value=_settings_response(copy.deepcopy(self.settings))) as network_get:
+            self.assertIs(self.follower.get_settings(), shared_settings)
+            network_get.assert_called_once()
+        self.assertTrue(self.follower.shared_settings_store.is_leader)
+        self.assertEqual(self.follower.shared_settings_store.get_generation(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
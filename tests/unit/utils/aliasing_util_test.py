@@ -0,0 +1,132 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import unittest
+from unittest.mock import patch
+
+from vwo import init
+from vwo.models.user.context_model import ContextModel
+from vwo.services.settings_manager import SettingsManager
+from vwo.utils.aliasing_util import get_alias, resolve_aliases, set_alias
+from ...data.dummy_test_data_reader import settings_files
+
+GATEWAY_LOOKUP = "vwo.utils.aliasing_util.get_from_gateway_service"
+GATEWAY_POST = "vwo.utils.aliasing_util.post_to_gateway_service"
+ALIASES = {"anonymous-1": "user-1", "anonymous-2": "user-2"}
+
+
+def alias_lookup(query_params, endpoint, context):
+    user_ids = json.loads(query_params["userId"])
+    return [{"aliasId": user_id, "userId": ALIASES.get(user_id, user_id)} for user_id in user_ids]
+
+
+class AliasCacheTest(unittest.TestCase):
+    """Resolved aliases are cached, filled in bulk and dropped by set_alias."""
+
+    def setUp(self):
+        SettingsManager(
+            {"sdk_key": "abcd", "account_id": "1234", "gateway_service": {"url": "http://127.0.0.1:1"}}
+        )
+
+    def test_aliases_are_looked_up_once(self):
+        with patch(GATEWAY_LOOKUP, side_effect=alias_lookup) as lookup:
+            for _ in range(3):
+                self.assertEqual(get_alias(ContextModel({"id": "anonymous-1"})), "user-1")
+            self.assertEqual(get_alias(ContextModel({"id": "user-9"})), "user-9")
+
+        self.assertEqual(lookup.call_count, 2)
+
+    def test_set_alias_drops_the_cached_alias(self):
+        with patch(GATEWAY_LOOKUP, side_effect=alias_lookup) as lookup, patch(
+            GATEWAY_POST, return_value={"isAliasSet": True}
+        ):
+            self.assertEqual(get_alias(ContextModel({"id": "anonymous-3"})), "anonymous-3")
+            ALIASES["anonymous-3"] = "user-3"
+            self.addCleanup(ALIASES.pop, "anonymous-3")
+            self.assertTrue(set_alias("user-3", "anonymous-3"))
+            self.assertEqual(get_alias(ContextModel({"id": "anonymous-3"})), "user-3")
+
+        self.assertEqual(lookup.call_count, 2)
+
+    def test_bulk_resolution_fills_the_cache_in_one_request(self):
+        with patch(GATEWAY_LOOKUP, side_effect=alias_lookup) as lookup:
+            get_alias(ContextModel({"id": "anonymous-1"}))
+            resolved = resolve_aliases(["anonymous-1", "anonymous-2", "user-9", "anonymous-2"])
+            self.assertEqual(get_alias(ContextModel({"id": "anonymous-2"})), "user-2")
+
+        self.assertEqual(resolved, {"anonymous-1": "user-1", "anonymous-2": "user-2", "user-9": "user-9"})
+        self.assertEqual(lookup.call_count, 2)
+        self.assertEqual(json.loads(lookup.call_args_list[1][0][0]["userId"]), ["anonymous-2", "user-9"])
+
+    def test_cache_can_be_disabled(self):
+        SettingsManager(
+            {
+                "sdk_key": "abcd",
+                "account_id": "1234",
+                "gateway_service": {"url": "http://127.0.0.1:1", "alias_cache": False},
+            }
+        )
+        with patch(GATEWAY_LOOKUP, side_effect=alias_lookup) as lookup:
+            get_alias(ContextModel({"id": "anonymous-1"}))
+            get_alias(ContextModel({"id": "anonymous-1"}))
+        self.assertEqual(lookup.call_count, 2)
+
+
+class ClientAliasResolutionTest(unittest.TestCase):
+    def setUp(self):
+        self.patches = [
+            patch(
+                "vwo.vwo_builder.VWOBuilder.get_settings",
+                return_value=copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS")),
+            ),
+            patch(
+                "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+                return_value=None,
+            ),
+            patch("vwo.packages.network_layer.manager.network_manager.NetworkManager.post", return_value=None),
+        ]
+        for active_patch in self.patches:
+            active_patch.start()
+        self.vwo_client = init(
+            {
+                "sdk_key": "abcd",
+                "account_id": "1234",
+                "gateway_service": {"url": "http://127.0.0.1:1"},
+                "is_aliasing_enabled": True,
+            }
+        )
+
+    def tearDown(self):
+        for active_patch in self.patches:
+            active_patch.stop()
+
+    def test_cohort_aliases_are_resolved_once_per_batch(self):
+        contexts = [{"id": f"anonymous-{index}"} for index in range(1, 6)]
+        with patch(GATEWAY_LOOKUP, side_effect=alias_lookup) as lookup:
+            flags = list(self.vwo_client.evaluate_cohort("feature1", contexts, batch_size=3))
+
+        self.assertEqual(len(flags), 5)
+        self.assertEqual(lookup.call_count, 2)
+
+    def test_resolve_aliases_validates_its_input(self):
+        with patch(GATEWAY_LOOKUP, side_effect=alias_lookup) as lookup:
+            self.assertEqual(self.vwo_client.resolve_aliases("anonymous-1"), {})
+            self.assertEqual(self.vwo_client.resolve_aliases([" anonymous-1 "]), {"anonymous-1": "user-1"})
+        self.assertEqual(lookup.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
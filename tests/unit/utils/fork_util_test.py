@@ -0,0 +1,99 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from vwo.packages.network_layer.manager.network_manager import NetworkManager
+from vwo.services.batch_event_queue import BatchEventQueue
+from vwo.services.event_spool import EventSpool
+from vwo.utils import fork_util
+from vwo.utils.fork_util import register_after_fork
+from vwo.utils.ttl_cache_util import TtlCache
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def increment(self):
+        self.calls += 1
+
+
+class ForkUtilTest(unittest.TestCase):
+    def test_callbacks_do_not_keep_their_objects_alive(self):
+        kept, dropped = Counter(), Counter()
+        # only this test's callbacks, the SDK objects of other tests must not be reinitialized
+        with patch.object(fork_util, "_after_fork_callbacks", []):
+            register_after_fork(kept.increment)
+            register_after_fork(dropped.increment)
+            del dropped
+
+            fork_util._after_fork_in_child()
+            self.assertEqual(kept.calls, 1)
+            self.assertEqual(len(fork_util._after_fork_callbacks), 1)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_a_forked_child_gets_its_own_threads_locks_and_session(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        network_manager = NetworkManager.get_instance()
+        if network_manager.client is None:
+            network_manager.attach_client()
+        parent_session = network_manager.client.session
+        cache = TtlCache(10, 60)
+        queue = BatchEventQueue(10, 600, 1, "sdk-key", spool=EventSpool(temp_dir.name, fsync_interval=60))
+        self.addCleanup(queue.close_spool)
+        self.addCleanup(queue.clear_request_timer)
+        queue.enqueue({"n": 0})
+
+        read_fd, write_fd = os.pipe()
+        # locks held at the fork are never released in the child unless they are recreated
+        with queue.lock, cache._lock:
+            pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                result = {
+                    "queued": len(queue.batch_queue),
+                    "spool": queue.spool is not None,
+                    "enqueued": queue.enqueue({"n": 1}),
+                    "flusher": queue._flusher.is_alive(),
+                    "cached": cache.get_or_load("key", lambda: "value"),
+                    "new_session": NetworkManager.get_instance().client.session is not parent_session,
+                }
+                os.write(write_fd, json.dumps(result).encode("utf-8"))
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as reader:
+            result = json.loads(reader.read())
+        os.waitpid(pid, 0)
+
+        self.assertEqual(
+            result,
+            {"queued": 0, "spool": False, "enqueued": True, "flusher": True, "cached": "value", "new_session": True},
+        )
+        # the parent keeps its queue and its spool
+        self.assertEqual(len(queue.batch_queue), 1)
+        self.assertEqual(queue.spool.pending_count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
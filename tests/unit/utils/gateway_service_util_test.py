@@ -0,0 +1,233 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import time
+import unittest
+from unittest.mock import patch
+
+from vwo import init
+from vwo.models.user.context_model import ContextModel
+from vwo.packages.segmentation_evaluator.evaluators.segment_operand_evaluator import (
+    SegmentOperandEvaluator,
+)
+from vwo.services.attribute_list_store import (
+    AttributeListLoader,
+    AttributeListStore,
+    BloomFilter,
+)
+from vwo.services.settings_manager import SettingsManager
+from vwo.utils.gateway_service_util import (
+    add_is_gateway_service_required_flag,
+    get_gateway_cache_stats,
+)
+from vwo.utils.settings_util import build_settings_snapshot
+from ...data.dummy_test_data_reader import settings_files
+
+NETWORK_POST = "vwo.packages.network_layer.manager.network_manager.NetworkManager.post"
+GATEWAY_LOOKUP = "vwo.utils.gateway_service_util.get_from_gateway_service"
+USER_DATA = {"location": {"country": "India"}, "userAgent": {"os": "Mac OS"}}
+
+
+class GatewayUserDataCacheTest(unittest.TestCase):
+    """User agent and IP lookups are served from a TTL cache instead of the gateway."""
+
+    def setUp(self):
+        self.patches = [
+            patch(
+                "vwo.vwo_builder.VWOBuilder.get_settings",
+                return_value=copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS")),
+            ),
+            patch(
+                "vwo.vwo_builder.VWOBuilder.update_poll_interval_and_check_and_poll",
+                return_value=None,
+            ),
+            patch(NETWORK_POST, return_value=None),
+            patch("vwo.api.get_flag_api.send_impression_for_variation_shown_batch"),
+            patch("vwo.api.get_flag_api.send_impression_for_variation_shown"),
+        ]
+        for active_patch in self.patches:
+            active_patch.start()
+
+    def tearDown(self):
+        for active_patch in self.patches:
+            active_patch.stop()
+
+    def _init(self, **gateway_options):
+        return init(
+            {
+                "sdk_key": "abcd",
+                "account_id": "1234",
+                "gateway_service": dict({"url": "http://127.0.0.1:1"}, **gateway_options),
+            }
+        )
+
+    def _get_flags(self, vwo_client, contexts):
+        for context in contexts:
+            vwo_client.get_flag("feature1", dict({"id": "user"}, **context))
+
+    def test_repeated_user_agents_are_looked_up_once(self):
+        vwo_client = self._init()
+        contexts = [
+            {"user_agent": "Mozilla/5.0", "ip_address": "1.2.3.4"},
+            {"user_agent": "Mozilla/5.0", "ip_address": "1.2.3.4"},
+            {"user_agent": "Mozilla/5.0", "ip_address": "5.6.7.8"},
+            {"user_agent": "Mozilla/5.0", "ip_address": "1.2.3.4"},
+        ]
+        with patch(GATEWAY_LOOKUP, return_value=USER_DATA) as lookup:
+            self._get_flags(vwo_client, contexts)
+
+        self.assertEqual(lookup.call_count, 2)
+        stats = get_gateway_cache_stats()["user_data"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 2, 2))
+
+    def test_failed_lookups_are_not_repeated_within_the_error_ttl(self):
+        vwo_client = self._init(user_data_cache={"error_ttl": 60})
+        with patch(GATEWAY_LOOKUP, return_value=False) as lookup:
+            self._get_flags(vwo_client, [{"user_agent": "Mozilla/5.0"}] * 3)
+
+        self.assertEqual(lookup.call_count, 1)
+        self.assertEqual(get_gateway_cache_stats()["user_data"]["negative_hits"], 2)
+
+    def test_cache_can_be_disabled(self):
+        vwo_client = self._init(user_data_cache=False)
+        with patch(GATEWAY_LOOKUP, return_value=USER_DATA) as lookup:
+            self._get_flags(vwo_client, [{"user_agent": "Mozilla/5.0"}] * 3)
+
+        self.assertEqual(lookup.call_count, 3)
+        self.assertNotIn("user_data", get_gateway_cache_stats())
+
+
+class StaticListLoader(AttributeListLoader):
+    def __init__(self, lists):
+        self.lists = lists
+        self.loads = []
+
+    def load(self, list_id):
+        self.loads.append(list_id)
+        return self.lists.get(list_id)
+
+
+class GatewayInlistCacheTest(unittest.TestCase):
+    """inlist(...) checks are cached per (listId, attribute) or answered from downloaded lists."""
+
+    def _check(self, attribute_value, list_id="premium"):
+        return SegmentOperandEvaluator().evaluate_custom_variable_dsl(
+            {"tier": f"inlist({list_id})"}, {"tier": attribute_value}, ContextModel({"id": "user"})
+        )
+
+    def _settings_manager(self, **gateway_options):
+        settings_manager = SettingsManager(
+            {"sdk_key": "abcd", "account_id": "1234", "gateway_service": dict({"url": "http://127.0.0.1:1"}, **gateway_options)}
+        )
+        if settings_manager.attribute_list_store is not None:
+            self.addCleanup(settings_manager.attribute_list_store.stop)
+        return settings_manager
+
+    def test_list_id_is_passed_to_the_gateway(self):
+        self._settings_manager()
+        with patch(GATEWAY_LOOKUP, return_value="true") as lookup:
+            self.assertTrue(self._check("gold", "list-42"))
+
+        query_params = lookup.call_args[0][0]
+        self.assertEqual((query_params["listId"], query_params["attribute"]), ("list-42", "gold"))
+
+    def test_repeated_checks_are_sent_once(self):
+        self._settings_manager()
+        with patch(GATEWAY_LOOKUP, side_effect=lambda query_params, *_: "true" if query_params["attribute"] == "gold" else "false") as lookup:
+            results = [self._check(value) for value in ("gold", "silver", "gold", "silver", "gold")]
+
+        self.assertEqual(results, ["true", False, "true", False, "true"])
+        self.assertEqual(lookup.call_count, 2)
+        stats = get_gateway_cache_stats()["inlist"]
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 2))
+
+    def test_failed_checks_are_not_cached_for_the_full_ttl(self):
+        self._settings_manager(inlist_cache={"error_ttl": 0})
+        with patch(GATEWAY_LOOKUP, return_value=False) as lookup:
+            self.assertFalse(self._check("gold"))
+            self.assertFalse(self._check("gold"))
+        self.assertEqual(lookup.call_count, 2)
+
+    def test_downloaded_lists_are_checked_locally(self):
+        loader = StaticListLoader({"premium": ["gold", "platinum"]})
+        settings_manager = self._settings_manager(attribute_lists={"loader": loader, "list_ids": ["premium"]})
+        settings_manager.attribute_list_store.refresh(force=True)
+
+        with patch(GATEWAY_LOOKUP, return_value="true") as lookup:
+            self.assertTrue(self._check("gold"))
+            self.assertFalse(self._check("silver"))
+            lookup.assert_not_called()
+            # lists that are not downloaded yet are still checked on the gateway
+            self.assertTrue(self._check("gold", "other"))
+        self.assertEqual(lookup.call_count, 1)
+        self.assertEqual(get_gateway_cache_stats()["attribute_lists"]["local_hits"], 2)
+
+    def test_settings_mark_inlist_segments_as_needing_the_gateway(self):
+        settings_file = copy.deepcopy(settings_files.get("BASIC_ROLLOUT_SETTINGS"))
+        settings_file["campaigns"][0]["variations"][0]["segments"] = {
+            "or": [{"custom_variable": {"tier": "inlist(premium)"}}]
+        }
+        settings = build_settings_snapshot(settings_file).get_settings()
+        feature = settings.get_features()[0]
+        feature.set_is_gateway_service_required(False)
+
+        add_is_gateway_service_required_flag(settings)
+        self.assertTrue(feature.get_is_gateway_service_required())
+
+
+class AttributeListStoreTest(unittest.TestCase):
+    def test_checked_lists_are_downloaded_in_the_background(self):
+        loader = StaticListLoader({"premium": [1, 2, 3]})
+        store = AttributeListStore(loader)
+        self.addCleanup(store.stop)
+
+        self.assertIsNone(store.contains("premium", "1"))
+        for _ in range(200):
+            if store.get_stats()["lists"]:
+                break
+            time.sleep(0.01)
+        self.assertTrue(store.contains("premium", "1"))
+        self.assertFalse(store.contains("premium", "4"))
+        self.assertEqual(loader.loads, ["premium"])
+
+    def test_lists_are_refreshed_after_the_interval(self):
+        now = [0.0]
+        loader = StaticListLoader({"premium": ["a"]})
+        store = AttributeListStore(loader, ["premium"], refresh_interval=60, clock=lambda: now[0])
+        store.refresh()
+        loader.lists["premium"] = ["b"]
+        store.refresh()
+        self.assertTrue(store.contains("premium", "a"))
+
+        now[0] = 61
+        store.refresh()
+        self.assertTrue(store.contains("premium", "b"))
+        self.assertEqual(loader.loads, ["premium", "premium"])
+
+    def test_bloom_filter_misses_are_definite_and_hits_are_confirmed_remotely(self):
+        values = [f"user-{index}" for index in range(5000)]
+        bloom_filter = BloomFilter.from_values(values)
+        self.assertTrue(all(value in bloom_filter for value in values))
+        false_positives = sum(f"other-{index}" in bloom_filter for index in range(5000))
+        self.assertLess(false_positives, 150)
+
+        store = AttributeListStore(StaticListLoader({"large": bloom_filter}), ["large"])
+        store.refresh()
+        self.assertIsNone(store.contains("large", "user-7"))
+        self.assertFalse(store.contains("large", next(f"other-{index}" for index in range(5000) if f"other-{index}" not in bloom_filter)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from vwo.utils.ttl_cache_util import TtlCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TtlCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.loads = []
+
+    def _loader(self, value):
+        def load():
+            self.loads.append(value)
+            return value
+
+        return load
+
+    def test_values_expire_after_the_ttl(self):
+        cache = TtlCache(10, 60, clock=self.clock)
+        self.assertEqual(cache.get_or_load("key", self._loader("first")), "first")
+        self.clock.now = 59
+        self.assertEqual(cache.get_or_load("key", self._loader("second")), "first")
+        self.clock.now = 60
+        self.assertEqual(cache.get_or_load("key", self._loader("second")), "second")
+
+        self.assertEqual(self.loads, ["first", "second"])
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_failures_are_cached_for_the_error_ttl(self):
+        cache = TtlCache(10, 60, 5, lambda value: value is False, self.clock)
+        self.assertFalse(cache.get_or_load("key", self._loader(False)))
+        self.assertFalse(cache.get_or_load("key", self._loader("data")))
+        self.clock.now = 5
+        self.assertEqual(cache.get_or_load("key", self._loader("data")), "data")
+
+        self.assertEqual(self.loads, [False, "data"])
+        self.assertEqual(cache.get_stats()["negative_hits"], 1)
+
+    def test_loader_exceptions_are_cached_and_raised_again(self):
+        cache = TtlCache(10, 60, 5, clock=self.clock)
+
+        def failing_load():
+            self.loads.append("failed")
+            raise ValueError("gateway down")
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.get_or_load("key", failing_load)
+        self.assertEqual(self.loads, ["failed"])
+
+    def test_failures_are_not_cached_without_an_error_ttl(self):
+        cache = TtlCache(10, 60, 0, lambda value: value is None, self.clock)
+        cache.get_or_load("key", self._loader(None))
+        cache.get_or_load("key", self._loader(None))
+        self.assertEqual(len(self.loads), 2)
+
+    def test_least_recently_used_key_is_evicted(self):
+        cache = TtlCache(2, 60, clock=self.clock)
+        cache.get_or_load("a", self._loader("a"))
+        cache.get_or_load("b", self._loader("b"))
+        cache.get_or_load("a", self._loader("a"))
+        cache.get_or_load("c", self._loader("c"))
+        cache.get_or_load("a", self._loader("a"))
+        cache.get_or_load("b", self._loader("b"))
+
+        self.assertEqual(self.loads, ["a", "b", "c", "b"])
+        self.assertEqual(cache.get_stats()["size"], 2)
+
+    def test_concurrent_misses_share_one_load(self):
+        cache = TtlCache(10, 60)
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def slow_load():
+            self.loads.append("load")
+            started.set()
+            release.wait(5)
+            return "value"
+
+        leader = threading.Thread(target=lambda: results.append(cache.get_or_load("key", slow_load)))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("key", slow_load)))
+            for _ in range(4)
+        ]
+        for follower in followers:
+            follower.start()
+        while cache.get_stats()["coalesced"] < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(self.loads, ["load"])
+
+    def test_values_can_be_set_and_invalidated(self):
+        cache = TtlCache(10, 60, clock=self.clock)
+        cache.set("key", "bulk")
+        self.assertTrue(cache.contains("key"))
+        self.assertEqual(cache.get_or_load("key", self._loader("loaded")), "bulk")
+        cache.invalidate("key")
+        self.assertFalse(cache.contains("key"))
+        self.assertEqual(cache.get_or_load("key", self._loader("loaded")), "loaded")
+
+    def test_invalidation_discards_a_load_in_progress(self):
+        cache = TtlCache(10, 60)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_load():
+            started.set()
+            release.wait(5)
+            return "stale"
+
+        leader = threading.Thread(target=lambda: cache.get_or_load("key", slow_load))
+        leader.start()
+        started.wait(5)
+        cache.invalidate("key")
+        release.set()
+        leader.join(5)
+
+        self.assertFalse(cache.contains("key"))
+        self.assertEqual(cache.get_or_load("key", self._loader("fresh")), "fresh")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import uuid
+
+import vwo
+from vwo.utils import uuid_util
+
+
+def _reference_uuid(user_id, account_id):
+    vwo_namespace = uuid.uuid5(uuid.NAMESPACE_URL, "https://vwo.com")
+    account_namespace = uuid.uuid5(vwo_namespace, str(account_id))
+    return str(uuid.uuid5(account_namespace, user_id)).replace("-", "").upper()
+
+
+class UuidUtilTest(unittest.TestCase):
+    def test_matches_uncached_generation(self):
+        self.assertEqual(
+            vwo.getUUID("user-123", "123456"), "CC25A368ADA0542699EAD62489811105"
+        )
+        for user_id in ("a", "user-1", "ünïcode"):
+            self.assertEqual(
+                uuid_util.get_uuid(user_id, 654321), _reference_uuid(user_id, 654321)
+            )
+
+    def test_int_and_str_account_ids_share_a_cache_entry(self):
+        uuid_util._get_cached_uuid.cache_clear()
+        uuid_util.get_uuid("user", 42)
+        uuid_util.get_uuid("user", "42")
+        info = uuid_util._get_cached_uuid.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_empty_user_id_has_no_uuid(self):
+        self.assertIsNone(uuid_util.get_uuid("", "123"))
+
+    def test_get_uuids(self):
+        user_ids = [f"user-{index}" for index in range(50)]
+        uuids = uuid_util.get_uuids(user_ids, "123456")
+        self.assertEqual(len(uuids), 50)
+        for user_id in user_ids:
+            self.assertEqual(uuids[user_id], uuid_util.get_uuid(user_id, "123456"))
+
+    def test_get_uuids_api_validates_input(self):
+        self.assertIsNone(vwo.getUUIDs(["user"], ""))
+        uuids = vwo.getUUIDs(["user", "", 5], "123456")
+        self.assertEqual(uuids["user"], vwo.getUUID("user", "123456"))
+        self.assertIsNone(uuids[""])
+        self.assertIsNone(uuids[5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .vwo import init, getUUID
+from .vwo import init, init_async, getUUID, getUUIDs
+from .async_vwo_client import AsyncVWOClient
 from .packages.storage.connector import StorageConnector
+from .packages.storage.async_connector import AsyncStorageConnector
+from .packages.storage.settings_cache import SettingsCacheConnector, FileSettingsCache
 from .packages.logger.enums.log_level_enum import LogLevelEnum
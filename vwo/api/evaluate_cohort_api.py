@@ -0,0 +1,398 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+from ..models.settings.settings_model import SettingsModel
+from ..models.campaign.campaign_model import CampaignModel
+from ..models.user.context_model import ContextModel
+from ..models.user.get_flag import GetFlag
+from ..services.campaign_decision_service import CampaignDecisionService
+from ..enums.api_enum import ApiEnum
+from ..enums.campaign_type_enum import CampaignTypeEnum
+from ..enums.event_enum import EventEnum
+from ..constants.Constants import Constants
+from ..packages.decision_maker.decision_maker import DecisionMaker
+from ..packages.logger.core.log_manager import LogManager
+from ..packages.segmentation_evaluator.core.segmentation_manager import (
+    SegmentationManager,
+)
+from ..packages.segmentation_evaluator.evaluators.segment_evaluator import (
+    SegmentEvaluator,
+)
+from ..packages.segmentation_evaluator.enums.segment_operator_value_enum import (
+    SegmentOperatorValueEnum,
+)
+from ..utils.function_util import (
+    get_feature_from_key,
+    get_specific_rules_based_on_type,
+    get_all_experiment_rules,
+    get_current_unix_timestamp,
+)
+from ..utils.campaign_util import (
+    get_group_details_if_campaign_part_of_it,
+    get_bucketing_id_for_user,
+)
+from ..utils.decision_util import _check_campaign_whitelisting
+from ..utils.data_type_util import is_object
+from ..utils.uuid_util import get_uuid
+from ..utils.network_util import get_track_user_payload_data
+from ..utils.impression_util import (
+    send_collected_impressions,
+    send_impression_for_variation_shown_batch,
+)
+from ..services.settings_manager import SettingsManager
+
+_MISSING = object()
+
+
+class EvaluateCohortApi:
+    """
+    Evaluates one feature for many users with the same rule order and bucketing as GetFlagApi.get,
+    but without side effects: no storage reads or writes, no gateway lookups, and no impressions,
+    hooks or debug events unless send_impressions is set.
+
+    The traffic and variation hashes of all users that reach a rule are computed together by
+    DecisionMaker (vectorized with NumPy when it is installed). Segments that only test custom
+    variables are evaluated once per distinct combination of the variables they read.
+
+    Decisions equal GetFlagApi.get for users without a stored decision. Features in a mutually
+    exclusive group, or whose segments need the gateway service (user agent or location), are
+    rejected with a ValueError, since their decisions depend on storage or a per-user lookup.
+    A missing feature is logged and evaluates to disabled flags, as in GetFlagApi.get.
+    """
+
+    def __init__(self, feature_key: str, settings: SettingsModel, send_impressions: bool = False):
+        self._settings = settings
+        self._send_impressions = send_impressions
+        self._decision_maker = DecisionMaker()
+        self._feature = get_feature_from_key(settings, feature_key)
+        self._rollout_rules = get_specific_rules_based_on_type(
+            self._feature, CampaignTypeEnum.ROLLOUT.value
+        )
+        self._experiment_rules = get_all_experiment_rules(self._feature)
+        # custom variables read by each rule's segments, keyed by the identity of the segments DSL
+        self._segment_keys: Dict[int, Optional[Tuple[str, ...]]] = {}
+
+        if self._feature is None:
+            LogManager.get_instance().error_log("FEATURE_NOT_FOUND", data={"featureKey": feature_key}, debug_data={"an": ApiEnum.GET_FLAG.value, "fk": feature_key})
+            return
+        if self._feature.get_is_gateway_service_required():
+            raise ValueError(
+                f"Feature {feature_key} has segments that need the gateway service, which bulk evaluation does not call"
+            )
+        for rule in self._rollout_rules + self._experiment_rules:
+            variation_id = (
+                rule.get_variations()[0].get_id()
+                if rule.get_type() == CampaignTypeEnum.PERSONALIZE.value
+                else None
+            )
+            if get_group_details_if_campaign_part_of_it(settings, str(rule.get_id()), variation_id):
+                raise ValueError(
+                    f"Feature {feature_key} is part of a mutually exclusive group, which bulk evaluation does not support"
+                )
+            segments = _get_rule_segments(rule)
+            self._segment_keys[id(segments)] = _get_custom_variable_keys(segments)
+
+    def evaluate(self, contexts: List[Optional[ContextModel]]) -> List[GetFlag]:
+        """
+        Evaluates the feature for a batch of users.
+
+        :param contexts: The context of each user, or None for a context that could not be built.
+        :return: The flag of each user, in the same order.
+        """
+        flags: List[Optional[GetFlag]] = [None] * len(contexts)
+        batch_indexes = []
+        session_id = get_current_unix_timestamp()
+
+        for index, context in enumerate(contexts):
+            if context is None or self._feature is None:
+                flags[index] = GetFlag(
+                    is_enabled=False,
+                    variables=[],
+                    session_id=context.get_session_id() if context else None,
+                    uuid=context.get_vwo_uuid() if context else None,
+                )
+                continue
+            if context.get_session_id() is None:
+                context.set_session_id(session_id)
+            batch_indexes.append(index)
+
+        batch_contexts = [contexts[index] for index in batch_indexes]
+        for index, flag in zip(batch_indexes, self._evaluate_batch(batch_contexts)):
+            flags[index] = flag
+
+        return flags
+
+    def _evaluate_batch(self, contexts: List[ContextModel]) -> List[GetFlag]:
+        """
+        Follows the order of GetFlagApi.get: the first rollout rule whose pre-segmentation passes is
+        checked for traffic, and experiment rules are only evaluated when that rollout rule enabled
+        the feature (or when there are no rollout rules).
+        """
+        count = len(contexts)
+        is_enabled = [False] * count
+        variables: List[List[Any]] = [[] for _ in range(count)]
+        impressions: List[List[Tuple[int, int]]] = [[] for _ in range(count)]
+        evaluators = [self._create_evaluator(context) for context in contexts]
+
+        experiment_indexes = list(range(count))
+        if self._rollout_rules:
+            experiment_indexes = []
+            for rule, indexes, _ in self._assign_rules(self._rollout_rules, contexts, evaluators, range(count)):
+                variation = rule.get_variations()[0]
+                for index, is_part in zip(indexes, self._is_part_of_campaign(rule, contexts, indexes)):
+                    if is_part:
+                        is_enabled[index] = True
+                        variables[index] = variation.get_variables()
+                        impressions[index].append((rule.get_id(), variation.get_id()))
+                        experiment_indexes.append(index)
+
+        for rule, indexes, whitelisted in self._assign_rules(
+            self._experiment_rules, contexts, evaluators, experiment_indexes
+        ):
+            for index, variation in whitelisted:
+                is_enabled[index] = True
+                variables[index] = variation.get_variables()
+                impressions[index].append((rule.get_id(), variation.get_id()))
+
+            part_indexes = [
+                index
+                for index, is_part in zip(indexes, self._is_part_of_campaign(rule, contexts, indexes))
+                if is_part
+            ]
+            for index, variation in zip(part_indexes, self._get_variations(rule, contexts, part_indexes)):
+                if variation is not None:
+                    is_enabled[index] = True
+                    variables[index] = variation.get_variables()
+                    impressions[index].append((rule.get_id(), variation.get_id()))
+
+        if self._send_impressions:
+            self._send_batch_impressions(contexts, is_enabled, impressions)
+
+        return [
+            GetFlag(
+                is_enabled=is_enabled[index],
+                variables=variables[index],
+                session_id=context.get_session_id(),
+                uuid=context.get_vwo_uuid(),
+            )
+            for index, context in enumerate(contexts)
+        ]
+
+    def _create_evaluator(self, context: ContextModel) -> SegmentEvaluator:
+        # set_contextual_data would look the user agent and IP up in the gateway service, so the evaluator is built here
+        evaluator = SegmentEvaluator()
+        evaluator.settings = self._settings
+        evaluator.context = context
+        evaluator.feature = self._feature
+        return evaluator
+
+    def _assign_rules(
+        self,
+        rules: List[CampaignModel],
+        contexts: List[ContextModel],
+        evaluators: List[SegmentEvaluator],
+        indexes,
+    ) -> List[Tuple[CampaignModel, List[int], List[Tuple[int, Any]]]]:
+        """
+        Groups the users by the first rule that applies to them: either a whitelisted variation of the
+        rule or its pre-segmentation passed.
+
+        :return: For each rule, the users to bucket and the (user, variation) pairs that were whitelisted.
+        """
+        # rules are told apart by position, the rollout rules of one campaign share its ID
+        assigned = [([], []) for _ in rules]
+        # results of custom-variable-only segments, per segments DSL and combination of the variables they read
+        segment_results: Dict[Tuple[int, Tuple[Any, ...]], bool] = {}
+
+        for index in indexes:
+            context = contexts[index]
+            for position, rule in enumerate(rules):
+                self._set_targeting_variables(rule, context)
+                if rule.get_type() == CampaignTypeEnum.AB.value and rule.get_is_forced_variation_enabled():
+                    SegmentationManager.get_instance().use_evaluator(evaluators[index])
+                    whitelisted_object = _check_campaign_whitelisting(rule, context)
+                    if whitelisted_object:
+                        assigned[position][1].append((index, whitelisted_object["variation"]))
+                        break
+                if self._passes_pre_segmentation(rule, context, evaluators[index], segment_results):
+                    assigned[position][0].append(index)
+                    break
+
+        return [
+            (rule, bucketed, whitelisted)
+            for rule, (bucketed, whitelisted) in zip(rules, assigned)
+            if bucketed or whitelisted
+        ]
+
+    def _set_targeting_variables(self, rule: CampaignModel, context: ContextModel) -> None:
+        # same targeting variables as check_whitelisting_and_pre_seg sets before evaluating the segments
+        vwo_user_id = (
+            get_uuid(context.get_id(), self._settings.get_account_id())
+            if rule.get_is_user_list_enabled()
+            else context.get_id()
+        )
+        if rule.get_type() == CampaignTypeEnum.AB.value:
+            context.set_variation_targeting_variables(
+                {**context.get_variation_targeting_variables(), "_vwoUserId": vwo_user_id}
+            )
+        context.set_custom_variables({**context.get_custom_variables(), "_vwoUserId": vwo_user_id})
+
+    def _passes_pre_segmentation(
+        self,
+        rule: CampaignModel,
+        context: ContextModel,
+        evaluator: SegmentEvaluator,
+        segment_results: Dict[Tuple[int, Tuple[Any, ...]], bool],
+    ) -> bool:
+        segments = _get_rule_segments(rule)
+        if is_object(segments) and not segments:
+            return True
+
+        custom_variables = context.get_custom_variables()
+        result_key = None
+        keys = self._segment_keys.get(id(segments))
+        if keys is not None:
+            result_key = (id(segments), tuple(custom_variables.get(key, _MISSING) for key in keys))
+            try:
+                if result_key in segment_results:
+                    return segment_results[result_key]
+            except TypeError:  # unhashable variable values are evaluated for every user
+                result_key = None
+
+        compiled_segment = self._settings.get_compiled_segment(segments)
+        if compiled_segment is not None:
+            result = bool(compiled_segment.evaluate(evaluator, custom_variables))
+        else:
+            result = bool(evaluator.is_segmentation_valid(segments, custom_variables))
+
+        if result_key is not None:
+            segment_results[result_key] = result
+        return result
+
+    def _is_part_of_campaign(
+        self, rule: CampaignModel, contexts: List[ContextModel], indexes: List[int]
+    ) -> List[bool]:
+        # mirrors CampaignDecisionService.is_user_part_of_campaign
+        if rule.get_type() in [CampaignTypeEnum.ROLLOUT.value, CampaignTypeEnum.PERSONALIZE.value]:
+            salt = rule.get_variations()[0].get_salt()
+            traffic_allocation = rule.get_variations()[0].get_weight()
+        else:
+            salt = rule.get_salt()
+            traffic_allocation = rule.get_percent_traffic()
+
+        prefix = salt if salt else rule.get_id()
+        bucketing_ids = [get_bucketing_id_for_user(contexts[index]) for index in indexes]
+        hash_values = self._decision_maker.generate_hash_values(
+            [f"{prefix}_{bucketing_id}" for bucketing_id in bucketing_ids]
+        )
+        bucket_values = self._decision_maker.generate_bucket_values(hash_values, 100)
+        return [
+            bool(bucketing_id) and value != 0 and value <= traffic_allocation
+            for bucketing_id, value in zip(bucketing_ids, bucket_values)
+        ]
+
+    def _get_variations(self, rule: CampaignModel, contexts: List[ContextModel], indexes: List[int]) -> List[Any]:
+        # mirrors CampaignDecisionService.bucket_user_to_variation
+        if rule.get_type() == CampaignTypeEnum.PERSONALIZE.value:
+            return [rule.get_variations()[0]] * len(indexes)
+        if not indexes:
+            return []
+
+        prefix = rule.get_salt() if rule.get_salt() else rule.get_id()
+        account_id = self._settings.get_account_id()
+        hash_values = self._decision_maker.generate_hash_values(
+            [f"{prefix}_{account_id}_{get_bucketing_id_for_user(contexts[index])}" for index in indexes]
+        )
+        bucket_values = self._decision_maker.generate_bucket_values(
+            hash_values, Constants.MAX_TRAFFIC_VALUE, 1
+        )
+        campaign_decision_service = CampaignDecisionService()
+        return [
+            campaign_decision_service.get_variation(rule.get_variations(), bucket_value)
+            for bucket_value in bucket_values
+        ]
+
+    def _send_batch_impressions(
+        self,
+        contexts: List[ContextModel],
+        is_enabled: List[bool],
+        impressions: List[List[Tuple[int, int]]],
+    ) -> None:
+        impact_campaign = self._feature.get_impact_campaign()
+        impact_campaign_id = impact_campaign.get_campaign_id() if impact_campaign else None
+        is_gateway_service_provided = SettingsManager.get_instance().is_gateway_service_provided
+        batch_payload = []
+
+        for index, context in enumerate(contexts):
+            variations_shown = list(impressions[index])
+            if impact_campaign_id:
+                variations_shown.append((impact_campaign_id, 2 if is_enabled[index] else 1))
+            payloads = [
+                get_track_user_payload_data(
+                    self._settings, EventEnum.VWO_VARIATION_SHOWN.value, campaign_id, variation_id, context
+                )
+                for campaign_id, variation_id in variations_shown
+            ]
+            if is_gateway_service_provided:
+                send_collected_impressions(
+                    payloads, context, self._settings.get_account_id(), self._settings.get_sdk_key()
+                )
+            else:
+                batch_payload.extend(payload for payload in payloads if payload)
+
+        if batch_payload:
+            send_impression_for_variation_shown_batch(
+                batch_payload, self._settings.get_account_id(), self._settings.get_sdk_key()
+            )
+
+
+def _get_rule_segments(rule: CampaignModel) -> Any:
+    if rule.get_type() == CampaignTypeEnum.AB.value:
+        return rule.get_segments()
+    return rule.get_variations()[0].get_segments()
+
+
+def _get_custom_variable_keys(dsl: Any) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the custom variables a segment reads if it tests nothing else (and no inlist),
+    so its result only depends on their values; None otherwise.
+    """
+    keys: Set[str] = set()
+    if not is_object(dsl) or not dsl or not _collect_custom_variable_keys(dsl, keys):
+        return None
+    return tuple(sorted(keys))
+
+
+def _collect_custom_variable_keys(dsl: Any, keys: Set[str]) -> bool:
+    if not isinstance(dsl, dict) or len(dsl) != 1:
+        return False
+
+    operator, sub_dsl = next(iter(dsl.items()))
+    if operator in (SegmentOperatorValueEnum.AND.value, SegmentOperatorValueEnum.OR.value):
+        return isinstance(sub_dsl, list) and all(
+            _collect_custom_variable_keys(item, keys) for item in sub_dsl
+        )
+    if operator == SegmentOperatorValueEnum.NOT.value:
+        return _collect_custom_variable_keys(sub_dsl, keys)
+    if operator == SegmentOperatorValueEnum.CUSTOM_VARIABLE.value:
+        if not isinstance(sub_dsl, dict) or len(sub_dsl) != 1:
+            return False
+        key, value = next(iter(sub_dsl.items()))
+        if isinstance(value, str) and "inlist" in value:
+            return False
+        keys.add(key)
+        return True
+    return False
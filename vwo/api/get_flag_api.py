@@ -13,7 +13,7 @@
 # limitations under the License.
 
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from ..models.settings.settings_model import SettingsModel
 from ..models.user.context_model import ContextModel
 from ..services.hooks_manager import HooksManager
@@ -65,6 +65,7 @@ class GetFlagApi:
         settings: SettingsModel,
         context: ContextModel,
         hook_manager: HooksManager,
+        batch_payload: Optional[List[Dict[str, Any]]] = None,
     ) -> GetFlag:
         """
         Gets the flag values for the given feature key.
@@ -73,6 +74,8 @@ class GetFlagApi:
         :param settings: The settings file containing the account settings.
         :param context: The context of the user.
         :param hook_manager: The hook manager to execute hooks.
+        :param batch_payload: Optional list to collect the impressions in instead of sending them,
+            so that the caller can send them together with send_collected_impressions.
         """
 
         feature = get_feature_from_key(settings, feature_key)
@@ -98,6 +101,11 @@ class GetFlagApi:
             feature_key, context, storage_service
         )
         batchPayload = []
+        # with a gateway service each impression is sent on its own, unless the caller collects them
+        send_impressions_individually = (
+            batch_payload is None
+            and SettingsManager.get_instance().is_gateway_service_provided
+        )
 
         if stored_data and stored_data.get("experimentVariationId"):
             if "experimentKey" in stored_data:
@@ -187,7 +195,7 @@ class GetFlagApi:
                     rollout_rules_to_evaluate.append(rule)
 
                     if (
-                        SettingsManager.get_instance().is_gateway_service_provided
+                        send_impressions_individually
                         and payload is not None
                         and len(payload) > 0
                     ):
@@ -228,7 +236,7 @@ class GetFlagApi:
                         context,
                     )
                     if (
-                        SettingsManager.get_instance().is_gateway_service_provided
+                        send_impressions_individually
                         and payload is not None
                         and len(payload) > 0
                     ):
@@ -273,7 +281,7 @@ class GetFlagApi:
                         experiment_rules_to_evaluate.append(rule)
                     else:
                         if (
-                            SettingsManager.get_instance().is_gateway_service_provided
+                            send_impressions_individually
                             and payload is not None
                             and len(payload) > 0
                         ):
@@ -317,7 +325,7 @@ class GetFlagApi:
                         context,
                     )
                     if (
-                        SettingsManager.get_instance().is_gateway_service_provided
+                        send_impressions_individually
                         and payload is not None
                         and len(payload) > 0
                     ):
@@ -371,7 +379,7 @@ class GetFlagApi:
                 context
             )
             if (
-                SettingsManager.get_instance().is_gateway_service_provided
+                send_impressions_individually
                 and payload is not None
                 and len(payload) > 0
             ):
@@ -380,7 +388,9 @@ class GetFlagApi:
                 if payload is not None and len(payload) > 0:
                     batchPayload.append(payload)
 
-        if not SettingsManager.get_instance().is_gateway_service_provided:
+        if batch_payload is not None:
+            batch_payload.extend(batchPayload)
+        elif not SettingsManager.get_instance().is_gateway_service_provided:
             send_impression_for_variation_shown_batch(
                 batchPayload, settings.get_account_id(), settings.get_sdk_key()
             )
@@ -0,0 +1,231 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .vwo_client import VWOClient
+from .models.user.get_flag import GetFlag
+from .constants.Constants import Constants
+from .services.settings_manager import SettingsManager
+from .packages.network_layer.manager.network_manager import NetworkManager
+from .packages.storage.storage import Storage
+from .utils.fork_util import register_after_fork
+from .packages.storage.async_connector import AsyncStorageConnector, LoopBoundStorageConnector
+
+
+class AsyncVWOClient:
+    """
+    asyncio front end of VWOClient with awaitable APIs.
+
+    Calls that only need the settings held in memory are evaluated inline on the event loop,
+    without a thread hop. Calls that would block, i.e. gateway lookups (user agent, IP,
+    inlist lists), alias resolution, storage connectors and network sends when threading is
+    disabled, run on a bounded transport pool and are awaited, so the event loop never waits
+    on a socket or a retry delay.
+    """
+
+    def __init__(self, vwo_client: VWOClient, max_workers: int = Constants.THREAD_POOL_MAX_WORKERS):
+        self._client = vwo_client
+        self._max_workers = max_workers
+        self._transport = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="vwo-async-transport"
+        )
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        # a forked child has none of the pool's threads, the copied pool would never run a task
+        self._transport = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="vwo-async-transport"
+        )
+
+    def get_client(self) -> VWOClient:
+        """
+        :return: The synchronous client this client delegates to.
+        """
+        return self._client
+
+    async def get_flag(self, feature_key: str, context: Dict) -> GetFlag:
+        """
+        Awaitable VWOClient.get_flag.
+
+        :param feature_key: The key of the feature to retrieve.
+        :param context: The user context, must include a valid user ID.
+        :return: The feature flag value.
+        """
+        if self._needs_transport([feature_key], context):
+            return await self._run_in_transport(self._client.get_flag, feature_key, context)
+        return self._client.get_flag(feature_key, context)
+
+    async def get_flags(self, feature_keys: List[str], context: Dict) -> Dict[str, GetFlag]:
+        """
+        Awaitable VWOClient.get_flags.
+
+        :param feature_keys: The keys of the features to retrieve.
+        :param context: The user context, must include a valid user ID.
+        :return: The feature flag values keyed by feature key.
+        """
+        if self._needs_transport(feature_keys, context):
+            return await self._run_in_transport(self._client.get_flags, feature_keys, context)
+        return self._client.get_flags(feature_keys, context)
+
+    async def get_all_flags(self, context: Dict) -> Dict[str, GetFlag]:
+        """
+        Awaitable VWOClient.get_all_flags.
+
+        :param context: The user context, must include a valid user ID.
+        :return: The values of every feature flag keyed by feature key.
+        """
+        settings = self._client._settings
+        feature_keys = [feature.get_key() for feature in settings.get_features()] if settings else []
+        if self._needs_transport(feature_keys, context):
+            return await self._run_in_transport(self._client.get_all_flags, context)
+        return self._client.get_all_flags(context)
+
+    async def track_event(
+        self, event_name: str, context: Dict, event_properties: Optional[Dict[str, Any]] = None
+    ) -> Dict:
+        """
+        Awaitable VWOClient.track_event.
+
+        :param event_name: The name of the event to track.
+        :param context: The user context, must include a valid user ID.
+        :param event_properties: The properties of the event.
+        """
+        event_properties = {} if event_properties is None else event_properties
+        if self._needs_transport([], context):
+            return await self._run_in_transport(
+                self._client.track_event, event_name, context, event_properties
+            )
+        return self._client.track_event(event_name, context, event_properties)
+
+    async def set_attribute(
+        self, key_or_map: Any, value_or_context: Any, context: Dict = None
+    ) -> None:
+        """
+        Awaitable VWOClient.set_attribute.
+
+        :param key_or_map: The attribute key, or a dictionary of attributes.
+        :param value_or_context: The attribute value, or the user context when a dictionary is passed.
+        :param context: The user context when a single attribute is passed.
+        """
+        user_context = context if isinstance(key_or_map, str) else value_or_context
+        if self._needs_transport([], user_context if isinstance(user_context, dict) else {}):
+            return await self._run_in_transport(
+                self._client.set_attribute, key_or_map, value_or_context, context
+            )
+        return self._client.set_attribute(key_or_map, value_or_context, context)
+
+    async def flush_events(self) -> bool:
+        """
+        Awaitable VWOClient.flush_events.
+        """
+        return await self._run_in_transport(self._client.flush_events)
+
+    async def update_settings(self, settings: Dict = None, is_via_webhook: bool = True) -> None:
+        """
+        Awaitable VWOClient.update_settings. Fetching the settings, when none are passed,
+        happens on the transport pool.
+
+        :param settings: The settings to apply, fetched from VWO if not passed.
+        :param is_via_webhook: Whether the settings are being updated via webhook.
+        """
+        return await self._run_in_transport(
+            self._client.update_settings, settings, is_via_webhook
+        )
+
+    async def set_alias(self, user_id_or_context: Any, alias_id: str) -> bool:
+        """
+        Awaitable VWOClient.set_alias.
+
+        :param user_id_or_context: User id or context to be aliased.
+        :param alias_id: Alias id to be set for the user id.
+        :return: True if the alias was set successfully, else False.
+        """
+        return await self._run_in_transport(self._client.set_alias, user_id_or_context, alias_id)
+
+    async def resolve_aliases(self, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Awaitable VWOClient.resolve_aliases.
+
+        :param user_ids: The user ids to resolve.
+        :return: The resolved user id of every given id.
+        """
+        return await self._run_in_transport(self._client.resolve_aliases, user_ids)
+
+    async def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Awaitable VWOClient.close. Also stops the transport pool once the calls already
+        submitted to it complete.
+
+        :param timeout: Seconds to wait for the queued network calls, None to wait until they finish.
+        :return: True if every queued network call finished within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._transport.shutdown, wait=True))
+        return await loop.run_in_executor(None, self._client.close, timeout)
+
+    def _needs_transport(self, feature_keys: List[str], context: Dict) -> bool:
+        """
+        Tells whether serving a call may block on I/O.
+
+        :param feature_keys: The features the call evaluates.
+        :param context: The user context of the call.
+        :return: True if the call has to run on the transport pool.
+        """
+        network_manager = NetworkManager.get_instance()
+        if network_manager is None or not network_manager.should_use_threading:
+            # impressions and events would be sent on the calling thread
+            return True
+        if Storage.get_instance().get_connector() is not None:
+            return True
+
+        settings_manager = SettingsManager.get_instance()
+        if settings_manager is None or not settings_manager.is_gateway_service_provided:
+            return False
+        context = context or {}
+        if self._client.options.get("is_aliasing_enabled") and context.get("id") is not None:
+            # a cached alias is resolved without a gateway request
+            alias_cache = settings_manager.alias_cache
+            if alias_cache is None or not alias_cache.contains(str(context["id"])):
+                return True
+        if (context.get("user_agent") or context.get("ip_address")) and context.get("_vwo") is None:
+            return True
+        settings = self._client._settings
+        if settings is None:
+            return False
+        for feature_key in feature_keys:
+            feature = settings.get_feature_by_key(feature_key) if isinstance(feature_key, str) else None
+            if feature is not None and feature.get_is_gateway_service_required():
+                return True
+        return False
+
+    async def _run_in_transport(self, func: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        self._bind_storage(loop)
+        return await loop.run_in_executor(self._transport, functools.partial(func, *args))
+
+    @staticmethod
+    def _bind_storage(loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Makes an async storage connector usable from the transport threads by binding it to the running loop.
+        """
+        storage = Storage.get_instance()
+        connector = storage.get_connector()
+        if isinstance(connector, AsyncStorageConnector):
+            storage.attach_connector(LoopBoundStorageConnector(connector, loop))
+        elif isinstance(connector, LoopBoundStorageConnector) and connector.loop is not loop:
+            storage.attach_connector(LoopBoundStorageConnector(connector.connector, loop))
@@ -58,10 +58,53 @@ class Constants:
     VWO_META_MEG_KEY = "_vwo_meta_meg_"
 
     THREAD_POOL_MAX_WORKERS = 5
+    THREAD_POOL_MAX_QUEUE_SIZE = 10000
+    THREAD_POOL_SHUTDOWN_TIMEOUT = 5  # seconds to drain background calls at exit
     SHOULD_USE_THREADING = True
 
     MAX_RETRIES = 3
     INITIAL_WAIT_TIME = 2
+    MAX_WAIT_TIME = 8
+    SETTINGS_RETRY_DEADLINE = 30  # seconds after the first attempt
+    EVENTS_RETRY_DEADLINE = 60
+    GATEWAY_MAX_RETRIES = 2
+    GATEWAY_INITIAL_WAIT_TIME = 0.1
+    GATEWAY_MAX_WAIT_TIME = 1
+    GATEWAY_RETRY_DEADLINE = 3
+    RETRY_BUDGET_RATIO = 0.2  # retries earned per call
+    RETRY_BUDGET_MAX_TOKENS = 10
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+    CIRCUIT_BREAKER_OPEN_DURATION = 30  # seconds
+    GATEWAY_CIRCUIT_BREAKER_OPEN_DURATION = 10
+    COMPRESSION_THRESHOLD = 1024  # bytes
+    COMPRESSION_LEVEL = 6
+
+    REGEX_CACHE_MAX_SIZE = 1000
+    USER_AGENT_CACHE_MAX_SIZE = 10000
+    GEO_IP_CACHE_MAX_SIZE = 100000
+    GEO_IP_LOCATION_CACHE_MAX_SIZE = 10000
+    UUID_CACHE_MAX_SIZE = 10000
+    UUID_NAMESPACE_CACHE_MAX_SIZE = 32
+    COHORT_BATCH_SIZE = 10000
+    BATCH_QUEUE_MAX_SIZE = 50000
+    EVENT_SPOOL_MAX_BYTES = 256 * 1024 * 1024
+    EVENT_SPOOL_MAX_AGE = 7 * 24 * 60 * 60
+    EVENT_SPOOL_SEGMENT_BYTES = 4 * 1024 * 1024
+    EVENT_SPOOL_FSYNC_INTERVAL = 1
+    EVENT_SPOOL_REPLAY_CONCURRENCY = 4
+    IMPRESSION_DEDUP_WINDOW = 3600  # seconds
+    IMPRESSION_DEDUP_MAX_KEYS = 100000
+    SHARED_SETTINGS_WAIT = 5  # seconds a process waits for the first shared snapshot
+    SHARED_SETTINGS_WAIT_STEP = 0.05
+    GATEWAY_CACHE_MAX_SIZE = 10000
+    GATEWAY_CACHE_ERROR_TTL = 30  # seconds a failed gateway lookup is not repeated
+    GATEWAY_USER_DATA_CACHE_TTL = 3600
+    GATEWAY_INLIST_CACHE_TTL = 300
+    GATEWAY_ALIAS_CACHE_TTL = 300
+    ALIAS_BATCH_SIZE = 100
+    ATTRIBUTE_LIST_REFRESH_INTERVAL = 600
+    BLOOM_FILTER_ERROR_RATE = 0.01
+
     PRODUCT_NAME = "fme"
 
     # Debugger constants
@@ -24,3 +24,4 @@ class ApiEnum(Enum):
     UPDATE_SETTINGS = "updateSettings"
     FLUSH_EVENTS = "flushEvents"
     SET_ALIAS = "setAlias"
+    RESOLVE_ALIASES = "resolveAliases"
@@ -0,0 +1,26 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import Enum
+
+
+class EndpointClassEnum(Enum):
+    """
+    Groups of VWO endpoints that share a retry policy and a circuit breaker.
+    """
+
+    SETTINGS = "settings"  # settings and webhook fetches
+    EVENTS = "events"  # impressions, track and batch events
+    GATEWAY = "gateway"  # gateway service lookups made while a decision is being taken
+    DEBUGGER = "debugger"  # log and debugger events
@@ -0,0 +1,25 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import Enum
+
+
+class OverflowPolicyEnum(Enum):
+    """
+    What a bounded queue does with a new item when it is full.
+    """
+
+    BLOCK = "block"  # wait until there is room
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued item to make room
+    DROP_NEWEST = "drop_newest"  # reject the new item
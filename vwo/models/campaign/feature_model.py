@@ -13,7 +13,7 @@
 # limitations under the License.
 
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .metric_model import MetricModel
 from .rule_model import RuleModel
 from .rule_model import RuleModel
@@ -47,6 +47,7 @@ class FeatureModel:
         self._rules_linked_campaign = rules_linked_campaign
         self._is_gateway_service_required = is_gateway_service_required
         self._is_debugger_enabled = isDebuggerEnabled
+        self._rules_by_campaign_id = None
 
     def get_id(self) -> int:
         return self._id
@@ -93,3 +94,18 @@ class FeatureModel:
     
     def set_is_debugger_enabled(self, is_debugger_enabled: bool) -> None:
         self._is_debugger_enabled = is_debugger_enabled
+
+    def build_rule_index(self) -> None:
+        """
+        Indexes the rules of the feature by campaign ID. The first rule wins when
+        several rules point to the same campaign, same as a linear scan would.
+        """
+        rules_by_campaign_id = {}
+        for rule in self._rules:
+            rules_by_campaign_id.setdefault(rule.get_campaign_id(), rule)
+        self._rules_by_campaign_id = rules_by_campaign_id
+
+    def get_rule_by_campaign_id(self, campaign_id: int) -> Optional[RuleModel]:
+        if self._rules_by_campaign_id is None:
+            self.build_rule_index()
+        return self._rules_by_campaign_id.get(campaign_id)
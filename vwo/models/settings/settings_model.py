@@ -13,9 +13,10 @@
 # limitations under the License.
 
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from ..campaign.campaign_model import CampaignModel
 from ..campaign.feature_model import FeatureModel
+from ..campaign.variation_model import VariationModel
 from ...utils.model_utils import _parse_campaign, _parse_feature
 import json
 from ...constants.Constants import Constants
@@ -34,6 +35,112 @@ class SettingsModel:
         self._collection_prefix = data.get("collectionPrefix", None)
         self._poll_interval = data.get("pollInterval", Constants.POLLING_INTERVAL)
         self._is_web_connectivity_enabled = data.get("isWebConnectivityEnabled", True)
+        self._compiled_segments = {}
+        # Lookup indexes, filled once by build_indexes before the settings are published
+        self._feature_by_key = {}
+        self._features_by_metric_identifier = {}
+        self._campaign_by_id = {}
+        self._campaign_by_key = {}
+        self._variation_by_campaign_id = {}
+        self._variation_by_campaign_key = {}
+        self._group_by_campaign = {}
+
+    def build_indexes(self) -> None:
+        """
+        Builds the lookup indexes used on the hot path (features by key, campaigns by ID
+        and key, variations by campaign, features by metric identifier and the group of
+        each campaign). Called once when settings are loaded, before the model is shared
+        between threads, so the getters only ever read them. Code that changes the
+        indexed attributes afterwards must call it again.
+        The first match wins on duplicate keys, same as a linear scan would.
+        """
+        feature_by_key = {}
+        features_by_metric_identifier = {}
+        for feature in self._features:
+            feature_by_key.setdefault(feature.get_key(), feature)
+            feature.build_rule_index()
+            for metric in feature.get_metrics():
+                features_by_metric_identifier.setdefault(
+                    metric.get_identifier(), []
+                ).append(feature)
+
+        campaign_by_id = {}
+        campaign_by_key = {}
+        variation_by_campaign_id = {}
+        variation_by_campaign_key = {}
+        for campaign in self._campaigns:
+            campaign_by_id.setdefault(campaign.get_id(), campaign)
+            campaign_by_key.setdefault(campaign.get_key(), campaign)
+            for variation in campaign.get_variations():
+                variation_by_campaign_id.setdefault(
+                    (campaign.get_id(), variation.get_id()), variation
+                )
+                variation_by_campaign_key.setdefault(
+                    (campaign.get_key(), variation.get_id()), variation
+                )
+
+        group_by_campaign = {}
+        for campaign, group_id in (self._campaign_groups or {}).items():
+            group = (self._groups or {}).get(str(group_id))
+            if group is not None:
+                group_by_campaign[campaign] = {
+                    "groupId": str(group_id),
+                    "groupName": group["name"],
+                }
+
+        self._feature_by_key = feature_by_key
+        self._features_by_metric_identifier = features_by_metric_identifier
+        self._campaign_by_id = campaign_by_id
+        self._campaign_by_key = campaign_by_key
+        self._variation_by_campaign_id = variation_by_campaign_id
+        self._variation_by_campaign_key = variation_by_campaign_key
+        self._group_by_campaign = group_by_campaign
+
+    def get_feature_by_key(self, feature_key: str) -> Optional[FeatureModel]:
+        return self._feature_by_key.get(feature_key)
+
+    def get_features_by_metric_identifier(self, identifier: str) -> List[FeatureModel]:
+        return self._features_by_metric_identifier.get(identifier, [])
+
+    def get_campaign_by_id(self, campaign_id: int) -> Optional[CampaignModel]:
+        return self._campaign_by_id.get(campaign_id)
+
+    def get_campaign_by_key(self, campaign_key: str) -> Optional[CampaignModel]:
+        return self._campaign_by_key.get(campaign_key)
+
+    def get_variation_by_campaign_id(
+        self, campaign_id: int, variation_id: int
+    ) -> Optional[VariationModel]:
+        return self._variation_by_campaign_id.get((campaign_id, variation_id))
+
+    def get_variation_by_campaign_key(
+        self, campaign_key: str, variation_id: int
+    ) -> Optional[VariationModel]:
+        return self._variation_by_campaign_key.get((campaign_key, variation_id))
+
+    def get_group_by_campaign(self, campaign: str) -> Dict:
+        """
+        :param campaign: The campaign ID, suffixed with _<variationId> for personalize rules.
+        :return: The groupId and groupName of the campaign's group, or an empty dict.
+        """
+        return self._group_by_campaign.get(campaign, {})
+
+    def set_compiled_segments(self, compiled_segments: Dict[int, Tuple[Dict, Any]]) -> None:
+        """
+        :param compiled_segments: Compiled segment trees keyed by id() of their segments DSL,
+            each entry holding the DSL itself and its tree.
+        """
+        self._compiled_segments = compiled_segments
+
+    def get_compiled_segment(self, segments: Dict) -> Optional[Any]:
+        """
+        :param segments: A segments DSL taken from a campaign or variation of these settings.
+        :return: The compiled tree of the DSL, or None if it was not compiled.
+        """
+        entry = self._compiled_segments.get(id(segments))
+        if entry is not None and entry[0] is segments:
+            return entry[1]
+        return None
 
     # Getter methods for accessing private attributes
     def get_features(self) -> List[FeatureModel]:
@@ -0,0 +1,51 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import Dict, Optional
+from .settings_model import SettingsModel
+
+
+class SettingsSnapshotModel:
+    """
+    A fully prepared settings load: the parsed model (allocations, linked campaigns and
+    indexes already built), the raw settings it came from and the validation result.
+
+    Snapshots are built off the request path and published on the client with a single
+    reference assignment. They are never modified after publishing, so an API call that
+    reads the snapshot once sees consistent settings even if a refresh lands mid-call.
+    """
+
+    __slots__ = ("_settings", "_original_settings", "_is_valid", "_version")
+
+    def __init__(self, settings: SettingsModel, original_settings: Dict, is_valid: bool):
+        object.__setattr__(self, "_settings", settings)
+        object.__setattr__(self, "_original_settings", original_settings)
+        object.__setattr__(self, "_is_valid", is_valid)
+        object.__setattr__(self, "_version", original_settings.get("version"))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshotModel is immutable")
+
+    def get_settings(self) -> SettingsModel:
+        return self._settings
+
+    def get_original_settings(self) -> Dict:
+        return self._original_settings
+
+    def get_is_valid(self) -> bool:
+        return self._is_valid
+
+    def get_version(self) -> Optional[int]:
+        return self._version
@@ -14,10 +14,19 @@
 
 
 from murmurhash import mrmr
+from typing import List, Sequence
 import math
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, bulk bucketing then hashes one key at a time
+    np = None
+
 SEED_VALUE = 1  # Seed value for the hash function
 
+_C1 = 0xCC9E2D51
+_C2 = 0x1B873593
+
 
 class DecisionMaker:
 
@@ -87,3 +96,89 @@ class DecisionMaker:
         # Ensure the hash is treated as an unsigned 32-bit integer
         hash_value = mrmr.hash(hash_key, self.seed_value)
         return hash_value & 0xFFFFFFFF  # Convert to unsigned 32-bit integer
+
+    def generate_hash_values(self, hash_keys: Sequence[str]) -> Sequence[int]:
+        """
+        Generates the hash values for many hash keys at once, vectorized with NumPy when it is installed.
+        Each value equals generate_hash_value() of the same key.
+
+        :param hash_keys: The hash keys for which the hash values are generated.
+        :return: The unsigned 32-bit hash values, as a NumPy array or a list.
+        """
+        if np is None:
+            return [mrmr.hash(hash_key, self.seed_value) & 0xFFFFFFFF for hash_key in hash_keys]
+
+        encoded_keys = [hash_key.encode("utf-8") for hash_key in hash_keys]
+        lengths = np.fromiter((len(key) for key in encoded_keys), dtype=np.int64, count=len(encoded_keys))
+        hash_values = np.empty(len(encoded_keys), dtype=np.uint32)
+        # keys of the same length are hashed together as the rows of one byte matrix
+        for length in np.unique(lengths):
+            indexes = np.flatnonzero(lengths == length)
+            data = np.frombuffer(b"".join(encoded_keys[index] for index in indexes), dtype=np.uint8)
+            hash_values[indexes] = _murmur3_32(data.reshape(len(indexes), int(length)), self.seed_value)
+        return hash_values
+
+    def generate_bucket_values(
+        self, hash_values: Sequence[int], max_value: int, multiplier: int = 1
+    ) -> List[int]:
+        """
+        Generates the bucket values for many hash values, as generate_bucket_value() does for one.
+
+        :param hash_values: The hash values used for calculation.
+        :param max_value: The maximum value for bucket scaling.
+        :param multiplier: Optional multiplier to adjust the value.
+        :return: The calculated bucket values.
+        """
+        if np is None or not isinstance(hash_values, np.ndarray):
+            return [self.generate_bucket_value(hash_value, max_value, multiplier) for hash_value in hash_values]
+
+        # same float64 operations in the same order as generate_bucket_value, so the results are identical
+        ratio = hash_values.astype(np.float64) / (2**32)
+        return np.floor((max_value * ratio + 1) * multiplier).astype(np.int64).tolist()
+
+
+def _rotl32(values, shift: int):
+    return (values << np.uint32(shift)) | (values >> np.uint32(32 - shift))
+
+
+def _murmur3_32(data, seed: int):
+    """
+    MurmurHash3 x86 32-bit over the rows of a (keys, length) uint8 matrix.
+
+    :param data: One row of bytes per key, all keys of the same length.
+    :param seed: The hash seed.
+    :return: The uint32 hash value of each row.
+    """
+    rows, length = data.shape
+    h = np.full(rows, seed, dtype=np.uint32)
+    c1 = np.uint32(_C1)
+    c2 = np.uint32(_C2)
+
+    block_count = length // 4
+    if block_count:
+        blocks = np.ascontiguousarray(data[:, : block_count * 4]).view("<u4").astype(np.uint32)
+        for index in range(block_count):
+            k = blocks[:, index] * c1
+            k = _rotl32(k, 15) * c2
+            h ^= k
+            h = _rotl32(h, 13) * np.uint32(5) + np.uint32(0xE6546B64)
+
+    tail = data[:, block_count * 4 :].astype(np.uint32)
+    remainder = length & 3
+    if remainder:
+        k = np.zeros(rows, dtype=np.uint32)
+        if remainder >= 3:
+            k ^= tail[:, 2] << np.uint32(16)
+        if remainder >= 2:
+            k ^= tail[:, 1] << np.uint32(8)
+        k ^= tail[:, 0]
+        k = _rotl32(k * c1, 15) * c2
+        h ^= k
+
+    h ^= np.uint32(length & 0xFFFFFFFF)
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> np.uint32(16)
+    return h
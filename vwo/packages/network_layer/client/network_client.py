@@ -12,23 +12,85 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import time
 import requests
+from typing import Any, Callable, Dict, Optional
 from ..models.request_model import RequestModel
 from ..models.response_model import ResponseModel
+from ..manager.background_executor import is_background_thread
+from ..manager.retry_scheduler import RetryScheduler
+from .request_compressor import RequestCompressor
+from ..retry.circuit_breaker import CircuitBreaker
+from ..retry.retry_policy import RetryBudget, RetryPolicy
 from ....constants.Constants import Constants
 from ...logger.core.log_manager import LogManager
-from ....utils.log_message_util import error_messages
+from ....utils.log_message_util import error_messages, info_messages
 from ....enums.event_enum import EventEnum
+from ....enums.endpoint_class_enum import EndpointClassEnum
 
 class NetworkClient:
     """
     NetworkClient is a class that handles the network requests for the VWO SDK.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        retry_scheduler: Optional[RetryScheduler] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        compressor: Optional[RequestCompressor] = None,
+    ):
         self.session = requests.Session()
+        self.compressor = compressor
         self.max_retries = Constants.MAX_RETRIES
         self.initial_wait_time = Constants.INITIAL_WAIT_TIME
+        self.retry_scheduler = retry_scheduler
+        self._clock = clock
+        self._sleep = sleep
+        self.retry_policies = self._create_retry_policies()
+        self.circuit_breakers = {
+            endpoint_class.value: CircuitBreaker(
+                endpoint_class.value,
+                Constants.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                Constants.GATEWAY_CIRCUIT_BREAKER_OPEN_DURATION
+                if endpoint_class == EndpointClassEnum.GATEWAY
+                else Constants.CIRCUIT_BREAKER_OPEN_DURATION,
+            )
+            for endpoint_class in EndpointClassEnum
+        }
+
+    def _create_retry_policies(self) -> Dict[str, RetryPolicy]:
+        def budget():
+            return RetryBudget(Constants.RETRY_BUDGET_RATIO, Constants.RETRY_BUDGET_MAX_TOKENS)
+
+        return {
+            # init and update_settings wait for the settings anyway, polling runs on its own timer
+            EndpointClassEnum.SETTINGS.value: RetryPolicy(
+                self.max_retries, self.initial_wait_time, Constants.MAX_WAIT_TIME,
+                Constants.SETTINGS_RETRY_DEADLINE, True, False, budget(),
+            ),
+            EndpointClassEnum.EVENTS.value: RetryPolicy(
+                self.max_retries, self.initial_wait_time, Constants.MAX_WAIT_TIME,
+                Constants.EVENTS_RETRY_DEADLINE, False, True, budget(),
+            ),
+            # a decision is waiting on the gateway, a request thread never sleeps for it
+            EndpointClassEnum.GATEWAY.value: RetryPolicy(
+                Constants.GATEWAY_MAX_RETRIES, Constants.GATEWAY_INITIAL_WAIT_TIME,
+                Constants.GATEWAY_MAX_WAIT_TIME, Constants.GATEWAY_RETRY_DEADLINE, False, False, budget(),
+            ),
+            # log and debugger events are best effort and never retried
+            EndpointClassEnum.DEBUGGER.value: RetryPolicy(0, 0, 0, 0, False, False, budget()),
+        }
+
+    def get_endpoint_class(self, request_model: RequestModel, url: str) -> str:
+        """
+        :return: The endpoint class set on the request, else the one inferred from its URL.
+        """
+        if request_model.get_endpoint_class() is not None:
+            return request_model.get_endpoint_class()
+        if EventEnum.VWO_LOG_EVENT.value in url or EventEnum.VWO_DEBUGGER_EVENT.value in url:
+            return EndpointClassEnum.DEBUGGER.value
+        return EndpointClassEnum.EVENTS.value
 
     def get(self, request_model: RequestModel) -> ResponseModel:
         """
@@ -38,130 +100,243 @@ class NetworkClient:
         :param request_model: The request model containing the URL and headers.
         :return: The response model containing the status code, headers, and data.
         """
-        response_model = ResponseModel()
-        options = request_model.get_options()
-        for attempt in range(0, self.max_retries + 1):
-            try:
-                response = self.session.get(
-                    options["url"],
-                    headers=options.get("headers"),
-                    timeout=options.get("timeout"),
-                )
-                response_model.set_status_code(response.status_code)
-                response_model.set_headers(response.headers)
+        return self._send_with_retries(request_model, self._get_once)
 
-                if response.headers.get("Content-Type", "").startswith(
-                    "application/json"
-                ):
-                    response_model.set_data(response.json())
-                else:
-                    response_model.set_data(response.text)
+    def post(self, request_model: RequestModel) -> ResponseModel:
+        """
+        Sends a POST request to the specified URL.
+
+        Args:
+            request_model: The request model containing the URL and headers.
+        :return: The response model containing the status code, headers, and data.
+        """
+        return self._send_with_retries(request_model, self._post_once)
 
-                # If the response is 400, it means the request is invalid and we should return the error
-                if response.status_code == 400:
-                    response_model.set_error(response.text)
-                    return response_model
-                if response.status_code < 200 or response.status_code >= 300:
-                    raise requests.HTTPError(f"HTTP {response.status_code} error {response.text}")
+    def _get_once(
+        self, request_model: RequestModel, options: Dict[str, Any], response_model: ResponseModel, timeout: float
+    ) -> None:
+        response = self.session.get(
+            options["url"],
+            headers=options.get("headers"),
+            timeout=timeout,
+        )
+        response_model.set_status_code(response.status_code)
+        response_model.set_headers(response.headers)
 
-                return response_model
+        # 304 means the resource has not changed since the If-None-Match tag, there is no body
+        if response.status_code == 304:
+            return
 
-            except (
-                requests.Timeout,
-                requests.ConnectionError,
-                requests.HTTPError,
-            ) as e:
-                response_model.set_error(str(e))
-                response_model.set_total_attempts(attempt)
-                url_without_query_params = options["url"].split("?")[0]
-                if attempt == self.max_retries:
-                    LogManager.get_instance().error(
-                        error_messages.get("NETWORK_CALL_RETRY_FAILED").format(
-                            endPoint=url_without_query_params, err=str(e)
-                        )
-                    )
-                    return response_model
-
-                sleep_time = self.initial_wait_time * (2 ** (attempt))
-                LogManager.get_instance().error(
-                    error_messages.get("ATTEMPTING_RETRY_FOR_FAILED_NETWORK_CALL").format(
-                        endPoint=url_without_query_params,
-                        err=str(e),
-                        delay=round(sleep_time, 2),
-                        attempt=attempt + 1,
-                        maxRetries=self.max_retries,
+        response_model.set_content(response.content)
+        # the caller already holds this exact body, hash it instead of parsing it again
+        known_content_digest = request_model.get_known_content_digest()
+        if known_content_digest is not None and response.status_code == 200:
+            content_digest = hashlib.sha256(response.content).hexdigest()
+            response_model.set_content_digest(content_digest)
+            if content_digest == known_content_digest:
+                response_model.set_is_content_unchanged(True)
+                return
+
+        self._read_response(response, response_model)
+
+    def _post_once(
+        self, request_model: RequestModel, options: Dict[str, Any], response_model: ResponseModel, timeout: float
+    ) -> None:
+        body = options.get("json")
+        compressed = None
+        # compressing is CPU work, it is left to the background sender
+        if body is not None and self.compressor is not None and is_background_thread():
+            endpoint_class = self.get_endpoint_class(request_model, options["url"])
+            compressed = self.compressor.compress(body, endpoint_class)
+
+        if compressed is None:
+            response = self.session.post(
+                options["url"],
+                json=body,
+                headers=options.get("headers"),
+                timeout=timeout,
+            )
+        else:
+            data, encoding = compressed
+            headers = dict(options.get("headers") or {})
+            headers["Content-Type"] = "application/json"
+            headers["Content-Encoding"] = encoding
+            response = self.session.post(options["url"], data=data, headers=headers, timeout=timeout)
+            if response.status_code == 415:
+                next_encoding = self.compressor.reject(
+                    endpoint_class, encoding, response.headers.get("Accept-Encoding")
+                )
+                LogManager.get_instance().info(
+                    info_messages.get("REQUEST_COMPRESSION_REJECTED").format(
+                        endPoint=options["url"].split("?")[0], encoding=encoding, nextEncoding=next_encoding or "uncompressed"
                     )
                 )
-                time.sleep(sleep_time)
-        return response_model
+                # sent again right away, the rejection is not a failure of the endpoint
+                return self._post_once(request_model, options, response_model, timeout)
+        response_model.set_status_code(response.status_code)
+        response_model.set_headers(response.headers)
+        self._read_response(response, response_model)
 
-    def post(self, request_model: RequestModel) -> ResponseModel:
+    def _read_response(self, response: requests.Response, response_model: ResponseModel) -> None:
+        if response.headers.get("Content-Type", "").startswith(
+            "application/json"
+        ):
+            response_model.set_data(response.json())
+        else:
+            response_model.set_data(response.text)
+
+        # If the response is 400, it means the request is invalid and we should return the error
+        if response.status_code == 400:
+            response_model.set_error(response.text)
+            return
+        if response.status_code < 200 or response.status_code >= 300:
+            raise requests.HTTPError(f"HTTP {response.status_code} error {response.text}")
+
+    def _send_with_retries(
+        self,
+        request_model: RequestModel,
+        send_once: Callable[[RequestModel, Dict[str, Any], ResponseModel, float], None],
+        attempt: int = 0,
+        started_at: Optional[float] = None,
+    ) -> ResponseModel:
         """
-        Sends a POST request to the specified URL.
+        Sends the request under the retry policy and circuit breaker of its endpoint class.
+        Retries sleep only where the policy allows it, otherwise they are scheduled in the
+        background or not made at all.
 
-        Args:
-            request_model: The request model containing the URL and headers.
-        :return: The response model containing the status code, headers, and data.
+        :param request_model: The request to send.
+        :param send_once: Makes one attempt, raises on a retryable failure.
+        :param attempt: Index of the first attempt, above 0 for a scheduled retry.
+        :param started_at: Monotonic time of the first attempt, for the deadline.
+        :return: The response of the last attempt.
         """
         response_model = ResponseModel()
         options = request_model.get_options()
+        url_without_query_params = options["url"].split("?")[0]
+        endpoint_class = self.get_endpoint_class(request_model, options["url"])
+        policy = self.retry_policies[endpoint_class]
+        circuit_breaker = self.circuit_breakers[endpoint_class]
+        if started_at is None:
+            started_at = self._clock()
+            policy.budget.record_call()
 
-        for attempt in range(0, self.max_retries + 1):
-            try:
-                response = self.session.post(
-                    options["url"],
-                    json=options.get("json"),
-                    headers=options.get("headers"),
-                    timeout=options.get("timeout"),
+        while True:
+            if not circuit_breaker.allow_request():
+                response_model.set_error(
+                    error_messages.get("CIRCUIT_BREAKER_OPEN").format(
+                        endpointClass=endpoint_class, endPoint=url_without_query_params
+                    )
                 )
-                response_model.set_status_code(response.status_code)
-                response_model.set_headers(response.headers)
-
-                if response.headers.get("Content-Type", "").startswith(
-                    "application/json"
-                ):
-                    response_model.set_data(response.json())
-                else:
-                    response_model.set_data(response.text)
+                response_model.set_total_attempts(attempt)
+                return response_model
 
-                # If the response is 400, it means the request is invalid and we should return the error
-                if response.status_code == 400:
-                    response_model.set_error(response.text)
-                    return response_model
+            timeout = options.get("timeout")
+            if policy.deadline and attempt > 0:
+                # a retry does not outlive the deadline waiting on a socket
+                remaining = max(0.1, policy.deadline - (self._clock() - started_at))
+                timeout = min(timeout, remaining) if timeout else remaining
 
-                if response.status_code < 200 or response.status_code >= 300:
-                    raise requests.HTTPError(f"HTTP {response.status_code} error {response.text}")
-        
+            try:
+                send_once(request_model, options, response_model, timeout)
+                circuit_breaker.record_success()
                 return response_model
-
             except (
                 requests.Timeout,
                 requests.ConnectionError,
                 requests.HTTPError,
             ) as e:
+                status_code = response_model.get_status_code()
+                # a 4xx means the endpoint is up, only outages count towards opening the breaker
+                if isinstance(e, requests.HTTPError) and status_code is not None and status_code < 500:
+                    circuit_breaker.record_success()
+                else:
+                    circuit_breaker.record_failure()
                 response_model.set_error(str(e))
                 response_model.set_total_attempts(attempt)
-                url_without_query_params = options["url"].split("?")[0]
-                if EventEnum.VWO_LOG_EVENT.value in options["url"]:
-                    return response_model
-
-                if attempt == self.max_retries:
-                    LogManager.get_instance().error(
-                        error_messages.get("NETWORK_CALL_RETRY_FAILED").format(
-                            endPoint=url_without_query_params, err=str(e)
-                        )
-                    )
-                    return response_model
-
-                sleep_time = self.initial_wait_time * (2 ** (attempt))
-                LogManager.get_instance().error(
-                    error_messages.get("ATTEMPTING_RETRY_FOR_FAILED_NETWORK_CALL").format(
-                        endPoint=url_without_query_params,
-                        err=str(e),
-                        delay=round(sleep_time, 2),
-                        attempt=attempt + 1,
-                        maxRetries=self.max_retries,
-                    )
+            except Exception:
+                # the endpoint answered but the body could not be read
+                circuit_breaker.record_success()
+                raise
+
+            if attempt >= policy.max_retries:
+                if policy.max_retries > 0:
+                    self._log_retries_exhausted(url_without_query_params, response_model)
+                return response_model
+
+            delay = policy.get_backoff_delay(attempt)
+            can_sleep = policy.blocks_caller or is_background_thread()
+            can_defer = policy.defers_retries and self.retry_scheduler is not None
+            if not can_sleep and not can_defer:
+                return response_model
+            if self._clock() - started_at + delay >= policy.deadline or not policy.budget.try_spend():
+                self._log_retries_exhausted(url_without_query_params, response_model)
+                return response_model
+
+            LogManager.get_instance().error(
+                error_messages.get("ATTEMPTING_RETRY_FOR_FAILED_NETWORK_CALL").format(
+                    endPoint=url_without_query_params,
+                    err=response_model.get_error(),
+                    delay=round(delay, 2),
+                    attempt=attempt + 1,
+                    maxRetries=policy.max_retries,
                 )
-                time.sleep(sleep_time)
+            )
+            attempt += 1
+            if can_sleep:
+                self._sleep(delay)
+                continue
+
+            next_attempt = attempt
+            is_scheduled = self.retry_scheduler.schedule(
+                delay,
+                lambda: self._send_scheduled_retry(request_model, send_once, next_attempt, started_at),
+            )
+            response_model.set_is_retry_scheduled(is_scheduled)
+            return response_model
+
+    def _send_scheduled_retry(
+        self,
+        request_model: RequestModel,
+        send_once: Callable[[RequestModel, Dict[str, Any], ResponseModel, float], None],
+        attempt: int,
+        started_at: float,
+    ) -> ResponseModel:
+        """
+        Runs a scheduled retry and reports its outcome to the request's on_retry_complete,
+        unless it was scheduled again.
+
+        :return: The response of the last attempt.
+        """
+        try:
+            response_model = self._send_with_retries(request_model, send_once, attempt, started_at)
+        except Exception as err:
+            response_model = ResponseModel()
+            response_model.set_error(str(err))
+        on_retry_complete = request_model.get_on_retry_complete()
+        if on_retry_complete is not None and not response_model.get_is_retry_scheduled():
+            on_retry_complete(response_model)
         return response_model
+
+    def _log_retries_exhausted(self, url_without_query_params: str, response_model: ResponseModel) -> None:
+        LogManager.get_instance().error(
+            error_messages.get("NETWORK_CALL_RETRY_FAILED").format(
+                endPoint=url_without_query_params, err=response_model.get_error()
+            )
+        )
+
+    def get_retry_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: Per endpoint class, the circuit breaker state and trip count and the retry
+            budget counters.
+        """
+        stats = {}
+        for endpoint_class, circuit_breaker in self.circuit_breakers.items():
+            stats[endpoint_class] = circuit_breaker.get_stats()
+            stats[endpoint_class].update(self.retry_policies[endpoint_class].budget.get_stats())
+        return stats
+
+    def get_compression_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        :return: The request compression counters, None if compression is disabled.
+        """
+        return self.compressor.get_stats() if self.compressor is not None else None
@@ -0,0 +1,139 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from requests.compat import json as complexjson
+
+from ....constants.Constants import Constants
+from ....enums.content_encoding_enum import ContentEncodingEnum
+from ....enums.endpoint_class_enum import EndpointClassEnum
+from ....utils.fork_util import register_after_fork
+
+# zlib window bits selecting the container of each encoding
+_WINDOW_BITS = {
+    ContentEncodingEnum.GZIP.value: 16 + zlib.MAX_WBITS,
+    ContentEncodingEnum.DEFLATE.value: zlib.MAX_WBITS,
+}
+
+
+class RequestCompressor:
+    """
+    Compresses JSON request bodies of the event endpoints above a size threshold.
+
+    The encoding is negotiated per endpoint class: when a server answers 415 to a compressed
+    body, the next request uses an encoding from the Accept-Encoding header of that response
+    (RFC 7694), or no compression if it lists none we support.
+
+    :param encoding: The ContentEncodingEnum value to start with.
+    :param threshold: Bodies smaller than this many bytes are sent as they are.
+    :param level: zlib compression level, 1 (fastest) to 9 (smallest).
+    """
+
+    def __init__(
+        self,
+        encoding: str = ContentEncodingEnum.GZIP.value,
+        threshold: int = Constants.COMPRESSION_THRESHOLD,
+        level: int = Constants.COMPRESSION_LEVEL,
+    ):
+        self.threshold = threshold
+        self.level = level
+        self._lock = threading.Lock()
+        # settings and gateway requests are small, or go to servers we do not control
+        self._encodings: Dict[str, Optional[str]] = {
+            EndpointClassEnum.EVENTS.value: encoding,
+            EndpointClassEnum.DEBUGGER.value: encoding,
+        }
+        self._rejected: Dict[str, set] = {}
+        self._compressed = 0
+        self._uncompressed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._rejections = 0
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def get_encoding(self, endpoint_class: str) -> Optional[str]:
+        """
+        :return: The encoding currently used for the endpoint class, None for no compression.
+        """
+        with self._lock:
+            return self._encodings.get(endpoint_class)
+
+    def compress(self, body: Any, endpoint_class: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Serializes and compresses a request body.
+
+        :param body: The JSON body of the request.
+        :param endpoint_class: The EndpointClassEnum value of the request.
+        :return: The compressed body and its encoding, or None if the body is to be sent as JSON.
+        """
+        encoding = self.get_encoding(endpoint_class)
+        if encoding is None:
+            return None
+        data = complexjson.dumps(body, allow_nan=False).encode("utf-8")
+        if len(data) < self.threshold:
+            with self._lock:
+                self._uncompressed += 1
+            return None
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, _WINDOW_BITS[encoding])
+        compressed = compressor.compress(data) + compressor.flush()
+        with self._lock:
+            self._compressed += 1
+            self._bytes_in += len(data)
+            self._bytes_out += len(compressed)
+        return compressed, encoding
+
+    def reject(self, endpoint_class: str, encoding: str, accept_encoding: Optional[str]) -> Optional[str]:
+        """
+        Records a 415 response to a body compressed with `encoding`.
+
+        :param endpoint_class: The EndpointClassEnum value of the request.
+        :param encoding: The encoding the server rejected.
+        :param accept_encoding: The Accept-Encoding header of the response, if any.
+        :return: The encoding to use from now on, None for no compression.
+        """
+        accepted = [
+            value.split(";")[0].strip().lower()
+            for value in (accept_encoding or "").split(",")
+        ]
+        with self._lock:
+            self._rejections += 1
+            # an encoding is never tried twice, so negotiation always ends
+            rejected = self._rejected.setdefault(endpoint_class, set())
+            rejected.add(encoding)
+            next_encoding = next(
+                (value for value in accepted if value in _WINDOW_BITS and value not in rejected), None
+            )
+            self._encodings[endpoint_class] = next_encoding
+        return next_encoding
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: Compressed and uncompressed (under the threshold) request counts, bytes
+            before and after compression, 415 rejections and the encoding per endpoint class.
+        """
+        with self._lock:
+            return {
+                "compressed": self._compressed,
+                "uncompressed": self._uncompressed,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "rejections": self._rejections,
+                "encodings": dict(self._encodings),
+            }
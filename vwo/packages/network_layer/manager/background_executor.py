@@ -0,0 +1,185 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from ....enums.overflow_policy_enum import OverflowPolicyEnum
+
+_worker_state = threading.local()
+
+
+def is_background_thread() -> bool:
+    """
+    :return: True when called from a background executor worker rather than a request thread.
+    """
+    return getattr(_worker_state, "is_background", False)
+
+
+class BackgroundExecutor:
+    """
+    Long-lived worker pool for the SDK's background network calls (impressions, debug events,
+    batch flushes). Workers are started lazily, up to max_workers, and pull from one bounded
+    queue. When the queue is full the overflow policy decides whether submit blocks, evicts the
+    oldest task or rejects the new one.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        overflow_policy: str = OverflowPolicyEnum.BLOCK.value,
+        thread_name_prefix: str = "vwo-background",
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.overflow_policy = overflow_policy
+        self.thread_name_prefix = thread_name_prefix
+        self._queue = deque()
+        self._workers = []
+        self._idle_workers = 0
+        self._is_shutdown = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_queue_depth = 0
+
+    def submit(self, func: Callable[[], None]) -> bool:
+        """
+        Queues a task for a background worker. Under the block policy a worker submitting into
+        a full queue runs the task itself instead of waiting, as only the workers drain the queue.
+
+        :param func: The task to run.
+        :return: True if the task was queued or run, False if it was rejected.
+        """
+        with self._lock:
+            if self._is_shutdown:
+                self._rejected += 1
+                return False
+
+            is_inline = False
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow_policy == OverflowPolicyEnum.DROP_NEWEST.value:
+                    self._rejected += 1
+                    return False
+                if self.overflow_policy == OverflowPolicyEnum.DROP_OLDEST.value:
+                    self._queue.popleft()
+                    self._rejected += 1
+                elif is_background_thread():
+                    is_inline = True
+                else:
+                    while len(self._queue) >= self.max_queue_size and not self._is_shutdown:
+                        self._not_full.wait()
+                    if self._is_shutdown:
+                        self._rejected += 1
+                        return False
+
+            self._submitted += 1
+            if not is_inline:
+                self._queue.append(func)
+                self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+                # start another worker only when the idle ones cannot take the queued tasks
+                if len(self._queue) > self._idle_workers and len(self._workers) < self.max_workers:
+                    self._start_worker()
+                self._not_empty.notify()
+                return True
+
+        self._run(func)
+        return True
+
+    def _start_worker(self) -> None:
+        worker = threading.Thread(
+            target=self._work,
+            name=f"{self.thread_name_prefix}-{len(self._workers)}",
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _work(self) -> None:
+        _worker_state.is_background = True
+        while True:
+            with self._lock:
+                while not self._queue and not self._is_shutdown:
+                    self._idle_workers += 1
+                    self._not_empty.wait()
+                    self._idle_workers -= 1
+                if not self._queue:
+                    # shut down and drained
+                    return
+                func = self._queue.popleft()
+                self._not_full.notify()
+
+            self._run(func)
+
+    def _run(self, func: Callable[[], None]) -> None:
+        try:
+            func()
+            is_failed = False
+        except Exception:
+            # tasks log their own errors, a failing task must not take a worker down
+            is_failed = True
+
+        with self._lock:
+            if is_failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops accepting tasks and waits for the queued ones to finish.
+
+        :param timeout: Seconds to wait for the queue to drain, None to wait until it does.
+        :return: True if every queued task finished within the timeout.
+        """
+        with self._lock:
+            self._is_shutdown = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            workers = list(self._workers)
+
+        # a task calling shutdown cannot wait for its own worker
+        workers = [worker for worker in workers if worker is not threading.current_thread()]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+        with self._lock:
+            return not self._queue and not any(worker.is_alive() for worker in workers)
+
+    def is_shutdown(self) -> bool:
+        return self._is_shutdown
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: The queue depth, the highest depth seen, the number of started workers and the
+            submitted, completed, failed and rejected task counters.
+        """
+        with self._lock:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "workers": len(self._workers),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
@@ -18,17 +18,25 @@ from ..models.request_model import RequestModel
 from ..models.response_model import ResponseModel
 from ..handlers.request_handler import RequestHandler
 from ..client.network_client import NetworkClient
+from ..client.request_compressor import RequestCompressor
+from .background_executor import BackgroundExecutor
+from .retry_scheduler import RetryScheduler
 from ...logger.core.log_manager import LogManager
 from ....utils.log_message_util import error_messages
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Dict, Any
+from ....enums.overflow_policy_enum import OverflowPolicyEnum
+from ....enums.content_encoding_enum import ContentEncodingEnum
+from typing import Callable, Dict, Any, Optional
 from ....constants.Constants import Constants
+from ....utils.fork_util import register_after_fork
+import atexit
+from threading import Lock
 
 
 class NetworkManager:
     _instance = None
 
     def __init__(self, threading: Dict[str, Any] = None):
+        threading = threading or {}
         self.client = None
         self.config = None
         self.should_use_threading = threading.get(
@@ -37,6 +45,49 @@ class NetworkManager:
         self.thread_pool_max_workers = threading.get(
             "max_workers", Constants.THREAD_POOL_MAX_WORKERS
         )
+        self.thread_pool_max_queue_size = threading.get(
+            "max_queue_size", Constants.THREAD_POOL_MAX_QUEUE_SIZE
+        )
+        if not isinstance(self.thread_pool_max_queue_size, int) or self.thread_pool_max_queue_size < 1:
+            LogManager.get_instance().error(
+                error_messages.get("INVALID_THREADING_CONFIGURATION").format(
+                    key="max_queue_size",
+                    correctType="int >= 1",
+                    defaultValue=Constants.THREAD_POOL_MAX_QUEUE_SIZE,
+                )
+            )
+            self.thread_pool_max_queue_size = Constants.THREAD_POOL_MAX_QUEUE_SIZE
+        self.thread_pool_overflow_policy = threading.get(
+            "overflow_policy", OverflowPolicyEnum.BLOCK.value
+        )
+        if self.thread_pool_overflow_policy not in [policy.value for policy in OverflowPolicyEnum]:
+            LogManager.get_instance().error(
+                error_messages.get("INVALID_THREADING_CONFIGURATION").format(
+                    key="overflow_policy",
+                    correctType=" | ".join(policy.value for policy in OverflowPolicyEnum),
+                    defaultValue=OverflowPolicyEnum.BLOCK.value,
+                )
+            )
+            self.thread_pool_overflow_policy = OverflowPolicyEnum.BLOCK.value
+        # shared by every background call, started on first use
+        self.executor: Optional[BackgroundExecutor] = None
+        self.executor_lock = Lock()
+        # retries that must not sleep on a request thread wait here, then run on the executor
+        self.retry_scheduler = RetryScheduler(self.execute_in_background)
+        self.is_exit_hook_registered = False
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Gives a forked child its own executor, retry scheduler and HTTP session. The parent's
+        queued calls and pending retries stay with the parent, and a pooled connection is
+        never shared between processes.
+        """
+        self.executor_lock = Lock()
+        self.executor = None
+        self.retry_scheduler = RetryScheduler(self.execute_in_background)
+        if self.client is not None:
+            self.client = NetworkClient(self.retry_scheduler, compressor=self.client.compressor)
 
     def set_config(self, config: GlobalRequestModel):
         self.config = config
@@ -44,10 +95,53 @@ class NetworkManager:
     def get_config(self) -> GlobalRequestModel:
         return self.config
 
-    def attach_client(self):
-        self.client = NetworkClient()
+    def attach_client(self, compression: Any = None):
+        """
+        :param compression: The compression option: False to send event bodies uncompressed,
+            or a dict that may set "encoding", "threshold" and "level".
+        """
+        # a client initialized after close() gets a fresh executor and retry scheduler
+        with self.executor_lock:
+            if self.executor is not None and self.executor.is_shutdown():
+                self.executor = None
+            if self.retry_scheduler.is_shutdown():
+                self.retry_scheduler = RetryScheduler(self.execute_in_background)
+        self.client = NetworkClient(self.retry_scheduler, compressor=self._create_compressor(compression))
         self.config = GlobalRequestModel()
 
+    @staticmethod
+    def _create_compressor(compression: Any) -> Optional[RequestCompressor]:
+        if compression is False:
+            return None
+        compression = compression if isinstance(compression, dict) else {}
+        encoding = compression.get("encoding", ContentEncodingEnum.GZIP.value)
+        if encoding not in [value.value for value in ContentEncodingEnum]:
+            LogManager.get_instance().error(
+                error_messages.get("INVALID_COMPRESSION_CONFIGURATION").format(
+                    key="encoding",
+                    correctType=" | ".join(value.value for value in ContentEncodingEnum),
+                    defaultValue=ContentEncodingEnum.GZIP.value,
+                )
+            )
+            encoding = ContentEncodingEnum.GZIP.value
+        threshold = compression.get("threshold", Constants.COMPRESSION_THRESHOLD)
+        if isinstance(threshold, bool) or not isinstance(threshold, int) or threshold < 0:
+            LogManager.get_instance().error(
+                error_messages.get("INVALID_COMPRESSION_CONFIGURATION").format(
+                    key="threshold", correctType="int >= 0", defaultValue=Constants.COMPRESSION_THRESHOLD
+                )
+            )
+            threshold = Constants.COMPRESSION_THRESHOLD
+        level = compression.get("level", Constants.COMPRESSION_LEVEL)
+        if isinstance(level, bool) or not isinstance(level, int) or not 1 <= level <= 9:
+            LogManager.get_instance().error(
+                error_messages.get("INVALID_COMPRESSION_CONFIGURATION").format(
+                    key="level", correctType="int from 1 to 9", defaultValue=Constants.COMPRESSION_LEVEL
+                )
+            )
+            level = Constants.COMPRESSION_LEVEL
+        return RequestCompressor(encoding, threshold, level)
+
     @classmethod
     def get_instance(cls, threading: Dict[str, Any] = None) -> "NetworkManager":
         if cls._instance is None:
@@ -73,7 +167,72 @@ class NetworkManager:
             return response
         return self.client.post(request_model)
 
-        # Generic function to handle background task execution with ThreadPoolExecutor
-    def execute_in_background(self, func: Callable):
-        executor = ThreadPoolExecutor(max_workers=self.thread_pool_max_workers)
-        executor.submit(func)
\ No newline at end of file
+    def get_executor(self) -> BackgroundExecutor:
+        """
+        Returns the shared background executor, creating it on first use.
+        """
+        if self.executor is None:
+            with self.executor_lock:
+                if self.executor is None:
+                    self.executor = BackgroundExecutor(
+                        self.thread_pool_max_workers,
+                        self.thread_pool_max_queue_size,
+                        self.thread_pool_overflow_policy,
+                    )
+                    # give queued events a chance to be sent before the process exits
+                    if not self.is_exit_hook_registered:
+                        atexit.register(self._shutdown_at_exit)
+                        self.is_exit_hook_registered = True
+        return self.executor
+
+    def _shutdown_at_exit(self) -> None:
+        # the current executor, a forked child must not wait on the parent's queue
+        executor = self.executor
+        if executor is not None:
+            executor.shutdown(Constants.THREAD_POOL_SHUTDOWN_TIMEOUT)
+
+    def execute_in_background(self, func: Callable) -> bool:
+        """
+        Runs the function on the shared background executor.
+
+        :param func: The task to run.
+        :return: True if the task was queued, False if the overflow policy or a shutdown rejected it.
+        """
+        return self.get_executor().submit(func)
+
+    def get_background_stats(self) -> Dict[str, int]:
+        """
+        :return: Queue depth and task counters of the background executor.
+        """
+        return self.get_executor().get_stats()
+
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """
+        :return: Circuit breaker state, trip count and retry budget counters per endpoint class,
+            plus the pending retries under "scheduler".
+        """
+        stats = self.client.get_retry_stats() if self.client is not None else {}
+        stats["scheduler"] = self.retry_scheduler.get_stats()
+        return stats
+
+    def get_compression_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        :return: Compressed request counts, bytes before and after compression and the
+            negotiated encoding per endpoint class, None if compression is disabled.
+        """
+        return self.client.get_compression_stats() if self.client is not None else None
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stops the background executor after the queued calls finish. Scheduled retries are
+        handed to the executor first so they get one more attempt.
+
+        :param timeout: Seconds to wait for the queue to drain, None to wait until it does.
+        :return: True if every queued call finished within the timeout.
+        """
+        self.retry_scheduler.shutdown()
+        with self.executor_lock:
+            executor = self.executor
+        if executor is None:
+            return True
+        return executor.shutdown(timeout)
\ No newline at end of file
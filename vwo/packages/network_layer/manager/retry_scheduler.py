@@ -0,0 +1,107 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class RetryScheduler:
+    """
+    Holds retries that must not sleep on the thread that made the call. One daemon thread waits
+    for the earliest due retry and hands it to `submit`, normally the shared background
+    executor, so a pending retry costs a heap entry instead of a sleeping thread.
+    """
+
+    def __init__(self, submit: Callable[[Callable[[], None]], bool]):
+        self._submit = submit
+        self._heap = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._is_shutdown = False
+        self._scheduled = 0
+        self._dispatched = 0
+
+    def schedule(self, delay: float, func: Callable[[], None]) -> bool:
+        """
+        Runs the function on the background executor after the delay.
+
+        :param delay: Seconds to wait.
+        :param func: The retry to run.
+        :return: False if the scheduler is shut down.
+        """
+        with self._lock:
+            if self._is_shutdown:
+                return False
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), func))
+            self._scheduled += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="vwo-retry-scheduler", daemon=True
+                )
+                self._thread.start()
+            self._has_work.notify()
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._is_shutdown:
+                    if self._heap:
+                        wait_time = self._heap[0][0] - time.monotonic()
+                        if wait_time <= 0:
+                            break
+                        self._has_work.wait(wait_time)
+                    else:
+                        self._has_work.wait()
+                if self._is_shutdown:
+                    return
+                _, _, func = heapq.heappop(self._heap)
+                self._dispatched += 1
+            self._submit(func)
+
+    def shutdown(self) -> int:
+        """
+        Stops the scheduler and hands every pending retry to the executor right away, so a
+        shutdown that drains the executor still gets one more attempt at them.
+
+        :return: The number of retries handed over early.
+        """
+        with self._lock:
+            self._is_shutdown = True
+            pending = [func for _, _, func in sorted(self._heap)]
+            self._heap = []
+            self._dispatched += len(pending)
+            self._has_work.notify_all()
+        for func in pending:
+            self._submit(func)
+        return len(pending)
+
+    def is_shutdown(self) -> bool:
+        return self._is_shutdown
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: The number of pending retries and the scheduled and dispatched counters.
+        """
+        with self._lock:
+            return {
+                "pending": len(self._heap),
+                "scheduled": self._scheduled,
+                "dispatched": self._dispatched,
+            }
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 
 
 class RequestModel:
@@ -39,6 +39,12 @@ class RequestModel:
         self.port = port
         self.timeout = timeout / 1000  # Convert milliseconds to seconds
         self.last_error = None
+        # sha256 of a body the caller already holds; a GET returning the same body is not parsed
+        self.known_content_digest = None
+        # EndpointClassEnum value picking the retry policy and circuit breaker, inferred when None
+        self.endpoint_class = None
+        # called with the response of the last attempt once a retry scheduled in the background ends
+        self.on_retry_complete = None
 
     def get_method(self) -> str:
         return self.method
@@ -106,6 +112,24 @@ class RequestModel:
     def get_last_error(self) -> str:
         return self.last_error
 
+    def set_known_content_digest(self, known_content_digest: Optional[str]):
+        self.known_content_digest = known_content_digest
+
+    def get_known_content_digest(self) -> Optional[str]:
+        return self.known_content_digest
+
+    def set_endpoint_class(self, endpoint_class: Optional[str]):
+        self.endpoint_class = endpoint_class
+
+    def get_endpoint_class(self) -> Optional[str]:
+        return self.endpoint_class
+
+    def set_on_retry_complete(self, on_retry_complete: Optional[Callable[[Any], None]]):
+        self.on_retry_complete = on_retry_complete
+
+    def get_on_retry_complete(self) -> Optional[Callable[[Any], None]]:
+        return self.on_retry_complete
+
     def get_options(self) -> Dict[str, Any]:
         query_params = "&".join([f"{key}={value}" for key, value in self.query.items()])
         options = {
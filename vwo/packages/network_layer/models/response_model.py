@@ -21,8 +21,13 @@ class ResponseModel:
         self.status_code = None
         self.headers = {}
         self.data = None
+        self.content = None
+        self.content_digest = None
+        self.is_content_unchanged = False
         self.error = None
         self.total_attempts = 0
+        # the call failed but a retry was scheduled to run in the background
+        self.is_retry_scheduled = False
 
     def set_status_code(self, status_code: int):
         self.status_code = status_code
@@ -42,6 +47,24 @@ class ResponseModel:
     def get_data(self) -> Any:
         return self.data
 
+    def set_content(self, content: Optional[bytes]):
+        self.content = content
+
+    def get_content(self) -> Optional[bytes]:
+        return self.content
+
+    def set_content_digest(self, content_digest: Optional[str]):
+        self.content_digest = content_digest
+
+    def get_content_digest(self) -> Optional[str]:
+        return self.content_digest
+
+    def set_is_content_unchanged(self, is_content_unchanged: bool):
+        self.is_content_unchanged = is_content_unchanged
+
+    def get_is_content_unchanged(self) -> bool:
+        return self.is_content_unchanged
+
     def set_error(self, error: Any):
         self.error = error
 
@@ -52,4 +75,10 @@ class ResponseModel:
         self.total_attempts = total_attempts
 
     def get_total_attempts(self) -> int:
-        return self.total_attempts
\ No newline at end of file
+        return self.total_attempts
+
+    def set_is_retry_scheduled(self, is_retry_scheduled: bool):
+        self.is_retry_scheduled = is_retry_scheduled
+
+    def get_is_retry_scheduled(self) -> bool:
+        return self.is_retry_scheduled
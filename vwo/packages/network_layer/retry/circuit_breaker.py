@@ -0,0 +1,120 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from ....enums.circuit_breaker_state_enum import CircuitBreakerStateEnum
+from ...logger.core.log_manager import LogManager
+from ....utils.log_message_util import error_messages, info_messages
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an endpoint class after `failure_threshold` consecutive failures. While open
+    every call fails fast; after `open_duration` seconds one probe call is let through and its
+    outcome closes the breaker or opens it again.
+    """
+
+    def __init__(
+        self,
+        endpoint_class: str,
+        failure_threshold: int,
+        open_duration: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoint_class = endpoint_class
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_duration = open_duration
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitBreakerStateEnum.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._is_probe_in_flight = False
+        self._trips = 0
+        self._short_circuited = 0
+
+    def allow_request(self) -> bool:
+        """
+        :return: True if the call may be made, False if it has to fail fast.
+        """
+        with self._lock:
+            if (
+                self._state == CircuitBreakerStateEnum.OPEN
+                and self._clock() - self._opened_at >= self.open_duration
+            ):
+                self._state = CircuitBreakerStateEnum.HALF_OPEN
+                self._is_probe_in_flight = False
+
+            if self._state == CircuitBreakerStateEnum.CLOSED:
+                return True
+            if self._state == CircuitBreakerStateEnum.HALF_OPEN and not self._is_probe_in_flight:
+                self._is_probe_in_flight = True
+                return True
+
+            self._short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            was_closed = self._state == CircuitBreakerStateEnum.CLOSED
+            self._state = CircuitBreakerStateEnum.CLOSED
+            self._consecutive_failures = 0
+            self._is_probe_in_flight = False
+
+        if not was_closed:
+            LogManager.get_instance().info(
+                info_messages.get("CIRCUIT_BREAKER_CLOSED").format(endpointClass=self.endpoint_class)
+            )
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            is_tripped = self._state == CircuitBreakerStateEnum.HALF_OPEN or (
+                self._state == CircuitBreakerStateEnum.CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            )
+            if is_tripped:
+                self._state = CircuitBreakerStateEnum.OPEN
+                self._opened_at = self._clock()
+                self._is_probe_in_flight = False
+                self._trips += 1
+            failures = self._consecutive_failures
+
+        if is_tripped:
+            LogManager.get_instance().error(
+                error_messages.get("CIRCUIT_BREAKER_OPENED").format(
+                    endpointClass=self.endpoint_class,
+                    failures=failures,
+                    duration=self.open_duration,
+                )
+            )
+
+    def get_state(self) -> str:
+        with self._lock:
+            return self._state.value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: The breaker state, how often it tripped and how many calls it failed fast.
+        """
+        with self._lock:
+            return {
+                "state": self._state.value,
+                "trips": self._trips,
+                "consecutive_failures": self._consecutive_failures,
+                "short_circuited": self._short_circuited,
+            }
@@ -0,0 +1,101 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import threading
+from typing import Dict
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a share of the calls made. Every call adds `ratio` tokens
+    up to `max_tokens` and every retry spends one, so a failing endpoint cannot be hit with
+    max_retries times its normal traffic.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._exhausted = 0
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        :return: True if a retry may be made, False if the budget is used up.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                self._exhausted += 1
+                return False
+            self._tokens -= 1
+            self._retries += 1
+            return True
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "retries": self._retries,
+                "budget_exhausted": self._exhausted,
+                "budget_tokens": round(self._tokens, 2),
+            }
+
+
+class RetryPolicy:
+    """
+    How calls of one endpoint class are retried.
+
+    :param max_retries: Retries after the first attempt.
+    :param base_delay: Backoff cap of the first retry in seconds, doubled on every retry.
+    :param max_delay: Upper bound of the backoff cap in seconds.
+    :param deadline: Seconds after the first attempt beyond which no retry is started.
+    :param blocks_caller: Whether a retry may sleep on the thread that made the call. When it
+        may not, the retry is handed to the retry scheduler if `defers_retries` is set and is
+        dropped otherwise. Background workers always retry in place.
+    :param defers_retries: Whether retries that cannot sleep on the caller are scheduled.
+    :param budget: Retry budget shared by the calls of the class.
+    """
+
+    def __init__(
+        self,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+        deadline: float,
+        blocks_caller: bool,
+        defers_retries: bool,
+        budget: RetryBudget,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.blocks_caller = blocks_caller
+        self.defers_retries = defers_retries
+        self.budget = budget
+
+    def get_backoff_delay(self, attempt: int) -> float:
+        """
+        Full jitter backoff: a uniform delay between 0 and the exponential cap, so clients
+        that failed together do not retry together.
+
+        :param attempt: Zero based index of the attempt that failed.
+        :return: Seconds to wait before the next attempt.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
@@ -13,22 +13,32 @@
 # limitations under the License.
 
 
-from ....enums.url_enum import UrlEnum
+import contextvars
+
 from ....models.user.context_vwo_model import ContextVWOModel
 from ....packages.logger.core.log_manager import LogManager
 from ....services.settings_manager import SettingsManager
 from ...segmentation_evaluator.evaluators.segment_evaluator import SegmentEvaluator
+from ...segmentation_evaluator.utils.user_agent_parser import UserAgentParser
+from ...segmentation_evaluator.utils.geo_ip_resolver import MmapGeoIpResolver
 from ....models.settings.settings_model import SettingsModel
 from ....models.campaign.feature_model import FeatureModel
 from ....models.user.context_model import ContextModel
-from ....utils.gateway_service_util import get_query_params, get_from_gateway_service
+from ....utils.gateway_service_util import get_user_data_from_gateway_service
 from ....constants.Constants import Constants
 from ....enums.api_enum import ApiEnum
+from ....utils.log_message_util import error_messages
+
+# Evaluator of the API call being served. Every thread and every asyncio task sees its own value,
+# so concurrent calls never evaluate segments against another user's context.
+_request_evaluator = contextvars.ContextVar("vwo_request_evaluator", default=None)
 
 
 class SegmentationManager:
     _instance = None  # Singleton instance of SegmentationManager
-    evaluator = None  # Holds the instance of SegmentEvaluator
+    _evaluator = None  # Evaluator attached at init, used when no API call has set its own
+    _user_agent_parser = None  # In-process user agent parser, None to ask the gateway
+    _geo_ip_resolver = None  # In-process IP to location resolver, None to ask the gateway
 
     def __new__(cls):
         """
@@ -49,6 +59,14 @@ class SegmentationManager:
             SegmentationManager._instance = SegmentationManager()
         return SegmentationManager._instance
 
+    @property
+    def evaluator(self):
+        """
+        The evaluator of the current API call, or the attached one outside of an API call.
+        """
+        evaluator = _request_evaluator.get()
+        return evaluator if evaluator is not None else self._evaluator
+
     def attach_evaluator(self, evaluator=None):
         """
         Attaches an evaluator to the manager, or creates a new one if none is provided.
@@ -56,9 +74,67 @@ class SegmentationManager:
         :param evaluator: Optional evaluator to attach.
         """
         if evaluator:
-            self.evaluator = evaluator
+            self._evaluator = evaluator
         else:
-            self.evaluator = SegmentEvaluator()
+            self._evaluator = SegmentEvaluator()
+
+    def attach_user_agent_parser(self, user_agent_parser_option=None):
+        """
+        Attaches the in-process user agent parser set by the user_agent_parser option: True or a
+        dict with "max_size" selects the built-in parser, an object with a parse(user_agent)
+        method is used as is, anything else keeps user agent lookups on the gateway.
+
+        :param user_agent_parser_option: The user_agent_parser value passed in options.
+        """
+        if user_agent_parser_option is True:
+            self._user_agent_parser = UserAgentParser()
+        elif isinstance(user_agent_parser_option, dict):
+            self._user_agent_parser = UserAgentParser(
+                user_agent_parser_option.get("max_size", Constants.USER_AGENT_CACHE_MAX_SIZE)
+            )
+        elif callable(getattr(user_agent_parser_option, "parse", None)):
+            self._user_agent_parser = user_agent_parser_option
+        else:
+            self._user_agent_parser = None
+
+    def attach_geo_ip_resolver(self, geo_ip_resolver_option=None):
+        """
+        Attaches the in-process GeoIP resolver set by the geo_ip_resolver option: the path of a
+        database file, or a dict with "path" and "max_size", selects the built-in mmap resolver,
+        an object with a resolve(ip_address) method is used as is, anything else keeps location
+        lookups on the gateway.
+
+        :param geo_ip_resolver_option: The geo_ip_resolver value passed in options.
+        """
+        if callable(getattr(geo_ip_resolver_option, "resolve", None)):
+            self._geo_ip_resolver = geo_ip_resolver_option
+            return
+
+        self._geo_ip_resolver = None
+        if isinstance(geo_ip_resolver_option, str):
+            geo_ip_resolver_option = {"path": geo_ip_resolver_option}
+        if not isinstance(geo_ip_resolver_option, dict) or not geo_ip_resolver_option.get("path"):
+            return
+        try:
+            self._geo_ip_resolver = MmapGeoIpResolver(
+                geo_ip_resolver_option["path"],
+                geo_ip_resolver_option.get("max_size", Constants.GEO_IP_CACHE_MAX_SIZE),
+            )
+        except Exception as err:
+            LogManager.get_instance().error(
+                error_messages.get("ERROR_LOADING_GEO_IP_DATABASE").format(
+                    path=geo_ip_resolver_option["path"], err=str(err)
+                )
+            )
+
+    def use_evaluator(self, evaluator):
+        """
+        Makes the evaluator the one used by validate_segmentation for the current thread or
+        asyncio task only, leaving concurrent API calls untouched.
+
+        :param evaluator: The evaluator holding the settings, feature and context of the call.
+        """
+        _request_evaluator.set(evaluator)
 
     def set_contextual_data(
         self, settings: SettingsModel, feature: FeatureModel, context: ContextModel
@@ -70,46 +146,62 @@ class SegmentationManager:
         :param feature: The feature data including segmentation needs.
         :param context: The context data for the evaluation.
         """
-        self.attach_evaluator()  # Ensure a fresh evaluator instance
-        self.evaluator.settings = settings  # Set settings in evaluator
-        self.evaluator.context = context  # Set context in evaluator
-        self.evaluator.feature = feature  # Set feature in evaluator
+        evaluator = SegmentEvaluator()  # Fresh evaluator for this API call only
+        evaluator.settings = settings  # Set settings in evaluator
+        evaluator.context = context  # Set context in evaluator
+        evaluator.feature = feature  # Set feature in evaluator
+        self.use_evaluator(evaluator)
 
         # if both user agent and ip address is none or empty then return
         if not context.get_user_agent() and not context.get_ip_address():
             return
+        if context.get_vwo() is not None:
+            return
 
-        # Call gateway service if required for segmentation OR if gateway service is provided and user agent is available
-        should_call_gateway_service = (
-            (feature.get_is_gateway_service_required() and Constants.HOST_NAME not in SettingsManager.get_instance().hostname) or
-            (Constants.HOST_NAME not in SettingsManager.get_instance().hostname and 
-             (context.get_user_agent() or context.get_ip_address()))
-        )
-        
-        if should_call_gateway_service and context.get_vwo() is None:
-            query_params = {}
-            if not context.get_user_agent() and not context.get_ip_address():
-                return
-                
-            if context.get_user_agent():
-                query_params["userAgent"] = context.get_user_agent()
-
-            if context.get_ip_address():
-                query_params["ipAddress"] = context.get_ip_address()
-
-            try:
-                params = get_query_params(query_params)
-                _vwo = get_from_gateway_service(params, UrlEnum.GET_USER_DATA.value, context)
-                context.set_vwo(ContextVWOModel(_vwo))
-            except Exception as err:
-                LogManager.get_instance().error_log("ERROR_SETTING_SEGMENTATION_CONTEXT",data={"err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value, "uuid": context.get_vwo_uuid(), "sId": context.get_session_id()})
+        user_agent = context.get_user_agent()
+        ip_address = context.get_ip_address()
+        user_data = {}
+        try:
+            if user_agent and self._user_agent_parser is not None:
+                # parsed in process, the gateway is only asked for what is left
+                user_data["userAgent"] = self._user_agent_parser.parse(user_agent)
+                user_agent = None
+            if ip_address and self._geo_ip_resolver is not None:
+                # an address missing from the database has no location, the gateway is not asked
+                user_data["location"] = self._geo_ip_resolver.resolve(ip_address) or {}
+                ip_address = None
+
+            # Call gateway service if it is provided and user agent or ip address is still unresolved
+            should_call_gateway_service = Constants.HOST_NAME not in SettingsManager.get_instance().hostname and (
+                user_agent or ip_address
+            )
+            if should_call_gateway_service:
+                _vwo = get_user_data_from_gateway_service(user_agent, ip_address, context)
+                if not user_data:
+                    context.set_vwo(ContextVWOModel(_vwo))
+                    return
+                if isinstance(_vwo, dict):
+                    user_data = dict(_vwo, **user_data)
+
+            if user_data:
+                context.set_vwo(ContextVWOModel(user_data))
+        except Exception as err:
+            LogManager.get_instance().error_log("ERROR_SETTING_SEGMENTATION_CONTEXT",data={"err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value, "uuid": context.get_vwo_uuid(), "sId": context.get_session_id()})
 
     def validate_segmentation(self, dsl, properties):
         """
         Validates the segmentation against provided DSL and properties.
+        Segments compiled when the settings were loaded are evaluated as predicate trees,
+        anything else goes through the evaluator.
 
         :param dsl: The segmentation DSL.
         :param properties: The properties to validate against.
         :return: True if segmentation is valid, otherwise False.
         """
-        return self.evaluator.is_segmentation_valid(dsl, properties)
+        evaluator = self.evaluator
+        settings = getattr(evaluator, "settings", None)
+        if isinstance(evaluator, SegmentEvaluator) and settings is not None:
+            compiled_segment = settings.get_compiled_segment(dsl)
+            if compiled_segment is not None:
+                return compiled_segment.evaluate(evaluator, properties)
+        return evaluator.is_segmentation_valid(dsl, properties)
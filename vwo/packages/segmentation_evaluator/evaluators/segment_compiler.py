@@ -0,0 +1,392 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Compiles segment DSL into trees of predicate objects.
+
+The interpreter in SegmentEvaluator walks the raw DSL on every evaluation and classifies
+each operand string with regexes. A compiled tree resolves the operators, operand types,
+literals, regexes and versions once, so that an evaluation only reads the context values.
+Compiled nodes follow the interpreter's semantics exactly, including how `or` groups
+user agent keys and `and` groups location keys.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from ..enums.segment_operand_value_enum import SegmentOperandValueEnum
+from ..enums.segment_operator_value_enum import SegmentOperatorValueEnum
+from .segment_operand_evaluator import SegmentOperandEvaluator
+from ..utils.regex_cache import RegexCache
+from ...logger.core.log_manager import LogManager
+from ....enums.api_enum import ApiEnum
+from ....models.settings.settings_model import SettingsModel
+
+_operand_evaluator = SegmentOperandEvaluator()
+
+_UA_PARSER_KEYS = (
+    SegmentOperatorValueEnum.OPERATING_SYSTEM.value,
+    SegmentOperatorValueEnum.BROWSER_AGENT.value,
+    SegmentOperatorValueEnum.DEVICE_TYPE.value,
+    SegmentOperatorValueEnum.DEVICE.value,
+)
+
+_LOCATION_KEYS = (
+    SegmentOperatorValueEnum.COUNTRY.value,
+    SegmentOperatorValueEnum.REGION.value,
+    SegmentOperatorValueEnum.CITY.value,
+)
+
+_VERSION_COMPARISONS = {
+    SegmentOperandValueEnum.GREATER_THAN_VALUE.value: lambda result: result > 0,
+    SegmentOperandValueEnum.GREATER_THAN_EQUAL_TO_VALUE.value: lambda result: result >= 0,
+    SegmentOperandValueEnum.LESS_THAN_VALUE.value: lambda result: result < 0,
+    SegmentOperandValueEnum.LESS_THAN_EQUAL_TO_VALUE.value: lambda result: result <= 0,
+}
+
+
+class CompiledOperand:
+    """
+    An operand with its type, literal, regex and version parts resolved.
+    matches() gives the same result as SegmentOperandEvaluator.extract_result.
+    """
+
+    def __init__(self, operand_type: int, operand_value: Any):
+        self.operand_type = operand_type
+        self.operand_value = str(operand_value)
+        self.lower_value = self.operand_value.lower()
+        self.pattern = None
+        self.is_numeric = False
+        self.version_parts = None
+
+        if operand_type == SegmentOperandValueEnum.REGEX_VALUE.value:
+            self.pattern = RegexCache.get_instance().get(self.operand_value)
+        elif operand_type in _VERSION_COMPARISONS:
+            self.is_numeric = _operand_evaluator.is_numeric_version(self.operand_value)
+            if self.is_numeric:
+                self.version_parts = [int(part) for part in self.operand_value.split(".")]
+
+    def matches(self, tag_value: Any) -> bool:
+        if tag_value is None:
+            return False
+
+        tag_value_str = str(tag_value)
+        operand_type = self.operand_type
+
+        if operand_type == SegmentOperandValueEnum.LOWER_VALUE.value:
+            return tag_value_str.lower() == self.lower_value
+        if operand_type == SegmentOperandValueEnum.STARTING_ENDING_STAR_VALUE.value:
+            return self.operand_value in tag_value_str
+        if operand_type == SegmentOperandValueEnum.STARTING_STAR_VALUE.value:
+            return tag_value_str.endswith(self.operand_value)
+        if operand_type == SegmentOperandValueEnum.ENDING_STAR_VALUE.value:
+            return tag_value_str.startswith(self.operand_value)
+        if operand_type == SegmentOperandValueEnum.REGEX_VALUE.value:
+            return self.pattern is not None and self.pattern.search(tag_value_str) is not None
+        if operand_type in _VERSION_COMPARISONS:
+            # Only compare if both values are of the same type (both numeric or both non-numeric)
+            if _operand_evaluator.is_numeric_version(tag_value_str) != self.is_numeric:
+                return False
+            return _VERSION_COMPARISONS[operand_type](self.compare_version(tag_value_str))
+        return tag_value_str == self.operand_value
+
+    def compare_version(self, tag_value: str) -> int:
+        if not self.is_numeric:
+            return _operand_evaluator.compare_versions(tag_value, self.operand_value)
+
+        tag_parts = tag_value.split(".")
+        for index in range(max(len(tag_parts), len(self.version_parts))):
+            tag_part = int(tag_parts[index]) if index < len(tag_parts) else 0
+            operand_part = self.version_parts[index] if index < len(self.version_parts) else 0
+            if tag_part != operand_part:
+                return -1 if tag_part < operand_part else 1
+        return 0
+
+
+def compile_operand(operand: str) -> CompiledOperand:
+    operand_type, operand_value = _operand_evaluator.pre_process_operand_value(
+        operand
+    ).values()
+    return CompiledOperand(operand_type, _operand_evaluator.convert_value(operand_value))
+
+
+class SegmentNode:
+    """Base class of compiled segment nodes."""
+
+    def evaluate(self, evaluator, properties: Dict[str, Any]) -> Any:
+        raise NotImplementedError
+
+
+class _ConstantNode(SegmentNode):
+    def __init__(self, value: bool):
+        self.value = value
+
+    def evaluate(self, evaluator, properties):
+        return self.value
+
+
+class _InterpretedNode(SegmentNode):
+    """Falls back to the interpreter for DSL that could not be compiled, so errors surface the same way."""
+
+    def __init__(self, dsl: Any):
+        self.dsl = dsl
+
+    def evaluate(self, evaluator, properties):
+        return evaluator.is_segmentation_valid(self.dsl, properties)
+
+
+class _NotNode(SegmentNode):
+    def __init__(self, child: SegmentNode):
+        self.child = child
+
+    def evaluate(self, evaluator, properties):
+        return not self.child.evaluate(evaluator, properties)
+
+
+class _AndNode(SegmentNode):
+    """
+    Location keys (country, region, city) of the children are merged into one map and checked
+    together once every child has contributed one; other children must all pass.
+    """
+
+    def __init__(self, dsl_nodes: List[Any]):
+        self.steps = []
+        location_map = {}
+        for dsl in dsl_nodes:
+            if any(key in dsl for key in _LOCATION_KEYS):
+                for key in _LOCATION_KEYS:
+                    if key in dsl:
+                        location_map[key] = dsl[key]
+                location_check = (
+                    dict(location_map) if len(location_map) == len(dsl_nodes) else None
+                )
+                self.steps.append((None, location_check))
+            else:
+                self.steps.append((compile_segment(dsl), None))
+
+    def evaluate(self, evaluator, properties):
+        for child, location_check in self.steps:
+            if child is None:
+                if location_check is not None:
+                    return evaluator.check_location_pre_segmentation(location_check)
+                continue
+            if not child.evaluate(evaluator, properties):
+                return False
+        return True
+
+
+class _OrNode(SegmentNode):
+    """
+    User agent keys (os, browser_string, device_type, device) of the children are merged and
+    checked together once all children are user agent keys; a featureId child decides the
+    result on its own; otherwise any passing child passes the node.
+    """
+
+    def __init__(self, dsl_nodes: List[Any]):
+        self.steps = []
+        ua_parser_map: Dict[str, List[str]] = {}
+        key_count = 0
+        is_ua_parser = False
+
+        for dsl in dsl_nodes:
+            feature_check = None
+            for key in dsl:
+                if key in _UA_PARSER_KEYS:
+                    is_ua_parser = True
+                    value = dsl[key]
+                    ua_parser_map.setdefault(key, [])
+                    values_array = value if isinstance(value, list) else [value]
+                    for val in values_array:
+                        if isinstance(val, str):
+                            ua_parser_map[key].append(val)
+                    key_count += 1
+
+                if key == SegmentOperatorValueEnum.FEATURE_ID.value and feature_check is None:
+                    feature_id_object = dsl[key]
+                    feature_id_key = list(feature_id_object.keys())[0]
+                    feature_id_value = feature_id_object[feature_id_key]
+                    if feature_id_value == "on" or feature_id_value == "off":
+                        feature_check = (feature_id_key, feature_id_value)
+                        break
+
+            ua_check = None
+            if feature_check is None and is_ua_parser and key_count == len(dsl_nodes):
+                ua_check = {key: list(values) for key, values in ua_parser_map.items()}
+
+            self.steps.append((feature_check, ua_check, compile_segment(dsl)))
+
+    def evaluate(self, evaluator, properties):
+        for feature_check, ua_check, child in self.steps:
+            if feature_check is not None:
+                return _evaluate_feature_check(evaluator, *feature_check)
+
+            if ua_check is not None:
+                try:
+                    return evaluator.check_user_agent_parser(ua_check)
+                except Exception as err:
+                    context = evaluator.context
+                    LogManager.get_instance().error_log("USER_AGENT_VALIDATION_ERROR", data={"err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value, "uuid": context.get_vwo_uuid(), "sId": context.get_session_id()})
+
+            if child.evaluate(evaluator, properties):
+                return True
+        return False
+
+
+def _evaluate_feature_check(evaluator, feature_id_key: str, feature_id_value: str):
+    feature = next(
+        (f for f in evaluator.settings.get_features() if f.get_id() == int(feature_id_key)),
+        None,
+    )
+    if feature:
+        result = evaluator.check_in_user_storage(
+            evaluator.settings, feature.get_key(), evaluator.context
+        )
+        if feature_id_value == "off":
+            return not result
+        return result
+
+    context = evaluator.context
+    LogManager.get_instance().error_log("FEATURE_NOT_FOUND_WITH_ID", data={"featureId": feature_id_key}, debug_data={"an": ApiEnum.GET_FLAG.value, "uuid": context.get_vwo_uuid(), "sId": context.get_session_id()})
+    return None
+
+
+class _CustomVariableNode(SegmentNode):
+    def __init__(self, operand_key: str, operand: str):
+        self.operand_key = operand_key
+        self.operand = compile_operand(operand)
+
+    def evaluate(self, evaluator, properties):
+        if self.operand_key not in properties:
+            return False
+        tag_value = _operand_evaluator.pre_process_tag_value(properties[self.operand_key])
+        return self.operand.matches(_operand_evaluator.convert_value(tag_value))
+
+
+class _InlistNode(SegmentNode):
+    """Attribute list checks need the gateway service, so they are evaluated at request time."""
+
+    def __init__(self, sub_dsl: Dict[str, Any]):
+        self.sub_dsl = sub_dsl
+        self.operand_key = list(sub_dsl.keys())[0]
+
+    def evaluate(self, evaluator, properties):
+        if self.operand_key not in properties:
+            return False
+        return _operand_evaluator.evaluate_custom_variable_dsl(
+            self.sub_dsl, properties, evaluator.context
+        )
+
+
+class _UserNode(SegmentNode):
+    def __init__(self, users: str):
+        self.users = frozenset(user.strip() for user in users.split(","))
+
+    def evaluate(self, evaluator, properties):
+        user_id = properties.get("_vwoUserId")
+        return isinstance(user_id, str) and user_id in self.users
+
+
+class _UserAgentNode(SegmentNode):
+    def __init__(self, operand: str):
+        self.operand = compile_operand(operand)
+
+    def evaluate(self, evaluator, properties):
+        context = evaluator.context
+        if not context.get_user_agent():
+            LogManager.get_instance().error_log("INVALID_USER_AGENT_IN_CONTEXT_FOR_PRE_SEGMENTATION", debug_data={"an": ApiEnum.GET_FLAG.value, "uuid": context.get_vwo_uuid(), "sId": context.get_session_id()})
+            return False
+        tag_value = _operand_evaluator.pre_process_tag_value(context.get_user_agent())
+        return self.operand.matches(_operand_evaluator.convert_value(tag_value))
+
+
+class _StringOperandNode(SegmentNode):
+    """ip_address, browser_version and os_version, read from the context."""
+
+    def __init__(self, operator: str, operand: Any):
+        self.operator = operator
+        operand_type, operand_value = _operand_evaluator.pre_process_operand_value(
+            str(operand)
+        ).values()
+        operand_value = _operand_evaluator.convert_value(operand_value).strip().replace('"', "")
+        self.operand = CompiledOperand(operand_type, operand_value)
+
+    def evaluate(self, evaluator, properties):
+        context = evaluator.context
+        tag_value = _operand_evaluator.get_tag_value_for_operand_type(context, self.operator)
+        if tag_value is None:
+            _operand_evaluator.log_missing_context_error(self.operator, context)
+            return False
+        return self.operand.matches(_operand_evaluator.convert_value(tag_value))
+
+
+def _compile(dsl: Any) -> SegmentNode:
+    operator, sub_dsl = list(dsl.items())[0]
+
+    if operator == SegmentOperatorValueEnum.NOT.value:
+        return _NotNode(compile_segment(sub_dsl))
+    if operator == SegmentOperatorValueEnum.AND.value:
+        return _AndNode(sub_dsl)
+    if operator == SegmentOperatorValueEnum.OR.value:
+        return _OrNode(sub_dsl)
+    if operator == SegmentOperatorValueEnum.CUSTOM_VARIABLE.value:
+        operand_key, operand = list(sub_dsl.items())[0]
+        if "inlist" in operand:
+            return _InlistNode(sub_dsl)
+        return _CustomVariableNode(operand_key, operand)
+    if operator == SegmentOperatorValueEnum.USER.value:
+        return _UserNode(sub_dsl)
+    if operator == SegmentOperatorValueEnum.UA.value:
+        return _UserAgentNode(sub_dsl)
+    if operator in (
+        SegmentOperatorValueEnum.IP.value,
+        SegmentOperatorValueEnum.BROWSER_VERSION.value,
+        SegmentOperatorValueEnum.OS_VERSION.value,
+    ):
+        return _StringOperandNode(operator, sub_dsl)
+    return _ConstantNode(False)
+
+
+def compile_segment(dsl: Any) -> SegmentNode:
+    """
+    Compiles a segment DSL into a predicate tree.
+
+    :param dsl: The segment DSL.
+    :return: The root node; evaluate it with node.evaluate(segment_evaluator, properties).
+    """
+    try:
+        return _compile(dsl)
+    except Exception:
+        return _InterpretedNode(dsl)
+
+
+def compile_settings_segments(settings: SettingsModel) -> None:
+    """
+    Compiles the segments of every campaign and variation in the settings and stores the
+    trees on the settings model. Linked campaigns share the segment objects of the campaigns
+    they were copied from, so they resolve to the same trees.
+
+    :param settings: The settings model.
+    """
+    compiled_segments = {}
+
+    def add(segments: Optional[Dict]):
+        if segments and isinstance(segments, dict) and id(segments) not in compiled_segments:
+            compiled_segments[id(segments)] = (segments, compile_segment(segments))
+
+    for campaign in settings.get_campaigns():
+        add(campaign.get_segments())
+        for variation in campaign.get_variations():
+            add(variation.get_segments())
+
+    settings.set_compiled_segments(compiled_segments)
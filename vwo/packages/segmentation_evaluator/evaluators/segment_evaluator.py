@@ -22,6 +22,7 @@ from ....models.campaign.feature_model import FeatureModel
 from ...logger.core.log_manager import LogManager
 from ....services.storage_service import StorageService
 from ....decorators.storage_decorator import StorageDecorator
+from ..utils.regex_cache import RegexCache
 import re
 from typing import Dict, List, Any
 from ....enums.api_enum import ApiEnum
@@ -205,10 +206,10 @@ class SegmentEvaluator:
                 for val in expected_values:
                     if val.startswith("wildcard(") and val.endswith(")"):
                         wildcard_pattern = val[9:-1]
-                        regex = re.compile(
+                        regex = RegexCache.get_instance().get(
                             wildcard_pattern.replace("*", ".*"), re.IGNORECASE
                         )
-                        if regex.match(actual_value):
+                        if regex and regex.match(actual_value):
                             return True
                 if actual_value.lower() in expected_values:
                     return True
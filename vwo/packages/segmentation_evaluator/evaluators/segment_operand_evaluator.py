@@ -16,15 +16,14 @@
 import re
 from typing import Dict, Any
 from ..utils.segment_util import get_key_value, match_with_regex
+from ..utils.regex_cache import RegexCache
 from ..enums.segment_operand_regex_enum import SegmentOperandRegexEnum
 from ..enums.segment_operand_value_enum import SegmentOperandValueEnum
 from ..enums.segment_operator_value_enum import SegmentOperatorValueEnum
 from ...logger.core.log_manager import LogManager
-from ....utils.gateway_service_util import get_from_gateway_service
-from ....enums.url_enum import UrlEnum
+from ....utils.gateway_service_util import check_attribute_in_list
 from ....utils.data_type_util import is_boolean
 from ....models.user.context_model import ContextModel
-from ....services.settings_manager import SettingsManager
 from ....enums.api_enum import ApiEnum
 
 class SegmentOperandEvaluator:
@@ -46,7 +45,7 @@ class SegmentOperandEvaluator:
             return False
 
         if "inlist" in operand:
-            list_id_regex = r"inlist\([^)]*\)"
+            list_id_regex = r"inlist\(([^)]*)\)"
             match = re.search(list_id_regex, operand)
             if not match or len(match.groups()) < 1:
                 LogManager.get_instance().error_log("INVALID_ATTRIBUTE_LIST_FORMAT", debug_data={"an": ApiEnum.GET_FLAG.value, "uuid": context.get_vwo_uuid(), "sId": context.get_session_id()})
@@ -55,17 +54,9 @@ class SegmentOperandEvaluator:
             tag_value = properties[operand_key]
             attribute_value = self.pre_process_tag_value(tag_value)
             list_id = match.group(1)
-            query_params_obj = {
-                "attribute": attribute_value,
-                "listId": list_id,
-                "accountId": SettingsManager.get_instance().account_id,
-                "sdkKey": SettingsManager.get_instance().sdk_key,
-            }
 
             try:
-                res = get_from_gateway_service(
-                    query_params_obj, UrlEnum.ATTRIBUTE_CHECK.value, context
-                )
+                res = check_attribute_in_list(list_id, attribute_value, context)
                 if not res or res == "false":
                     return False
                 return res
@@ -214,7 +205,8 @@ class SegmentOperandEvaluator:
         :param regex: The regex pattern to use for extraction.
         :return: The extracted value.
         """
-        match = re.search(regex, operand)
+        pattern = RegexCache.get_instance().get(regex)
+        match = pattern.search(operand) if pattern else None
         return match.group(1) if match else None
 
     def process_values(self, operand_value, tag_value):
@@ -261,12 +253,8 @@ class SegmentOperandEvaluator:
         elif operand_type == SegmentOperandValueEnum.ENDING_STAR_VALUE.value:
             result = tag_value_str.startswith(operand_value_str)
         elif operand_type == SegmentOperandValueEnum.REGEX_VALUE.value:
-            try:
-                pattern = re.compile(operand_value_str)
-                matcher = pattern.search(tag_value_str)
-                result = matcher is not None
-            except re.error:
-                result = False
+            pattern = RegexCache.get_instance().get(operand_value_str)
+            result = pattern is not None and pattern.search(tag_value_str) is not None
         elif operand_type == SegmentOperandValueEnum.GREATER_THAN_VALUE.value:
             # Only compare if both values are of the same type (both numeric or both non-numeric)
             if self.is_numeric_version(tag_value_str) == self.is_numeric_version(
@@ -0,0 +1,213 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import ipaddress
+import mmap
+import socket
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from ....constants.Constants import Constants
+
+# little-endian header: magic, IPv4 range count, IPv6 range count, location count, reserved
+_HEADER = struct.Struct("<8sIIII")
+_MAGIC = b"VWOGEO\x00\x01"
+_LOCATION_KEYS = ("country", "region", "city")
+_IPV4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
+
+class GeoIpResolver:
+    """
+    Resolves an IP address to the location fields location pre-segmentation matches on
+    (country, region, city). Pass an implementation as the geo_ip_resolver option to use your
+    own data source.
+    """
+
+    def resolve(self, ip_address: str) -> Optional[Dict[str, str]]:
+        pass
+
+
+class _KeyColumn:
+    """Read-only sequence over fixed-width big-endian keys in the mapped file, for bisect."""
+
+    def __init__(self, buffer: memoryview, offset: int, count: int, width: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._width = width
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._offset + index * self._width
+        return bytes(self._buffer[start:start + self._width])
+
+
+class MmapGeoIpResolver(GeoIpResolver):
+    """
+    Resolves IP addresses from a compact database of sorted, non-overlapping address ranges,
+    read through mmap so that the data is shared between processes and never parsed up front.
+    A lookup is a binary search over the range starts, and resolved addresses are kept in an
+    LRU of `max_size` entries.
+
+    File layout, little-endian, see `write_database`:
+    header | IPv4 starts, ends, location ids (u32 each) | IPv6 starts, ends (16 byte big-endian)
+    and location ids (u32) | location offsets (u32, count + 1) | "country\\tregion\\tcity" strings
+    """
+
+    def __init__(self, path: str, max_size: int = Constants.GEO_IP_CACHE_MAX_SIZE):
+        self.path = path
+        with open(path, "rb") as database_file:
+            self._mmap = mmap.mmap(database_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._buffer = memoryview(self._mmap)
+            magic, ipv4_count, ipv6_count, location_count, _ = _HEADER.unpack_from(self._buffer, 0)
+            if magic != _MAGIC:
+                raise ValueError("not a VWO GeoIP database")
+
+            offset = _HEADER.size
+            self._ipv4_starts = self._u32_column(offset, ipv4_count)
+            self._ipv4_ends = self._u32_column(offset + 4 * ipv4_count, ipv4_count)
+            self._ipv4_locations = self._u32_column(offset + 8 * ipv4_count, ipv4_count)
+            offset += 12 * ipv4_count
+            self._ipv6_starts = _KeyColumn(self._buffer, offset, ipv6_count, 16)
+            self._ipv6_ends = _KeyColumn(self._buffer, offset + 16 * ipv6_count, ipv6_count, 16)
+            self._ipv6_locations = self._u32_column(offset + 32 * ipv6_count, ipv6_count)
+            offset += 36 * ipv6_count
+            self._location_offsets = self._u32_column(offset, location_count + 1)
+            self._locations_start = offset + 4 * (location_count + 1)
+        except Exception:
+            self.close()
+            raise
+        self._resolve_cached = lru_cache(maxsize=max_size)(self._resolve)
+        # many ranges share a location, so decoded locations are kept apart from addresses
+        self._read_location = lru_cache(maxsize=Constants.GEO_IP_LOCATION_CACHE_MAX_SIZE)(self._read_location)
+
+    def _u32_column(self, offset: int, count: int):
+        column = self._buffer[offset:offset + 4 * count].cast("I")
+        if sys.byteorder == "little":
+            return column
+        # the file is little-endian, big-endian hosts read a swapped copy
+        swapped = array("I", column.tobytes())
+        swapped.byteswap()
+        return swapped
+
+    def resolve(self, ip_address: str) -> Optional[Dict[str, str]]:
+        """
+        :param ip_address: An IPv4 or IPv6 address.
+        :return: The location of the address, None if it is invalid or not in the database.
+        """
+        location = self._resolve_cached(ip_address)
+        # a copy, so the cached location cannot be changed through one context
+        return dict(location) if location is not None else None
+
+    def _resolve(self, ip_address: str) -> Optional[Dict[str, str]]:
+        # inet_pton is several times faster than the ipaddress module on the uncached path
+        try:
+            packed = socket.inet_pton(socket.AF_INET, ip_address.strip())
+        except OSError:
+            try:
+                packed = socket.inet_pton(socket.AF_INET6, ip_address.strip())
+            except OSError:
+                return None
+            if packed.startswith(_IPV4_MAPPED_PREFIX):
+                packed = packed[12:]
+        except (TypeError, AttributeError):
+            return None
+
+        if len(packed) == 4:
+            key = int.from_bytes(packed, "big")
+            starts, ends, locations = self._ipv4_starts, self._ipv4_ends, self._ipv4_locations
+        else:
+            key = packed
+            starts, ends, locations = self._ipv6_starts, self._ipv6_ends, self._ipv6_locations
+
+        index = bisect.bisect_right(starts, key) - 1
+        if index < 0 or key > ends[index]:
+            return None
+        return self._read_location(locations[index])
+
+    def _read_location(self, location_id: int) -> Dict[str, str]:
+        start = self._locations_start + self._location_offsets[location_id]
+        end = self._locations_start + self._location_offsets[location_id + 1]
+        values = bytes(self._buffer[start:end]).decode("utf-8").split("\t")
+        return {key: value for key, value in zip(_LOCATION_KEYS, values) if value}
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Hit and miss counts and the number of cached addresses.
+        """
+        cache_info = self._resolve_cached.cache_info()
+        return {"hits": cache_info.hits, "misses": cache_info.misses, "size": cache_info.currsize}
+
+    def close(self) -> None:
+        for column in ("_ipv4_starts", "_ipv4_ends", "_ipv4_locations", "_ipv6_locations", "_location_offsets"):
+            view = getattr(self, column, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if getattr(self, "_buffer", None) is not None:
+            self._buffer.release()
+        self._mmap.close()
+
+    @staticmethod
+    def write_database(path: str, ranges: Iterable[Tuple[str, str, Dict[str, str]]]) -> None:
+        """
+        Writes a database readable by MmapGeoIpResolver, for converting your own IP data.
+
+        :param path: The file to write.
+        :param ranges: (first address, last address, location) tuples with non-overlapping
+            ranges; the location has optional "country", "region" and "city" keys.
+        """
+        location_ids = {}
+        ipv4_ranges = []
+        ipv6_ranges = []
+        for first, last, location in ranges:
+            values = "\t".join(str(location.get(key) or "") for key in _LOCATION_KEYS)
+            location_id = location_ids.setdefault(values, len(location_ids))
+            first_address = ipaddress.ip_address(first)
+            last_address = ipaddress.ip_address(last)
+            if first_address.version != last_address.version:
+                raise ValueError(f"range {first} - {last} mixes IPv4 and IPv6")
+            if first_address.version == 4:
+                ipv4_ranges.append((int(first_address), int(last_address), location_id))
+            else:
+                ipv6_ranges.append((first_address.packed, last_address.packed, location_id))
+        ipv4_ranges.sort()
+        ipv6_ranges.sort()
+
+        encoded_locations = [values.encode("utf-8") for values in location_ids]
+        location_offsets = [0]
+        for encoded_location in encoded_locations:
+            location_offsets.append(location_offsets[-1] + len(encoded_location))
+
+        def u32_bytes(values):
+            column = array("I", values)
+            if sys.byteorder != "little":
+                column.byteswap()
+            return column.tobytes()
+
+        with open(path, "wb") as database_file:
+            database_file.write(_HEADER.pack(_MAGIC, len(ipv4_ranges), len(ipv6_ranges), len(encoded_locations), 0))
+            for column in range(3):
+                database_file.write(u32_bytes(row[column] for row in ipv4_ranges))
+            for column in range(2):
+                database_file.write(b"".join(row[column] for row in ipv6_ranges))
+            database_file.write(u32_bytes(row[2] for row in ipv6_ranges))
+            database_file.write(u32_bytes(location_offsets))
+            database_file.write(b"".join(encoded_locations))
@@ -0,0 +1,107 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Pattern
+
+from ....constants.Constants import Constants
+from ....utils.fork_util import register_after_fork
+
+# Cached in place of a pattern that failed to compile
+_INVALID_PATTERN = object()
+
+
+class RegexCache:
+    """
+    Bounded, thread-safe LRU cache of compiled regex patterns keyed by (pattern, flags).
+    Patterns that fail to compile are cached too, so a bad regex in the settings costs
+    one re.error rather than one per evaluation.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_size: int = Constants.REGEX_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._patterns = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "RegexCache":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def get(self, pattern: str, flags: int = 0) -> Optional[Pattern]:
+        """
+        Returns the compiled pattern, compiling and caching it on a miss.
+
+        :param pattern: The regex pattern text.
+        :param flags: The re flags to compile with.
+        :return: The compiled pattern, or None if the pattern is invalid.
+        """
+        key = (pattern, flags)
+        with self._lock:
+            compiled = self._patterns.get(key)
+            if compiled is not None:
+                self._patterns.move_to_end(key)
+                self._hits += 1
+                return None if compiled is _INVALID_PATTERN else compiled
+            self._misses += 1
+
+        # compile outside the lock, a racing thread compiling the same pattern is harmless
+        try:
+            compiled = re.compile(pattern, flags)
+        except (re.error, TypeError):
+            compiled = _INVALID_PATTERN
+
+        with self._lock:
+            self._patterns[key] = compiled
+            self._patterns.move_to_end(key)
+            while len(self._patterns) > self.max_size:
+                self._patterns.popitem(last=False)
+                self._evictions += 1
+
+        return None if compiled is _INVALID_PATTERN else compiled
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Hit, miss and eviction counts, and the current number of cached patterns.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._patterns),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._patterns.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
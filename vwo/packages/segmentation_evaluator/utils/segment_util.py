@@ -13,8 +13,8 @@
 # limitations under the License.
 
 
-import re
 from ....utils.data_type_util import is_object
+from .regex_cache import RegexCache
 from typing import List
 
 
@@ -27,7 +27,7 @@ def get_key_value(obj):
 
 
 def match_with_regex(string, regex):
-    try:
-        return re.findall(regex, string)
-    except re.error:
+    pattern = RegexCache.get_instance().get(regex)
+    if pattern is None:
         return None
+    return pattern.findall(string)
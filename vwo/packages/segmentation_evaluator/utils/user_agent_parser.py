@@ -0,0 +1,153 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from ....constants.Constants import Constants
+
+# (pattern, name) rules, the first matching rule wins and group 1 is the version.
+# Order matters: Edge, Opera and Samsung Internet also claim to be Chrome, Chrome claims to be
+# Safari, and iOS user agents say "like Mac OS X". Patterns start with a literal rather than \b
+# so the regex engine can skip ahead to it, which makes a search several times faster.
+_BROWSER_RULES: List[Tuple[Pattern, str]] = [
+    (re.compile(pattern), name)
+    for pattern, name in (
+        (r"Edg(?:e|A|iOS)?/([\d.]+)", "Edge"),
+        (r"(?:OPR|Opera)/([\d.]+)", "Opera"),
+        (r"SamsungBrowser/([\d.]+)", "Samsung Internet"),
+        (r"UCBrowser/([\d.]+)", "UC Browser"),
+        (r"YaBrowser/([\d.]+)", "Yandex"),
+        (r"Vivaldi/([\d.]+)", "Vivaldi"),
+        (r"FBAV/([\d.]+)", "Facebook"),
+        (r"Instagram ([\d.]+)", "Instagram"),
+        (r"FxiOS/([\d.]+)", "Firefox"),
+        (r"CriOS/([\d.]+)", "Chrome"),
+        (r"Firefox/([\d.]+)", "Firefox"),
+        (r"(?:Chrome|Chromium)/([\d.]+)", "Chrome"),
+        (r"MSIE ([\d.]+)", "Internet Explorer"),
+        (r"Trident/.*\brv:([\d.]+)", "Internet Explorer"),
+        (r"Android\b.*\bVersion/([\d.]+)", "Android Browser"),
+        (r"Version/([\d.]+).*\bSafari/", "Safari"),
+        (r"AppleWebKit/.*\bMobile/", "Safari"),
+    )
+]
+
+_OS_RULES: List[Tuple[Pattern, str]] = [
+    (re.compile(pattern), name)
+    for pattern, name in (
+        (r"Windows Phone(?: OS)? ([\d.]+)", "Windows Phone"),
+        (r"Windows NT ([\d.]+)", "Windows"),
+        (r"(?:iPhone|iPad|iPod)\b.*?\bOS ([\d_]+)", "iOS"),
+        (r"Mac OS X ([\d_.]+)", "Mac OS"),
+        (r"Android ([\d.]+)", "Android"),
+        (r"CrOS \S+ ([\d.]+)", "Chrome OS"),
+        (r"(?:Linux|X11)\b", "Linux"),
+    )
+]
+
+# marketing names of the Windows NT versions segments are written against
+_WINDOWS_VERSIONS = {"10.0": "10", "6.3": "8.1", "6.2": "8", "6.1": "7"}
+
+_BOT = re.compile(r"(?:bot|crawler|spider|slurp)\b")
+_TABLET = re.compile(r"iPad\b|Tablet\b|Kindle\b|Silk/|PlayBook\b")
+_MOBILE = re.compile(r"iPhone\b|iPod\b|Mobile\b|Windows Phone\b|Opera Mini\b")
+_ANDROID = re.compile(r"Android\b")
+_ANDROID_MODEL = re.compile(
+    r"Android [\d.]+;(?:[^;)]*;)*?\s*((?:[^;()]|\([^;()]*\))+?)(?:\s+Build/[^;)]*)?\)"
+)
+_APPLE_DEVICE = re.compile(r"(iPhone|iPad|iPod|Macintosh)\b")
+
+
+class UserAgentParser:
+    """
+    In-process user agent parser filling the same ua_info fields as the gateway service:
+    os, os_version, browser_string, browser_version, device_type and device. Rule tables are
+    compiled once at import, and parsed user agents are kept in an LRU of `max_size` entries
+    since most traffic comes from a few thousand distinct strings.
+
+    Any object with a parse(user_agent) method returning such a dictionary can be passed as
+    the user_agent_parser option instead.
+    """
+
+    def __init__(self, max_size: int = Constants.USER_AGENT_CACHE_MAX_SIZE):
+        self._parse_cached = lru_cache(maxsize=max_size)(self._parse)
+
+    def parse(self, user_agent: str) -> Dict[str, str]:
+        """
+        Parses the user agent.
+
+        :param user_agent: The User-Agent header value.
+        :return: The ua_info fields that could be detected, an empty dictionary if none.
+        """
+        if not user_agent:
+            return {}
+        # a copy, so the cached result cannot be changed through one context
+        return dict(self._parse_cached(user_agent))
+
+    @staticmethod
+    def _match(rules: List[Tuple[Pattern, str]], user_agent: str) -> Tuple[Optional[str], Optional[str]]:
+        for pattern, name in rules:
+            match = pattern.search(user_agent)
+            if match:
+                return name, match.group(1) if pattern.groups else None
+        return None, None
+
+    def _parse(self, user_agent: str) -> Dict[str, str]:
+        ua_info = {}
+        browser, browser_version = self._match(_BROWSER_RULES, user_agent)
+        os_name, os_version = self._match(_OS_RULES, user_agent)
+        if os_version:
+            os_version = os_version.replace("_", ".")
+            if os_name == "Windows":
+                os_version = _WINDOWS_VERSIONS.get(os_version, os_version)
+
+        if _BOT.search(user_agent.lower()):
+            device_type = "bot"
+        elif _TABLET.search(user_agent) or (_ANDROID.search(user_agent) and "Mobile" not in user_agent):
+            device_type = "tablet"
+        elif _MOBILE.search(user_agent):
+            device_type = "mobile"
+        else:
+            device_type = "desktop"
+
+        device = None
+        apple_device = _APPLE_DEVICE.search(user_agent)
+        if apple_device:
+            device = "Mac" if apple_device.group(1) == "Macintosh" else apple_device.group(1)
+        elif os_name == "Android":
+            model = _ANDROID_MODEL.search(user_agent)
+            # reduced user agents only send "K" in place of the model
+            if model and model.group(1) not in ("K", "Mobile", "wv"):
+                device = model.group(1)
+
+        for key, value in (
+            ("os", os_name),
+            ("os_version", os_version),
+            ("browser_string", browser),
+            ("browser_version", browser_version),
+            ("device_type", device_type),
+            ("device", device),
+        ):
+            if value:
+                ua_info[key] = value
+        return ua_info
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Hit and miss counts and the number of cached user agents.
+        """
+        cache_info = self._parse_cached.cache_info()
+        return {"hits": cache_info.hits, "misses": cache_info.misses, "size": cache_info.currsize}
@@ -0,0 +1,60 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Coroutine, Dict, Optional
+
+
+class AsyncStorageConnector:
+    """
+    Storage connector for asyncio applications, e.g. one backed by an async Redis client.
+    Pass it as the storage option of init_async.
+    """
+
+    async def get(self, key: str, user_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    async def set(self, value: Dict[str, Any]) -> None:
+        pass
+
+
+class LoopBoundStorageConnector:
+    """
+    Exposes an AsyncStorageConnector to the synchronous decision code. AsyncVWOClient only
+    reaches storage from its transport threads, which run each coroutine on the event loop
+    and wait for the result, so the event loop itself never blocks on storage.
+    """
+
+    def __init__(self, connector: AsyncStorageConnector, loop: asyncio.AbstractEventLoop):
+        self.connector = connector
+        self.loop = loop
+
+    def get(self, key: str, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._run(self.connector.get(key, user_id))
+
+    def set(self, value: Dict[str, Any]) -> None:
+        return self._run(self.connector.set(value))
+
+    def _run(self, coroutine: Coroutine) -> Any:
+        try:
+            is_loop_thread = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            is_loop_thread = False
+        if is_loop_thread:
+            # waiting here would deadlock the event loop the coroutine needs
+            coroutine.close()
+            raise RuntimeError(
+                "An AsyncStorageConnector can only be used through the AsyncVWOClient APIs"
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
@@ -0,0 +1,74 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+
+class SettingsCacheConnector:
+    """
+    Persists the last known good settings so that the SDK can start without waiting
+    for the settings endpoint. Only settings that passed schema validation are stored.
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    def set(self, key: str, settings: Dict[str, Any]) -> None:
+        pass
+
+
+class FileSettingsCache(SettingsCacheConnector):
+    """
+    Default settings cache, one JSON file per account and SDK key.
+    Writes go to a temporary file in the same directory that is then renamed over the
+    cache file, so readers (including other processes) never see a partial file.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(
+            tempfile.gettempdir(), "vwo-fme-settings"
+        )
+
+    def get_file_path(self, key: str) -> str:
+        # the key contains the SDK key, so it is hashed rather than used as a file name
+        file_name = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self.directory, file_name)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.get_file_path(key), "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, settings: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=".settings-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+                json.dump(settings, temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.get_file_path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,211 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from murmurhash import mrmr
+
+from ..constants.Constants import Constants
+from ..packages.logger.core.log_manager import LogManager
+from ..utils.log_message_util import error_messages
+from ..utils.fork_util import register_after_fork
+
+
+class AttributeListLoader:
+    """
+    Downloads the values of an attribute list so inlist(...) checks can be answered locally.
+    Pass an implementation as gateway_service.attribute_lists.loader.
+    """
+
+    def load(self, list_id: str) -> Optional[Iterable[Any]]:
+        """
+        :param list_id: The id of the list, as used in the segment's inlist(...) operand.
+        :return: The values of the list, a BloomFilter of them, or None to keep the list remote.
+        """
+        pass
+
+
+class BloomFilter:
+    """
+    Compact membership pre-check for lists too large to hold as a set. A miss is definite, a hit
+    may be a false positive (at about `error_rate`), so hits are confirmed by the gateway.
+
+    :param capacity: Number of values the filter is sized for.
+    :param error_rate: False positive rate at capacity.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = Constants.BLOOM_FILTER_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any], error_rate: float = Constants.BLOOM_FILTER_ERROR_RATE):
+        values = [str(value) for value in values]
+        bloom_filter = cls(len(values), error_rate)
+        for value in values:
+            bloom_filter.add(value)
+        return bloom_filter
+
+    def _positions(self, value: Any):
+        # double hashing: the k positions are h1 + i * h2
+        key = str(value)
+        first = mrmr.hash(key, 0) & 0xFFFFFFFF
+        second = (mrmr.hash(key, first) & 0xFFFFFFFF) | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, value: Any) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: Any) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class AttributeListStore:
+    """
+    Keeps whole attribute lists in memory so inlist(...) checks on them need no gateway call.
+    Lists named in `list_ids` and lists that are checked while running are downloaded through the
+    loader on a background thread and refreshed every `refresh_interval` seconds; until a list is
+    loaded, its checks go to the gateway.
+
+    :param loader: Downloads the values of a list.
+    :param list_ids: Lists to download up front.
+    :param refresh_interval: Seconds between downloads of a list.
+    :param clock: Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        loader: AttributeListLoader,
+        list_ids: Optional[Iterable[str]] = None,
+        refresh_interval: float = Constants.ATTRIBUTE_LIST_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lists: Dict[str, Any] = {}  # list id -> frozenset or BloomFilter of its values
+        self._loaded_at: Dict[str, float] = {}
+        self._wanted = set(str(list_id) for list_id in (list_ids or []))
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._local_hits = 0
+        self._remote_checks = 0
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        # the loaded lists are kept, only the refresh thread is started again
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        is_running = self._thread is not None and not self._stopped.is_set()
+        self._stopped = threading.Event()
+        self._thread = None
+        if is_running:
+            self._start()
+
+    def contains(self, list_id: str, value: Any) -> Optional[bool]:
+        """
+        :param list_id: The id of the list.
+        :param value: The attribute value to look for.
+        :return: True or False when the local copy decides, None when the gateway must be asked.
+        """
+        membership = self._lists.get(list_id)
+        if membership is None:
+            if list_id not in self._wanted:
+                with self._lock:
+                    self._wanted.add(list_id)
+                self._start()
+                self._wake.set()
+            self._remote_checks += 1
+            return None
+        if str(value) in membership:
+            if isinstance(membership, BloomFilter):
+                self._remote_checks += 1
+                return None
+            self._local_hits += 1
+            return True
+        self._local_hits += 1
+        return False
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Downloads the wanted lists that are missing or older than the refresh interval.
+
+        :param force: Download every wanted list regardless of its age.
+        """
+        with self._lock:
+            list_ids = list(self._wanted)
+        for list_id in list_ids:
+            loaded_at = self._loaded_at.get(list_id)
+            if not force and loaded_at is not None and self._clock() - loaded_at < self.refresh_interval:
+                continue
+            try:
+                values = self.loader.load(list_id)
+            except Exception as err:
+                LogManager.get_instance().error(
+                    error_messages.get("ERROR_LOADING_ATTRIBUTE_LIST").format(listId=list_id, err=str(err))
+                )
+                continue
+            if values is None:
+                continue
+            if not isinstance(values, BloomFilter):
+                values = frozenset(str(value) for value in values)
+            self._lists[list_id] = values
+            self._loaded_at[list_id] = self._clock()
+
+    def start(self) -> None:
+        """
+        Starts the background thread that downloads and refreshes the lists.
+        """
+        self._start()
+        self._wake.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None or self._stopped.is_set():
+                return
+            self._thread = threading.Thread(target=self._run, name="vwo-attribute-lists", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            self.refresh()
+
+    def stop(self) -> None:
+        """
+        Stops the background refresh, checks keep using the lists already loaded.
+        """
+        self._stopped.set()
+        self._wake.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Loaded list count, checks answered locally and checks left to the gateway.
+        """
+        return {
+            "lists": len(self._lists),
+            "local_hits": self._local_hits,
+            "remote_checks": self._remote_checks,
+        }
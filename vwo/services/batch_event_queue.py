@@ -13,85 +13,345 @@
 # limitations under the License.
 
 
+import hashlib
+import os
+import tempfile
 import threading
-import queue
-from typing import Dict, Any
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
 from vwo.packages.network_layer.manager.network_manager import NetworkManager
-from ..utils.network_util import send_post_batch_request 
-from ..utils.log_message_util import error_messages, info_messages
+from ..constants.Constants import Constants
+from ..enums.overflow_policy_enum import OverflowPolicyEnum
+from .event_spool import EventSpool
+from ..utils.network_util import send_post_batch_request
+from ..utils.log_message_util import debug_messages, error_messages, info_messages
 from vwo.packages.logger.core.log_manager import LogManager
 from ..enums.api_enum import ApiEnum
+from ..utils.fork_util import register_after_fork
 
 class BatchEventQueue:
+    """
+    Bounded queue of events sent in batches. A single long-lived flusher thread sends the queue
+    every request_time_interval seconds, or as soon as it holds events_per_request events.
+    Flushing swaps the queued events out under the lock and sends them after releasing it, so
+    enqueue never waits on the network. When the queue is full the overflow policy decides
+    whether enqueue blocks, evicts the oldest event or rejects the new one.
+
+    With an EventSpool every event is also written to disk and acknowledged once uploaded.
+    A full queue then spills new events to the spool instead of applying the overflow policy,
+    and spilled events, including those left by a previous run, are read back as the queue
+    drains, with at most replay_concurrency batches in flight.
+    """
+
     MAX_EVENTS_PER_REQUEST = 5000
 
-    def __init__(self, events_per_request: int, request_time_interval: int, account_id: int, sdk_key: str, flush_callback=None):
+    def __init__(
+        self,
+        events_per_request: int,
+        request_time_interval: int,
+        account_id: int,
+        sdk_key: str,
+        flush_callback=None,
+        max_queue_size: int = Constants.BATCH_QUEUE_MAX_SIZE,
+        overflow_policy: str = OverflowPolicyEnum.DROP_OLDEST.value,
+        clock: Callable[[], float] = time.monotonic,
+        spool: Optional[EventSpool] = None,
+        replay_concurrency: int = Constants.EVENT_SPOOL_REPLAY_CONCURRENCY,
+    ):
         """
         Initializes the batch event queue with the provided parameters.
-        
+
         :param events_per_request: The number of events to send per batch.
         :param request_time_interval: The time interval (in seconds) between batch requests.
         :param account_id: The account ID for the batch events.
         :param sdk_key: The SDK key for the batch events.
         :param flush_callback: Optional callback function that gets called when the queue is flushed.
+        :param max_queue_size: The maximum number of queued events, at least events_per_request.
+        :param overflow_policy: What enqueue does when the queue is full, see OverflowPolicyEnum.
+        :param clock: Monotonic time source for the flush latency, injectable for tests.
+        :param spool: Optional disk spool the events are written to until they are uploaded.
+        :param replay_concurrency: The maximum number of batches in flight while spooled
+            events are read back.
         """
-        self.batch_queue = []
+        self.batch_queue = deque()
         self.events_per_request = events_per_request
         self.request_time_interval = request_time_interval
         self.account_id = account_id
         self.sdk_key = sdk_key
-        self.is_batch_processing = False
+        self.max_queue_size = max(max_queue_size, events_per_request)
+        self.overflow_policy = overflow_policy
         self.lock = threading.Lock()
         self.flush_callback = flush_callback
+        self._clock = clock
+        self._not_full = threading.Condition(self.lock)
+        self._flush_requested = threading.Event()
+        self._is_closed = False
+        self._flusher = None
+        self._enqueued = 0
+        self._dropped = 0
+        self._max_depth = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._flushed_events = 0
+        self._last_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+        self.spool = spool
+        self.replay_concurrency = max(1, replay_concurrency)
+        # spool sequence numbers of the queued and the in-flight events, aligned with batch_queue
+        self._queued_sequences = deque()
+        self._in_flight_sequences = set()
+        self._in_flight_batches = 0
+        self._spilled = 0
+        self._spill_generation = 0
+        self._has_spilled = spool is not None and spool.pending_count() > 0
 
-        self.create_new_batch_timer()
+        self.start_flusher()
+        if self._has_spilled:
+            # events left by a previous run are replayed right away
+            self._flush_requested.set()
+        register_after_fork(self._reinit_after_fork)
 
-    def enqueue(self, event_data: Dict[str, Any]):
-        with self.lock:
-            self.batch_queue.append(event_data)
-            # Print the current batch queue size
+    def _reinit_after_fork(self) -> None:
+        """
+        Gives a forked child new locks and its own flusher thread. The events queued or in
+        flight at the fork are the parent's to send, so the child starts with an empty queue.
+        """
+        self.lock = threading.Lock()
+        self._not_full = threading.Condition(self.lock)
+        self._flush_requested = threading.Event()
+        self.batch_queue = deque()
+        self._queued_sequences = deque()
+        self._in_flight_sequences = set()
+        self._in_flight_batches = 0
+        if self.spool is not None:
             LogManager.get_instance().info(
-                info_messages.get('BATCH_QUEUE_SIZE').format(
-                    size=len(self.batch_queue)
+                info_messages.get("EVENT_SPOOL_LEFT_TO_PARENT").format(directory=self.spool.directory)
+            )
+            self.spool = None
+            self._has_spilled = False
+        self._flusher = None
+        if not self._is_closed:
+            self.start_flusher()
+
+    @staticmethod
+    def create_spool(spool_option: Any, account_id: Any, sdk_key: str) -> Optional[EventSpool]:
+        """
+        Resolves the batch_event_data.spool option: True spools to a directory per account
+        under the system temp directory, a dict may set "path", "max_bytes", "max_age",
+        "segment_bytes" and "fsync_interval".
+
+        :param spool_option: The value passed under batch_event_data.
+        :param account_id: The account ID, for the default directory.
+        :param sdk_key: The SDK key, for the default directory.
+        :return: The spool, or None if spooling is disabled or the spool cannot be opened.
+        """
+        if not spool_option:
+            return None
+        spool_option = spool_option if isinstance(spool_option, dict) else {}
+        # the directory name must not reveal the SDK key
+        directory_name = hashlib.sha256(f"{account_id}:{sdk_key}".encode("utf-8")).hexdigest()[:16]
+        directory = spool_option.get("path") or os.path.join(
+            tempfile.gettempdir(), "vwo-fme-events", directory_name
+        )
+        defaults = {
+            "max_bytes": Constants.EVENT_SPOOL_MAX_BYTES,
+            "max_age": Constants.EVENT_SPOOL_MAX_AGE,
+            "segment_bytes": Constants.EVENT_SPOOL_SEGMENT_BYTES,
+            "fsync_interval": Constants.EVENT_SPOOL_FSYNC_INTERVAL,
+        }
+        config = {}
+        for key, default_value in defaults.items():
+            value = spool_option.get(key, default_value)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_BATCH_QUEUE_CONFIGURATION").format(
+                        key=f"spool.{key}", correctType="number > 0", defaultValue=default_value
+                    )
                 )
+                value = default_value
+            config[key] = value
+        try:
+            return EventSpool(directory, **config)
+        except Exception as err:
+            LogManager.get_instance().error(
+                error_messages.get("ERROR_OPENING_EVENT_SPOOL").format(directory=directory, err=str(err))
+            )
+            return None
+
+    def enqueue(self, event_data: Dict[str, Any]) -> bool:
+        """
+        Queues an event for the next batch.
+
+        :param event_data: The event payload.
+        :return: True if the event was queued, False if the overflow policy rejected it.
+        """
+        with self.lock:
+            # appended under the queue lock, so the backfill never reads an event being queued
+            seq = self._append_to_spool(event_data)
+            if len(self.batch_queue) >= self.max_queue_size:
+                if seq is not None:
+                    # kept on disk only, read back once the queue has room
+                    self._spilled += 1
+                    self._spill_generation += 1
+                    self._has_spilled = True
+                    return True
+                if self.overflow_policy == OverflowPolicyEnum.DROP_NEWEST.value:
+                    self._dropped += 1
+                    return False
+                if self.overflow_policy == OverflowPolicyEnum.DROP_OLDEST.value:
+                    self.batch_queue.popleft()
+                    self._dropped += 1
+                else:
+                    # the flusher makes room, a closed queue has no flusher left to wait for
+                    while len(self.batch_queue) >= self.max_queue_size and not self._is_closed:
+                        self._flush_requested.set()
+                        self._not_full.wait()
+                    if len(self.batch_queue) >= self.max_queue_size:
+                        self._dropped += 1
+                        return False
+
+            self.batch_queue.append(event_data)
+            if self.spool is not None:
+                self._queued_sequences.append(seq)
+            self._enqueued += 1
+            size = len(self.batch_queue)
+            self._max_depth = max(self._max_depth, size)
+
+        LogManager.get_instance().debug(
+            debug_messages.get('BATCH_QUEUE_SIZE').format(size=size)
+        )
+        # If batch size reaches the limit, wake the flusher
+        if size >= self.events_per_request:
+            self._flush_requested.set()
+        return True
+
+    def _append_to_spool(self, event_data: Dict[str, Any]) -> Optional[int]:
+        """
+        :return: The spool sequence number, or None without a spool or if the write failed,
+            in which case the event is only kept in memory.
+        """
+        if self.spool is None:
+            return None
+        try:
+            return self.spool.append(event_data)
+        except Exception as err:
+            LogManager.get_instance().error(
+                error_messages.get("ERROR_WRITING_EVENT_SPOOL").format(directory=self.spool.directory, err=str(err))
             )
+            return None
 
-            # If batch size reaches the limit, trigger flush
-            if len(self.batch_queue) >= self.events_per_request:
+    def start_flusher(self):
+        """
+        Starts the flusher thread, if it is not running.
+        """
+        with self.lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._is_closed = False
+            self._flusher = threading.Thread(target=self._run_flusher, name="vwo-batch-flusher", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        next_flush_at = self._clock() + self.request_time_interval
+        while True:
+            self._flush_requested.wait(max(0.0, next_flush_at - self._clock()))
+            self._flush_requested.clear()
+            if self._is_closed:
+                return
+            try:
                 self.flush()
+                if self._backfill():
+                    self.flush()
+            except Exception as e:
+                # the flusher must outlive a failing flush
+                LogManager.get_instance().error_log("ERROR_FLUSHING_BATCH_EVENTS", data={"error": str(e)}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
+            next_flush_at = self._clock() + self.request_time_interval
 
-    def create_new_batch_timer(self):
-        """Create a timer to flush the batch queue at the specified interval."""
-        self.timer = threading.Timer(self.request_time_interval, self.flush)
-        self.timer.start()
+    def _backfill(self) -> bool:
+        """
+        Reads spilled events back from the spool into the queue, as many as fit and as the
+        free replay slots can send.
+
+        :return: True if events were read back.
+        """
+        if self.spool is None or not self._has_spilled:
+            return False
+        with self.lock:
+            free_slots = self.replay_concurrency - self._in_flight_batches
+            room = min(self.max_queue_size - len(self.batch_queue), free_slots * self.events_per_request)
+            if room <= 0:
+                return False
+            live_sequences = set(self._queued_sequences) | self._in_flight_sequences
+            # events appended after this point are queued in memory or flagged as spilled again
+            last_sequence = self.spool.get_last_sequence()
+            spill_generation = self._spill_generation
+
+        events = self.spool.pending(exclude=live_sequences, limit=room, max_seq=last_sequence)
+
+        with self.lock:
+            if not events and spill_generation == self._spill_generation:
+                self._has_spilled = False
+            for seq, event in events:
+                self.batch_queue.append(event)
+                self._queued_sequences.append(seq)
+        return bool(events)
 
     def clear_request_timer(self):
         """
-        Cancels the timer if it exists.
+        Stops the flusher thread. Queued events stay queued until the next flush.
         """
-        if self.timer:
-            self.timer.cancel()  # Cancel the ongoing timer
+        with self.lock:
+            self._is_closed = True
+            self._not_full.notify_all()
+        self._flush_requested.set()
 
     def flush_and_clear_timer(self):
         """
-        Flushes the queue and clears the timer.
+        Flushes the queue and stops the flusher thread.
         """
         flush_result = self.flush(manual=True)
-        if isinstance(self.timer, threading.Timer):
-            self.clear_request_timer()  # Cancel the request timer
-
+        self.clear_request_timer()
         return flush_result
 
+    def close(self):
+        """
+        Sends the queued events and stops the flusher thread.
+        """
+        return self.flush_and_clear_timer()
+
+    def close_spool(self):
+        """
+        Syncs and closes the spool, once the sends in flight have finished.
+        """
+        if self.spool is not None:
+            self.spool.close()
+
     def flush(self, manual=False):
-        self.is_batch_processing = True
+        """
+        Sends the queued events in the background, events_per_request per request. The events
+        are swapped out under the lock and sent after it is released. Events of a failed send
+        are put back at the front of the queue.
+
+        :param manual: Whether the flush was requested through flush_events.
+        :return: True if the events were handed to the background sender.
+        """
         if manual:
             LogManager.get_instance().info(
                 info_messages.get('BATCH_FLUSH_MANUAL')
             )
 
-
-        events_to_send = self.batch_queue[:]  
-        self.batch_queue.clear()
+        with self.lock:
+            if not self.batch_queue:
+                return False
+            events_to_send = list(self.batch_queue)
+            sequences = list(self._queued_sequences)
+            self.batch_queue = deque()
+            self._queued_sequences = deque()
+            self._in_flight_sequences.update(sequences)
+            self._not_full.notify_all()
 
         # Log before sending batch events
         LogManager.get_instance().info(
@@ -100,40 +360,128 @@ class BatchEventQueue:
             )
         )
         network_instance = NetworkManager.get_instance()
-        is_sent_successfully = False
+        is_queued = True
+        for start in range(0, len(events_to_send), self.events_per_request):
+            batch = events_to_send[start:start + self.events_per_request]
+            batch_sequences = sequences[start:start + self.events_per_request]
+            with self.lock:
+                self._in_flight_batches += 1
+            if not network_instance.execute_in_background(
+                self._create_send_request(batch, batch_sequences, self._clock())
+            ):
+                with self.lock:
+                    self._in_flight_batches -= 1
+                self._requeue(batch, batch_sequences)
+                is_queued = False
+        return is_queued
 
+    def _create_send_request(self, events: List[Dict[str, Any]], sequences: List[int], flushed_at: float):
         # Use background thread to handle the batch event sending
         def send_request():
+            is_sent_successfully = False
             try:
-                is_sent_successfully = self.send_batch_events(events_to_send)
-                if is_sent_successfully:
-                    LogManager.get_instance().info(
-                        info_messages.get('BATCH_FLUSH_SUCCESS').format(
-                            eventCount=len(events_to_send)
-                        )
-                    )
-                else:
-                    LogManager.get_instance().error(
-                        error_messages.get("BATCH_FLUSH_FAILED")
-                    )
-                    self.batch_queue.extend(events_to_send)
+                is_sent_successfully = self.send_batch_events(events, on_retry_complete=complete)
+                if is_sent_successfully is None:
+                    # handed to a scheduled retry, which completes the batch when it ends
+                    return
             except Exception as e:
                 LogManager.get_instance().error_log("ERROR_FLUSHING_BATCH_EVENTS", data={"error": str(e)}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
-                self.batch_queue.extend(events_to_send)
-            finally:
-                # Reset the flag after flush
-                self.is_batch_processing = False
+            complete(is_sent_successfully)
 
-        # Execute the batch sending in the background thread
-        network_instance.execute_in_background(send_request)
-        self.clear_request_timer()
-        self.create_new_batch_timer()
-        return is_sent_successfully
+        def complete(is_sent_successfully):
+            if not is_sent_successfully:
+                LogManager.get_instance().error(
+                    error_messages.get("BATCH_FLUSH_FAILED")
+                )
+            self._record_flush(events, is_sent_successfully, self._clock() - flushed_at)
+            if is_sent_successfully:
+                # acknowledged only once delivered, events of a pending retry stay in the spool
+                spooled_sequences = [seq for seq in sequences if seq is not None]
+                if spooled_sequences:
+                    try:
+                        self.spool.ack(spooled_sequences)
+                    except Exception as err:
+                        # left unacknowledged, the events are sent again after a restart
+                        LogManager.get_instance().error(
+                            error_messages.get("ERROR_WRITING_EVENT_SPOOL").format(
+                                directory=self.spool.directory, err=str(err)
+                            )
+                        )
+                with self.lock:
+                    self._in_flight_sequences.difference_update(sequences)
+            else:
+                self._requeue(events, sequences)
+            with self.lock:
+                self._in_flight_batches -= 1
+                has_spilled = self._has_spilled
+            if has_spilled:
+                # a replay slot is free
+                self._flush_requested.set()
+
+        return send_request
+
+    def _requeue(self, events: List[Dict[str, Any]], sequences: List[int]):
+        """
+        Puts unsent events back at the front of the queue. Events that no longer fit are
+        dropped, oldest first, since retrying a send must never block a worker; with a spool
+        they stay on disk and are read back later instead.
+        """
+        with self.lock:
+            self._in_flight_sequences.difference_update(sequences)
+            overflow = max(0, len(self.batch_queue) + len(events) - self.max_queue_size)
+            if sequences:
+                not_spooled = sum(1 for seq in sequences[:overflow] if seq is None)
+                self._dropped += not_spooled
+                if overflow > not_spooled:
+                    self._spill_generation += 1
+                    self._has_spilled = True
+            else:
+                self._dropped += min(overflow, len(events))
+            self.batch_queue.extendleft(reversed(events[overflow:]))
+            self._queued_sequences.extendleft(reversed(sequences[overflow:]))
 
-    def send_batch_events(self, events):
-        """ Send the batch events asynchronously. """
+    def _record_flush(self, events: List[Dict[str, Any]], is_sent_successfully: bool, latency: float):
+        with self.lock:
+            self._flushes += 1
+            if is_sent_successfully:
+                self._flushed_events += len(events)
+            else:
+                self._failed_flushes += 1
+            self._last_flush_latency = latency
+            self._max_flush_latency = max(self._max_flush_latency, latency)
+            self._total_flush_latency += latency
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: Queue depth, enqueued and dropped event counts, flush counts and flush latency
+            (seconds from swapping the events out to the end of their send).
+        """
+        with self.lock:
+            return {
+                "depth": len(self.batch_queue),
+                "max_depth": self._max_depth,
+                "enqueued": self._enqueued,
+                "dropped": self._dropped,
+                "flushes": self._flushes,
+                "failed_flushes": self._failed_flushes,
+                "flushed_events": self._flushed_events,
+                "last_flush_latency": self._last_flush_latency,
+                "max_flush_latency": self._max_flush_latency,
+                "average_flush_latency": self._total_flush_latency / self._flushes if self._flushes else 0.0,
+                "spilled": self._spilled,
+                "spool": self.spool.get_stats() if self.spool is not None else None,
+            }
+
+    def send_batch_events(self, events, on_retry_complete=None):
+        """
+        Send the batch events asynchronously.
+
+        :return: True or False, or None if a retry was scheduled, which then calls on_retry_complete.
+        """
         try:
-            is_sent_successfully = send_post_batch_request(events, self.account_id, self.sdk_key, self.flush_callback)
+            is_sent_successfully = send_post_batch_request(
+                events, self.account_id, self.sdk_key, self.flush_callback, on_retry_complete
+            )
             return is_sent_successfully
         except Exception as ex:
             LogManager.get_instance().error_log("ERROR_FLUSHING_BATCH_EVENTS", data={"error": str(ex)}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
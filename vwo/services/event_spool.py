@@ -0,0 +1,423 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..constants.Constants import Constants
+from ..packages.logger.core.log_manager import LogManager
+from ..utils.log_message_util import error_messages
+from ..utils.fork_util import register_after_fork
+
+try:
+    import fcntl
+except ImportError:  # Windows, the directory is not locked
+    fcntl = None
+
+_SEGMENT_SUFFIX = ".wal"
+_LOCK_FILE = ".lock"
+
+
+class _Segment:
+    __slots__ = ("path", "first_seq", "updated_at", "size", "sequences", "acked", "file")
+
+    def __init__(self, path: str, first_seq: int, updated_at: float):
+        self.path = path
+        self.first_seq = first_seq
+        self.updated_at = updated_at  # time of the newest event, for max_age
+        self.size = 0
+        self.sequences: Set[int] = set()
+        self.acked: Set[int] = set()
+        self.file = None  # open only while the segment is the active one
+
+    def is_done(self) -> bool:
+        return not self.sequences - self.acked
+
+
+class EventSpool:
+    """
+    Write-ahead log of batched events, so queued events survive restarts and outages.
+
+    Events are appended to segment files as "E<tab>seq<tab>time<tab>json" lines and written through to
+    the OS on every append; fsync is batched every `fsync_interval` seconds on a background
+    thread (group commit), so a crash of the process loses nothing and a power loss at most the
+    last interval. Uploaded events are acknowledged with "A<tab>seq,seq" lines in the segment
+    they belong to, and a segment is deleted once all of its events are acknowledged. When
+    the spool outgrows `max_bytes` its oldest segments are dropped, and segments whose newest
+    event is older than `max_age` seconds expire. Only one process may use a directory at a
+    time, so a closed spool takes no more writes.
+
+    :param directory: The directory holding the segment files.
+    :param max_bytes: The maximum size of all segments together.
+    :param max_age: Seconds after which spooled events are dropped.
+    :param segment_bytes: The size at which the active segment is closed and a new one started.
+    :param fsync_interval: Seconds between group fsyncs.
+    :param clock: Wall clock time source for segment ages, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = Constants.EVENT_SPOOL_MAX_BYTES,
+        max_age: float = Constants.EVENT_SPOOL_MAX_AGE,
+        segment_bytes: int = Constants.EVENT_SPOOL_SEGMENT_BYTES,
+        fsync_interval: float = Constants.EVENT_SPOOL_FSYNC_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._first_sequences: List[int] = []
+        self._dirty_files = set()
+        self._next_seq = 1
+        self._closed_event = threading.Event()
+        self._appended = 0
+        self._acked = 0
+        self._dropped = 0
+        self._expired = 0
+        self._fsyncs = 0
+        self.is_detached = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, _LOCK_FILE), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_file.close()
+                raise RuntimeError(f"event spool {directory} is in use by another process")
+        self._recover()
+        self._open_segment()
+
+        self._syncer = threading.Thread(target=self._run_syncer, name="vwo-event-spool", daemon=True)
+        self._syncer.start()
+        register_after_fork(self._detach_after_fork)
+
+    def _detach_after_fork(self) -> None:
+        """
+        Leaves the directory to the parent process: a forked child closes its copies of the
+        files without syncing, compacting or unlocking them. The lock stays held, as it belongs
+        to the parent's open file description.
+        """
+        self._lock = threading.RLock()
+        self._closed_event = threading.Event()
+        self._closed_event.set()
+        for segment in self._segments:
+            if segment.file is not None:
+                segment.file.close()
+                segment.file = None
+        self._segments = []
+        self._first_sequences = []
+        self._dirty_files = set()
+        self._lock_file.close()
+        self.is_detached = True
+
+    def _recover(self) -> None:
+        """Rebuilds the segment index from the files left by a previous run."""
+        file_names = sorted(name for name in os.listdir(self.directory) if name.endswith(_SEGMENT_SUFFIX))
+        for file_name in file_names:
+            path = os.path.join(self.directory, file_name)
+            try:
+                first_seq = int(file_name[: -len(_SEGMENT_SUFFIX)])
+            except ValueError:
+                continue
+            # the time comes from the event records, acks appended later move the file mtime
+            segment = _Segment(path, first_seq, 0.0)
+            for kind, value in self._read_records(path):
+                if kind == "E":
+                    segment.sequences.add(value[0])
+                    segment.updated_at = max(segment.updated_at, value[2])
+                else:
+                    segment.acked.update(value)
+            segment.size = os.path.getsize(path)
+            if segment.is_done():
+                os.remove(path)
+                continue
+            self._segments.append(segment)
+            self._first_sequences.append(first_seq)
+            self._next_seq = max(self._next_seq, max(segment.sequences) + 1)
+        self.expire()
+
+    @staticmethod
+    def _read_records(path: str) -> Iterator[Tuple[str, Any]]:
+        with open(path, "r", encoding="utf-8") as segment_file:
+            for line in segment_file:
+                if not line.endswith("\n"):
+                    # torn write at a crash, everything before it is intact
+                    return
+                kind, _, rest = line[:-1].partition("\t")
+                try:
+                    if kind == "E":
+                        seq, appended_at, payload = rest.split("\t", 2)
+                        yield kind, (int(seq), payload, float(appended_at))
+                    elif kind == "A":
+                        yield kind, [int(seq) for seq in rest.split(",")]
+                except ValueError:
+                    continue
+
+    def _open_segment(self) -> None:
+        if self.is_detached:
+            raise RuntimeError(f"event spool {self.directory} belongs to the parent process")
+        segment = _Segment(
+            os.path.join(self.directory, f"{self._next_seq:020d}{_SEGMENT_SUFFIX}"), self._next_seq, self._clock()
+        )
+        segment.file = open(segment.path, "a", encoding="utf-8")
+        self._segments.append(segment)
+        self._first_sequences.append(segment.first_seq)
+
+    def _write(self, segment: _Segment, line: str) -> None:
+        if segment.file is not None:
+            segment.file.write(line)
+            # written through to the OS, so a crash of the process loses nothing
+            segment.file.flush()
+            self._dirty_files.add(segment.file)
+        else:
+            # an ack in a closed segment; losing it to a power loss only means a resend
+            with open(segment.path, "a", encoding="utf-8") as segment_file:
+                segment_file.write(line)
+        segment.size += len(line.encode("utf-8"))
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """
+        Appends an event to the active segment.
+
+        :param event: The event payload.
+        :return: The sequence number that acknowledges the event.
+        """
+        line_payload = json.dumps(event, separators=(",", ":"))
+        with self._lock:
+            if self.is_detached:
+                raise RuntimeError(f"event spool {self.directory} belongs to the parent process")
+            if self._closed_event.is_set():
+                # the directory lock is released, another process may own the directory now
+                raise RuntimeError(f"event spool {self.directory} is closed")
+            seq = self._next_seq
+            self._next_seq += 1
+            active = self._segments[-1]
+            appended_at = self._clock()
+            self._write(active, f"E\t{seq}\t{appended_at:.3f}\t{line_payload}\n")
+            active.sequences.add(seq)
+            active.updated_at = appended_at
+            self._appended += 1
+            if active.size >= self.segment_bytes:
+                self._roll()
+            if self._total_bytes() > self.max_bytes:
+                self._drop_oldest()
+            return seq
+
+    def _roll(self) -> None:
+        active = self._segments[-1]
+        self._close_file(active)
+        if active.is_done():
+            self._remove(active)
+        self._open_segment()
+
+    def _close_file(self, segment: _Segment) -> None:
+        if segment.file is None:
+            return
+        segment.file.flush()
+        os.fsync(segment.file.fileno())
+        self._fsyncs += 1
+        self._dirty_files.discard(segment.file)
+        segment.file.close()
+        segment.file = None
+
+    def _total_bytes(self) -> int:
+        return sum(segment.size for segment in self._segments)
+
+    def _drop_oldest(self) -> None:
+        # the active segment is kept, whatever its size
+        while len(self._segments) > 1 and self._total_bytes() > self.max_bytes:
+            segment = self._segments[0]
+            self._dropped += len(segment.sequences - segment.acked)
+            self._remove(segment)
+
+    def _remove(self, segment: _Segment) -> None:
+        self._close_file(segment)
+        index = self._segments.index(segment)
+        del self._segments[index]
+        del self._first_sequences[index]
+        try:
+            os.remove(segment.path)
+        except OSError:
+            pass
+
+    def _find_segment(self, seq: int) -> Optional[_Segment]:
+        index = bisect.bisect_right(self._first_sequences, seq) - 1
+        if index < 0:
+            return None
+        segment = self._segments[index]
+        return segment if seq in segment.sequences else None
+
+    def ack(self, sequences: Iterable[int]) -> None:
+        """
+        Acknowledges uploaded events. Segments whose events are all acknowledged are deleted,
+        except the active one, which is deleted once it is closed. Acknowledgements after close
+        are not written, so those events are sent again after a restart.
+
+        :param sequences: The sequence numbers returned by append.
+        """
+        with self._lock:
+            if self._closed_event.is_set():
+                return
+            by_segment: Dict[int, List[int]] = {}
+            for seq in sequences:
+                segment = self._find_segment(seq)
+                if segment is not None and seq not in segment.acked:
+                    by_segment.setdefault(segment.first_seq, []).append(seq)
+            for first_seq, acked_sequences in by_segment.items():
+                segment = self._find_segment(acked_sequences[0])
+                segment.acked.update(acked_sequences)
+                self._acked += len(acked_sequences)
+                if segment.is_done() and segment is not self._segments[-1]:
+                    # compaction: nothing in the segment needs replaying any more
+                    self._remove(segment)
+                else:
+                    self._write(segment, "A\t" + ",".join(str(seq) for seq in acked_sequences) + "\n")
+
+    def pending(
+        self,
+        exclude: Optional[Set[int]] = None,
+        limit: Optional[int] = None,
+        max_seq: Optional[int] = None,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Reads unacknowledged events back from disk, oldest first.
+
+        :param exclude: Sequence numbers to skip, e.g. events already queued in memory.
+        :param limit: The maximum number of events to return.
+        :param max_seq: Skip events appended after this sequence number.
+        :return: (sequence number, event) pairs.
+        """
+        exclude = exclude or set()
+        with self._lock:
+            self.expire()
+            segments = []
+            for segment in self._segments:
+                wanted = segment.sequences - segment.acked - exclude
+                if max_seq is not None:
+                    wanted = {seq for seq in wanted if seq <= max_seq}
+                if wanted:
+                    segments.append((segment.path, wanted))
+        events = []
+        for path, wanted in segments:
+            try:
+                records = list(self._read_records(path))
+            except OSError:
+                # dropped or compacted since the index was read
+                continue
+            for kind, value in records:
+                if kind != "E" or value[0] not in wanted:
+                    continue
+                try:
+                    events.append((value[0], json.loads(value[1])))
+                except ValueError:
+                    continue
+                if limit is not None and len(events) >= limit:
+                    return events
+        return events
+
+    def get_last_sequence(self) -> int:
+        """
+        :return: The sequence number of the last appended event.
+        """
+        with self._lock:
+            return self._next_seq - 1
+
+    def pending_count(self) -> int:
+        """
+        :return: The number of spooled events not acknowledged yet.
+        """
+        with self._lock:
+            return sum(len(segment.sequences - segment.acked) for segment in self._segments)
+
+    def expire(self) -> None:
+        """
+        Drops the segments whose newest event is older than max_age.
+        """
+        with self._lock:
+            if self._closed_event.is_set():
+                return
+            expires_before = self._clock() - self.max_age
+            for segment in list(self._segments):
+                if segment.updated_at >= expires_before:
+                    break
+                if segment.file is not None:
+                    # the active segment, replaced before it goes
+                    self._roll()
+                    if segment not in self._segments:
+                        continue
+                self._expired += len(segment.sequences - segment.acked)
+                self._remove(segment)
+
+    def sync(self) -> None:
+        """
+        Group commit: one fsync of every segment written since the last one.
+        """
+        with self._lock:
+            dirty_files, self._dirty_files = self._dirty_files, set()
+            for segment_file in dirty_files:
+                if not segment_file.closed:
+                    os.fsync(segment_file.fileno())
+                    self._fsyncs += 1
+
+    def _run_syncer(self) -> None:
+        while not self._closed_event.wait(self.fsync_interval):
+            try:
+                self.sync()
+                self.expire()
+            except Exception as err:
+                LogManager.get_instance().error(
+                    error_messages.get("ERROR_WRITING_EVENT_SPOOL").format(directory=self.directory, err=str(err))
+                )
+
+    def close(self) -> None:
+        """
+        Syncs and closes the active segment, stops the background fsync and releases the
+        directory. Appends after close are refused.
+        """
+        with self._lock:
+            self._closed_event.set()
+            active = self._segments[-1] if self._segments else None
+            if active is not None:
+                self._close_file(active)
+                if active.is_done():
+                    self._remove(active)
+            self._lock_file.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Segment count, bytes on disk, pending events and appended, acknowledged,
+            dropped (over max_bytes) and expired (over max_age) event counts, plus fsyncs.
+        """
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "bytes": self._total_bytes(),
+                "pending": sum(len(segment.sequences - segment.acked) for segment in self._segments),
+                "appended": self._appended,
+                "acked": self._acked,
+                "dropped": self._dropped,
+                "expired": self._expired,
+                "fsyncs": self._fsyncs,
+            }
@@ -0,0 +1,109 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+from ..constants.Constants import Constants
+from ..utils.fork_util import register_after_fork
+
+
+class ImpressionDeduplicator:
+    """
+    Drops vwo_variationShown impressions already sent for the same (uuid, campaign id,
+    variation id) within `window` seconds.
+
+    Keys are kept as 16 byte digests in insertion order, which is also send time order, so
+    expired keys are always at the front. At most `max_keys` are held; the oldest are evicted
+    first, which can only let a duplicate through, never drop a new impression.
+
+    A key sent again after its window is reported with isFirst 0, as long as it is still held.
+
+    :param window: Seconds during which repeated impressions are dropped.
+    :param max_keys: The maximum number of keys held.
+    :param clock: Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        window: float = Constants.IMPRESSION_DEDUP_WINDOW,
+        max_keys: int = Constants.IMPRESSION_DEDUP_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sent_at: "OrderedDict[bytes, float]" = OrderedDict()
+        self._passed = 0
+        self._dropped = 0
+        self._evicted = 0
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        # the keys are kept: the parent sent those impressions
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(payload: Dict[str, Any]) -> bytes:
+        data = payload["d"]
+        props = data["event"]["props"]
+        key = f"{data.get('visId')}:{props.get('id')}:{props.get('variation')}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+    def should_send(self, payload: Dict[str, Any]) -> bool:
+        """
+        Records an impression about to be sent and sets its isFirst flag.
+
+        :param payload: The vwo_variationShown event payload.
+        :return: False if the impression is a duplicate within the window and must be dropped.
+        """
+        key = self._get_key(payload)
+        now = self._clock()
+        with self._lock:
+            sent_at = self._sent_at.get(key)
+            if sent_at is not None and now - sent_at < self.window:
+                self._dropped += 1
+                return False
+            if sent_at is not None:
+                self._sent_at.move_to_end(key)
+            self._sent_at[key] = now
+            while len(self._sent_at) > self.max_keys:
+                self._sent_at.popitem(last=False)
+                self._evicted += 1
+            self._passed += 1
+        payload["d"]["event"]["props"]["isFirst"] = 1 if sent_at is None else 0
+        return True
+
+    def filter(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        :param payloads: vwo_variationShown event payloads.
+        :return: The payloads that are not duplicates within the window.
+        """
+        return [payload for payload in payloads if self.should_send(payload)]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Keys held, and passed, dropped and evicted impression counts.
+        """
+        with self._lock:
+            return {
+                "keys": len(self._sent_at),
+                "passed": self._passed,
+                "dropped": self._dropped,
+                "evicted": self._evicted,
+            }
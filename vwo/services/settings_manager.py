@@ -13,8 +13,11 @@
 # limitations under the License.
 
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import os
 import random
+import tempfile
 
 from vwo.packages.logger.enums.log_level_enum import LogLevelEnum
 from ..packages.network_layer.manager.network_manager import NetworkManager
@@ -29,11 +32,17 @@ import jsonschema
 import time
 from ..enums.api_enum import ApiEnum
 from ..enums.debug_category_enum import DebugCategoryEnum
+from ..enums.endpoint_class_enum import EndpointClassEnum
 from ..utils.debugger_service_util import send_debug_event_to_vwo
+from ..packages.storage.settings_cache import SettingsCacheConnector, FileSettingsCache
+from ..utils.ttl_cache_util import TtlCache
+from .attribute_list_store import AttributeListStore
+from .shared_settings_store import SharedSettingsStore
 
 
 class SettingsManager:
     _instance = None
+    _settings_validator = None
 
     def __init__(self, options):
         self.sdk_key = options["sdk_key"]
@@ -48,6 +57,50 @@ class SettingsManager:
         self.hostname = Constants.HOST_NAME
         self.protocol = Constants.HTTPS_PROTOCOL
         self.port = None
+        # used for conditional fetches: the ETag is sent back as If-None-Match and the
+        # digest detects an unchanged body when the server does not support ETags
+        self.settings_etag = None
+        self.settings_digest = None
+        self.last_settings = None
+        self.validated_settings_digest = None
+        self.settings_cache = SettingsManager.create_settings_cache(options.get("settings_cache"))
+        self.cached_settings_digest = None
+        # set when settings_digest was seeded from the cached settings rather than a fetched body
+        self.is_settings_digest_from_cache = False
+        self.shared_settings_store = SettingsManager.create_shared_settings_store(
+            options.get("shared_settings"), self.get_settings_cache_key()
+        )
+        # generation and digest of the last shared snapshot read or published by this process
+        self.shared_settings_generation = 0
+        self.shared_settings_digest = None
+        # digest of the fetched settings body this process last published when elected
+        self.published_settings_digest = None
+        gateway_service_options = options.get("gateway_service") or {}
+        # gateway user data (location and user agent details) keyed by (userAgent, ipAddress)
+        self.user_data_cache = SettingsManager.create_gateway_cache(
+            gateway_service_options.get("user_data_cache"),
+            "user_data_cache",
+            Constants.GATEWAY_USER_DATA_CACHE_TTL,
+            lambda user_data: not isinstance(user_data, dict),
+        )
+        # inlist(...) check results keyed by (listId, attribute); False is a failed check,
+        # a value outside the list comes back as "false"
+        self.inlist_cache = SettingsManager.create_gateway_cache(
+            gateway_service_options.get("inlist_cache"),
+            "inlist_cache",
+            Constants.GATEWAY_INLIST_CACHE_TTL,
+            lambda result: result is None or result is False,
+        )
+        # resolved aliases keyed by user id, set_alias drops the ids it changes
+        self.alias_cache = SettingsManager.create_gateway_cache(
+            gateway_service_options.get("alias_cache"),
+            "alias_cache",
+            Constants.GATEWAY_ALIAS_CACHE_TTL,
+            lambda user_id: not user_id,
+        )
+        self.attribute_list_store = SettingsManager.create_attribute_list_store(
+            gateway_service_options.get("attribute_lists")
+        )
 
         if ("proxy_url" in options and options["proxy_url"] is not None ) and ("gateway_service" in options and "url" in options["gateway_service"]):
             LogManager.get_instance().info(
@@ -96,6 +149,9 @@ class SettingsManager:
         LogManager.get_instance().debug(
             debug_messages.get("SERVICE_INITIALIZED").format(service="Settings Manager")
         )
+        previous_instance = SettingsManager._instance
+        if previous_instance is not None and getattr(previous_instance, "attribute_list_store", None):
+            previous_instance.attribute_list_store.stop()
         SettingsManager._instance = self
 
     @classmethod
@@ -108,12 +164,300 @@ class SettingsManager:
     def get_sdk_key(self):
         return self.sdk_key
 
-    def fetch_settings_and_cache_in_storage(self, is_via_webhook=False):
+    @staticmethod
+    def create_settings_cache(settings_cache_option: Any) -> Optional[SettingsCacheConnector]:
+        """
+        Resolves the settings_cache option: True or a dict (with an optional "path")
+        selects the file-backed cache, any object with get/set is used as is.
+        :param settings_cache_option: The settings_cache value passed in options.
+        :return: The settings cache connector, or None if caching is disabled.
+        """
+        if not settings_cache_option:
+            return None
+        if settings_cache_option is True:
+            return FileSettingsCache()
+        if isinstance(settings_cache_option, dict):
+            return FileSettingsCache(settings_cache_option.get("path"))
+        return settings_cache_option
+
+    @staticmethod
+    def create_shared_settings_store(shared_settings_option: Any, key: str) -> Optional[SharedSettingsStore]:
+        """
+        Resolves the shared_settings option: True or a dict (with an optional "path") makes
+        the SDK processes of this host share one settings fetch.
+        :param shared_settings_option: The shared_settings value passed in options.
+        :param key: The settings cache key, naming the shared files.
+        :return: The shared settings store, or None if sharing is disabled or unavailable.
+        """
+        if not shared_settings_option:
+            return None
+        if not SharedSettingsStore.is_supported():
+            LogManager.get_instance().info(info_messages.get("SHARED_SETTINGS_NOT_SUPPORTED"))
+            return None
+        path = shared_settings_option.get("path") if isinstance(shared_settings_option, dict) else None
+        directory = path or os.path.join(tempfile.gettempdir(), "vwo-fme-shared-settings")
+        try:
+            return SharedSettingsStore(directory, key)
+        except OSError as err:
+            LogManager.get_instance().error(
+                error_messages.get("ERROR_SHARED_SETTINGS").format(operation="opened", err=str(err))
+            )
+            return None
+
+    @staticmethod
+    def create_gateway_cache(
+        cache_option: Any, option_key: str, default_ttl: float, is_error: Callable[[Any], bool]
+    ) -> Optional[TtlCache]:
+        """
+        Resolves a gateway_service cache option: False disables the cache, None or True uses the
+        defaults and a dict may set "max_size", "ttl" and "error_ttl" (seconds).
+        :param cache_option: The value passed under gateway_service.
+        :param option_key: The name of the option, for logging.
+        :param default_ttl: Seconds a looked up value stays fresh by default.
+        :param is_error: Tells whether a looked up value is a failed lookup.
+        :return: The cache, or None if caching is disabled.
+        """
+        if cache_option is False:
+            return None
+        cache_option = cache_option if isinstance(cache_option, dict) else {}
+        defaults = {
+            "max_size": Constants.GATEWAY_CACHE_MAX_SIZE,
+            "ttl": default_ttl,
+            "error_ttl": Constants.GATEWAY_CACHE_ERROR_TTL,
+        }
+        config = {}
+        for key, default_value in defaults.items():
+            value = cache_option.get(key, default_value)
+            is_valid = isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+            if key == "max_size":
+                is_valid = is_valid and isinstance(value, int) and value >= 1
+            if not is_valid:
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_GATEWAY_CACHE_CONFIGURATION").format(
+                        key=key,
+                        cache=option_key,
+                        correctType="int >= 1" if key == "max_size" else "number >= 0",
+                        defaultValue=default_value,
+                    )
+                )
+                value = default_value
+            config[key] = value
+        return TtlCache(config["max_size"], config["ttl"], config["error_ttl"], is_error)
+
+    @staticmethod
+    def create_attribute_list_store(attribute_lists_option: Any) -> Optional[AttributeListStore]:
+        """
+        Resolves the gateway_service.attribute_lists option: a dict with a "loader" (an
+        AttributeListLoader), optional "list_ids" to download up front and an optional
+        "refresh_interval" in seconds.
+
+        :param attribute_lists_option: The value passed under gateway_service.
+        :return: The started store, or None if no loader is given.
+        """
+        if not isinstance(attribute_lists_option, dict):
+            return None
+        loader = attribute_lists_option.get("loader")
+        if not callable(getattr(loader, "load", None)):
+            return None
+        refresh_interval = attribute_lists_option.get("refresh_interval", Constants.ATTRIBUTE_LIST_REFRESH_INTERVAL)
+        if isinstance(refresh_interval, bool) or not isinstance(refresh_interval, (int, float)) or refresh_interval <= 0:
+            LogManager.get_instance().error(
+                error_messages.get("INVALID_GATEWAY_CACHE_CONFIGURATION").format(
+                    key="refresh_interval",
+                    cache="attribute_lists",
+                    correctType="number > 0",
+                    defaultValue=Constants.ATTRIBUTE_LIST_REFRESH_INTERVAL,
+                )
+            )
+            refresh_interval = Constants.ATTRIBUTE_LIST_REFRESH_INTERVAL
+        store = AttributeListStore(loader, attribute_lists_option.get("list_ids"), refresh_interval)
+        store.start()
+        return store
+
+    def get_settings_cache_key(self) -> str:
+        return f"{self.account_id}_{self.sdk_key}"
+
+    def get_cached_settings(self) -> Optional[Dict]:
+        """
+        Reads the last known good settings from the settings cache.
+        :return: The cached settings if present and valid, else None.
+        """
+        if not self.settings_cache:
+            return None
+        try:
+            settings = self.settings_cache.get(self.get_settings_cache_key())
+        except Exception as err:
+            LogManager.get_instance().error_log("ERROR_SETTINGS_CACHE", data={"operation": "read", "err": str(err)}, debug_data={"an": ApiEnum.INIT.value})
+            return None
+
+        if not settings or not self.is_settings_valid(settings):
+            return None
+
+        # seed the change detection with the cached settings, so that a refresh returning
+        # the same settings hands back this object instead of a rebuilt copy
+        digest = SettingsManager.compute_settings_digest(None, settings)
+        self.last_settings = settings
+        self.settings_digest = digest
+        self.validated_settings_digest = digest
+        self.cached_settings_digest = digest
+        self.is_settings_digest_from_cache = True
+        return settings
+
+    def cache_settings(self, settings: Dict) -> None:
+        """
+        Writes validated settings to the settings cache, unless they are already there.
+        :param settings: The validated settings.
+        """
+        if not self.settings_cache or not self.settings_digest:
+            return
+        if self.settings_digest == self.cached_settings_digest:
+            return
         try:
-            settings = self.fetch_settings(is_via_webhook)
-            # Simulate storing settings in a cache (memory, file, etc.)
-            # For demonstration, we'll skip actual caching
+            self.settings_cache.set(self.get_settings_cache_key(), settings)
+            self.cached_settings_digest = self.settings_digest
+        except Exception as err:
+            LogManager.get_instance().error_log("ERROR_SETTINGS_CACHE", data={"operation": "written", "err": str(err)}, debug_data={"an": ApiEnum.INIT.value})
+
+    def get_shared_settings(self) -> Optional[Dict]:
+        """
+        Reads the settings published by the elected process of this host. The generation
+        counter is checked first, so an unchanged snapshot hands out last_settings as is.
+        On the first call the elected process may still be fetching, so this waits for it.
+        :return: The shared settings, or None if this process has to fetch them itself.
+        """
+        store = self.shared_settings_store
+        generation = store.get_generation()
+        if self.last_settings is not None and generation == self.shared_settings_generation:
+            return self.last_settings
+        if self.last_settings is None and self.shared_settings_generation == 0:
+            snapshot = store.wait_for_snapshot()
+        else:
+            snapshot = store.read()
+        if snapshot is None:
+            return None
+        generation, settings = snapshot
+        digest = SettingsManager.compute_settings_digest(None, settings)
+        if self.last_settings is not None and digest == self.shared_settings_digest:
+            # republished by a newly elected process, the settings did not change
+            self.shared_settings_generation = generation
+            return self.last_settings
+        if not self.is_settings_valid(settings):
+            return None
+        # seeded like cached settings, so this process does not rebuild its client when
+        # it is elected later and fetches the same settings
+        self.last_settings = settings
+        self.settings_digest = digest
+        self.is_settings_digest_from_cache = True
+        self.validated_settings_digest = digest
+        self.settings_etag = None
+        self.shared_settings_generation = generation
+        self.shared_settings_digest = digest
+        return settings
+
+    def publish_shared_settings(self, settings: Dict) -> None:
+        """
+        Publishes validated settings for the other processes of this host, if this process
+        is the elected one and the settings changed since its last publish.
+        :param settings: The validated settings.
+        """
+        store = self.shared_settings_store
+        if store is None or not store.is_leader or self.published_settings_digest == self.settings_digest:
+            return
+        try:
+            if self.published_settings_digest is None:
+                LogManager.get_instance().info(
+                    info_messages.get("SHARED_SETTINGS_LEADER").format(directory=store.directory)
+                )
+            self.shared_settings_generation = store.publish(settings)
+            self.published_settings_digest = self.settings_digest
+        except (OSError, ValueError) as err:
+            LogManager.get_instance().error(
+                error_messages.get("ERROR_SHARED_SETTINGS").format(operation="published", err=str(err))
+            )
+
+    def get_settings_digest(self) -> Optional[str]:
+        return self.settings_digest
+
+    @staticmethod
+    def compute_settings_digest(content: Optional[bytes], settings: Any) -> str:
+        """
+        Computes the digest of a settings body. Hashing the raw body is cheap; the JSON
+        dump is only a fallback for responses without one.
+        :param content: The raw response body, if available.
+        :param settings: The parsed settings.
+        :return: The hex digest.
+        """
+        if not content:
+            content = json.dumps(settings, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def _remember_settings(self, response, settings, is_via_webhook=False):
+        """
+        Records the digest and ETag of a fetched settings body. An unchanged body resolves to
+        the previously returned settings object, so callers can skip re-validating it.
+        :param response: The response model of the settings request.
+        :param settings: The parsed settings.
+        :param is_via_webhook: Whether the settings came from the webhook endpoint.
+        :return: The settings to hand out.
+        """
+        if response.get_status_code() != 200:
+            return settings
+
+        if response.get_is_content_unchanged() and self.last_settings is not None:
+            # the network client matched the body against settings_digest and skipped parsing it
+            LogManager.get_instance().debug(
+                debug_messages.get("SETTINGS_NOT_MODIFIED").format(reason="same digest")
+            )
+            settings = self.last_settings
+        elif not isinstance(settings, dict):
             return settings
+        else:
+            digest = response.get_content_digest() or SettingsManager.compute_settings_digest(
+                response.get_content(), settings
+            )
+            if self.last_settings is not None and (
+                digest == self.settings_digest or self._matches_cached_settings(settings, digest)
+            ):
+                LogManager.get_instance().debug(
+                    debug_messages.get("SETTINGS_NOT_MODIFIED").format(reason="same digest")
+                )
+                settings = self.last_settings
+            else:
+                self.last_settings = settings
+                self.settings_digest = digest
+
+        # the webhook endpoint is not cached, its ETag is not meaningful for polling
+        if not is_via_webhook:
+            self.settings_etag = (response.get_headers() or {}).get("ETag")
+        return settings
+
+    def _matches_cached_settings(self, settings: Dict, digest: str) -> bool:
+        """
+        Checks the first fetched body after a cache start against the cached settings.
+        The seeded digest is computed from the parsed cached settings, which the digest of
+        a raw body never equals, so the fetched settings are compared the same way once.
+        On a match the digest of the raw body takes over for the following fetches.
+        :param settings: The parsed fetched settings.
+        :param digest: The digest of the fetched body.
+        :return: True if the fetched settings equal the cached ones.
+        """
+        if not self.is_settings_digest_from_cache:
+            return False
+        self.is_settings_digest_from_cache = False
+        if SettingsManager.compute_settings_digest(None, settings) != self.settings_digest:
+            return False
+
+        if self.validated_settings_digest == self.settings_digest:
+            self.validated_settings_digest = digest
+        if self.cached_settings_digest == self.settings_digest:
+            self.cached_settings_digest = digest
+        self.settings_digest = digest
+        return True
+
+    def fetch_settings_and_cache_in_storage(self, is_via_webhook=False):
+        try:
+            # the settings cache is written by get_settings once the settings pass validation
+            return self.fetch_settings(is_via_webhook)
         except Exception as err:
             LogManager.get_instance().error(
                 error_messages.get("SETTINGS_FETCH_ERROR").format(err=str(err))
@@ -150,6 +494,11 @@ class SettingsManager:
             if not is_via_webhook
             else Constants.WEBHOOK_SETTINTS_ENDPOINT
         )
+        # Ask the server to skip the body if the settings have not changed since the last fetch
+        headers = None
+        if not is_via_webhook and self.settings_etag and self.last_settings is not None:
+            headers = {"If-None-Match": self.settings_etag}
+
         # Start timer for settings fetch
         settings_fetch_start_time = time.time() * 1000  # Convert to milliseconds
         response = None
@@ -160,12 +509,24 @@ class SettingsManager:
                 endpoint,
                 options,
                 None,
-                None,
+                headers,
                 self.protocol,
                 self.port,
             )
             request.set_timeout(self.network_timeout)
+            request.set_endpoint_class(EndpointClassEnum.SETTINGS.value)
+            if self.last_settings is not None:
+                # lets the network client detect an unchanged body before parsing it
+                request.set_known_content_digest(self.settings_digest)
             response = network_instance.get(request)
+
+            if response.get_status_code() == 304 and self.last_settings is not None:
+                self.settings_fetch_time = int((time.time() * 1000) - settings_fetch_start_time)
+                LogManager.get_instance().debug(
+                    debug_messages.get("SETTINGS_NOT_MODIFIED").format(reason="HTTP 304")
+                )
+                return self.last_settings
+
             response_data = response.get_data()
 
             if response.get_total_attempts() > 0 or response.status_code == 400:
@@ -191,7 +552,7 @@ class SettingsManager:
 
             # Calculate settings fetch time
             self.settings_fetch_time = int((time.time() * 1000) - settings_fetch_start_time)
-            return response_data
+            return self._remember_settings(response, response_data, is_via_webhook)
 
         except Exception as err:
             debug_event_props = {
@@ -213,10 +574,23 @@ class SettingsManager:
         if force_fetch:
             return self.fetch_settings_and_cache_in_storage(True)
         else:
-            # Simulate fetching settings from a cache
-            # For demonstration, we'll skip actual caching
+            if self.shared_settings_store is not None and not self.shared_settings_store.try_lead():
+                shared_settings = self.get_shared_settings()
+                if shared_settings is not None:
+                    self.is_settings_valid_on_init = True
+                    return shared_settings
             fetched_settings = self.fetch_settings_and_cache_in_storage()
-            if self.is_settings_valid(fetched_settings):
+            # an unchanged settings body that already passed validation is not validated again
+            is_already_validated = (
+                fetched_settings is not None
+                and fetched_settings is self.last_settings
+                and self.validated_settings_digest == self.settings_digest
+            )
+            if is_already_validated or self.is_settings_valid(fetched_settings):
+                if fetched_settings is self.last_settings:
+                    self.validated_settings_digest = self.settings_digest
+                    self.cache_settings(fetched_settings)
+                    self.publish_shared_settings(fetched_settings)
                 self.is_settings_valid_on_init = True
                 LogManager.get_instance().info(
                     info_messages.get("SETTINGS_FETCH_SUCCESS").format()
@@ -228,6 +602,18 @@ class SettingsManager:
                 )
                 return {}
 
+    @staticmethod
+    def get_settings_validator():
+        """
+        Returns the schema validator for the settings file.
+        The validator is built once and reused, as compiling the schema is costly.
+        """
+        if SettingsManager._settings_validator is None:
+            SettingsManager._settings_validator = jsonschema.Draft7Validator(
+                SETTINGS_FILE_SCHEMA
+            )
+        return SettingsManager._settings_validator
+
     @staticmethod
     def is_settings_valid(settings):
         try:
@@ -240,7 +626,7 @@ class SettingsManager:
             return False
 
         # Validate the loaded JSON data against the schema
-        validator = jsonschema.Draft7Validator(SETTINGS_FILE_SCHEMA)
+        validator = SettingsManager.get_settings_validator()
         errors = sorted(validator.iter_errors(settings_file), key=lambda e: e.path)
 
         if errors:
@@ -0,0 +1,184 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..constants.Constants import Constants
+from ..utils.fork_util import register_after_fork
+
+try:
+    import fcntl
+except ImportError:  # Windows, where the shared snapshot is not supported
+    fcntl = None
+
+_MAGIC = b"VWOSET\x00\x01"
+# magic, generation
+_SNAPSHOT_HEADER = struct.Struct("<8sQ")
+_GENERATION = struct.Struct("<Q")
+
+
+class SharedSettingsStore:
+    """
+    Host-level settings snapshot shared by the SDK processes of one account and SDK key.
+
+    One process, elected by an exclusive lock on `<key>.lock`, fetches the settings and
+    publishes them as a compact JSON snapshot (`<key>.snapshot`, replaced atomically), then
+    bumps the generation counter in `<key>.generation`. The other processes map the counter
+    read-only, so checking for a new version is a memory read, and only read the snapshot
+    when the generation moves. When the elected process exits its lock is released and the
+    next process to check takes over.
+
+    Only the standard library's mmap and fcntl are used, so this works on Python 3.7, where
+    multiprocessing.shared_memory is not available. See is_supported for other platforms.
+
+    :param directory: The directory holding the shared files.
+    :param key: The account ID and SDK key, hashed into the file names.
+    """
+
+    def __init__(self, directory: str, key: str):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        base_name = os.path.join(directory, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32])
+        self.snapshot_path = base_name + ".snapshot"
+        self.generation_path = base_name + ".generation"
+        self.lock_path = base_name + ".lock"
+        self.is_leader = False
+        self._lock_file = None
+        self._generation_file = None
+        self._generation_map = None
+        self._open_generation()
+        register_after_fork(self._reinit_after_fork)
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        :return: True if the platform has the file locks used for the election.
+        """
+        return fcntl is not None
+
+    def _open_generation(self) -> None:
+        self._generation_file = os.open(self.generation_path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = os.fstat(self._generation_file).st_size
+        if size < _GENERATION.size:
+            # two processes may both pad the file, neither write changes a counter already set
+            os.pwrite(self._generation_file, b"\x00" * (_GENERATION.size - size), size)
+        # mapped read-only, the elected process writes the counter through the file
+        self._generation_map = mmap.mmap(self._generation_file, _GENERATION.size, access=mmap.ACCESS_READ)
+
+    def _reinit_after_fork(self) -> None:
+        # the lock belongs to the parent's open file description, the child must not lead with it
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.is_leader = False
+
+    def try_lead(self) -> bool:
+        """
+        Takes the fetcher role if no other process holds it.
+
+        :return: True if this process is the elected fetcher.
+        """
+        if self.is_leader:
+            return True
+        try:
+            if self._lock_file is None:
+                self._lock_file = open(self.lock_path, "a")
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        self.is_leader = True
+        return True
+
+    def get_generation(self) -> int:
+        """
+        :return: The generation of the last published snapshot, 0 if none was published.
+        """
+        return _GENERATION.unpack_from(self._generation_map, 0)[0]
+
+    def publish(self, settings: Dict[str, Any]) -> int:
+        """
+        Writes a new snapshot and bumps the generation. Only the elected process publishes.
+
+        :param settings: The validated settings.
+        :return: The generation of the snapshot.
+        """
+        generation = self.get_generation() + 1
+        payload = json.dumps(settings, separators=(",", ":")).encode("utf-8")
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".snapshot-", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(_SNAPSHOT_HEADER.pack(_MAGIC, generation))
+                temp_file.write(payload)
+            # readers open either the previous snapshot or this one, never a partial file
+            os.replace(temp_path, self.snapshot_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        # bumped after the replace, so a reader seeing the new generation finds the new snapshot
+        os.pwrite(self._generation_file, _GENERATION.pack(generation), 0)
+        return generation
+
+    def read(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Reads the current snapshot through a read-only mapping.
+
+        :return: The generation and the settings, or None if there is no valid snapshot.
+        """
+        try:
+            with open(self.snapshot_path, "rb") as snapshot_file:
+                if os.fstat(snapshot_file.fileno()).st_size <= _SNAPSHOT_HEADER.size:
+                    return None
+                with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+                    magic, generation = _SNAPSHOT_HEADER.unpack_from(snapshot, 0)
+                    if magic != _MAGIC:
+                        return None
+                    return generation, json.loads(snapshot[_SNAPSHOT_HEADER.size:].decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def wait_for_snapshot(self, timeout: float = Constants.SHARED_SETTINGS_WAIT) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Waits for the elected process to publish a first snapshot, e.g. while all workers of a
+        host start at once.
+
+        :param timeout: Seconds to wait.
+        :return: The generation and the settings, or None if nothing was published in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self.read() if self.get_generation() > 0 else None
+            if snapshot is not None or time.monotonic() >= deadline or self.try_lead():
+                return snapshot
+            time.sleep(Constants.SHARED_SETTINGS_WAIT_STEP)
+
+    def close(self) -> None:
+        """
+        Releases the fetcher role and unmaps the generation counter.
+        """
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.is_leader = False
+        if self._generation_map is not None:
+            self._generation_map.close()
+            os.close(self._generation_file)
+            self._generation_map = None
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional
 import json
 
 from ..enums.url_enum import UrlEnum
@@ -25,12 +25,13 @@ from ..constants.Constants import Constants
 from ..utils.gateway_service_util import get_from_gateway_service, post_to_gateway_service
 from ..models.user.context_model import ContextModel
 
-def get_alias(context: ContextModel) -> str:
+def fetch_aliases(user_ids: List[str], context: ContextModel) -> Dict[str, str]:
     """
-    Get the alias for the given user ID.
+    Get the user IDs the given IDs are aliases of, in one gateway request.
 
-    :param context: The context to get the alias for.
-    :return: The alias for the given user ID.
+    :param user_ids: The IDs to resolve.
+    :param context: The context of the API call, for logging.
+    :return: The resolved user ID of every given ID, the ID itself if it is not an alias.
     """
     params: Dict[str, Any] = {
         "accountId": str(SettingsManager.get_instance().get_account_id()),
@@ -38,28 +39,80 @@ def get_alias(context: ContextModel) -> str:
     }
 
     # gateway expects JSON array for userId
-    user_id_json = json.dumps([context.get_id()])
+    user_id_json = json.dumps(user_ids)
     params[Constants.KEY_USER_ID] = user_id_json
 
     response = get_from_gateway_service(params, UrlEnum.GET_ALIAS.value, context)
     if not response:
         raise RuntimeError(
-            error_messages.get("ERROR_GETTING_ALIAS").format(userId=context.get_id(), err="Response is null")
+            error_messages.get("ERROR_GETTING_ALIAS").format(userId=user_id_json, err="Response is null")
         )
 
     try:
         data_list: List[Dict[str, Any]] = json.loads(response) if isinstance(response, str) else response
     except Exception as exc:
         raise RuntimeError(
-            error_messages.get("ERROR_GETTING_ALIAS").format(userId=context.get_id(), err="Invalid JSON response")
+            error_messages.get("ERROR_GETTING_ALIAS").format(userId=user_id_json, err="Invalid JSON response")
         ) from exc
 
+    resolved_user_ids = {user_id: user_id for user_id in user_ids}
     alias_objects = [Alias(item) for item in data_list or []]
     for item in alias_objects:
-        if item.get_alias() == context.get_id():
-            return item.get_user_id() or context.get_id()
+        if item.get_alias() in resolved_user_ids and item.get_user_id():
+            resolved_user_ids[item.get_alias()] = item.get_user_id()
+
+    return resolved_user_ids
+
 
-    return context.get_id()
+def get_alias(context: ContextModel) -> str:
+    """
+    Get the alias for the given user ID. Resolved aliases are cached for
+    gateway_service.alias_cache.ttl seconds, and set_alias drops the IDs it changes.
+
+    :param context: The context to get the alias for.
+    :return: The alias for the given user ID.
+    """
+    return _resolve_alias(context.get_id(), context)
+
+
+def _resolve_alias(user_id: str, context: ContextModel) -> str:
+    def load_alias():
+        return fetch_aliases([user_id], context)[user_id]
+
+    alias_cache = SettingsManager.get_instance().alias_cache
+    if alias_cache is None:
+        return load_alias()
+    return alias_cache.get_or_load(user_id, load_alias)
+
+
+def resolve_aliases(user_ids: Iterable[str], context: Optional[ContextModel] = None) -> Dict[str, str]:
+    """
+    Resolve the aliases of many user IDs. IDs missing from the alias cache are looked up in
+    batches of Constants.ALIAS_BATCH_SIZE per gateway request, and the results fill the cache.
+
+    :param user_ids: The IDs to resolve.
+    :param context: The context of the API call, for logging.
+    :return: The resolved user ID of every given ID.
+    """
+    user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    if not user_ids:
+        return {}
+    context = context or ContextModel({"id": user_ids[0]})
+    alias_cache = SettingsManager.get_instance().alias_cache
+    if alias_cache is None:
+        resolved_user_ids = {}
+        for start in range(0, len(user_ids), Constants.ALIAS_BATCH_SIZE):
+            resolved_user_ids.update(fetch_aliases(user_ids[start:start + Constants.ALIAS_BATCH_SIZE], context))
+        return resolved_user_ids
+
+    missing_user_ids = [user_id for user_id in user_ids if not alias_cache.contains(user_id)]
+    for start in range(0, len(missing_user_ids), Constants.ALIAS_BATCH_SIZE):
+        fetched_user_ids = fetch_aliases(missing_user_ids[start:start + Constants.ALIAS_BATCH_SIZE], context)
+        for user_id, resolved_user_id in fetched_user_ids.items():
+            alias_cache.set(user_id, resolved_user_id)
+
+    # entries evicted or expired since the bulk fill are loaded one by one
+    return {user_id: _resolve_alias(user_id, context) for user_id in user_ids}
 
 
 def set_alias(user_id: str, alias_id: str) -> bool:
@@ -90,6 +143,10 @@ def set_alias(user_id: str, alias_id: str) -> bool:
 
     alias_set_response = AliasSetResponse(data)
     if alias_set_response.get_is_alias_set():
+        alias_cache = SettingsManager.get_instance().alias_cache
+        if alias_cache is not None:
+            alias_cache.invalidate(alias_id)
+            alias_cache.invalidate(user_id)
         return True
 
     raise RuntimeError(error_messages.get("ERROR_SETTING_ALIAS").format(userId=user_id))
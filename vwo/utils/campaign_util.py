@@ -154,8 +154,7 @@ def get_variation_from_campaign_key(
     """
     Retrieves a variation from a campaign by its key and variation ID.
 
-    Searches through all campaigns in the settings to find the specified campaign by its key,
-    and then looks for the variation within that campaign by its ID.
+    Looks the variation up in the settings index keyed by campaign key and variation ID.
 
     Args:
         settings (SettingsModel): The settings object containing campaign information.
@@ -165,18 +164,7 @@ def get_variation_from_campaign_key(
     Returns:
         Optional[VariationModel]: The variation object if found, otherwise None.
     """
-    campaign = next(
-        (c for c in settings.get_campaigns() if c.get_key() == campaign_key), None
-    )
-
-    if campaign:
-        variation = next(
-            (v for v in campaign.get_variations() if v.get_id() == variation_id), None
-        )
-        if variation:
-            return variation
-
-    return None
+    return settings.get_variation_by_campaign_key(campaign_key, variation_id)
 
 
 def set_campaign_allocation(campaigns: List[VariationModel]) -> None:
@@ -204,7 +192,7 @@ def get_group_details_if_campaign_part_of_it(
     """
     Retrieves group details if a campaign is part of a group.
 
-    Looks up the group ID for the given campaign ID in the settings and returns
+    Looks up the group of the given campaign ID in the settings index and returns
     the group details including the group ID and group name.
 
     Args:
@@ -218,23 +206,16 @@ def get_group_details_if_campaign_part_of_it(
     campaign_to_check = campaign_id
     if variationId:
         campaign_to_check = campaign_id + "_" + str(variationId)
-    if (
-        settings.get_campaign_groups()
-        and campaign_to_check in settings.get_campaign_groups()
-    ):
-        group_id = str(settings.get_campaign_groups()[campaign_to_check])
-        group_name = settings.get_groups()[group_id]["name"]
-        return {"groupId": group_id, "groupName": group_name}
-
-    return {}
+    group = settings.get_group_by_campaign(campaign_to_check)
+    return dict(group) if group else {}
 
 
 def find_groups_feature_part_of(settings: SettingsModel, feature_key: str) -> List:
     """
     Finds all groups that a feature is part of.
 
-    Searches through the features in the settings to find the feature by its key,
-    then collects the group details for all campaigns associated with the feature.
+    Looks the feature up by its key, then collects the group details for all
+    campaigns associated with the feature.
 
     Args:
         settings (SettingsModel): The settings object containing feature information.
@@ -245,12 +226,12 @@ def find_groups_feature_part_of(settings: SettingsModel, feature_key: str) -> Li
     """
     ruleArrayList: List[RuleModel] = []
 
-    for feature in settings.get_features():
-        if feature.get_key() == feature_key:
-            for rule in feature.get_rules():
-                # Add rule to the array if it's not already present
-                if rule not in ruleArrayList:
-                    ruleArrayList.append(rule)
+    feature = settings.get_feature_by_key(feature_key)
+    if feature:
+        for rule in feature.get_rules():
+            # Add rule to the array if it's not already present
+            if rule not in ruleArrayList:
+                ruleArrayList.append(rule)
 
     groups = []
 
@@ -396,7 +377,7 @@ def get_rule_type_using_campaign_id_from_feature(
     """
     Retrieves the rule type associated with a specific campaign ID from a feature.
 
-    Searches through the rules of the feature to find the one linked to the given campaign ID,
+    Looks the rule linked to the given campaign ID up in the feature's rule index,
     and returns the type of that rule.
 
     Args:
@@ -406,9 +387,7 @@ def get_rule_type_using_campaign_id_from_feature(
     Returns:
         str: The type of the rule associated with the campaign ID, or an empty string if not found.
     """
-    rule = next(
-        (r for r in feature.get_rules() if r.get_campaign_id() == campaign_id), None
-    )
+    rule = feature.get_rule_by_campaign_id(campaign_id)
     return rule.get_type() if rule else ""
 
 
@@ -464,10 +443,9 @@ def get_campaign_key_from_campaign_id(settings: SettingsModel, campaign_id: int)
     """
     Retrieves the campaign key associated with a given campaign ID.
 
-    Searches through the campaigns in the settings to find the campaign by its ID,
-    and returns the key of that campaign.
+    Looks the campaign up by its ID and returns the key of that campaign.
     """
-    campaign = next((c for c in settings.get_campaigns() if c.get_id() == campaign_id), None)
+    campaign = settings.get_campaign_by_id(campaign_id)
     return campaign.get_key() if campaign else ""
 
 def get_variation_name_from_campaign_id_and_variation_id(
@@ -475,21 +453,18 @@ def get_variation_name_from_campaign_id_and_variation_id(
     """
     Retrieves the variation name associated with a given campaign ID and variation ID.
 
-    Searches through the campaigns in the settings to find the campaign by its ID,
-    and returns the name of the variation that matches the given variation ID.
+    Looks the variation up by campaign ID and variation ID and returns its name.
     """
-    campaign = next((c for c in settings.get_campaigns() if c.get_id() == campaign_id), None)
-    variation = next((v for v in campaign.get_variations() if v.get_id() == variation_id), None)
+    variation = settings.get_variation_by_campaign_id(campaign_id, variation_id)
     return variation.get_name() if variation else ""
 
 def get_campaign_type_from_campaign_id(settings: SettingsModel, campaign_id: int) -> str:
     """
     Retrieves the type of a campaign associated with a given campaign ID.
 
-    Searches through the campaigns in the settings to find the campaign by its ID,
-    and returns the type of that campaign.
+    Looks the campaign up by its ID and returns the type of that campaign.
     """
-    campaign = next((c for c in settings.get_campaigns() if c.get_id() == campaign_id), None)
+    campaign = settings.get_campaign_by_id(campaign_id)
     return campaign.get_type() if campaign else ""
 
 
@@ -0,0 +1,62 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import weakref
+from typing import Callable, List
+
+_after_fork_callbacks: List[Callable[[], Callable[[], None]]] = []
+_callbacks_lock = threading.Lock()
+
+
+def register_after_fork(method: Callable[[], None]) -> None:
+    """
+    Calls `method` in the child process after os.fork, in registration order, so that an
+    object holding threads, locks or sockets can recreate them. Bound methods are held
+    weakly and never keep their object alive.
+
+    :param method: A bound method or function taking no arguments.
+    """
+    reference = weakref.WeakMethod(method) if hasattr(method, "__self__") else (lambda: method)
+    with _callbacks_lock:
+        _after_fork_callbacks.append(reference)
+
+
+def _after_fork_in_child() -> None:
+    global _callbacks_lock
+    # the forking thread is the only thread left, a lock held by another one is never released
+    _callbacks_lock = threading.Lock()
+    live_callbacks = []
+    for reference in _after_fork_callbacks:
+        method = reference()
+        if method is None:
+            continue
+        live_callbacks.append(reference)
+        try:
+            method()
+        except Exception as err:
+            from ..packages.logger.core.log_manager import LogManager
+            from .log_message_util import error_messages
+
+            LogManager.get_instance().error(
+                error_messages.get("ERROR_REINITIALIZING_AFTER_FORK").format(
+                    component=type(getattr(method, "__self__", method)).__name__, err=str(err)
+                )
+            )
+    _after_fork_callbacks[:] = live_callbacks
+
+
+if hasattr(os, "register_at_fork"):  # not available on Windows, which has no fork
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -78,21 +78,14 @@ def get_feature_from_key(
     if not settings or not settings.get_features():
         return None
 
-    for feature in settings.get_features():
-        if feature.get_key() == feature_key:
-            return feature
-
-    return None
+    return settings.get_feature_by_key(feature_key)
 
 
 def does_event_belong_to_any_feature(event_name: str, settings: SettingsModel) -> bool:
     if not settings or not settings.get_features():
         return False
 
-    return any(
-        any(metric.get_identifier() == event_name for metric in feature.get_metrics())
-        for feature in settings.get_features()
-    )
+    return len(settings.get_features_by_metric_identifier(event_name)) > 0
 
 
 def add_linked_campaigns_to_settings(settings: SettingsModel):
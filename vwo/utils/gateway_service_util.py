@@ -13,7 +13,7 @@
 # limitations under the License.
 
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from ..packages.network_layer.manager.network_manager import NetworkManager
 from ..services.settings_manager import SettingsManager
 from ..packages.logger.core.log_manager import LogManager
@@ -25,6 +25,8 @@ import re
 from ..models.settings.settings_model import SettingsModel
 from ..enums.campaign_type_enum import CampaignTypeEnum
 from ..enums.api_enum import ApiEnum
+from ..enums.endpoint_class_enum import EndpointClassEnum
+from ..enums.url_enum import UrlEnum
 from ..models.user.context_model import ContextModel
 
 
@@ -55,6 +57,8 @@ def get_from_gateway_service(query_params: Dict[str, Any], endpoint: str, contex
             port=SettingsManager.get_instance().port,
         )
 
+        request.set_endpoint_class(EndpointClassEnum.GATEWAY.value)
+
         # Perform the network GET request synchronously
         response = network_instance.get(request)
 
@@ -92,6 +96,8 @@ def post_to_gateway_service(query_params: Dict[str, Any], payload: Dict[str, Any
             port=SettingsManager.get_instance().port,
         )
 
+        request.set_endpoint_class(EndpointClassEnum.GATEWAY.value)
+
         # Perform the network GET request synchronously
         response = network_instance.post(request)
 
@@ -101,6 +107,83 @@ def post_to_gateway_service(query_params: Dict[str, Any], payload: Dict[str, Any
         LogManager.get_instance().error_log("ERROR_SENDING_DATA_TO_GATEWAY", data={"err": str(e)}, debug_data={"an": ApiEnum.GET_FLAG.value})
         return False
 
+def get_user_data_from_gateway_service(user_agent: Optional[str], ip_address: Optional[str], context: ContextModel) -> Any:
+    """
+    Get the user agent details and the location of an IP address from the gateway service.
+    Lookups are cached per (userAgent, ipAddress) pair, failed lookups for a shorter time, and
+    concurrent lookups of one pair share a single request.
+
+    :param user_agent: The user agent to look up, None to skip it.
+    :param ip_address: The IP address to look up, None to skip it.
+    :param context: The context of the API call, for logging.
+    :return: The user data from the gateway service, False or None if the lookup failed.
+    """
+    query_params = {}
+    if user_agent:
+        query_params["userAgent"] = user_agent
+    if ip_address:
+        query_params["ipAddress"] = ip_address
+
+    def load_user_data():
+        return get_from_gateway_service(get_query_params(query_params), UrlEnum.GET_USER_DATA.value, context)
+
+    user_data_cache = SettingsManager.get_instance().user_data_cache
+    if user_data_cache is None:
+        return load_user_data()
+    return user_data_cache.get_or_load((user_agent or "", ip_address or ""), load_user_data)
+
+def check_attribute_in_list(list_id: str, attribute_value: Any, context: ContextModel) -> Any:
+    """
+    Check whether an attribute value is in an attribute list, for inlist(...) segments. Lists
+    downloaded through gateway_service.attribute_lists are checked locally; other checks go to
+    the gateway, cached per (listId, attribute) with concurrent identical checks sharing a
+    single request.
+
+    :param list_id: The id of the list.
+    :param attribute_value: The attribute value to look for.
+    :param context: The context of the API call, for logging.
+    :return: The gateway's answer ("false" or False when the value is not in the list).
+    """
+    settings_manager = SettingsManager.get_instance()
+    attribute_list_store = settings_manager.attribute_list_store
+    if attribute_list_store is not None:
+        is_in_list = attribute_list_store.contains(list_id, attribute_value)
+        if is_in_list is not None:
+            return is_in_list
+
+    query_params = {
+        "attribute": attribute_value,
+        "listId": list_id,
+        "accountId": settings_manager.account_id,
+        "sdkKey": settings_manager.sdk_key,
+    }
+
+    def check_attribute():
+        return get_from_gateway_service(query_params, UrlEnum.ATTRIBUTE_CHECK.value, context)
+
+    inlist_cache = settings_manager.inlist_cache
+    if inlist_cache is None:
+        return check_attribute()
+    return inlist_cache.get_or_load((list_id, str(attribute_value)), check_attribute)
+
+def get_gateway_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get the hit, miss and size counters of the gateway lookup caches.
+
+    :return: The stats of every enabled cache, keyed by lookup.
+    """
+    stats = {}
+    user_data_cache = SettingsManager.get_instance().user_data_cache
+    if user_data_cache is not None:
+        stats["user_data"] = user_data_cache.get_stats()
+    inlist_cache = SettingsManager.get_instance().inlist_cache
+    if inlist_cache is not None:
+        stats["inlist"] = inlist_cache.get_stats()
+    attribute_list_store = SettingsManager.get_instance().attribute_list_store
+    if attribute_list_store is not None:
+        stats["attribute_lists"] = attribute_list_store.get_stats()
+    return stats
+
 def get_query_params(query_params: Dict[str, Any]) -> Dict[str, str]:
     """
     Get the query parameters for the gateway service.
@@ -126,7 +209,7 @@ def add_is_gateway_service_required_flag(settings: SettingsModel) -> None:
         r"\b(country|region|city|os|device_type|browser_string|ua|os_version|browser_version)\b", re.IGNORECASE
     )
     # Regex pattern to match inlist(...) under custom_variable
-    custom_variable_pattern = re.compile(r"inlist\([^)]*\)", re.IGNORECASE)
+    custom_variable_pattern = re.compile(r"inlist\(([^)]*)\)", re.IGNORECASE)
 
     for feature in settings.get_features():
         rules = feature.get_rules_linked_campaign()
@@ -21,6 +21,28 @@ from ..utils.network_util import (
 )
 from ..enums.event_enum import EventEnum
 from ..packages.network_layer.manager.network_manager import NetworkManager
+from ..services.settings_manager import SettingsManager
+from ..packages.logger.core.log_manager import LogManager
+from ..utils.log_message_util import debug_messages
+
+
+def _is_duplicate(payload: dict) -> bool:
+    """
+    :return: True if the impression was already sent within the de-duplication window.
+    """
+    from ..vwo_client import VWOClient
+
+    vwo_instance = VWOClient.get_instance()
+    deduplicator = vwo_instance.impression_deduplicator if vwo_instance is not None else None
+    if deduplicator is None or deduplicator.should_send(payload):
+        return False
+    props = payload["d"]["event"]["props"]
+    LogManager.get_instance().debug(
+        debug_messages.get("IMPRESSION_DEDUPLICATED").format(
+            campaignId=props.get("id"), variationId=props.get("variation"), uuid=payload["d"].get("visId")
+        )
+    )
+    return True
 
 
 # The function that creates and sends an impression for a variation shown event
@@ -32,6 +54,10 @@ def send_impression_for_variation_shown(payload: dict, context: ContextModel):
     """
     from ..vwo_client import VWOClient
 
+    # duplicates are dropped before they reach the batch queue or the network
+    if _is_duplicate(payload):
+        return
+
     # Get base properties for the event
     properties = get_events_base_properties(
         EventEnum.VWO_VARIATION_SHOWN.value,
@@ -60,6 +86,10 @@ def send_impression_for_variation_shown_batch(
     """
     from ..vwo_client import VWOClient
 
+    batch_payload = [payload for payload in batch_payload if not _is_duplicate(payload)]
+    if not batch_payload:
+        return
+
     vwo_instance = VWOClient.get_instance()
     if vwo_instance.batch_event_queue is not None:
         # batch_payload - contains all events from getFlag for a single user
@@ -80,4 +110,25 @@ def send_impression_for_variation_shown_batch(
             network_instance.execute_in_background(send_batch_request)
         else:
             # execute the request immediately
-            send_batch_request()
\ No newline at end of file
+            send_batch_request()
+
+
+def send_collected_impressions(
+    batch_payload: list, context: ContextModel, account_id: int, sdk_key: str
+):
+    """
+    Sends the impressions collected for a single user across several flag evaluations.
+    With a gateway service each impression is sent on its own, otherwise they are sent as one batch.
+    :param batch_payload: The collected impression payloads
+    :param context: The context of the user
+    :param account_id: The account ID
+    :param sdk_key: The SDK key
+    """
+    if not batch_payload:
+        return
+
+    if SettingsManager.get_instance().is_gateway_service_provided:
+        for payload in batch_payload:
+            send_impression_for_variation_shown(payload, context)
+    else:
+        send_impression_for_variation_shown_batch(batch_payload, account_id, sdk_key)
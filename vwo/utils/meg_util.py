@@ -341,10 +341,11 @@ def _normalize_weights_and_find_winning_campaign(
     for campaign in shortlisted_campaigns:
         # Example of weight normalization, to keep the result with four decimal places
         weight = round(100 / len(shortlisted_campaigns) * 10000) / 10000
-        campaign.set_weight(weight)
 
-        # Convert CampaignModel to VariationModel
+        # Convert CampaignModel to VariationModel, the campaign belongs to the published
+        # settings and is shared by concurrent calls, so only the copy gets the weight
         variation = convert_campaign_to_variation_model(campaign)
+        variation.set_weight(weight)
 
         # Append the created VariationModel to the new List
         variation_models.append(variation)
@@ -352,6 +352,9 @@ def send_post_api_request(
         def send_request():
             try:
                 response = network_instance.post(request)
+                if response.get_is_retry_scheduled():
+                    # the retry runs in the background and logs its own outcome
+                    return
                 if response.get_total_attempts() > 0:
                     debug_category = DebugCategoryEnum.RETRY.value
                     msg_t = Constants.NETWORK_CALL_SUCCESS_WITH_RETRIES
@@ -403,9 +406,19 @@ def send_post_api_request(
 
 
 def send_post_batch_request(
-    payload: dict, account_id: int, sdk_key: str, flush_callback=None
+    payload: dict, account_id: int, sdk_key: str, flush_callback=None, on_retry_complete=None
 ):
-
+    """
+    Sends a batch of events.
+
+    :param payload: The events.
+    :param account_id: The account ID.
+    :param sdk_key: The SDK key.
+    :param flush_callback: Called with an error (None on success) and the events.
+    :param on_retry_complete: Called with True or False once a retry scheduled in the background ends.
+    :return: True if the events were sent, False if not, None if they were handed to a
+        scheduled retry, which reports back through on_retry_complete.
+    """
     try:
         # Prepare the batch payload
         batch_payload = {"ev": payload}
@@ -434,28 +447,41 @@ def send_post_batch_request(
         )
 
         request_model.set_user_id("NA")
+
+        def handle_response(response):
+            # After sending the request, check the response
+            if response.status_code == 200:
+                LogManager.get_instance().info(
+                    info_messages.get('BATCH_FLUSH_SUCCESS').format(
+                        eventCount=len(payload)
+                    )
+                )
+                # On success, call the flush callback if defined
+                if flush_callback:
+                    flush_callback(None, payload)  # No error, events sent successfully
+                return True
+            else:
+                LogManager.get_instance().error_log("NETWORK_CALL_FAILURE_AFTER_MAX_RETRIES", data={"extraData": "event: " + UrlEnum.BATCH_EVENTS.value, "attempts": response.get_total_attempts(), "err": response.get_error()}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
+                if flush_callback:
+                    flush_callback(
+                        f"Failed with status code: {response.status_code}", payload
+                    )
+                return False
+
+        def complete_retry(response):
+            is_sent_successfully = handle_response(response)
+            if on_retry_complete:
+                on_retry_complete(is_sent_successfully)
+
+        request_model.set_on_retry_complete(complete_retry)
         # Call PostAsync to send the request asynchronously
         network_manager = NetworkManager.get_instance()
         response = network_manager.post(request_model)
-
-        # After sending the request, check the response
-        if response.status_code == 200:
-            LogManager.get_instance().info(
-                info_messages.get('BATCH_FLUSH_SUCCESS').format(
-                    eventCount=len(payload)
-                )
-            )
-            # On success, call the flush callback if defined
-            if flush_callback:
-                flush_callback(None, payload)  # No error, events sent successfully
-            return True
-        else:
-            LogManager.get_instance().error_log("NETWORK_CALL_FAILURE_AFTER_MAX_RETRIES", data={"extraData": "event: " + UrlEnum.BATCH_EVENTS.value, "attempts": response.get_total_attempts(), "err": response.get_error()}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
-            if flush_callback:
-                flush_callback(
-                    f"Failed with status code: {response.status_code}", payload
-                )
-            return False
+        if response.get_is_retry_scheduled():
+            # the events now belong to the scheduled retry, re-queuing or acknowledging them
+            # before it ends would send them twice or lose them
+            return None
+        return handle_response(response)
     except Exception as ex:
         LogManager.get_instance().error_log("ERROR_FLUSHING_BATCH_EVENTS", data={"error": str(ex)}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
 
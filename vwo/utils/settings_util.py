@@ -14,26 +14,61 @@
 
 
 from ..models.settings.settings_model import SettingsModel
+from ..models.settings.settings_snapshot_model import SettingsSnapshotModel
 from .campaign_util import set_variation_allocation
 from .function_util import add_linked_campaigns_to_settings
 from .gateway_service_util import add_is_gateway_service_required_flag
-from typing import Any, Dict
+from ..services.settings_manager import SettingsManager
+from ..packages.segmentation_evaluator.evaluators.segment_compiler import (
+    compile_settings_segments,
+)
+from typing import Any, Dict, Optional
 
 
-def set_settings_and_add_campaigns_to_rules(
-    settings: Dict, vwo_client_instance: Any
-) -> None:
-    # Initialize the settings model with the provided settings
-    vwo_client_instance._settings = SettingsModel(settings)
-    vwo_client_instance.original_settings = settings
+def build_settings_snapshot(
+    settings: Dict, is_settings_valid: Optional[bool] = None
+) -> SettingsSnapshotModel:
+    """
+    Parses the settings and prepares the campaigns for evaluation without touching
+    any client, so that the work happens off the request path.
+
+    Settings are validated against the schema here, once per load, unless the caller
+    already did it.
+
+    :param settings: The raw settings.
+    :param is_settings_valid: Result of a schema validation already done by the caller, if any.
+    :return: The prepared settings snapshot.
+    """
+    if is_settings_valid is None:
+        is_settings_valid = SettingsManager.is_settings_valid(settings)
+
+    settings_model = SettingsModel(settings)
     # Get the campaigns from the settings once and process each campaign
-    campaigns = vwo_client_instance._settings.get_campaigns()
-    for index, campaign in enumerate(campaigns):
+    for campaign in settings_model.get_campaigns():
         set_variation_allocation(campaign)
-        campaigns[index] = (
-            campaign  # Update the campaign back into the List (if necessary)
-        )
 
     # Add linked campaigns to settings and set gateway service required flag
-    add_linked_campaigns_to_settings(vwo_client_instance._settings)
-    add_is_gateway_service_required_flag(vwo_client_instance._settings)
+    add_linked_campaigns_to_settings(settings_model)
+    add_is_gateway_service_required_flag(settings_model)
+    # Build the lookup indexes once so that the APIs do not scan the settings on every call
+    settings_model.build_indexes()
+    # Compile the segments of every campaign and variation once per settings version
+    compile_settings_segments(settings_model)
+
+    return SettingsSnapshotModel(settings_model, settings, is_settings_valid)
+
+
+def set_settings_and_add_campaigns_to_rules(
+    settings: Dict, vwo_client_instance: Any, is_settings_valid: Optional[bool] = None
+) -> None:
+    """
+    Builds a settings snapshot and publishes it on the client with a single reference swap.
+    API calls already in flight keep the snapshot they started with.
+
+    :param settings: The settings to set.
+    :param vwo_client_instance: The client instance to set the settings on.
+    :param is_settings_valid: Result of a schema validation already done by the caller, if any.
+    """
+    vwo_client_instance._settings_snapshot = build_settings_snapshot(
+        settings, is_settings_valid
+    )
@@ -0,0 +1,212 @@
+# Copyright 2024-2025 Wingify Software Pvt. Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .fork_util import register_after_fork
+
+
+class _Entry:
+    __slots__ = ("value", "error", "expires_at")
+
+    def __init__(self, value: Any, error: Optional[BaseException], expires_at: float):
+        self.value = value
+        self.error = error
+        self.expires_at = expires_at
+
+
+class _Flight:
+    __slots__ = ("done", "entry", "is_invalidated")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[_Entry] = None
+        # set when the key is invalidated mid-load, the loaded value is then not cached
+        self.is_invalidated = False
+
+
+class TtlCache:
+    """
+    Bounded, thread-safe LRU cache whose entries expire after a TTL.
+
+    Failed loads (a loader that raises, or a value `is_error` flags) are cached for the shorter
+    `error_ttl`, so a failing backend is not called on every lookup. Concurrent misses for one
+    key are coalesced: one caller runs the loader and the others wait for its result.
+
+    :param max_size: Maximum number of cached keys, the least recently used is evicted first.
+    :param ttl: Seconds a loaded value stays fresh.
+    :param error_ttl: Seconds a failed load stays cached, 0 to not cache failures.
+    :param is_error: Tells whether a value returned by the loader is a failure.
+    :param clock: Monotonic time source, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        error_ttl: float = 0,
+        is_error: Optional[Callable[[Any], bool]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._is_error = is_error
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self) -> None:
+        # the loads in flight belong to the parent's threads, their waiters are not in this process
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of the key, running the loader on a miss.
+
+        :param key: The cache key.
+        :param loader: Loads the value, called at most once per miss across threads.
+        :return: The cached or loaded value. A cached loader exception is raised again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > self._clock():
+                self._entries.move_to_end(key)
+                if entry.error is not None or (self._is_error and self._is_error(entry.value)):
+                    self._negative_hits += 1
+                else:
+                    self._hits += 1
+                return self._unwrap(entry)
+
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            flight.done.wait()
+            return self._unwrap(flight.entry)
+
+        try:
+            entry = self._load(loader)
+        except BaseException as err:
+            # interrupted load, the waiters fail with it instead of blocking forever
+            flight.entry = _Entry(None, err, 0)
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+            raise
+
+        with self._lock:
+            if not flight.is_invalidated:
+                self._store(key, entry)
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.entry = entry
+        flight.done.set()
+        return self._unwrap(entry)
+
+    def _load(self, loader: Callable[[], Any]) -> _Entry:
+        try:
+            value = loader()
+        except Exception as err:
+            return _Entry(None, err, self._clock() + self.error_ttl)
+        is_failure = self._is_error is not None and self._is_error(value)
+        return _Entry(value, None, self._clock() + (self.error_ttl if is_failure else self.ttl))
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        is_failure = entry.error is not None or (self._is_error is not None and self._is_error(entry.value))
+        if is_failure and self.error_ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    @staticmethod
+    def _unwrap(entry: _Entry) -> Any:
+        if entry.error is not None:
+            raise entry.error
+        return entry.value
+
+    def contains(self, key: Hashable) -> bool:
+        """
+        :param key: The cache key.
+        :return: True if the key has a fresh entry, without counting a hit or a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Caches a value loaded outside get_or_load, e.g. by a bulk lookup.
+
+        :param key: The cache key.
+        :param value: The value, cached for `ttl` (or `error_ttl` if `is_error` flags it).
+        """
+        is_failure = self._is_error is not None and self._is_error(value)
+        entry = _Entry(value, None, self._clock() + (self.error_ttl if is_failure else self.ttl))
+        with self._lock:
+            self._store(key, entry)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drops the key. A load of the key already in progress is not cached, so a value read
+        before the invalidation cannot come back.
+
+        :param key: The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            flight = self._flights.pop(key, None)
+            if flight is not None:
+                flight.is_invalidated = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: Hit, negative hit, miss, coalesced and eviction counts, and the number of
+            cached keys.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+            }
@@ -15,6 +15,12 @@
 
 import uuid
 import re
+from functools import lru_cache
+from typing import Dict, Iterable
+
+from ..constants.Constants import Constants
+
+VWO_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://vwo.com")
 
 def get_random_uuid(sdk_key: str) -> str:
     """
@@ -34,20 +40,48 @@ def get_random_uuid(sdk_key: str) -> str:
 def get_uuid(user_id: str, account_id: str) -> str:
     """
     Generates a UUID for a user based on their userId and accountId.
+    Results are memoized in a bounded LRU, since the same user is looked up several times per API call.
 
     :param user_id: The user's ID.
     :param account_id: The account ID associated with the user.
     :return: A UUID string formatted without dashes and in uppercase.
     """
-    VWO_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://vwo.com")
+    return _get_cached_uuid(user_id, str(account_id))
+
+
+def get_uuids(user_ids: Iterable[str], account_id: str) -> Dict[str, str]:
+    """
+    Generates UUIDs for many users of one account, e.g. for offline jobs.
+    The account namespace is resolved once and the per-user LRU is bypassed so large batches do not evict it.
+
+    :param user_ids: The users' IDs.
+    :param account_id: The account ID associated with the users.
+    :return: A dictionary mapping each user ID to its UUID.
+    """
+    user_id_namespace = _get_account_namespace(str(account_id))
+    uuids = {}
+    for user_id in user_ids:
+        if user_id not in uuids:
+            uuids[user_id] = _format_uuid(generate_uuid(user_id, user_id_namespace))
+    return uuids
+
+
+@lru_cache(maxsize=Constants.UUID_CACHE_MAX_SIZE)
+def _get_cached_uuid(user_id: str, account_id: str) -> str:
+    # Generate a UUID based on the userId and the namespace generated from the accountId
+    return _format_uuid(generate_uuid(user_id, _get_account_namespace(account_id)))
+
+
+@lru_cache(maxsize=Constants.UUID_NAMESPACE_CACHE_MAX_SIZE)
+def _get_account_namespace(account_id: str) -> uuid.UUID:
     # Generate a namespace UUID based on the accountId
-    user_id_namespace = generate_uuid(str(account_id), VWO_NAMESPACE)
-    # Generate a UUID based on the userId and the previously generated namespace
-    uuid_for_user_id_account_id = generate_uuid(user_id, uuid.UUID(user_id_namespace))
-    if uuid_for_user_id_account_id:
+    return uuid.UUID(generate_uuid(account_id, VWO_NAMESPACE))
+
+
+def _format_uuid(generated_uuid: str) -> str:
+    if generated_uuid:
         # Remove all dashes from the UUID and convert it to uppercase
-        desired_uuid = uuid_for_user_id_account_id.replace("-", "").upper()
-        return desired_uuid
+        return generated_uuid.replace("-", "").upper()
     return None
 
 
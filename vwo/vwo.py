@@ -13,14 +13,19 @@
 # limitations under the License.
 
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
+import asyncio
 import time
 from vwo.vwo_builder import VWOBuilder
 from vwo.vwo_client import VWOClient
+from vwo.async_vwo_client import AsyncVWOClient
+from vwo.constants.Constants import Constants
 from vwo.enums.url_enum import UrlEnum
 from vwo.utils.event_util import send_sdk_init_event, send_sdk_usage_stats_event
-from vwo.utils.uuid_util import get_uuid as uuid_util_get_uuid
+from vwo.utils.uuid_util import get_uuid as uuid_util_get_uuid, get_uuids as uuid_util_get_uuids
 from vwo.utils.data_type_util import is_string
+from vwo.packages.logger.core.log_manager import LogManager
+from vwo.utils.log_message_util import info_messages
 
 
 class VWO:
@@ -38,14 +43,32 @@ class VWO:
         # Configure the builder
         VWO.vwo_builder.set_logger().set_settings_manager().set_storage().set_network_manager().set_segmentation().init_polling().init_usage_stats()
 
-        # Fetch settings synchronously and build the VWO instance
-        settings = VWO.vwo_builder.get_settings(force=False)
-        VWO.instance = VWO.vwo_builder.build(settings)
-        VWO.instance.settings_fetch_time = VWO.vwo_builder.setting_file_manager.settings_fetch_time
-        VWO.instance.is_settings_valid_on_init = VWO.vwo_builder.setting_file_manager.is_settings_valid_on_init
+        # Start from the last known good settings if a settings cache is configured,
+        # otherwise fetch settings synchronously, then build the VWO instance
+        cache_read_start_time = time.time() * 1000
+        settings = VWO.vwo_builder.get_cached_settings()
+        if settings:
+            LogManager.get_instance().info(
+                info_messages.get("SETTINGS_LOADED_FROM_CACHE").format(
+                    version=settings.get("version")
+                )
+            )
+            # cached settings are only returned once they pass validation
+            VWO.instance = VWO.vwo_builder.build(settings, True)
+            # read before the refresh starts updating the settings manager; the settings
+            # came from the cache, so its read time is what the init event reports
+            VWO.instance.settings_fetch_time = int((time.time() * 1000) - cache_read_start_time)
+            VWO.instance.is_settings_valid_on_init = True
+            VWO.vwo_builder.refresh_settings_in_background()
+        else:
+            settings = VWO.vwo_builder.get_settings(force=False)
+            VWO.instance = VWO.vwo_builder.build(settings)
+            VWO.instance.settings_fetch_time = VWO.vwo_builder.setting_file_manager.settings_fetch_time
+            VWO.instance.is_settings_valid_on_init = VWO.vwo_builder.setting_file_manager.is_settings_valid_on_init
         
         # Initialize batching
         VWO.vwo_builder.init_batching()
+        VWO.vwo_builder.init_impression_deduplication()
         return VWO.instance
 
     @staticmethod
@@ -106,6 +129,24 @@ def init(options: Dict[str, Any]) -> Optional["VWOClient"]:
         print("VWO initialization failed. Error:", e)
         return None
 
+async def init_async(options: Dict[str, Any]) -> Optional["AsyncVWOClient"]:
+    """
+    asyncio variant of init. The settings are fetched on a worker thread so that the event loop
+    keeps running, and the client is returned as an AsyncVWOClient. The storage option may be
+    an AsyncStorageConnector.
+
+    :param options: The same options as init.
+    :return: The async client, or None if initialization failed.
+    """
+    vwo_client = await asyncio.get_running_loop().run_in_executor(None, init, options)
+    if vwo_client is None:
+        return None
+    threading_options = (options or {}).get("threading") or {}
+    return AsyncVWOClient(
+        vwo_client,
+        threading_options.get("max_workers", Constants.THREAD_POOL_MAX_WORKERS),
+    )
+
 def getUUID(user_id: str, account_id: str) -> Optional[str]:
     """
     Generate a deterministic UUID for a given user and account combination.
@@ -133,3 +174,32 @@ def getUUID(user_id: str, account_id: str) -> Optional[str]:
     except Exception as error:
         print(f"API - {api_name} failed to execute. Trace: {error}")
         return None
+
+
+def getUUIDs(user_ids: Iterable[str], account_id: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Generate deterministic UUIDs for many users of the same account, e.g. in offline jobs.
+
+    :param user_ids: The users' IDs (each must be a non-empty string).
+    :param account_id: The account ID (must be a non-empty string).
+    :return: A dictionary mapping each user ID to its UUID (None for an invalid user ID), or None on invalid input or error.
+    """
+    api_name = "getUUIDs"
+
+    try:
+        # Validate account_id
+        if not is_string(account_id) or account_id == '':
+            print(f"accountId passed to {api_name} API is not of valid type.")
+            return None
+
+        user_ids = list(user_ids)
+        valid_user_ids = [user_id for user_id in user_ids if is_string(user_id) and user_id != '']
+        if len(valid_user_ids) != len(user_ids):
+            print(f"Some userIds passed to {api_name} API are not of valid type.")
+
+        uuids = uuid_util_get_uuids(valid_user_ids, account_id)
+        return {user_id: uuids.get(user_id) for user_id in user_ids}
+
+    except Exception as error:
+        print(f"API - {api_name} failed to execute. Trace: {error}")
+        return None
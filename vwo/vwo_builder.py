@@ -16,11 +16,11 @@
 from typing import Dict, Any, Optional
 
 from vwo.services.batch_event_queue import BatchEventQueue
+from vwo.services.impression_deduplicator import ImpressionDeduplicator
 from .packages.network_layer.manager.network_manager import NetworkManager
 from .services.settings_manager import SettingsManager
 from .vwo_client import VWOClient
 import random
-import json
 import threading
 from .packages.logger.core.log_manager import LogManager
 from .utils.log_message_util import debug_messages, error_messages, info_messages
@@ -32,6 +32,8 @@ from .packages.storage.storage import Storage
 from .constants.Constants import Constants
 from .utils.usage_stats_util import UsageStatsUtil
 from .enums.api_enum import ApiEnum
+from .enums.overflow_policy_enum import OverflowPolicyEnum
+from .utils.fork_util import register_after_fork
 
 class VWOBuilder:
     def __init__(self, options):
@@ -41,14 +43,28 @@ class VWOBuilder:
         self.storage = None
         self.log_manager = None
         self.original_settings = None
-        self.is_settings_fetch_in_progress = False
+        # serializes settings fetches between init, the background refresh and polling
+        self.settings_lock = threading.RLock()
         self.is_valid_poll_interval_passed_from_init = False
         self.vwo_instance = None
         self.is_batching_used = False
         self.batch_event_queue = None
+        self.is_polling = False
+        register_after_fork(self._reinit_after_fork)
+
+    def _reinit_after_fork(self):
+        """
+        Restarts polling in a forked child, whose copy of the polling timer has no thread.
+        The settings already held are kept, so the child does not fetch them again.
+        """
+        self.settings_lock = threading.RLock()
+        if self.is_polling:
+            self.check_and_poll()
 
     def set_network_manager(self):
-        NetworkManager.get_instance(self.options.get("threading", {})).attach_client()
+        NetworkManager.get_instance(self.options.get("threading", {})).attach_client(
+            self.options.get("compression")
+        )
         LogManager.get_instance().debug(
             debug_messages.get("SERVICE_INITIALIZED").format(service="Network Layer")
         )
@@ -61,6 +77,12 @@ class VWOBuilder:
         SegmentationManager.get_instance().attach_evaluator(
             self.options.get("segmentation", None)
         )
+        SegmentationManager.get_instance().attach_user_agent_parser(
+            self.options.get("user_agent_parser", None)
+        )
+        SegmentationManager.get_instance().attach_geo_ip_resolver(
+            self.options.get("geo_ip_resolver", None)
+        )
         LogManager.get_instance().debug(
             debug_messages.get("SERVICE_INITIALIZED").format(
                 service="Segmentation Evaluator"
@@ -74,18 +96,16 @@ class VWOBuilder:
                 "sdk_key and account_id are required for fetching settings. Aborting!"
             )
 
-        if not self.is_settings_fetch_in_progress:
-            self.is_settings_fetch_in_progress = True
-            try:
-                settings = self.setting_file_manager.get_settings(force)
-                if not force:
-                    self.original_settings = settings
-
-                self.is_settings_fetch_in_progress = False
-                return settings
-            except Exception as err:
-                self.is_settings_fetch_in_progress = False
-                raise err
+        # another thread is already fetching the settings
+        if not self.settings_lock.acquire(blocking=False):
+            return None
+        try:
+            settings = self.setting_file_manager.get_settings(force)
+            if not force:
+                self.original_settings = settings
+            return settings
+        finally:
+            self.settings_lock.release()
 
     def get_settings(self, force=False):
         try:
@@ -106,6 +126,29 @@ class VWOBuilder:
             )
             return {}
 
+    def get_cached_settings(self):
+        """
+        Returns the last known good settings from the settings cache, if one is configured.
+        """
+        try:
+            return self.setting_file_manager.get_cached_settings()
+        except Exception as err:
+            LogManager.get_instance().error_log("ERROR_SETTINGS_CACHE", data={"operation": "read", "err": str(err)}, debug_data={"an": ApiEnum.INIT.value})
+            return None
+
+    def refresh_settings_in_background(self):
+        """
+        Fetches fresh settings on a background thread and applies them if they differ from
+        the ones the client was built with. Used when the client started from cached settings.
+        """
+        def refresh():
+            try:
+                self.poll_settings()
+            except Exception as e:
+                LogManager.get_instance().error_log("ERROR_FETCHING_SETTINGS", data={"err": str(e)}, debug_data={"an": ApiEnum.INIT.value})
+
+        threading.Thread(target=refresh, daemon=True).start()
+
     def set_storage(self):
         if self.options.get("storage"):
             self.storage = Storage.get_instance().attach_connector(
@@ -185,6 +228,42 @@ class VWOBuilder:
                     )
                     request_time_interval = 600
 
+                max_queue_size = batch_event_data.get('max_queue_size', Constants.BATCH_QUEUE_MAX_SIZE)
+                if isinstance(max_queue_size, bool) or not isinstance(max_queue_size, int) or max_queue_size < events_per_request:
+                    LogManager.get_instance().error(
+                        error_messages.get("INVALID_BATCH_QUEUE_CONFIGURATION").format(
+                            key="max_queue_size",
+                            correctType="int >= events_per_request",
+                            defaultValue=max(Constants.BATCH_QUEUE_MAX_SIZE, events_per_request),
+                        )
+                    )
+                    max_queue_size = max(Constants.BATCH_QUEUE_MAX_SIZE, events_per_request)
+
+                overflow_policy = batch_event_data.get('overflow_policy', OverflowPolicyEnum.DROP_OLDEST.value)
+                if overflow_policy not in [policy.value for policy in OverflowPolicyEnum]:
+                    LogManager.get_instance().error(
+                        error_messages.get("INVALID_BATCH_QUEUE_CONFIGURATION").format(
+                            key="overflow_policy",
+                            correctType=" | ".join(policy.value for policy in OverflowPolicyEnum),
+                            defaultValue=OverflowPolicyEnum.DROP_OLDEST.value,
+                        )
+                    )
+                    overflow_policy = OverflowPolicyEnum.DROP_OLDEST.value
+
+                spool_option = batch_event_data.get('spool', None)
+                replay_concurrency = Constants.EVENT_SPOOL_REPLAY_CONCURRENCY
+                if isinstance(spool_option, dict):
+                    replay_concurrency = spool_option.get('replay_concurrency', replay_concurrency)
+                    if isinstance(replay_concurrency, bool) or not isinstance(replay_concurrency, int) or replay_concurrency < 1:
+                        LogManager.get_instance().error(
+                            error_messages.get("INVALID_BATCH_QUEUE_CONFIGURATION").format(
+                                key="spool.replay_concurrency",
+                                correctType="int > 0",
+                                defaultValue=Constants.EVENT_SPOOL_REPLAY_CONCURRENCY,
+                            )
+                        )
+                        replay_concurrency = Constants.EVENT_SPOOL_REPLAY_CONCURRENCY
+
                 # Initialize the BatchEventQueue
                 self.batch_event_queue = BatchEventQueue(
                     events_per_request=events_per_request,
@@ -192,6 +271,12 @@ class VWOBuilder:
                     flush_callback=batch_event_data.get('flush_callback', None),
                     account_id=self.options.get("account_id", 0),
                     sdk_key=self.options.get("sdk_key", ""),
+                    max_queue_size=max_queue_size,
+                    overflow_policy=overflow_policy,
+                    spool=BatchEventQueue.create_spool(
+                        spool_option, self.options.get("account_id", 0), self.options.get("sdk_key", "")
+                    ),
+                    replay_concurrency=replay_concurrency,
                 )
 
                 # Assuming vwo_client is defined and linked to this builder
@@ -209,6 +294,32 @@ class VWOBuilder:
 
             return self
         
+    def init_impression_deduplication(self):
+        """
+        Sets up the impression de-duplication window from the impression_deduplication option:
+        True for the defaults, or a dict that may set "window" (seconds) and "max_keys".
+        """
+        option = self.options.get("impression_deduplication")
+        if not option or self.vwo_instance is None:
+            return self
+        option = option if isinstance(option, dict) else {}
+        config = {}
+        for key, default_value in (
+            ("window", Constants.IMPRESSION_DEDUP_WINDOW),
+            ("max_keys", Constants.IMPRESSION_DEDUP_MAX_KEYS),
+        ):
+            value = option.get(key, default_value)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_IMPRESSION_DEDUPLICATION_CONFIGURATION").format(
+                        key=key, correctType="number > 0", defaultValue=default_value
+                    )
+                )
+                value = default_value
+            config[key] = value
+        self.vwo_instance.impression_deduplicator = ImpressionDeduplicator(config["window"], int(config["max_keys"]))
+        return self
+
     def init_usage_stats(self):
         """
         Initializes usage statistics for the SDK.
@@ -219,8 +330,8 @@ class VWOBuilder:
         UsageStatsUtil().set_usage_stats(self.options)
         return self
 
-    def build(self, settings):
-        self.vwo_instance = VWOClient(settings, self.options)
+    def build(self, settings, is_settings_valid=None):
+        self.vwo_instance = VWOClient(settings, self.options, is_settings_valid)
 
         # if poll_interval is not present in options, set it to the pollInterval from settings
         self.update_poll_interval_and_check_and_poll(settings)
@@ -245,27 +356,41 @@ class VWOBuilder:
         if should_check_and_poll and not self.is_valid_poll_interval_passed_from_init:
             self.check_and_poll()
 
+    def poll_settings(self):
+        """
+        Fetches the settings once and applies them if they changed since the last fetch.
+        The settings manager hands back the settings object it already holds when the body
+        did not change (HTTP 304 or same digest), so a change is a different object.
+        Runs under settings_lock, as the background refresh and the polling timer both
+        call it and both replace the settings manager's ETag, digest and last settings.
+        """
+        with self.settings_lock:
+            self._poll_settings()
+
+    def _poll_settings(self):
+        previous_settings = self.setting_file_manager.last_settings
+        latest_settings = self.get_settings()
+        if latest_settings and latest_settings is not previous_settings:
+            self.original_settings = latest_settings
+            LogManager.get_instance().info(
+                info_messages.get("POLLING_SET_SETTINGS")
+            )
+            # settings returned by the settings manager are already validated
+            set_settings_and_add_campaigns_to_rules(
+                latest_settings, self.vwo_instance, True
+            )
+            # reinitialize the poll_interval value if there is a change in settings
+            # this is to ensure that we use the updated poll_interval value
+            self.update_poll_interval_and_check_and_poll(latest_settings, False)
+        elif latest_settings:
+            LogManager.get_instance().info(
+                info_messages.get("POLLING_NO_CHANGE_IN_SETTINGS")
+            )
+
     def check_and_poll(self):
         def poll():
             try:
-                latest_settings = self.get_settings()
-                if latest_settings and json.dumps(
-                    latest_settings, sort_keys=True
-                ) != json.dumps(self.original_settings, sort_keys=True):
-                    self.original_settings = latest_settings
-                    LogManager.get_instance().info(
-                        info_messages.get("POLLING_SET_SETTINGS")
-                    )
-                    set_settings_and_add_campaigns_to_rules(
-                        latest_settings, self.vwo_instance
-                    )
-                    # reinitialize the poll_interval value if there is a change in settings
-                    # this is to ensure that we use the updated poll_interval value
-                    self.update_poll_interval_and_check_and_poll(latest_settings, False)
-                elif latest_settings:
-                    LogManager.get_instance().info(
-                        info_messages.get("POLLING_NO_CHANGE_IN_SETTINGS")
-                    )
+                self.poll_settings()
             except Exception as e:
                 LogManager.get_instance().error_log("ERROR_FETCHING_SETTINGS_WITH_POLLING", data={"err": str(e)}, debug_data={"an": Constants.POLLING})
             finally:
@@ -275,4 +400,5 @@ class VWOBuilder:
                 ).start()  # Timer expects seconds, so convert milliseconds
 
         # start the polling after given interval
+        self.is_polling = True
         threading.Timer(self.options["poll_interval"] / 1000, poll).start()
\ No newline at end of file
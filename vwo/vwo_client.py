@@ -14,7 +14,9 @@
 
 
 from vwo.services.batch_event_queue import BatchEventQueue
+from vwo.services.impression_deduplicator import ImpressionDeduplicator
 from .models.settings.settings_model import SettingsModel
+from .models.settings.settings_snapshot_model import SettingsSnapshotModel
 from .utils.settings_util import set_settings_and_add_campaigns_to_rules
 from .services.url_service import UrlService
 from .packages.logger.core.log_manager import LogManager
@@ -23,28 +25,32 @@ from .services.hooks_manager import HooksManager
 from .models.user.context_model import ContextModel
 from .models.user.get_flag import GetFlag
 from .api.get_flag_api import GetFlagApi
+from .api.evaluate_cohort_api import EvaluateCohortApi
+from .utils.impression_util import send_collected_impressions
 from .api.track_api import TrackApi
 from .api.set_attribute_api import SetAttributeApi
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 from .utils.data_type_util import is_string, is_object, is_boolean
 from .services.settings_manager import SettingsManager
+from .packages.network_layer.manager.network_manager import NetworkManager
 from .enums.api_enum import ApiEnum
-from .utils.aliasing_util import get_alias_user_id
+from .utils.aliasing_util import get_alias_user_id, resolve_aliases as resolve_aliases_util
 from .utils.aliasing_util import set_alias as set_user_alias_util
 from .utils.uuid_util import is_web_uuid, get_uuid
 from .utils.function_util import get_current_unix_timestamp
+from .constants.Constants import Constants
 
 class VWOClient:
-    _settings: SettingsModel = None
-    original_settings: Dict = None
+    _settings_snapshot: SettingsSnapshotModel = None
     batch_event_queue: BatchEventQueue = None 
+    impression_deduplicator: Optional[ImpressionDeduplicator] = None
     _vwo_client_instance = None
 
-    def __init__(self, settings: str, options: Dict):
+    def __init__(self, settings: str, options: Dict, is_settings_valid: Optional[bool] = None):
         self.options = options
         if settings is None or settings == {}:
             return
-        set_settings_and_add_campaigns_to_rules(settings, self)
+        set_settings_and_add_campaigns_to_rules(settings, self, is_settings_valid)
 
         # Set the singleton instance to the current instance
         if VWOClient._vwo_client_instance is None:
@@ -54,6 +60,16 @@ class VWOClient:
 
         LogManager.get_instance().info(info_messages.get("CLIENT_INITIALIZED"))
     
+    @property
+    def _settings(self) -> Optional[SettingsModel]:
+        snapshot = self._settings_snapshot
+        return snapshot.get_settings() if snapshot else None
+
+    @property
+    def original_settings(self) -> Optional[Dict]:
+        snapshot = self._settings_snapshot
+        return snapshot.get_original_settings() if snapshot else None
+
     @staticmethod
     def get_instance():
         """
@@ -81,12 +97,15 @@ class VWOClient:
         """
         api_name = "getFlag"
         uuid = None
+        # Read the settings snapshot once so that a concurrent refresh cannot change it mid-evaluation
+        settings_snapshot = self._settings_snapshot
+        settings = settings_snapshot.get_settings() if settings_snapshot else None
         try:
             LogManager.get_instance().debug(
                 debug_messages.get("API_CALLED").format(apiName=api_name)
             )
             # get uuid from context
-            uuid = self._get_uuid_from_context(context, api_name)
+            uuid = self._get_uuid_from_context(context, api_name, settings)
         except Exception as err:
             LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
             return GetFlag(is_enabled=False, variables=[], session_id=context.get("session_id", get_current_unix_timestamp()), uuid=uuid)
@@ -110,7 +129,7 @@ class VWOClient:
 
             # Validate settings are loaded and valid
             settings_manager = SettingsManager.get_instance()
-            if not settings_manager or not settings_manager.is_settings_valid(self.original_settings):
+            if not settings_manager or not self._has_valid_settings(settings_snapshot):
                 LogManager.get_instance().error(
                     error_messages.get("INVALID_SETTINGS_SCHEMA")
                 )
@@ -123,25 +142,12 @@ class VWOClient:
                 )
                 raise ValueError("Invalid context")
 
-            context_copy = context.copy()
-            context_copy["uuid"] = uuid
-            if "bucketingSeed" in context:
-                bucketing_seed = context.get("bucketingSeed")
-                if not isinstance(bucketing_seed, str) or not bucketing_seed.strip():
-                    LogManager.get_instance().error(
-                        error_messages.get("INVALID_BUCKETING_SEED")
-                    )
-                    del context_copy["bucketingSeed"]
-
-            context_model = ContextModel(context_copy)
-
-            if self.options.get("is_aliasing_enabled"):
-                context_model.set_id(get_alias_user_id(context_model))
+            context_model = self._build_flag_context_model(context, uuid)
 
             # Fetch the feature flag value using FlagApi
             flag_api = GetFlagApi()
             data = flag_api.get(
-                feature_key, self._settings, context_model, hook_manager
+                feature_key, settings, context_model, hook_manager
             )
 
             return data
@@ -154,6 +160,252 @@ class VWOClient:
             LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
             return get_flag_response
 
+    def get_flags(self, feature_keys: List[str], context: Dict) -> Dict[str, GetFlag]:
+        """
+        Retrieves the feature flags for the given feature keys and one user context.
+        The per-user setup of get_flag (context, alias, gateway lookup and settings checks) is done once,
+        every flag is evaluated against the same settings snapshot and all impressions are sent as one batch.
+
+        :param feature_keys: The keys of the features to retrieve.
+        :param context: The context in which the feature flags are being retrieved, must include a valid user ID.
+        :return: A dictionary mapping each feature key to its flag value.
+        """
+        return self._get_flags(feature_keys, context, "getFlags", self._settings_snapshot)
+
+    def get_all_flags(self, context: Dict) -> Dict[str, GetFlag]:
+        """
+        Retrieves every feature flag in the settings for one user context, as get_flags does.
+
+        :param context: The context in which the feature flags are being retrieved, must include a valid user ID.
+        :return: A dictionary mapping each feature key to its flag value.
+        """
+        settings_snapshot = self._settings_snapshot
+        settings = settings_snapshot.get_settings() if settings_snapshot else None
+        feature_keys = [feature.get_key() for feature in settings.get_features()] if settings else []
+        return self._get_flags(feature_keys, context, "getAllFlags", settings_snapshot)
+
+    def _get_flags(
+        self,
+        feature_keys: List[str],
+        context: Dict,
+        api_name: str,
+        settings_snapshot: Optional[SettingsSnapshotModel],
+    ) -> Dict[str, GetFlag]:
+        uuid = None
+        settings = settings_snapshot.get_settings() if settings_snapshot else None
+        flags: Dict[str, GetFlag] = {}
+
+        def disabled_flags() -> Dict[str, GetFlag]:
+            session_id = context.get("session_id", get_current_unix_timestamp()) if is_object(context) else None
+            return {
+                feature_key: GetFlag(is_enabled=False, variables=[], session_id=session_id, uuid=uuid)
+                for feature_key in (feature_keys if isinstance(feature_keys, (list, tuple)) else [])
+                if isinstance(feature_key, str)
+            }
+
+        try:
+            LogManager.get_instance().debug(
+                debug_messages.get("API_CALLED").format(apiName=api_name)
+            )
+
+            # Validate featureKeys is a list of strings
+            if not isinstance(feature_keys, (list, tuple)) or not all(
+                isinstance(feature_key, str) for feature_key in feature_keys
+            ):
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_PARAM").format(
+                        apiName=api_name,
+                        key="feature_keys",
+                        type=type(feature_keys).__name__,
+                        correctType="list of strings",
+                    )
+                )
+                raise TypeError("TypeError: featureKeys should be a list of strings")
+
+            # Validate settings are loaded and valid
+            settings_manager = SettingsManager.get_instance()
+            if not settings_manager or not self._has_valid_settings(settings_snapshot):
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_SETTINGS_SCHEMA")
+                )
+                raise ValueError("Invalid Settings")
+
+            # Validate user ID is present in context
+            if not context or "id" not in context:
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_CONTEXT_PASSED")
+                )
+                raise ValueError("Invalid context")
+
+            uuid = self._get_uuid_from_context(context, api_name, settings)
+            # One context model is shared by all flags, so the gateway lookup and session ID are resolved once
+            context_model = self._build_flag_context_model(context, uuid)
+            hook_manager = HooksManager(self.options)
+            batch_payload = []
+
+            for feature_key in feature_keys:
+                if feature_key in flags:
+                    continue
+                try:
+                    flags[feature_key] = GetFlagApi().get(
+                        feature_key, settings, context_model, hook_manager, batch_payload
+                    )
+                except Exception as err:
+                    LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
+                    flags[feature_key] = GetFlag(is_enabled=False, variables=[], session_id=context_model.get_session_id(), uuid=uuid)
+
+            send_collected_impressions(
+                batch_payload, context_model, settings.get_account_id(), settings.get_sdk_key()
+            )
+
+            return flags
+
+        except Exception as err:
+            LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
+            disabled = disabled_flags()
+            disabled.update(flags)
+            return disabled
+
+    def evaluate_cohort(
+        self,
+        feature_key: str,
+        contexts: Iterable[Dict],
+        batch_size: int = Constants.COHORT_BATCH_SIZE,
+        send_impressions: bool = False,
+    ) -> Iterator[GetFlag]:
+        """
+        Evaluates a feature flag for a stream of user contexts, e.g. for offline audience sizing or backfills.
+        The contexts are read in batches and the bucketing of each batch is vectorized. The decisions are
+        the same as get_flag gives for users without a stored decision. Storage is not used, and no
+        impressions are sent unless send_impressions is set. The gateway service is only called with
+        is_aliasing_enabled, to resolve the uncached aliases of each batch (one request per
+        Constants.ALIAS_BATCH_SIZE user IDs).
+
+        :param feature_key: The key of the feature to evaluate.
+        :param contexts: The user contexts, each must include a valid user ID.
+        :param batch_size: The number of contexts evaluated together.
+        :param send_impressions: Whether to send the impressions of the decisions.
+        :return: An iterator over the flag of each context, in the same order as the contexts.
+        :raises ValueError: If the feature is part of a mutually exclusive group or needs the gateway service.
+        """
+        api_name = "evaluateCohort"
+        settings_snapshot = self._settings_snapshot
+        settings = settings_snapshot.get_settings() if settings_snapshot else None
+        cohort_api = None
+
+        LogManager.get_instance().debug(
+            debug_messages.get("API_CALLED").format(apiName=api_name)
+        )
+
+        try:
+            # Validate featureKey is a string
+            if not isinstance(feature_key, str):
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_PARAM").format(
+                        apiName=api_name,
+                        key="feature_key",
+                        type=type(feature_key).__name__,
+                        correctType="string",
+                    )
+                )
+                raise TypeError("TypeError: featureKey should be a string")
+
+            # Validate settings are loaded and valid
+            if not SettingsManager.get_instance() or not self._has_valid_settings(settings_snapshot):
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_SETTINGS_SCHEMA")
+                )
+                raise ValueError("Invalid Settings")
+        except (TypeError, ValueError) as err:
+            LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
+        else:
+            # features that cannot be evaluated in bulk are rejected rather than reported as disabled
+            cohort_api = EvaluateCohortApi(feature_key, settings, send_impressions)
+
+        batch = []
+        for context in contexts:
+            batch.append(context)
+            if len(batch) >= max(batch_size, 1):
+                yield from self._evaluate_cohort_batch(
+                    cohort_api, self._build_cohort_context_models(batch, api_name, settings)
+                )
+                batch = []
+        if batch:
+            yield from self._evaluate_cohort_batch(
+                cohort_api, self._build_cohort_context_models(batch, api_name, settings)
+            )
+
+    def _build_cohort_context_models(
+        self, contexts: List[Dict], api_name: str, settings: Optional[SettingsModel]
+    ) -> List[Optional[ContextModel]]:
+        if self.options.get("is_aliasing_enabled"):
+            # one gateway request per batch fills the alias cache the context models read from
+            try:
+                resolve_aliases_util(context["id"] for context in contexts if context and "id" in context)
+            except Exception as err:
+                LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
+        return [self._build_cohort_context_model(context, api_name, settings) for context in contexts]
+
+    def _build_cohort_context_model(
+        self, context: Dict, api_name: str, settings: Optional[SettingsModel]
+    ) -> Optional[ContextModel]:
+        try:
+            # Validate user ID is present in context
+            if not context or "id" not in context:
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_CONTEXT_PASSED")
+                )
+                return None
+            uuid = self._get_uuid_from_context(context, api_name, settings)
+            return self._build_flag_context_model(context, uuid)
+        except Exception as err:
+            LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
+            return None
+
+    @staticmethod
+    def _evaluate_cohort_batch(
+        cohort_api: Optional[EvaluateCohortApi], context_models: List[Optional[ContextModel]]
+    ) -> List[GetFlag]:
+        if cohort_api is not None:
+            try:
+                return cohort_api.evaluate(context_models)
+            except Exception as err:
+                LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": "evaluateCohort", "err": str(err)}, debug_data={"an": ApiEnum.GET_FLAG.value})
+        return [
+            GetFlag(
+                is_enabled=False,
+                variables=[],
+                session_id=context_model.get_session_id() if context_model else None,
+                uuid=context_model.get_vwo_uuid() if context_model else None,
+            )
+            for context_model in context_models
+        ]
+
+    def _build_flag_context_model(self, context: Dict, uuid: Optional[str]) -> ContextModel:
+        """
+        Builds the context model a flag is evaluated with, dropping an invalid bucketing seed and resolving the alias.
+
+        :param context: The user context passed to the API.
+        :param uuid: The VWO UUID of the user.
+        :return: The context model.
+        """
+        context_copy = context.copy()
+        context_copy["uuid"] = uuid
+        if "bucketingSeed" in context:
+            bucketing_seed = context.get("bucketingSeed")
+            if not isinstance(bucketing_seed, str) or not bucketing_seed.strip():
+                LogManager.get_instance().error(
+                    error_messages.get("INVALID_BUCKETING_SEED")
+                )
+                del context_copy["bucketingSeed"]
+
+        context_model = ContextModel(context_copy)
+
+        if self.options.get("is_aliasing_enabled"):
+            context_model.set_id(get_alias_user_id(context_model))
+
+        return context_model
+
     def track_event(
         self, event_name: str, context: Dict, event_properties: Dict[str, Any] = {}
     ) -> Dict:
@@ -166,6 +418,8 @@ class VWOClient:
         :param event_properties: The properties of the event.
         """
         api_name = "track_event"
+        settings_snapshot = self._settings_snapshot
+        settings = settings_snapshot.get_settings() if settings_snapshot else None
 
         try:
             hook_manager = HooksManager(self.options)
@@ -199,7 +453,7 @@ class VWOClient:
 
             # Validate settings are loaded and valid
             settings_manager = SettingsManager.get_instance()
-            if not settings_manager or not settings_manager.is_settings_valid(self.original_settings):
+            if not settings_manager or not self._has_valid_settings(settings_snapshot):
                 LogManager.get_instance().error(
                     error_messages.get("INVALID_SETTINGS_SCHEMA")
                 )
@@ -213,7 +467,7 @@ class VWOClient:
                 raise ValueError("Invalid context")
             
             context_copy = context.copy()
-            context_copy["uuid"] = self._get_uuid_from_context(context, api_name)
+            context_copy["uuid"] = self._get_uuid_from_context(context, api_name, settings)
             context_model = ContextModel(context_copy)
 
             if self.options.get("is_aliasing_enabled"):
@@ -222,7 +476,7 @@ class VWOClient:
             # Fetch the feature flag value using FlagApi
             trackApi = TrackApi()
             data = trackApi.track(
-                self._settings,
+                settings,
                 event_name,
                 context_model,
                 event_properties,
@@ -255,6 +509,8 @@ class VWOClient:
         :param context: The context in which the attribute is being set (only used when setting single attribute)
         """
         api_name = "set_attribute"
+        settings_snapshot = self._settings_snapshot
+        settings = settings_snapshot.get_settings() if settings_snapshot else None
 
         try:
             LogManager.get_instance().debug(
@@ -335,7 +591,7 @@ class VWOClient:
 
             # Validate settings are loaded and valid
             settings_manager = SettingsManager.get_instance()
-            if not settings_manager or not settings_manager.is_settings_valid(self.original_settings):
+            if not settings_manager or not self._has_valid_settings(settings_snapshot):
                 LogManager.get_instance().error(
                     error_messages.get("INVALID_SETTINGS_SCHEMA")
                 )
@@ -348,7 +604,7 @@ class VWOClient:
                 raise ValueError("Invalid context")
             
             context_copy = user_context.copy()
-            context_copy["uuid"] = self._get_uuid_from_context(user_context, api_name)
+            context_copy["uuid"] = self._get_uuid_from_context(user_context, api_name, settings)
             context_model = ContextModel(context_copy)
 
             if self.options.get("is_aliasing_enabled"):
@@ -356,7 +612,7 @@ class VWOClient:
 
             set_attribute_api = SetAttributeApi()
             set_attribute_api.set_attribute(
-                self._settings, attribute_map, context_model
+                settings, attribute_map, context_model
             )
             return
 
@@ -400,7 +656,7 @@ class VWOClient:
                 raise ValueError("TypeError: Invalid Settings schema")
 
             # update the settings
-            set_settings_and_add_campaigns_to_rules(settings_to_update, self)
+            set_settings_and_add_campaigns_to_rules(settings_to_update, self, True)
             LogManager.get_instance().info(
                 info_messages.get("SETTINGS_UPDATED").format(
                     apiName=api_name, isViaWebhook=is_via_webhook
@@ -430,7 +686,7 @@ class VWOClient:
                     f"Flushing events for accountId: {self.options.get('account_id')}. Queue size: {len(self.batch_event_queue.batch_queue)}"
                 )
                 # Trigger the flush and clear the queue
-                flush_result = self.batch_event_queue.flush_and_clear_timer()
+                flush_result = self.batch_event_queue.flush(manual=True)
                 return flush_result
             else:
                 LogManager.get_instance().debug(
@@ -442,6 +698,38 @@ class VWOClient:
             LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
             return False
     
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends the queued batch events, stops the attribute list refresh, gives up the shared settings
+        fetch and stops the background executor once the queued network calls finish, then closes the
+        event spool. Background calls made after close are rejected.
+
+        :param timeout: Seconds to wait for the queued calls, None to wait until they finish.
+        :return: True if every queued call finished within the timeout.
+        """
+        api_name = "close"
+        try:
+            LogManager.get_instance().debug(
+                debug_messages.get("API_CALLED").format(apiName=api_name)
+            )
+            if self.batch_event_queue:
+                self.batch_event_queue.close()
+            settings_manager = SettingsManager.get_instance()
+            if settings_manager is not None and settings_manager.attribute_list_store is not None:
+                settings_manager.attribute_list_store.stop()
+            if settings_manager is not None and settings_manager.shared_settings_store is not None:
+                # hands the settings fetch over to another process of this host
+                settings_manager.shared_settings_store.close()
+                settings_manager.shared_settings_store = None
+            is_finished = NetworkManager.get_instance().shutdown(timeout)
+            if self.batch_event_queue:
+                # after the sends, so the uploaded events are acknowledged first
+                self.batch_event_queue.close_spool()
+            return is_finished
+        except Exception as err:
+            LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.FLUSH_EVENTS.value})
+            return False
+
     def set_alias(self, user_id_or_context: Any, alias_id: str) -> bool:
         """
         Set an alias for a given user id using the gateway service.
@@ -489,14 +777,59 @@ class VWOClient:
             LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.SET_ALIAS.value})
             return False
     
-    def _get_uuid_from_context(self, context: Dict, api_name: str) -> str:
+    def resolve_aliases(self, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Resolves the aliases of many user ids with one gateway request per batch and caches them,
+        so get_flag, track_event and set_attribute for these users need no alias lookup.
+
+        :param user_ids: The user ids to resolve.
+        :return: The resolved user id of every given id, the id itself if it is not an alias.
+            Empty if the aliases could not be resolved.
+        """
+        api_name = "resolveAliases"
+        try:
+            LogManager.get_instance().debug(
+                debug_messages.get("API_CALLED").format(apiName=api_name)
+            )
+
+            # check if aliasing is enabled
+            if not self.options.get("is_aliasing_enabled"):
+                raise ValueError("Aliasing is not enabled")
+
+            # check if gateway service is provided
+            settings_manager = SettingsManager.get_instance()
+            if not settings_manager or not settings_manager.is_gateway_service_provided:
+                raise ValueError("Gateway service is not provided")
+
+            if not isinstance(user_ids, (list, tuple, set)) or not all(
+                isinstance(user_id, str) and user_id.strip() for user_id in user_ids
+            ):
+                raise TypeError("User IDs should be a list of non-empty strings")
+
+            return resolve_aliases_util(user_id.strip() for user_id in user_ids)
+        except Exception as err:
+            LogManager.get_instance().error_log("EXECUTION_FAILED", data={"apiName": api_name, "err": str(err)}, debug_data={"an": ApiEnum.RESOLVE_ALIASES.value})
+            return {}
+
+    @staticmethod
+    def _has_valid_settings(settings_snapshot: Optional[SettingsSnapshotModel]) -> bool:
+        """
+        Checks whether the settings snapshot passed schema validation.
+        Validation runs once when the snapshot is built, so this only reads its result.
+        :param settings_snapshot: The settings snapshot read at the start of the API call.
+        :return: True if the settings are loaded and valid, else False.
+        """
+        return settings_snapshot is not None and settings_snapshot.get_is_valid()
+
+    def _get_uuid_from_context(self, context: Dict, api_name: str, settings: SettingsModel) -> str:
         """
         Gets the UUID from the context.
         :param context: The context to get the UUID from.
         :param api_name: The name of the API calling this method.
+        :param settings: The settings read at the start of the API call.
         :return: The UUID from the context.
         """
-        if self._settings.get_is_web_connectivity_enabled():
+        if settings.get_is_web_connectivity_enabled():
             # if web connectivity is enabled, check if context id is a valid web UUID
             if is_web_uuid(context.get("id")):
                 # if it is a valid web UUID, return it